@@ -0,0 +1,70 @@
+"""
+Benchmark do índice de similaridade: revocação e latência do IVF contra a
+busca exata (força bruta).
+
+Uso:
+    python benchmarks/bench_embeddings.py [número de memórias] [consultas]
+"""
+
+import sys
+import os
+import random
+import time
+
+# Adiciona o diretório pai ao path para importar os módulos
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.embeddings import HashingEmbedder, IVFIndex
+
+VOCABULARY = [f"palavra{i}" for i in range(2000)]
+# Situações: cada uma tem um vocabulário próprio, como memórias de um mesmo tema
+TOPICS = [VOCABULARY[i:i + 40] for i in range(0, 2000, 20)]
+
+
+def random_texts(count, rng):
+    """Gera frases de 8 palavras: 6 de uma situação e 2 quaisquer."""
+    texts = []
+    for _ in range(count):
+        topic = rng.choice(TOPICS)
+        words = [rng.choice(topic) for _ in range(6)] + [rng.choice(VOCABULARY) for _ in range(2)]
+        texts.append(" ".join(words))
+    return texts
+
+
+def run(size=50000, queries=200, k=10, dim=256):
+    """Mede revocação@k e latência para vários valores de n_probe."""
+    rng = random.Random(42)
+    embedder = HashingEmbedder(dim)
+    print(f"Incorporando {size} textos (dim={dim})...")
+    matrix = embedder.embed_many(random_texts(size, rng))
+    query_matrix = embedder.embed_many(random_texts(queries, rng))
+
+    index = IVFIndex(dim, min_train_size=size + 1)
+    for i, vector in enumerate(matrix):
+        index.add(f"m{i}", vector)
+    start = time.perf_counter()
+    index.train()
+    print(f"Treino: {time.perf_counter() - start:.2f}s ({len(index._centroids)} listas)")
+
+    start = time.perf_counter()
+    exact = [index.brute_force_search(q, k) for q in query_matrix]
+    brute = (time.perf_counter() - start) / queries
+    print(f"Força bruta: {brute * 1000:.3f} ms/consulta")
+
+    index.min_train_size = 0
+    for n_probe in (1, 4, 8, 16, 32):
+        index.n_probe = n_probe
+        start = time.perf_counter()
+        results = index.search_batch(query_matrix, k)
+        latency = (time.perf_counter() - start) / queries
+        recall = sum(len({i for i, _ in e} & {i for i, _ in r}) for e, r in zip(exact, results)) / (queries * k)
+        # Textos curtos empatam muito: conta também os resultados tão bons quanto o k-ésimo exato
+        tied = sum(sum(1 for _, score in r if score >= e[-1][1] - 1e-6)
+                   for e, r in zip(exact, results)) / (queries * k)
+        print(f"IVF n_probe={n_probe:>2}: revocação@{k}={recall:.3f} (com empates {tied:.3f})  "
+              f"{latency * 1000:.3f} ms/consulta  ({brute / latency:.1f}x)")
+
+
+if __name__ == "__main__":
+    arguments = [int(a) for a in sys.argv[1:3]]
+    run(*arguments)
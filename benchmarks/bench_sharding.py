@@ -0,0 +1,60 @@
+"""
+Benchmark do mundo particionado: passos por segundo (ações de movimento e
+percepção de todos os agentes) para vários números de shards em processos.
+
+Uso:
+    python benchmarks/bench_sharding.py [número de agentes] [passos]
+"""
+
+import sys
+import os
+import random
+import time
+
+# Adiciona o diretório pai ao path para importar os módulos
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.world import Entity
+from src.sharding import StripPartition, ShardedWorld
+
+WIDTH = 2000.0
+HEIGHT = 200.0
+
+
+def random_walk(positions, rng, step=2.0):
+    """Gera uma ação de movimento curto para cada agente."""
+    actions = []
+    for agent_id, position in positions.items():
+        x = min(max(position["x"] + rng.uniform(-step, step), 0.0), WIDTH)
+        y = min(max(position["y"] + rng.uniform(-step, step), 0.0), HEIGHT)
+        position = positions[agent_id] = {"x": x, "y": y, "z": 0.0}
+        actions.append((agent_id, {"type": "move", "position": position}))
+    return actions
+
+
+def run(agents=4000, steps=20, shard_counts=(1, 2, 4)):
+    """Mede os passos por segundo para cada número de shards."""
+    baseline = None
+    for shard_count in shard_counts:
+        rng = random.Random(42)
+        positions = {f"a{i}": {"x": rng.uniform(0.0, WIDTH), "y": rng.uniform(0.0, HEIGHT), "z": 0.0}
+                     for i in range(agents)}
+        partition = StripPartition(0.0, WIDTH, shard_count, halo=10.0)
+        with ShardedWorld(partition, transport="process") as world:
+            world.add_entities(Entity(entity_id=agent_id, position=dict(position))
+                               for agent_id, position in positions.items())
+            agent_ids = list(positions)
+            start = time.perf_counter()
+            for _ in range(steps):
+                world.step(random_walk(positions, rng), agent_ids)
+            elapsed = time.perf_counter() - start
+            rate = steps / elapsed
+            baseline = baseline or rate
+            ghosts = sum(stats["ghosts"] for stats in world.stats())
+            print(f"{shard_count} shard(s): {rate:.2f} passos/s  ({rate / baseline:.2f}x)  "
+                  f"handoffs={world.handoffs}  fantasmas={ghosts}")
+
+
+if __name__ == "__main__":
+    arguments = [int(a) for a in sys.argv[1:3]]
+    run(*arguments)
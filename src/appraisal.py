@@ -0,0 +1,284 @@
+"""
+Módulo que implementa a avaliação emocional de eventos pelo modelo OCC
+(Ortony, Clore e Collins).
+
+Cada par (evento, agente) de um tick recebe três pontuações, calculadas
+para o lote inteiro com operações de matriz sobre o registro de população:
+
+- desejabilidade das consequências: soma das prioridades dos valores
+  afetados e das carências (1 - satisfação) das necessidades afetadas,
+  ponderadas pelo efeito do evento -> Joy/Distress (ou Hope/Fear se o
+  evento for prospectivo);
+- louvabilidade da ação do autor: prioridades dos valores ponderadas pelo
+  quanto a ação os respeita -> Pride/Shame (o próprio agente) ou
+  Admiration/Reproach (outro agente);
+- atratividade de um objeto: prioridades dos valores ponderadas pelo apelo
+  do objeto -> Love/Hate.
+
+As emoções resultantes são combinadas por (emoção, alvo, causa) com as
+emoções vivas do agente, como no acumulador de emoções: as chaves já vivas
+são reforçadas e as novas são inseridas em bloco (uma chamada de
+`add_edges_bulk` por agente).
+"""
+
+from typing import Dict, List, Any, Optional, Sequence, Tuple
+
+import numpy as np
+
+from src.population import PopulationRegistry, TRACKED_TYPES
+from src.edges import EmotionEdge
+from src.emotions import EmotionAccumulator, EmotionKey, combine_intensities
+
+# Emoção para pontuação positiva / negativa
+CONSEQUENCE_EMOTIONS = ("Joy", "Distress")
+PROSPECT_EMOTIONS = ("Hope", "Fear")
+SELF_ACTION_EMOTIONS = ("Pride", "Shame")
+OTHER_ACTION_EMOTIONS = ("Admiration", "Reproach")
+OBJECT_EMOTIONS = ("Love", "Hate")
+
+
+class AppraisalEvent:
+    """
+    Evento a ser avaliado, descrito pelos seus efeitos sobre valores e necessidades.
+    """
+
+    def __init__(self, event_id: str, value_effects: Optional[Dict[str, float]] = None,
+                 need_effects: Optional[Dict[str, float]] = None, actor: Optional[str] = None,
+                 standards: Optional[Dict[str, float]] = None, object_id: Optional[str] = None,
+                 appeal: Optional[Dict[str, float]] = None, prospective: bool = False):
+        """
+        Inicializa um evento.
+
+        Args:
+            event_id: ID do evento.
+            value_effects: Nome do valor -> efeito das consequências (entre -1 e 1).
+            need_effects: Nome da necessidade -> efeito sobre a satisfação (entre -1 e 1).
+            actor: ID do agente autor da ação (None se não houver autor).
+            standards: Nome do valor -> quanto a ação do autor o respeita (entre -1 e 1).
+            object_id: ID do objeto envolvido (None se não houver).
+            appeal: Nome do valor -> apelo do objeto para quem preza o valor (entre -1 e 1).
+            prospective: True se as consequências ainda são uma perspectiva.
+        """
+        self.id = event_id
+        self.value_effects = value_effects or {}
+        self.need_effects = need_effects or {}
+        self.actor = actor
+        self.standards = standards or {}
+        self.object_id = object_id
+        self.appeal = appeal or {}
+        self.prospective = prospective
+
+
+class AppraisalEngine:
+    """
+    Avaliação OCC vetorizada de lotes de pares (evento, agente).
+    """
+
+    def __init__(self, registry: PopulationRegistry, min_intensity: float = 0.05,
+                 decay_rate: float = 0.1):
+        """
+        Inicializa o motor de avaliação.
+
+        Args:
+            registry: Registro de população com as psiques dos agentes.
+            min_intensity: Intensidade mínima para uma emoção ser gerada.
+            decay_rate: Taxa de decaimento das emoções geradas.
+        """
+        self.registry = registry
+        self.min_intensity = min_intensity
+        self.decay_rate = decay_rate
+        self.emitted = 0
+        self.merges = 0
+        # Emoções vivas de cada agente avaliado, por (emoção, alvo, causa)
+        self._accumulators: Dict[str, EmotionAccumulator] = {}
+
+    def _weights(self, events: List[AppraisalEvent], attribute: str, node_type: str) -> np.ndarray:
+        """
+        Monta a matriz eventos x colunas com os pesos de um aspecto dos eventos.
+        """
+        registry = self.registry
+        weights = np.zeros((len(events), registry.matrix.shape[1]))
+        for i, event in enumerate(events):
+            for name, effect in getattr(event, attribute).items():
+                column = registry.column(node_type, name)
+                if column is not None:
+                    weights[i, column] = effect
+        return weights
+
+    def score(self, pairs: Sequence[Tuple[AppraisalEvent, str]]) -> Dict[str, np.ndarray]:
+        """
+        Calcula as pontuações OCC de um lote.
+
+        Args:
+            pairs: Pares (evento, ID do agente). Agentes não registrados recebem 0.
+
+        Returns:
+            Dicionário com os vetores "desirability", "praiseworthiness" e
+            "appealingness", na ordem dos pares.
+        """
+        registry = self.registry
+        count = len(pairs)
+        events: List[AppraisalEvent] = []
+        event_index: Dict[str, int] = {}
+        event_rows = np.zeros(count, dtype=np.int64)
+        agent_rows = np.full(count, -1, dtype=np.int64)
+        for i, (event, agent_id) in enumerate(pairs):
+            position = event_index.get(event.id)
+            if position is None:
+                position = event_index[event.id] = len(events)
+                events.append(event)
+            event_rows[i] = position
+            row = registry.row(agent_id)
+            if row is not None:
+                agent_rows[i] = row
+
+        known = agent_rows >= 0
+        scores = {name: np.zeros(count) for name in ("desirability", "praiseworthiness", "appealingness")}
+        if not known.any():
+            return scores
+
+        # Uma única leitura das linhas dos agentes: prioridades (NaN -> 0) e carências
+        levels = registry.matrix[agent_rows[known]]
+        missing = np.isnan(levels)
+        priorities = np.where(missing, 0.0, levels)
+        deficits = np.where(missing, 0.0, 1.0 - levels)
+        rows = event_rows[known]
+
+        value_effects = self._weights(events, "value_effects", "Value")[rows]
+        need_effects = self._weights(events, "need_effects", "Need")[rows]
+        standards = self._weights(events, "standards", "Value")[rows]
+        appeal = self._weights(events, "appeal", "Value")[rows]
+        scores["desirability"][known] = (np.einsum("ij,ij->i", priorities, value_effects)
+                                         + np.einsum("ij,ij->i", deficits, need_effects))
+        scores["praiseworthiness"][known] = np.einsum("ij,ij->i", priorities, standards)
+        scores["appealingness"][known] = np.einsum("ij,ij->i", priorities, appeal)
+        return scores
+
+    def appraise(self, pairs: Sequence[Tuple[AppraisalEvent, str]],
+                 current_time: Optional[int] = None) -> Dict[str, List[EmotionEdge]]:
+        """
+        Avalia um lote e registra as emoções resultantes nas psiques dos agentes.
+
+        Avaliações com a mesma chave (emoção, alvo, evento) são combinadas com
+        `combine_intensities`, entre si e com a emoção viva da chave, se houver.
+
+        Args:
+            pairs: Pares (evento, ID do agente).
+            current_time: Tempo atual (timestamp das emoções).
+
+        Returns:
+            Dicionário ID do agente -> emoções criadas ou reforçadas.
+        """
+        scores = self.score(pairs)
+        desirability = scores["desirability"]
+        praiseworthiness = scores["praiseworthiness"]
+        appealingness = scores["appealingness"]
+        threshold = self.min_intensity
+
+        # Emoções de cada agente: chave -> (intensidade, aspectos afetados)
+        pending: Dict[str, Dict[EmotionKey, Tuple[float, List[Tuple[str, str]]]]] = {}
+        for i, (event, agent_id) in enumerate(pairs):
+            appraisals = []
+            if abs(desirability[i]) >= threshold:
+                positive, negative = PROSPECT_EMOTIONS if event.prospective else CONSEQUENCE_EMOTIONS
+                affected = ([("Value", name) for name in event.value_effects] +
+                            [("Need", name) for name in event.need_effects])
+                appraisals.append((positive if desirability[i] > 0 else negative,
+                                   event.id, desirability[i], affected))
+            if event.actor is not None and abs(praiseworthiness[i]) >= threshold:
+                positive, negative = SELF_ACTION_EMOTIONS if event.actor == agent_id else OTHER_ACTION_EMOTIONS
+                appraisals.append((positive if praiseworthiness[i] > 0 else negative, event.actor,
+                                   praiseworthiness[i], [("Value", name) for name in event.standards]))
+            if event.object_id is not None and abs(appealingness[i]) >= threshold:
+                positive, negative = OBJECT_EMOTIONS
+                appraisals.append((positive if appealingness[i] > 0 else negative, event.object_id,
+                                   appealingness[i], [("Value", name) for name in event.appeal]))
+            if appraisals:
+                merged = pending.setdefault(agent_id, {})
+                for emotion, target, value, affected in appraisals:
+                    key = (emotion, target, event.id)
+                    intensity = min(1.0, abs(float(value)))
+                    if key in merged:
+                        intensity = combine_intensities(merged[key][0], intensity)
+                        affected = merged[key][1]
+                    merged[key] = (intensity, affected)
+
+        emitted: Dict[str, List[EmotionEdge]] = {}
+        for agent_id, merged in pending.items():
+            psyche_module = self.registry.psyche(agent_id)
+            if psyche_module is None:
+                continue
+            graph = psyche_module.psyche
+            accumulator = self._accumulator(agent_id, graph)
+            edges: Dict[EmotionKey, EmotionEdge] = {}
+            new_keys = []
+            with graph.batch():
+                for key, (intensity, _) in merged.items():
+                    edge = accumulator.get(*key)
+                    if edge is None:
+                        new_keys.append(key)
+                        continue
+                    changes: Dict[str, Any] = {"intensity": combine_intensities(edge.intensity, intensity)}
+                    if current_time is not None:
+                        changes["timestamp"] = current_time
+                    edges[key] = graph.update_edge(edge.id, **changes)
+                    self.merges += 1
+            if new_keys:
+                node_ids = self._node_ids(graph)
+                count = len(new_keys)
+                created = graph.add_edges_bulk(
+                    [None] * count,
+                    [[node_ids[aspect] for aspect in merged[key][1] if aspect in node_ids]
+                     for key in new_keys],
+                    "Emotion",
+                    {"emotion": [emotion for emotion, _, _ in new_keys],
+                     "target": [target for _, target, _ in new_keys],
+                     "intensity": [merged[key][0] for key in new_keys],
+                     "decay_rate": [self.decay_rate] * count,
+                     "timestamp": [current_time] * count})
+                for key, edge in zip(new_keys, created):
+                    accumulator.track(key, edge)
+                    edges[key] = edge
+                self.emitted += count
+            emitted[agent_id] = [edges[key] for key in merged]
+        return emitted
+
+    def _accumulator(self, agent_id: str, graph: Any) -> EmotionAccumulator:
+        """
+        Obtém o acumulador de emoções de um agente (recriado se a psique mudou).
+        """
+        accumulator = self._accumulators.get(agent_id)
+        if accumulator is None or accumulator.graph is not graph:
+            if accumulator is not None:
+                accumulator.detach()
+            accumulator = self._accumulators[agent_id] = EmotionAccumulator(graph)
+        return accumulator
+
+    def broadcast(self, event: AppraisalEvent, agent_ids: Optional[Sequence[str]] = None,
+                  current_time: Optional[int] = None) -> Dict[str, List[EmotionEdge]]:
+        """
+        Avalia um evento percebido por muitos agentes (ex: uma explosão ouvida pela multidão).
+
+        Args:
+            event: Evento.
+            agent_ids: Agentes que perceberam o evento (todos os registrados por padrão).
+            current_time: Tempo atual.
+
+        Returns:
+            Dicionário ID do agente -> emoções criadas.
+        """
+        if agent_ids is None:
+            agent_ids = list(self.registry.agent_ids)
+        return self.appraise([(event, agent_id) for agent_id in agent_ids], current_time)
+
+    @staticmethod
+    def _node_ids(graph: Any) -> Dict[Tuple[str, str], str]:
+        """
+        Mapeia (tipo, nome) -> ID dos nós de valores e necessidades de uma psique.
+        """
+        node_ids = {}
+        for node_type in ("Value", "Need"):
+            name_attr = TRACKED_TYPES[node_type][0]
+            for node in graph.get_nodes_by_type(node_type):
+                node_ids[(node_type, getattr(node, name_attr))] = node.id
+        return node_ids
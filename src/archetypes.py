@@ -0,0 +1,71 @@
+"""
+Módulo que implementa os templates de arquétipo compartilhados.
+
+Um template materializa uma única vez o hiper-grafo de um arquétipo (traços,
+valores, necessidades, hábitos e crenças). Os personagens criados a partir
+dele recebem uma psique em camadas (OverlayHypergraph) que guarda apenas as
+diferenças, de modo que multidões homogêneas compartilham os mesmos nós.
+"""
+
+from typing import Dict, Any, Optional
+
+from src.hypergraph import Hypergraph
+from src.psyche import PsycheModule, populate_from_archetype
+
+
+class ArchetypeTemplate:
+    """
+    Hiper-grafo congelado de um arquétipo, compartilhado pelos personagens.
+    """
+
+    def __init__(self, name: str, archetype: Dict[str, Any]):
+        """
+        Materializa o template.
+
+        Args:
+            name: Nome do arquétipo (ex: "commoner").
+            archetype: Dicionário descrevendo o arquétipo (mesmo formato de
+                `PsycheModule.create_from_archetype`).
+        """
+        self.name = name
+        self.archetype = archetype
+        self.graph = Hypergraph(graph_id=f"archetype_{name}", name=f"Archetype {name}")
+        populate_from_archetype(self.graph, archetype)
+        # Congelado antes de ser compartilhado: as escritas são recusadas antes de acontecer
+        self.graph.freeze()
+
+    def instantiate(self, character_id: str, name: str) -> PsycheModule:
+        """
+        Cria um personagem a partir do template.
+
+        Args:
+            character_id: ID único do personagem.
+            name: Nome do personagem.
+
+        Returns:
+            Um PsycheModule cuja psique é uma camada sobre o template.
+        """
+        return PsycheModule.from_template(self, character_id, name)
+
+
+# Templates já materializados, por nome do arquétipo
+_TEMPLATES: Dict[str, ArchetypeTemplate] = {}
+
+
+def get_template(name: str, archetype: Optional[Dict[str, Any]] = None) -> ArchetypeTemplate:
+    """
+    Obtém o template de um arquétipo, materializando-o na primeira vez.
+
+    Args:
+        name: Nome do arquétipo.
+        archetype: Descrição do arquétipo (obrigatória na primeira chamada).
+
+    Returns:
+        O template compartilhado.
+    """
+    template = _TEMPLATES.get(name)
+    if template is None:
+        if archetype is None:
+            raise ValueError(f"Arquétipo {name} ainda não foi materializado.")
+        template = _TEMPLATES[name] = ArchetypeTemplate(name, archetype)
+    return template
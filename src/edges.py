@@ -3,19 +3,23 @@ Módulo que implementa os tipos específicos de hiper-arestas para o hiper-grafo
 """
 
 from typing import Dict, List, Any, Optional, Union
-from src.hypergraph import Hyperedge
+from src.hypergraph import Hyperedge, register_edge_type
 
 
+@register_edge_type("Memory")
 class MemoryEdge(Hyperedge):
     """
     Representa uma memória que conecta nós que participaram de um evento.
     Implementação das "Cornerstone Memories".
     """
     
+    INDEXED_ATTRIBUTES = ("salience", "intensity", "timestamp")
+    
     def __init__(self, edge_id: Optional[str] = None, nodes: Optional[List[str]] = None,
                  emotion_tag: str = "", intensity: float = 0.5, salience: float = 0.5,
                  is_cornerstone: bool = False, timestamp: Optional[int] = None,
-                 description: str = ""):
+                 description: str = "", merged_count: int = 1,
+                 embedding: Optional[List[float]] = None):
         """
         Inicializa uma hiper-aresta de memória.
         
@@ -28,6 +32,8 @@ class MemoryEdge(Hyperedge):
             is_cornerstone: Indica se esta é uma memória fundamental (cornerstone).
             timestamp: Timestamp do evento (opcional).
             description: Descrição textual do evento.
+            merged_count: Número de memórias resumidas por esta (1 para uma memória simples).
+            embedding: Vetor de características da descrição (opcional, ver src.embeddings).
         """
         super().__init__(edge_id=edge_id, edge_type="Memory", nodes=nodes)
         self.emotion_tag = emotion_tag
@@ -36,6 +42,8 @@ class MemoryEdge(Hyperedge):
         self.is_cornerstone = is_cornerstone
         self.timestamp = timestamp
         self.description = description
+        self.merged_count = merged_count
+        self.embedding = embedding
         
     def to_dict(self) -> Dict[str, Any]:
         """
@@ -51,7 +59,9 @@ class MemoryEdge(Hyperedge):
             "salience": self.salience,
             "is_cornerstone": self.is_cornerstone,
             "timestamp": self.timestamp,
-            "description": self.description
+            "description": self.description,
+            "merged_count": self.merged_count,
+            "embedding": [float(x) for x in self.embedding] if self.embedding is not None else None
         })
         return data
     
@@ -74,7 +84,9 @@ class MemoryEdge(Hyperedge):
             salience=data.get("salience", 0.5),
             is_cornerstone=data.get("is_cornerstone", False),
             timestamp=data.get("timestamp"),
-            description=data.get("description", "")
+            description=data.get("description", ""),
+            merged_count=data.get("merged_count", 1),
+            embedding=data.get("embedding")
         )
     
     def __str__(self) -> str:
@@ -82,11 +94,14 @@ class MemoryEdge(Hyperedge):
         return f"MemoryEdge(id={self.id}, emotion={self.emotion_tag}, intensity={self.intensity:.2f}{cornerstone})"
 
 
+@register_edge_type("Emotion")
 class EmotionEdge(Hyperedge):
     """
     Representa um estado emocional atual, conectando a causa da emoção aos valores e necessidades afetados.
     """
     
+    INDEXED_ATTRIBUTES = ("intensity",)
+    
     def __init__(self, edge_id: Optional[str] = None, nodes: Optional[List[str]] = None,
                  emotion: str = "", target: Optional[str] = None, decay_rate: float = 0.1,
                  intensity: float = 0.5, timestamp: Optional[int] = None):
@@ -164,11 +179,14 @@ class EmotionEdge(Hyperedge):
         return f"EmotionEdge(id={self.id}, emotion={self.emotion}, intensity={self.intensity:.2f}{target_str})"
 
 
+@register_edge_type("Rule")
 class RuleEdge(Hyperedge):
     """
     Representa uma regra de reescrita do próprio hiper-grafo, a base da aprendizagem e da "transvaloração".
     """
     
+    INDEXED_ATTRIBUTES = ("confidence",)
+    
     def __init__(self, edge_id: Optional[str] = None, nodes: Optional[List[str]] = None,
                  trigger: str = "", action: str = "", confidence: float = 0.5):
         """
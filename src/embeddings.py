@@ -0,0 +1,452 @@
+"""
+Módulo que implementa a busca por similaridade de vetores sobre memórias e
+crenças ("esta situação me lembra...").
+
+Os textos (`MemoryEdge.description` e `BeliefNode.content`) são convertidos
+em vetores de tamanho fixo por uma função de embedding local e plugável; a
+padrão usa o truque do hashing sobre um saco de palavras, sem modelos
+externos. Cada psique mantém um índice IVF (listas invertidas sobre
+centróides de k-means) implementado com NumPy: uma busca compara o vetor
+apenas com os elementos das `n_probe` listas mais próximas.
+"""
+
+from typing import Dict, List, Any, Optional, Callable, Iterable, Sequence, Tuple
+import re
+import zlib
+
+import numpy as np
+
+from src.hypergraph import Hypergraph
+
+_TOKEN_PATTERN = re.compile(r"\w+", re.UNICODE)
+
+
+class HashingEmbedder:
+    """
+    Embedding por truque do hashing: cada palavra (e, opcionalmente, cada
+    par de palavras vizinhas) soma ±1 em uma das `dim` posições do vetor,
+    que é normalizado para norma 1.
+
+    Usa CRC32 em vez de `hash` para que os vetores sejam os mesmos entre
+    processos e execuções.
+    """
+
+    def __init__(self, dim: int = 256, bigrams: bool = True):
+        """
+        Inicializa o embedder.
+
+        Args:
+            dim: Dimensão dos vetores.
+            bigrams: Se True, também considera pares de palavras vizinhas.
+        """
+        self.dim = dim
+        self.bigrams = bigrams
+
+    def tokens(self, text: str) -> List[str]:
+        """
+        Separa o texto em termos (palavras em minúsculas e, se ativado, pares).
+
+        Args:
+            text: Texto de entrada.
+
+        Returns:
+            Lista de termos.
+        """
+        words = _TOKEN_PATTERN.findall(text.lower())
+        if self.bigrams:
+            words += [f"{a} {b}" for a, b in zip(words, words[1:])]
+        return words
+
+    def __call__(self, text: str) -> np.ndarray:
+        """
+        Calcula o vetor de um texto.
+
+        Args:
+            text: Texto de entrada.
+
+        Returns:
+            Vetor float32 de norma 1 (ou nulo, para um texto sem palavras).
+        """
+        vector = np.zeros(self.dim, dtype=np.float32)
+        for token in self.tokens(text):
+            code = zlib.crc32(token.encode("utf-8"))
+            vector[code % self.dim] += 1.0 if code & 0x80000000 else -1.0
+        norm = np.linalg.norm(vector)
+        return vector / norm if norm > 0 else vector
+
+    def embed_many(self, texts: Sequence[str]) -> np.ndarray:
+        """
+        Calcula os vetores de vários textos.
+
+        Args:
+            texts: Textos de entrada.
+
+        Returns:
+            Matriz float32 (len(texts) x dim).
+        """
+        matrix = np.zeros((len(texts), self.dim), dtype=np.float32)
+        for row, text in enumerate(texts):
+            matrix[row] = self(text)
+        return matrix
+
+
+def _normalize_rows(matrix: np.ndarray) -> np.ndarray:
+    """
+    Normaliza as linhas de uma matriz para norma 1 (linhas nulas ficam nulas).
+    """
+    norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+    norms[norms == 0] = 1.0
+    return matrix / norms
+
+
+class IVFIndex:
+    """
+    Índice aproximado de vizinhos mais próximos por similaridade de cosseno,
+    com listas invertidas (IVF) sobre centróides de k-means.
+
+    Enquanto o índice é pequeno ou não foi treinado, as buscas são exatas.
+    O treino é refeito automaticamente quando o número de vetores dobra.
+    """
+
+    def __init__(self, dim: int, n_lists: Optional[int] = None, n_probe: int = 8,
+                 min_train_size: int = 256, seed: int = 0):
+        """
+        Inicializa um índice vazio.
+
+        Args:
+            dim: Dimensão dos vetores.
+            n_lists: Número de listas (None usa ~raiz quadrada do número de vetores).
+            n_probe: Número de listas visitadas por busca.
+            min_train_size: Tamanho mínimo para usar as listas (abaixo dele a busca é exata).
+            seed: Semente do k-means.
+        """
+        self.dim = dim
+        self.n_lists = n_lists
+        self.n_probe = n_probe
+        self.min_train_size = min_train_size
+        self.seed = seed
+        self._matrix = np.zeros((16, dim), dtype=np.float32)
+        self._ids: List[str] = []
+        self._positions: Dict[str, int] = {}
+        self._centroids: Optional[np.ndarray] = None
+        self._assignments = np.zeros(16, dtype=np.int64)
+        self._trained_size = 0
+        # Linhas de cada lista: (linhas ordenadas por lista, início de cada lista)
+        self._lists: Optional[Tuple[np.ndarray, np.ndarray]] = None
+
+    def __len__(self) -> int:
+        return len(self._ids)
+
+    def __contains__(self, item_id: str) -> bool:
+        return item_id in self._positions
+
+    @property
+    def is_trained(self) -> bool:
+        return self._centroids is not None
+
+    def add(self, item_id: str, vector: Any) -> None:
+        """
+        Insere (ou substitui) o vetor de um elemento.
+
+        Args:
+            item_id: ID do elemento.
+            vector: Vetor de dimensão `dim`.
+        """
+        vector = np.asarray(vector, dtype=np.float32)
+        norm = np.linalg.norm(vector)
+        if norm > 0:
+            vector = vector / norm
+        row = self._positions.get(item_id)
+        if row is None:
+            row = len(self._ids)
+            if row == len(self._matrix):
+                self._grow()
+            self._ids.append(item_id)
+            self._positions[item_id] = row
+        self._matrix[row] = vector
+        if self._centroids is not None:
+            self._assignments[row] = int(np.argmax(self._centroids @ vector))
+        self._lists = None
+        if len(self._ids) >= max(self.min_train_size, 2 * self._trained_size):
+            self.train()
+
+    def _grow(self) -> None:
+        """
+        Dobra a capacidade das matrizes internas.
+        """
+        capacity = 2 * len(self._matrix)
+        matrix = np.zeros((capacity, self.dim), dtype=np.float32)
+        matrix[:len(self._matrix)] = self._matrix
+        assignments = np.zeros(capacity, dtype=np.int64)
+        assignments[:len(self._assignments)] = self._assignments
+        self._matrix = matrix
+        self._assignments = assignments
+
+    def remove(self, item_id: str) -> None:
+        """
+        Retira um elemento (a última linha ocupa o lugar da removida).
+
+        Args:
+            item_id: ID do elemento.
+        """
+        row = self._positions.pop(item_id, None)
+        if row is None:
+            return
+        last = len(self._ids) - 1
+        if row != last:
+            moved = self._ids[last]
+            self._ids[row] = moved
+            self._positions[moved] = row
+            self._matrix[row] = self._matrix[last]
+            self._assignments[row] = self._assignments[last]
+        self._ids.pop()
+        self._lists = None
+
+    def train(self, iterations: int = 10) -> None:
+        """
+        Treina os centróides por k-means (inicialização amostral, semente fixa).
+
+        Args:
+            iterations: Número de iterações do k-means.
+        """
+        count = len(self._ids)
+        if count == 0:
+            return
+        data = self._matrix[:count]
+        n_lists = self.n_lists or max(1, int(np.sqrt(count)))
+        n_lists = min(n_lists, count)
+        rng = np.random.default_rng(self.seed)
+        centroids = data[rng.choice(count, n_lists, replace=False)].copy()
+        for _ in range(iterations):
+            assignments = np.argmax(data @ centroids.T, axis=1)
+            sums = np.zeros_like(centroids)
+            np.add.at(sums, assignments, data)
+            filled = np.bincount(assignments, minlength=n_lists) > 0
+            centroids[filled] = _normalize_rows(sums[filled])
+        self._centroids = centroids
+        self._assignments[:count] = np.argmax(data @ centroids.T, axis=1)
+        self._trained_size = count
+        self._lists = None
+
+    def _inverted_lists(self) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Obtém (e guarda) as linhas de cada lista, agrupadas por ordenação.
+        """
+        if self._lists is None:
+            count = len(self._ids)
+            assignments = self._assignments[:count]
+            order = np.argsort(assignments, kind="stable")
+            starts = np.searchsorted(assignments[order], np.arange(len(self._centroids) + 1))
+            self._lists = (order, starts)
+        return self._lists
+
+    def _top_k(self, rows: np.ndarray, scores: np.ndarray, k: int) -> List[Tuple[str, float]]:
+        """
+        Seleciona as k maiores pontuações (argpartition + ordenação dos k).
+        """
+        if len(scores) > k:
+            best = np.argpartition(-scores, k - 1)[:k]
+        else:
+            best = np.arange(len(scores))
+        best = best[np.argsort(-scores[best], kind="stable")]
+        return [(self._ids[rows[i]], float(scores[i])) for i in best]
+
+    def brute_force_search(self, query: Any, k: int = 5) -> List[Tuple[str, float]]:
+        """
+        Busca exata: compara o vetor com todos os elementos.
+
+        Args:
+            query: Vetor de consulta.
+            k: Número de resultados.
+
+        Returns:
+            Lista de pares (id, similaridade), da maior para a menor.
+        """
+        count = len(self._ids)
+        if count == 0 or k <= 0:
+            return []
+        scores = self._matrix[:count] @ np.asarray(query, dtype=np.float32)
+        return self._top_k(np.arange(count), scores, k)
+
+    def search(self, query: Any, k: int = 5) -> List[Tuple[str, float]]:
+        """
+        Busca aproximada pelos k vetores mais similares.
+
+        Args:
+            query: Vetor de consulta.
+            k: Número de resultados.
+
+        Returns:
+            Lista de pares (id, similaridade), da maior para a menor.
+        """
+        return self.search_batch(np.asarray(query, dtype=np.float32)[None, :], k)[0]
+
+    def search_batch(self, queries: np.ndarray, k: int = 5) -> List[List[Tuple[str, float]]]:
+        """
+        Busca aproximada para várias consultas de uma vez.
+
+        As similaridades com os centróides são calculadas em uma única
+        multiplicação de matrizes para todas as consultas.
+
+        Args:
+            queries: Matriz de consultas (n x dim).
+            k: Número de resultados por consulta.
+
+        Returns:
+            Uma lista de resultados por consulta.
+        """
+        queries = np.asarray(queries, dtype=np.float32)
+        if self._centroids is None or len(self._ids) < self.min_train_size:
+            return [self.brute_force_search(query, k) for query in queries]
+        order, starts = self._inverted_lists()
+        n_probe = min(self.n_probe, len(self._centroids))
+        probes = np.argpartition(-(queries @ self._centroids.T), n_probe - 1, axis=1)[:, :n_probe]
+        results = []
+        for query, lists in zip(queries, probes):
+            rows = np.concatenate([order[starts[i]:starts[i + 1]] for i in lists])
+            if len(rows) == 0 or k <= 0:
+                results.append([])
+                continue
+            results.append(self._top_k(rows, self._matrix[rows] @ query, k))
+        return results
+
+
+class EmbeddingIndex:
+    """
+    Índice de similaridade das memórias e crenças de uma psique, mantido
+    pelos ouvintes do hiper-grafo.
+
+    Elementos sem vetor recebem um calculado pelo embedder, gravado no
+    atributo `embedding` por `update_node`/`update_edge` (em um grafo
+    congelado o vetor fica só no índice); os que já têm vetor são indexados
+    como estão.
+    """
+
+    # (natureza, tipo) -> atributo de texto incorporado
+    TEXT_ATTRIBUTES = {("edge", "Memory"): "description", ("node", "Belief"): "content"}
+
+    def __init__(self, graph: Hypergraph, embedder: Optional[Callable[[str], Any]] = None,
+                 dim: int = 256, **ivf_options: Any):
+        """
+        Inicializa o índice e incorpora as memórias e crenças existentes.
+
+        Args:
+            graph: Hiper-grafo de personagem.
+            embedder: Função texto -> vetor. Se não fornecida, usa HashingEmbedder(dim).
+            dim: Dimensão dos vetores.
+            **ivf_options: Parâmetros do IVFIndex (ex: n_probe, n_lists).
+        """
+        self.graph = graph
+        self.embedder = embedder if embedder is not None else HashingEmbedder(dim)
+        self.dim = dim
+        self.ivf = IVFIndex(dim, **ivf_options)
+        self._texts: Dict[str, str] = {}
+        for kind, item_type in self.TEXT_ATTRIBUTES:
+            items = graph.get_edges_by_type(item_type) if kind == "edge" else graph.get_nodes_by_type(item_type)
+            for item in items:
+                self._add(kind, item)
+        graph.register_listener(self._on_graph_event)
+
+    def __len__(self) -> int:
+        return len(self.ivf)
+
+    def detach(self) -> None:
+        """
+        Deixa de acompanhar as alterações do hiper-grafo.
+        """
+        self.graph.unregister_listener(self._on_graph_event)
+
+    def _on_graph_event(self, event: str, item: Any) -> None:
+        """
+        Mantém o índice a partir dos eventos do hiper-grafo.
+        """
+        kind, action = event.split("_", 1)
+        if (kind, item.type) not in self.TEXT_ATTRIBUTES:
+            return
+        if action == "removed":
+            self.ivf.remove(item.id)
+            self._texts.pop(item.id, None)
+        else:
+            self._add(kind, item)
+
+    def _add(self, kind: str, item: Any) -> None:
+        """
+        Indexa um elemento, calculando o vetor se ele não tiver um ou se o texto mudou.
+        """
+        text = getattr(item, self.TEXT_ATTRIBUTES[(kind, item.type)], "") or ""
+        known = self._texts.get(item.id)
+        if known == text and item.id in self.ivf:
+            return
+        embedding = getattr(item, "embedding", None)
+        if embedding is None or (known is not None and known != text):
+            embedding = self.embedder(text)
+        self._texts[item.id] = text
+        self.ivf.add(item.id, embedding)
+        if embedding is not getattr(item, "embedding", None) and not self.graph.frozen:
+            # Pelas APIs do grafo, para respeitar a cópia na escrita das psiques em
+            # camadas; o evento gerado volta para cá e é ignorado (texto já indexado)
+            if kind == "edge":
+                self.graph.update_edge(item.id, embedding=embedding)
+            else:
+                self.graph.update_node(item.id, embedding=embedding)
+
+    def _resolve(self, pairs: List[Tuple[str, float]]) -> List[Tuple[Any, float]]:
+        """
+        Troca os IDs pelos elementos do grafo.
+        """
+        graph = self.graph
+        return [(graph.edges.get(item_id) or graph.nodes.get(item_id), score)
+                for item_id, score in pairs]
+
+    def similar(self, text: str, k: int = 5) -> List[Tuple[Any, float]]:
+        """
+        Busca as memórias e crenças mais parecidas com um texto.
+
+        Args:
+            text: Descrição da situação.
+            k: Número de resultados.
+
+        Returns:
+            Lista de pares (elemento, similaridade), da maior para a menor.
+        """
+        return self._resolve(self.ivf.search(self.embedder(text), k))
+
+    def similar_to_vector(self, vector: Any, k: int = 5) -> List[Tuple[Any, float]]:
+        """
+        Busca os elementos mais parecidos com um vetor já calculado.
+
+        Args:
+            vector: Vetor de consulta.
+            k: Número de resultados.
+
+        Returns:
+            Lista de pares (elemento, similaridade), da maior para a menor.
+        """
+        return self._resolve(self.ivf.search(vector, k))
+
+
+def search_across(indexes: Dict[str, EmbeddingIndex], texts: Sequence[str],
+                  k: int = 5) -> Dict[str, List[List[Tuple[Any, float]]]]:
+    """
+    Busca os mesmos textos nos índices de vários agentes.
+
+    Os textos são incorporados uma única vez (os índices devem usar o mesmo
+    embedder) e cada índice responde a todas as consultas em lote.
+
+    Args:
+        indexes: Dicionário ID do agente -> índice da sua psique.
+        texts: Textos de consulta.
+        k: Número de resultados por consulta.
+
+    Returns:
+        Dicionário ID do agente -> uma lista de resultados por texto.
+    """
+    if not indexes:
+        return {}
+    embedder = next(iter(indexes.values())).embedder
+    if hasattr(embedder, "embed_many"):
+        queries = embedder.embed_many(texts)
+    else:
+        queries = np.stack([np.asarray(embedder(text), dtype=np.float32) for text in texts])
+    return {agent_id: [index._resolve(pairs) for pairs in index.ivf.search_batch(queries, k)]
+            for agent_id, index in indexes.items()}
@@ -0,0 +1,187 @@
+"""
+Módulo que implementa o acumulador de emoções.
+
+Avaliações repetidas da mesma emoção, com o mesmo alvo e a mesma causa, são
+combinadas em uma única hiper-aresta em vez de criar arestas redundantes:
+
+    intensidade = 1 - (1 - atual) * (1 - nova)
+
+Assim o conjunto de emoções vivas fica limitado ao número de chaves
+(emoção, alvo, causa) distintas, e o decaimento remove as que ficam abaixo
+de um limiar.
+"""
+
+from typing import Dict, List, Any, Optional, Callable, Tuple
+
+from src.hypergraph import Hypergraph, Hyperedge
+from src.edges import EmotionEdge
+
+EmotionKey = Tuple[str, Optional[str], Optional[str]]
+
+
+def combine_intensities(current: float, new: float) -> float:
+    """
+    Combina duas intensidades como eventos independentes (nunca passa de 1).
+
+    Args:
+        current: Intensidade atual.
+        new: Intensidade da nova avaliação.
+
+    Returns:
+        A intensidade combinada.
+    """
+    return 1.0 - (1.0 - current) * (1.0 - new)
+
+
+def _default_factory(key: EmotionKey, nodes: List[str], intensity: float,
+                     decay_rate: float, current_time: Optional[int]) -> Hyperedge:
+    emotion, target, _ = key
+    return EmotionEdge(nodes=nodes, emotion=emotion, target=target, decay_rate=decay_rate,
+                       intensity=intensity, timestamp=current_time)
+
+
+class EmotionAccumulator:
+    """
+    Emoções vivas de um hiper-grafo indexadas por (emoção, alvo, causa).
+    """
+
+    def __init__(self, graph: Hypergraph,
+                 edge_factory: Optional[Callable[..., Hyperedge]] = None,
+                 decay_attribute: str = "decay_rate", prune_below: float = 0.01):
+        """
+        Inicializa o acumulador.
+
+        Args:
+            graph: Hiper-grafo onde as emoções são guardadas.
+            edge_factory: Função (chave, nós, intensidade, taxa de decaimento, tempo)
+                que cria a hiper-aresta de uma nova emoção. Por padrão cria EmotionEdge.
+            decay_attribute: Nome do atributo com a taxa de decaimento das arestas.
+            prune_below: Intensidade abaixo da qual uma emoção é removida no decaimento.
+        """
+        self.graph = graph
+        self.edge_factory = edge_factory or _default_factory
+        self.decay_attribute = decay_attribute
+        self.prune_below = prune_below
+        self._by_key: Dict[EmotionKey, str] = {}
+        self._keys: Dict[str, EmotionKey] = {}
+        self.merges = 0
+        graph.register_listener(self._on_graph_event)
+
+    def __len__(self) -> int:
+        return len(self._by_key)
+
+    def detach(self) -> None:
+        """
+        Deixa de acompanhar as remoções do hiper-grafo.
+        """
+        self.graph.unregister_listener(self._on_graph_event)
+
+    def _on_graph_event(self, event: str, item: Any) -> None:
+        """
+        Esquece as emoções removidas do hiper-grafo por outros caminhos.
+        """
+        if event == "edge_removed":
+            key = self._keys.pop(item.id, None)
+            if key is not None and self._by_key.get(key) == item.id:
+                del self._by_key[key]
+
+    def get(self, emotion: str, target: Optional[str] = None,
+            cause: Optional[str] = None) -> Optional[Hyperedge]:
+        """
+        Obtém a emoção viva de uma chave em O(1).
+
+        Args:
+            emotion: Nome da emoção.
+            target: ID do alvo.
+            cause: ID da causa.
+
+        Returns:
+            A hiper-aresta da emoção, ou None.
+        """
+        edge_id = self._by_key.get((emotion, target, cause))
+        return self.graph.get_edge(edge_id) if edge_id is not None else None
+
+    def live(self) -> List[Hyperedge]:
+        """
+        Obtém todas as emoções vivas.
+
+        Returns:
+            Lista de hiper-arestas.
+        """
+        edges = self.graph.edges
+        return [edges[edge_id] for edge_id in self._by_key.values()]
+
+    def appraise(self, emotion: str, intensity: float, target: Optional[str] = None,
+                 cause: Optional[str] = None, nodes: Optional[List[str]] = None,
+                 decay_rate: float = 0.1, current_time: Optional[int] = None) -> Hyperedge:
+        """
+        Registra uma avaliação emocional, combinando-a com a emoção viva da mesma chave.
+
+        Args:
+            emotion: Nome da emoção (ex: "Joy").
+            intensity: Intensidade da avaliação (entre 0 e 1).
+            target: ID do alvo da emoção.
+            cause: ID da causa (evento) da emoção.
+            nodes: Nós conectados pela hiper-aresta, se ela for criada
+                (por padrão, a causa e o alvo que forem nós do grafo).
+            decay_rate: Taxa de decaimento, se a emoção for criada.
+            current_time: Tempo atual.
+
+        Returns:
+            A hiper-aresta criada ou reforçada.
+        """
+        intensity = max(0.0, min(1.0, intensity))
+        key = (emotion, target, cause)
+        edge = self.get(emotion, target, cause)
+        if edge is not None:
+            changes: Dict[str, Any] = {"intensity": combine_intensities(edge.intensity, intensity)}
+            if current_time is not None and hasattr(edge, "timestamp"):
+                changes["timestamp"] = current_time
+            self.merges += 1
+            return self.graph.update_edge(edge.id, **changes)
+
+        if nodes is None:
+            graph_nodes = self.graph.nodes
+            nodes = [node_id for node_id in (cause, target) if node_id in graph_nodes]
+        edge = self.edge_factory(key, nodes, intensity, decay_rate, current_time)
+        self.graph.add_edge(edge)
+        self.track(key, edge)
+        return edge
+
+    def track(self, key: EmotionKey, edge: Hyperedge) -> None:
+        """
+        Passa a acompanhar uma emoção inserida no grafo por outro caminho
+        (ex: em bloco, por `add_edges_bulk`).
+
+        Args:
+            key: Chave (emoção, alvo, causa).
+            edge: Hiper-aresta da emoção, já presente no grafo.
+        """
+        self._by_key[key] = edge.id
+        self._keys[edge.id] = key
+
+    def decay(self, steps: float = 1) -> int:
+        """
+        Decai todas as emoções vivas e remove as que ficam abaixo do limiar.
+
+        Args:
+            steps: Número de ticks decorridos.
+
+        Returns:
+            Número de emoções removidas.
+        """
+        if steps <= 0:
+            return 0
+        graph = self.graph
+        expired = []
+        with graph.batch():
+            for edge in self.live():
+                rate = getattr(edge, self.decay_attribute, 0.0)
+                intensity = edge.intensity * (1.0 - rate) ** steps
+                if intensity < self.prune_below:
+                    expired.append(edge.id)
+                else:
+                    graph.update_edge(edge.id, intensity=intensity)
+        for edge_id in expired:
+            graph.remove_edge(edge_id)
+        return len(expired)
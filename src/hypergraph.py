@@ -3,10 +3,92 @@ Módulo base para as estruturas de dados do hiper-grafo.
 Contém as classes Node, Hyperedge e Hypergraph.
 """
 
-from typing import Dict, List, Any, Optional, Set, Union
+from typing import Dict, List, Any, Optional, Set, Union, Sequence, Iterable, Callable, TYPE_CHECKING
+from collections import defaultdict
+from contextlib import contextmanager
+from itertools import chain
 import uuid
 import json
 
+from src.indexes import SortedAttributeIndex
+
+if TYPE_CHECKING:
+    from src.query import Query
+
+
+# Registros de tipos concretos, preenchidos por src.nodes e src.edges.
+# Permitem reconstruir a subclasse correta a partir do campo "type".
+NODE_TYPES: Dict[str, type] = {}
+EDGE_TYPES: Dict[str, type] = {}
+
+
+def register_node_type(type_name: str) -> Callable[[type], type]:
+    """
+    Decorador que registra uma subclasse de Node para um tipo de nó.
+    
+    Args:
+        type_name: Valor do campo "type" produzido pela subclasse.
+        
+    Returns:
+        O decorador que registra a classe.
+    """
+    def decorator(cls: type) -> type:
+        NODE_TYPES[type_name] = cls
+        return cls
+    return decorator
+
+
+def register_edge_type(type_name: str) -> Callable[[type], type]:
+    """
+    Decorador que registra uma subclasse de Hyperedge para um tipo de hiper-aresta.
+    
+    Args:
+        type_name: Valor do campo "type" produzido pela subclasse.
+        
+    Returns:
+        O decorador que registra a classe.
+    """
+    def decorator(cls: type) -> type:
+        EDGE_TYPES[type_name] = cls
+        return cls
+    return decorator
+
+
+def _as_list(column: Any) -> List[Any]:
+    """
+    Converte uma coluna (lista, tupla, array NumPy, iterável) em lista Python.
+    """
+    if hasattr(column, "tolist"):
+        return column.tolist()
+    return column if isinstance(column, list) else list(column)
+
+
+def _columns_to_rows(count: int, attributes: Optional[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """
+    Transforma colunas paralelas de atributos em uma lista de kwargs por linha.
+    """
+    if not attributes:
+        return [{} for _ in range(count)]
+    names = list(attributes.keys())
+    columns = [_as_list(attributes[name]) for name in names]
+    for name, column in zip(names, columns):
+        if len(column) != count:
+            raise ValueError(f"Coluna de atributo '{name}' tem {len(column)} valores; esperado {count}.")
+    return [dict(zip(names, row)) for row in zip(*columns)]
+
+
+def _group_positions(type_column: List[str]) -> Dict[str, List[int]]:
+    """
+    Agrupa as posições de uma coluna de tipos, para resolver cada classe uma única vez.
+    """
+    first = type_column[0] if type_column else None
+    if all(value == first for value in type_column):
+        return {first: range(len(type_column))} if type_column else {}
+    groups: Dict[str, List[int]] = {}
+    for position, value in enumerate(type_column):
+        groups.setdefault(value, []).append(position)
+    return groups
+
 
 class Node:
     """
@@ -14,6 +96,9 @@ class Node:
     Um nó representa um conceito ou entidade na psique do personagem.
     """
     
+    # Atributos numéricos mantidos em índices ordenados pelo Hypergraph
+    INDEXED_ATTRIBUTES: tuple = ()
+    
     def __init__(self, node_id: Optional[str] = None, node_type: str = "Node"):
         """
         Inicializa um nó com um ID único e um tipo.
@@ -63,6 +148,9 @@ class Hyperedge:
     Uma hiper-aresta representa uma relação complexa entre múltiplos nós.
     """
     
+    # Atributos numéricos mantidos em índices ordenados pelo Hypergraph
+    INDEXED_ATTRIBUTES: tuple = ()
+    
     def __init__(self, edge_id: Optional[str] = None, edge_type: str = "Hyperedge", 
                  nodes: Optional[List[str]] = None):
         """
@@ -138,6 +226,13 @@ class Hypergraph:
     """
     Classe que representa um hiper-grafo completo.
     Um hiper-grafo é uma coleção de nós e hiper-arestas.
+    
+    Além dos dicionários `nodes` e `edges`, o grafo mantém índices por tipo
+    e um índice de incidência (nó -> hiper-arestas), atualizados em cada
+    inserção e remoção, além de índices ordenados para os atributos listados
+    em `INDEXED_ATTRIBUTES` de cada classe (ex: `priority` dos valores). Alterações de atributos devem passar por
+    `update_node`/`update_edge` (ou `notify_changed`) para que os ouvintes
+    registrados sejam avisados.
     """
     
     def __init__(self, graph_id: Optional[str] = None, name: str = "Hypergraph"):
@@ -152,6 +247,250 @@ class Hypergraph:
         self.name = name
         self.nodes: Dict[str, Node] = {}
         self.edges: Dict[str, Hyperedge] = {}
+        self._nodes_by_type: Dict[str, Dict[str, Node]] = {}
+        self._edges_by_type: Dict[str, Dict[str, Hyperedge]] = {}
+        self._incidence: Dict[str, Set[str]] = defaultdict(set)
+        self._listeners: List[Callable[[str, Any], None]] = []
+        self._batch_depth = 0
+        self._pending_updates: Dict[tuple, Any] = {}
+        self._range_indexes: Dict[tuple, SortedAttributeIndex] = {}
+        self._extra_indexed: Dict[tuple, tuple] = {}
+        self.frozen = False
+        
+    def register_listener(self, listener: Callable[[str, Any], None]) -> None:
+        """
+        Registra um ouvinte para as mutações do grafo.
+        
+        O ouvinte é chamado como `listener(evento, elemento)`, onde o evento é
+        "node_added", "node_removed", "node_updated", "edge_added",
+        "edge_removed" ou "edge_updated".
+        
+        Args:
+            listener: Função a ser chamada a cada mutação.
+        """
+        self._listeners.append(listener)
+        
+    def unregister_listener(self, listener: Callable[[str, Any], None]) -> None:
+        """
+        Remove um ouvinte registrado.
+        
+        Args:
+            listener: Função previamente registrada.
+        """
+        if listener in self._listeners:
+            self._listeners.remove(listener)
+            
+    def freeze(self) -> None:
+        """
+        Congela o grafo: inserções, remoções e alterações passam a levantar
+        RuntimeError antes de qualquer mudança. Alterar um elemento
+        diretamente (setattr) continua possível e não é detectado.
+        """
+        self.frozen = True
+
+    def _check_writable(self) -> None:
+        """
+        Levanta RuntimeError se o grafo estiver congelado.
+        """
+        if self.frozen:
+            raise RuntimeError(f"O hiper-grafo {self.name} está congelado (somente leitura).")
+
+    def _emit(self, event: str, item: Any) -> None:
+        """
+        Notifica os ouvintes sobre uma mutação.
+        """
+        if self._pending_updates and event.endswith("_removed"):
+            self._pending_updates.pop((event[:4], item.id), None)
+        for listener in self._listeners:
+            listener(event, item)
+            
+    @contextmanager
+    def batch(self):
+        """
+        Agrupa mutações: a reindexação e as notificações de alteração de
+        atributos são acumuladas e feitas uma única vez por elemento ao final
+        do lote (cada índice ordenado é atualizado de uma vez).
+        
+        Inserções e remoções continuam sendo notificadas imediatamente.
+        Lotes podem ser aninhados; a notificação ocorre no lote mais externo.
+        """
+        self._batch_depth += 1
+        try:
+            yield self
+        finally:
+            self._batch_depth -= 1
+            if self._batch_depth == 0 and self._pending_updates:
+                pending = list(self._pending_updates.items())
+                self._pending_updates.clear()
+                changed = []
+                for (kind, item_id), item in pending:
+                    current = self.edges.get(item_id) if kind == "edge" else self.nodes.get(item_id)
+                    if current is item:
+                        changed.append((kind, item))
+                self._index_attributes_many(changed)
+                if self._listeners:
+                    for kind, item in changed:
+                        self._emit(kind + "_updated", item)
+                        
+    def _indexed_attributes(self, kind: str, item: Any) -> tuple:
+        """
+        Obtém os atributos indexados de um elemento (da classe e os criados sob demanda).
+        """
+        extra = self._extra_indexed.get((kind, item.type))
+        return item.INDEXED_ATTRIBUTES + extra if extra else item.INDEXED_ATTRIBUTES
+    
+    def _get_or_create_range_index(self, kind: str, item_type: str, attribute: str) -> SortedAttributeIndex:
+        """
+        Obtém o índice ordenado de um atributo, criando-o se necessário.
+        """
+        key = (kind, item_type, attribute)
+        index = self._range_indexes.get(key)
+        if index is None:
+            index = self._range_indexes[key] = SortedAttributeIndex(attribute)
+        return index
+    
+    def _index_attributes(self, kind: str, item: Any) -> None:
+        """
+        Indexa (ou reindexa) os atributos ordenados de um elemento.
+        """
+        for attribute in self._indexed_attributes(kind, item):
+            self._get_or_create_range_index(kind, item.type, attribute).add(
+                item.id, getattr(item, attribute, None))
+            
+    def _index_attributes_many(self, items: List[tuple]) -> None:
+        """
+        Indexa os atributos ordenados de vários elementos, agrupando por índice.
+        """
+        groups: Dict[tuple, List[tuple]] = {}
+        for kind, item in items:
+            for attribute in self._indexed_attributes(kind, item):
+                groups.setdefault((kind, item.type, attribute), []).append(
+                    (item.id, getattr(item, attribute, None)))
+        for (kind, item_type, attribute), pairs in groups.items():
+            self._get_or_create_range_index(kind, item_type, attribute).add_many(pairs)
+            
+    def _unindex_attributes(self, kind: str, item: Any) -> None:
+        """
+        Retira um elemento dos índices ordenados.
+        """
+        for attribute in self._indexed_attributes(kind, item):
+            index = self._range_indexes.get((kind, item.type, attribute))
+            if index is not None:
+                index.remove(item.id)
+        
+    def _index_node(self, node: Node) -> None:
+        """
+        Registra um nó nos índices do grafo, substituindo um nó anterior com o mesmo ID.
+        """
+        self._check_writable()
+        previous = self.nodes.get(node.id)
+        if previous is not None:
+            self._unindex_node(previous)
+        self.nodes[node.id] = node
+        bucket = self._nodes_by_type.get(node.type)
+        if bucket is None:
+            bucket = self._nodes_by_type[node.type] = {}
+        bucket[node.id] = node
+        self._index_attributes("node", node)
+        if self._listeners:
+            self._emit("node_added", node)
+            
+    def _unindex_node(self, node: Node) -> None:
+        """
+        Remove um nó dos índices do grafo (sem tocar nas hiper-arestas).
+        """
+        self._check_writable()
+        del self.nodes[node.id]
+        self._nodes_by_type[node.type].pop(node.id, None)
+        self._unindex_attributes("node", node)
+        if self._listeners:
+            self._emit("node_removed", node)
+        
+    def _index_edge(self, edge: Hyperedge) -> None:
+        """
+        Registra uma hiper-aresta nos índices do grafo, substituindo uma anterior com o mesmo ID.
+        """
+        self._check_writable()
+        if edge.id in self.edges:
+            self._unindex_edge(self.edges[edge.id])
+        self.edges[edge.id] = edge
+        bucket = self._edges_by_type.get(edge.type)
+        if bucket is None:
+            bucket = self._edges_by_type[edge.type] = {}
+        bucket[edge.id] = edge
+        incidence = self._incidence
+        for node_id in edge.nodes:
+            incidence[node_id].add(edge.id)
+        self._index_attributes("edge", edge)
+        if self._listeners:
+            self._emit("edge_added", edge)
+            
+    def _unindex_edge(self, edge: Hyperedge) -> None:
+        """
+        Remove uma hiper-aresta de todos os índices do grafo.
+        """
+        self._check_writable()
+        del self.edges[edge.id]
+        self._edges_by_type[edge.type].pop(edge.id, None)
+        self._remove_incidence(edge)
+        self._unindex_attributes("edge", edge)
+        if self._listeners:
+            self._emit("edge_removed", edge)
+            
+    def _remove_incidence(self, edge: Hyperedge) -> None:
+        """
+        Remove uma hiper-aresta das listas de incidência dos seus nós.
+        """
+        for node_id in edge.nodes:
+            incident = self._incidence.get(node_id)
+            if incident is not None:
+                incident.discard(edge.id)
+                if not incident:
+                    del self._incidence[node_id]
+        
+    def _insert_nodes(self, nodes: List[Node]) -> None:
+        """
+        Registra um lote de nós nos índices em uma única passada.
+        """
+        self._check_writable()
+        batch = {node.id: node for node in nodes}
+        for node_id in batch.keys() & self.nodes.keys():
+            self._unindex_node(self.nodes[node_id])
+        self.nodes.update(batch)
+        by_type = self._nodes_by_type
+        for node in batch.values():
+            bucket = by_type.get(node.type)
+            if bucket is None:
+                bucket = by_type[node.type] = {}
+            bucket[node.id] = node
+        self._index_attributes_many([("node", node) for node in batch.values()])
+        if self._listeners:
+            for node in batch.values():
+                self._emit("node_added", node)
+            
+    def _insert_edges(self, edges: List[Hyperedge]) -> None:
+        """
+        Registra um lote de hiper-arestas nos índices em uma única passada.
+        """
+        self._check_writable()
+        batch = {edge.id: edge for edge in edges}
+        for edge_id in batch.keys() & self.edges.keys():
+            self._unindex_edge(self.edges[edge_id])
+        self.edges.update(batch)
+        by_type = self._edges_by_type
+        incidence = self._incidence
+        for edge in batch.values():
+            bucket = by_type.get(edge.type)
+            if bucket is None:
+                bucket = by_type[edge.type] = {}
+            bucket[edge.id] = edge
+            edge_id = edge.id
+            for node_id in edge.nodes:
+                incidence[node_id].add(edge_id)
+        self._index_attributes_many([("edge", edge) for edge in batch.values()])
+        if self._listeners:
+            for edge in batch.values():
+                self._emit("edge_added", edge)
         
     def add_node(self, node: Node) -> None:
         """
@@ -160,7 +499,7 @@ class Hypergraph:
         Args:
             node: Nó a ser adicionado.
         """
-        self.nodes[node.id] = node
+        self._index_node(node)
         
     def add_edge(self, edge: Hyperedge) -> None:
         """
@@ -174,7 +513,92 @@ class Hypergraph:
             if node_id not in self.nodes:
                 raise ValueError(f"Nó com ID {node_id} não existe no grafo.")
         
-        self.edges[edge.id] = edge
+        self._index_edge(edge)
+        
+    def add_nodes_bulk(self, ids: Sequence[Optional[str]],
+                       types: Union[str, Sequence[str]] = "Node",
+                       attributes: Optional[Dict[str, Sequence[Any]]] = None) -> List[Node]:
+        """
+        Adiciona vários nós de uma vez a partir de colunas paralelas.
+        
+        Cada posição das colunas descreve um nó. A classe concreta é escolhida
+        pelo tipo (ver `register_node_type`) e os atributos são passados como
+        argumentos nomeados do construtor (ex: `trait`, `value`).
+        
+        Args:
+            ids: IDs dos nós (None gera um UUID). Aceita listas ou arrays NumPy.
+            types: Tipo único para todos os nós ou uma coluna de tipos.
+            attributes: Dicionário nome do atributo -> coluna de valores.
+            
+        Returns:
+            Lista dos nós criados, na ordem das colunas.
+        """
+        ids = _as_list(ids)
+        count = len(ids)
+        type_column = [types] * count if isinstance(types, str) else _as_list(types)
+        if len(type_column) != count:
+            raise ValueError(f"Coluna de tipos tem {len(type_column)} valores; esperado {count}.")
+        rows = _columns_to_rows(count, attributes)
+        
+        nodes: List[Node] = []
+        for node_type, positions in _group_positions(type_column).items():
+            node_class = NODE_TYPES.get(node_type)
+            if node_class is not None:
+                nodes.extend(node_class(node_id=ids[i], **rows[i]) for i in positions)
+            elif any(rows[i] for i in positions):
+                raise ValueError(f"Tipo de nó '{node_type}' não registrado não aceita atributos.")
+            else:
+                nodes.extend(Node(node_id=ids[i], node_type=node_type) for i in positions)
+        
+        self._insert_nodes(nodes)
+        return nodes
+    
+    def add_edges_bulk(self, ids: Sequence[Optional[str]], nodes: Sequence[Sequence[str]],
+                       types: Union[str, Sequence[str]] = "Hyperedge",
+                       attributes: Optional[Dict[str, Sequence[Any]]] = None) -> List[Hyperedge]:
+        """
+        Adiciona várias hiper-arestas de uma vez a partir de colunas paralelas.
+        
+        A existência dos nós é verificada com uma única diferença de conjuntos
+        sobre todos os membros do lote; se algum faltar, nada é inserido.
+        
+        Args:
+            ids: IDs das hiper-arestas (None gera um UUID).
+            nodes: Coluna com a lista de IDs de nós de cada hiper-aresta.
+            types: Tipo único para todas as hiper-arestas ou uma coluna de tipos.
+            attributes: Dicionário nome do atributo -> coluna de valores.
+            
+        Returns:
+            Lista das hiper-arestas criadas, na ordem das colunas.
+        """
+        ids = _as_list(ids)
+        count = len(ids)
+        members = [edge_nodes if isinstance(edge_nodes, list) else list(edge_nodes)
+                   for edge_nodes in _as_list(nodes)]
+        if len(members) != count:
+            raise ValueError(f"Coluna de nós tem {len(members)} valores; esperado {count}.")
+        type_column = [types] * count if isinstance(types, str) else _as_list(types)
+        if len(type_column) != count:
+            raise ValueError(f"Coluna de tipos tem {len(type_column)} valores; esperado {count}.")
+        
+        missing = set(chain.from_iterable(members)).difference(self.nodes)
+        if missing:
+            raise ValueError(f"Nós não existem no grafo: {sorted(missing)}")
+        
+        rows = _columns_to_rows(count, attributes)
+        edges: List[Hyperedge] = []
+        for edge_type, positions in _group_positions(type_column).items():
+            edge_class = EDGE_TYPES.get(edge_type)
+            if edge_class is not None:
+                edges.extend(edge_class(edge_id=ids[i], nodes=members[i], **rows[i]) for i in positions)
+            elif any(rows[i] for i in positions):
+                raise ValueError(f"Tipo de hiper-aresta '{edge_type}' não registrado não aceita atributos.")
+            else:
+                edges.extend(Hyperedge(edge_id=ids[i], edge_type=edge_type, nodes=members[i])
+                             for i in positions)
+        
+        self._insert_edges(edges)
+        return edges
         
     def get_node(self, node_id: str) -> Optional[Node]:
         """
@@ -200,6 +624,30 @@ class Hypergraph:
         """
         return self.edges.get(edge_id)
     
+    def get_nodes_by_type(self, node_type: str) -> List[Node]:
+        """
+        Obtém todos os nós de um tipo usando o índice por tipo.
+        
+        Args:
+            node_type: Tipo do nó (ex: "Value").
+            
+        Returns:
+            Lista de nós do tipo.
+        """
+        return list(self._nodes_by_type.get(node_type, {}).values())
+    
+    def get_edges_by_type(self, edge_type: str) -> List[Hyperedge]:
+        """
+        Obtém todas as hiper-arestas de um tipo usando o índice por tipo.
+        
+        Args:
+            edge_type: Tipo da hiper-aresta (ex: "Memory").
+            
+        Returns:
+            Lista de hiper-arestas do tipo.
+        """
+        return list(self._edges_by_type.get(edge_type, {}).values())
+    
     def get_edges_for_node(self, node_id: str) -> List[Hyperedge]:
         """
         Obtém todas as hiper-arestas que contêm um determinado nó.
@@ -210,7 +658,171 @@ class Hypergraph:
         Returns:
             Lista de hiper-arestas que contêm o nó.
         """
-        return [edge for edge in self.edges.values() if node_id in edge.nodes]
+        edges = self.edges
+        return [edges[edge_id] for edge_id in self._incidence.get(node_id, ())]
+    
+    def get_range_index(self, kind: str, item_type: str, attribute: str) -> Optional[SortedAttributeIndex]:
+        """
+        Obtém o índice ordenado de um atributo, se existir.
+        
+        Args:
+            kind: "node" ou "edge".
+            item_type: Tipo dos elementos (ex: "Value").
+            attribute: Nome do atributo (ex: "priority").
+            
+        Returns:
+            O índice, ou None se o atributo não for indexado.
+        """
+        return self._range_indexes.get((kind, item_type, attribute))
+    
+    def create_range_index(self, kind: str, item_type: str, attribute: str) -> SortedAttributeIndex:
+        """
+        Passa a indexar um atributo que a classe não declara em INDEXED_ATTRIBUTES.
+        
+        Args:
+            kind: "node" ou "edge".
+            item_type: Tipo dos elementos.
+            attribute: Nome do atributo.
+            
+        Returns:
+            O índice criado e preenchido com os elementos atuais.
+        """
+        key = (kind, item_type, attribute)
+        if key not in self._range_indexes:
+            self._extra_indexed[(kind, item_type)] = self._extra_indexed.get((kind, item_type), ()) + (attribute,)
+            buckets = self._edges_by_type if kind == "edge" else self._nodes_by_type
+            index = self._range_indexes[key] = SortedAttributeIndex(attribute)
+            index.add_many((item.id, getattr(item, attribute, None))
+                           for item in buckets.get(item_type, {}).values())
+        return self._range_indexes[key]
+    
+    def _iter_range(self, kind: str, item_type: str, attribute: str, low: Optional[float],
+                    high: Optional[float], include_low: bool, include_high: bool,
+                    descending: bool) -> List[Any]:
+        """
+        Obtém os elementos com o atributo dentro de um intervalo, pelo índice ordenado.
+        """
+        index = self.get_range_index(kind, item_type, attribute)
+        if index is None:
+            index = self.create_range_index(kind, item_type, attribute)
+        elements = self.edges if kind == "edge" else self.nodes
+        return [elements[item_id] for item_id in
+                index.range(low, high, include_low, include_high, descending)]
+    
+    def nodes_in_range(self, node_type: str, attribute: str, low: Optional[float] = None,
+                       high: Optional[float] = None, include_low: bool = True,
+                       include_high: bool = True, descending: bool = False) -> List[Node]:
+        """
+        Obtém os nós de um tipo cujo atributo está dentro de um intervalo, em O(log n + k).
+        
+        Args:
+            node_type: Tipo dos nós (ex: "Value").
+            attribute: Atributo numérico (ex: "priority").
+            low: Limite inferior (None para sem limite).
+            high: Limite superior (None para sem limite).
+            include_low: Se o limite inferior é inclusivo.
+            include_high: Se o limite superior é inclusivo.
+            descending: Se True, ordena do maior para o menor valor.
+            
+        Returns:
+            Lista de nós ordenada pelo atributo.
+        """
+        return self._iter_range("node", node_type, attribute, low, high,
+                                include_low, include_high, descending)
+    
+    def edges_in_range(self, edge_type: str, attribute: str, low: Optional[float] = None,
+                       high: Optional[float] = None, include_low: bool = True,
+                       include_high: bool = True, descending: bool = False) -> List[Hyperedge]:
+        """
+        Obtém as hiper-arestas de um tipo cujo atributo está dentro de um intervalo, em O(log n + k).
+        
+        Args:
+            edge_type: Tipo das hiper-arestas (ex: "Memory").
+            attribute: Atributo numérico (ex: "salience").
+            low: Limite inferior (None para sem limite).
+            high: Limite superior (None para sem limite).
+            include_low: Se o limite inferior é inclusivo.
+            include_high: Se o limite superior é inclusivo.
+            descending: Se True, ordena do maior para o menor valor.
+            
+        Returns:
+            Lista de hiper-arestas ordenada pelo atributo.
+        """
+        return self._iter_range("edge", edge_type, attribute, low, high,
+                                include_low, include_high, descending)
+    
+    def top_nodes(self, node_type: str, attribute: str, k: int) -> List[Node]:
+        """
+        Obtém os k nós de um tipo com maior valor do atributo.
+        
+        Args:
+            node_type: Tipo dos nós (ex: "Value").
+            attribute: Atributo numérico (ex: "priority").
+            k: Número de nós.
+            
+        Returns:
+            Lista de nós em ordem decrescente do atributo.
+        """
+        index = self.get_range_index("node", node_type, attribute)
+        if index is None:
+            index = self.create_range_index("node", node_type, attribute)
+        return [self.nodes[node_id] for node_id in index.top_k(k)]
+    
+    def top_edges(self, edge_type: str, attribute: str, k: int) -> List[Hyperedge]:
+        """
+        Obtém as k hiper-arestas de um tipo com maior valor do atributo.
+        
+        Args:
+            edge_type: Tipo das hiper-arestas (ex: "Memory").
+            attribute: Atributo numérico (ex: "salience").
+            k: Número de hiper-arestas.
+            
+        Returns:
+            Lista de hiper-arestas em ordem decrescente do atributo.
+        """
+        index = self.get_range_index("edge", edge_type, attribute)
+        if index is None:
+            index = self.create_range_index("edge", edge_type, attribute)
+        return [self.edges[edge_id] for edge_id in index.top_k(k)]
+    
+    def query_nodes(self, node_type: Optional[str] = None) -> 'Query':
+        """
+        Inicia uma consulta declarativa sobre os nós (ver src.query).
+        
+        Args:
+            node_type: Tipo dos nós (None para qualquer tipo).
+            
+        Returns:
+            Uma consulta que pode ser refinada e iterada.
+        """
+        from src.query import Query
+        return Query(self, "node", node_type)
+    
+    def query_edges(self, edge_type: Optional[str] = None) -> 'Query':
+        """
+        Inicia uma consulta declarativa sobre as hiper-arestas (ver src.query).
+        
+        Args:
+            edge_type: Tipo das hiper-arestas (None para qualquer tipo).
+            
+        Returns:
+            Uma consulta que pode ser refinada e iterada.
+        """
+        from src.query import Query
+        return Query(self, "edge", edge_type)
+    
+    def query(self, pattern: str) -> 'Query':
+        """
+        Inicia uma consulta a partir da notação das regras, como `ValueNode(priority>0.8)`.
+        
+        Args:
+            pattern: Texto do padrão.
+            
+        Returns:
+            Uma consulta que pode ser refinada e iterada.
+        """
+        from src.query import Query
+        return Query.from_pattern(self, pattern)
     
     def get_connected_nodes(self, node_id: str) -> Set[str]:
         """
@@ -240,13 +852,13 @@ class Hypergraph:
             node_id: ID do nó a ser removido.
         """
         if node_id in self.nodes:
-            # Remove o nó
-            del self.nodes[node_id]
-            
             # Remove todas as hiper-arestas que contêm o nó
             edges_to_remove = [edge.id for edge in self.get_edges_for_node(node_id)]
             for edge_id in edges_to_remove:
-                del self.edges[edge_id]
+                self._unindex_edge(self.edges[edge_id])
+            
+            # Remove o nó
+            self._unindex_node(self.nodes[node_id])
     
     def remove_edge(self, edge_id: str) -> None:
         """
@@ -256,7 +868,73 @@ class Hypergraph:
             edge_id: ID da hiper-aresta a ser removida.
         """
         if edge_id in self.edges:
-            del self.edges[edge_id]
+            self._unindex_edge(self.edges[edge_id])
+    
+    def update_node(self, node_id: str, **attributes: Any) -> Node:
+        """
+        Altera atributos de um nó e notifica os ouvintes.
+        
+        Args:
+            node_id: ID do nó.
+            **attributes: Atributos a serem alterados (ex: priority=0.3).
+            
+        Returns:
+            O nó alterado.
+        """
+        node = self.nodes.get(node_id)
+        if node is None:
+            raise ValueError(f"Nó com ID {node_id} não existe no grafo.")
+        self._check_writable()
+        for name, value in attributes.items():
+            setattr(node, name, value)
+        self.notify_changed(node)
+        return node
+    
+    def update_edge(self, edge_id: str, **attributes: Any) -> Hyperedge:
+        """
+        Altera atributos de uma hiper-aresta e notifica os ouvintes.
+        
+        Alterar `nodes` por aqui mantém o índice de incidência consistente.
+        
+        Args:
+            edge_id: ID da hiper-aresta.
+            **attributes: Atributos a serem alterados (ex: intensity=0.3).
+            
+        Returns:
+            A hiper-aresta alterada.
+        """
+        edge = self.edges.get(edge_id)
+        if edge is None:
+            raise ValueError(f"Hiper-aresta com ID {edge_id} não existe no grafo.")
+        self._check_writable()
+        if "nodes" in attributes:
+            for node_id in attributes["nodes"]:
+                if node_id not in self.nodes:
+                    raise ValueError(f"Nó com ID {node_id} não existe no grafo.")
+            self._remove_incidence(edge)
+        for name, value in attributes.items():
+            setattr(edge, name, value)
+        if "nodes" in attributes:
+            for node_id in edge.nodes:
+                self._incidence[node_id].add(edge.id)
+        self.notify_changed(edge)
+        return edge
+    
+    def notify_changed(self, item: Union[Node, Hyperedge]) -> None:
+        """
+        Reindexa um elemento alterado diretamente e avisa os ouvintes.
+        
+        Args:
+            item: Nó ou hiper-aresta alterado.
+        """
+        self._check_writable()
+        kind = "edge" if isinstance(item, Hyperedge) else "node"
+        if self._batch_depth:
+            self._pending_updates[(kind, item.id)] = item
+            return
+        self._index_attributes(kind, item)
+        if self._listeners:
+            self._emit(kind + "_updated", item)
     
     def to_dict(self) -> Dict[str, Any]:
         """
@@ -277,6 +955,9 @@ class Hypergraph:
         """
         Cria um hiper-grafo a partir de um dicionário.
         
+        Os nós e hiper-arestas são reconstruídos com a subclasse registrada
+        para o seu tipo, quando houver.
+        
         Args:
             data: Dicionário contendo os dados do hiper-grafo.
             
@@ -287,14 +968,14 @@ class Hypergraph:
         
         # Adiciona os nós
         for node_data in data.get("nodes", []):
-            node = Node.from_dict(node_data)
-            graph.add_node(node)
+            node_class = NODE_TYPES.get(node_data.get("type"), Node)
+            graph._index_node(node_class.from_dict(node_data))
         
         # Adiciona as hiper-arestas
         for edge_data in data.get("edges", []):
-            edge = Hyperedge.from_dict(edge_data)
+            edge_class = EDGE_TYPES.get(edge_data.get("type"), Hyperedge)
             # Ignora a verificação de nós existentes
-            graph.edges[edge.id] = edge
+            graph._index_edge(edge_class.from_dict(edge_data))
         
         return graph
     
@@ -328,4 +1009,3 @@ class Hypergraph:
     
     def __repr__(self) -> str:
         return self.__str__()
-
@@ -0,0 +1,203 @@
+"""
+Módulo que implementa índices ordenados por atributo para o hiper-grafo.
+
+Cada índice mantém os pares (valor, id) de um atributo numérico de um tipo
+de elemento (ex: `priority` dos nós "Value") em uma lista ordenada. Consultas
+por limiar e os k maiores custam O(log n + k).
+"""
+
+from typing import Dict, List, Any, Optional, Iterator, Iterable, Tuple
+from bisect import bisect_left, bisect_right, insort
+from itertools import islice
+from operator import itemgetter
+
+_VALUE = itemgetter(0)
+
+
+def is_indexable(value: Any) -> bool:
+    """
+    Verifica se um valor pode ser indexado (números, exceto booleanos).
+
+    Args:
+        value: Valor do atributo.
+
+    Returns:
+        True se o valor for int ou float.
+    """
+    return isinstance(value, (int, float)) and not isinstance(value, bool)
+
+
+class SortedAttributeIndex:
+    """
+    Índice ordenado dos valores de um atributo.
+    """
+
+    def __init__(self, attribute: str):
+        """
+        Inicializa um índice vazio.
+
+        Args:
+            attribute: Nome do atributo indexado.
+        """
+        self.attribute = attribute
+        self._entries: List[Tuple[float, str]] = []
+        self._values: Dict[str, float] = {}
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __contains__(self, item_id: str) -> bool:
+        return item_id in self._values
+
+    def get(self, item_id: str) -> Optional[float]:
+        """
+        Obtém o valor indexado de um elemento.
+
+        Args:
+            item_id: ID do elemento.
+
+        Returns:
+            O valor indexado, ou None se o elemento não estiver no índice.
+        """
+        return self._values.get(item_id)
+
+    def add(self, item_id: str, value: Any) -> None:
+        """
+        Indexa (ou reindexa) um elemento.
+
+        Args:
+            item_id: ID do elemento.
+            value: Valor do atributo. Valores não numéricos retiram o elemento do índice.
+        """
+        current = self._values.get(item_id)
+        if current is not None:
+            if current == value:
+                return
+            self.remove(item_id)
+        if is_indexable(value):
+            self._values[item_id] = value
+            insort(self._entries, (value, item_id))
+
+    def add_many(self, pairs: Iterable[Tuple[str, Any]]) -> None:
+        """
+        Indexa vários elementos de uma vez, ordenando a lista uma única vez.
+
+        Args:
+            pairs: Pares (id, valor).
+        """
+        pairs = list(pairs)
+        if len(pairs) < 32 and len(pairs) * 8 < len(self._entries):
+            for item_id, value in pairs:
+                self.add(item_id, value)
+            return
+        values = self._values
+        for item_id, value in pairs:
+            if item_id in values:
+                del values[item_id]
+            if is_indexable(value):
+                values[item_id] = value
+        self.rebuild()
+
+    def remove(self, item_id: str) -> None:
+        """
+        Retira um elemento do índice.
+
+        Args:
+            item_id: ID do elemento.
+        """
+        value = self._values.pop(item_id, None)
+        if value is None:
+            return
+        entries = self._entries
+        position = bisect_left(entries, (value, item_id))
+        if position < len(entries) and entries[position] == (value, item_id):
+            del entries[position]
+
+    def rebuild(self) -> None:
+        """
+        Reconstrói a lista ordenada a partir dos valores atuais.
+        """
+        self._entries = sorted((value, item_id) for item_id, value in self._values.items())
+
+    def _bounds(self, low: Optional[float], high: Optional[float],
+                include_low: bool, include_high: bool) -> Tuple[int, int]:
+        """
+        Calcula as posições da lista ordenada que delimitam o intervalo.
+        """
+        entries = self._entries
+        if low is None:
+            start = 0
+        elif include_low:
+            start = bisect_left(entries, low, key=_VALUE)
+        else:
+            start = bisect_right(entries, low, key=_VALUE)
+        if high is None:
+            end = len(entries)
+        elif include_high:
+            end = bisect_right(entries, high, key=_VALUE)
+        else:
+            end = bisect_left(entries, high, key=_VALUE)
+        return start, max(start, end)
+
+    def count_range(self, low: Optional[float] = None, high: Optional[float] = None,
+                    include_low: bool = True, include_high: bool = True) -> int:
+        """
+        Conta os elementos dentro de um intervalo em O(log n).
+
+        Args:
+            low: Limite inferior (None para sem limite).
+            high: Limite superior (None para sem limite).
+            include_low: Se o limite inferior é inclusivo.
+            include_high: Se o limite superior é inclusivo.
+
+        Returns:
+            Número de elementos no intervalo.
+        """
+        start, end = self._bounds(low, high, include_low, include_high)
+        return end - start
+
+    def range(self, low: Optional[float] = None, high: Optional[float] = None,
+              include_low: bool = True, include_high: bool = True,
+              descending: bool = False) -> Iterator[str]:
+        """
+        Percorre os IDs dos elementos dentro de um intervalo, em ordem de valor.
+
+        Args:
+            low: Limite inferior (None para sem limite).
+            high: Limite superior (None para sem limite).
+            include_low: Se o limite inferior é inclusivo.
+            include_high: Se o limite superior é inclusivo.
+            descending: Se True, percorre do maior para o menor valor.
+
+        Returns:
+            Gerador de IDs.
+        """
+        start, end = self._bounds(low, high, include_low, include_high)
+        entries = self._entries
+        positions = range(end - 1, start - 1, -1) if descending else range(start, end)
+        for position in positions:
+            yield entries[position][1]
+
+    def top_k(self, k: int) -> List[str]:
+        """
+        Obtém os IDs dos k elementos de maior valor, em ordem decrescente.
+
+        Args:
+            k: Número de elementos.
+
+        Returns:
+            Lista de IDs.
+        """
+        return list(islice(self.range(descending=True), max(0, k)))
+
+    def bottom_k(self, k: int) -> List[str]:
+        """
+        Obtém os IDs dos k elementos de menor valor, em ordem crescente.
+
+        Args:
+            k: Número de elementos.
+
+        Returns:
+            Lista de IDs.
+        """
+        return list(islice(self.range(), max(0, k)))
@@ -0,0 +1,148 @@
+"""
+Módulo que implementa o gerenciamento de interesse (interest management).
+
+Cada agente inscrito tem um raio de interesse; o gerenciador guarda o
+conjunto visível de cada um (ID -> versão da entidade) e, a cada tick,
+devolve só as diferenças em relação ao tick anterior:
+
+- entered: entidades que entraram no raio;
+- left: IDs das entidades que saíram do raio (ou do mundo);
+- changed: entidades que continuam visíveis mas mudaram de versão.
+
+As entidades vêm como EntityView (sem cópia); quem precisar de um retrato
+independente, ex: para enviar pela rede, chama `to_dict()`.
+
+Assim os agentes, e qualquer consumidor de rede ou visualização, processam
+apenas os deltas em vez de uma cópia completa do que é visível.
+"""
+
+from typing import Dict, List, Optional, NamedTuple, FrozenSet
+
+from src.world import WorldModule, EntityView
+
+
+class PerceptionDiff(NamedTuple):
+    """
+    Diferença entre os conjuntos visíveis de dois ticks.
+    """
+    entered: List[EntityView]
+    left: List[str]
+    changed: List[EntityView]
+
+    def is_empty(self) -> bool:
+        """
+        Verifica se nada mudou.
+
+        Returns:
+            True se não houver entradas, saídas nem mudanças.
+        """
+        return not (self.entered or self.left or self.changed)
+
+
+class InterestManager:
+    """
+    Conjuntos visíveis dos agentes inscritos e as suas diferenças entre ticks.
+    """
+
+    def __init__(self, world: WorldModule, default_radius: float = 10.0):
+        """
+        Inicializa o gerenciador.
+
+        Args:
+            world: Mundo cujas entidades são observadas.
+            default_radius: Raio de interesse dos agentes inscritos sem raio próprio.
+        """
+        self.world = world
+        self.default_radius = default_radius
+        self._radii: Dict[str, float] = {}
+        self._visible: Dict[str, Dict[str, int]] = {}
+        # Diferenças calculadas na última atualização
+        self.diffs: Dict[str, PerceptionDiff] = {}
+        self.reported = 0
+
+    def __contains__(self, agent_id: str) -> bool:
+        return agent_id in self._radii
+
+    def subscribe(self, agent_id: str, radius: Optional[float] = None) -> None:
+        """
+        Inscreve um agente. O primeiro diff traz todo o conjunto visível em `entered`.
+
+        Args:
+            agent_id: ID do agente.
+            radius: Raio de interesse (por padrão, `default_radius`).
+        """
+        self._radii[agent_id] = self.default_radius if radius is None else radius
+        self._visible.setdefault(agent_id, {})
+
+    def unsubscribe(self, agent_id: str) -> None:
+        """
+        Cancela a inscrição de um agente.
+
+        Args:
+            agent_id: ID do agente.
+        """
+        self._radii.pop(agent_id, None)
+        self._visible.pop(agent_id, None)
+        self.diffs.pop(agent_id, None)
+
+    def visible(self, agent_id: str) -> FrozenSet[str]:
+        """
+        Obtém o conjunto visível de um agente no último diff.
+
+        Args:
+            agent_id: ID do agente.
+
+        Returns:
+            Conjunto de IDs das entidades visíveis.
+        """
+        return frozenset(self._visible.get(agent_id, ()))
+
+    def diff(self, agent_id: str) -> PerceptionDiff:
+        """
+        Calcula o que mudou no conjunto visível de um agente desde o último diff.
+
+        Args:
+            agent_id: ID do agente inscrito.
+
+        Returns:
+            A diferença (se o agente saiu do mundo, tudo o que via fica em `left`).
+        """
+        if agent_id not in self._radii:
+            raise KeyError(f"Agent '{agent_id}' is not subscribed.")
+        world = self.world
+        agent = world.get_entity(agent_id)
+        previous = self._visible[agent_id]
+        if agent is None:
+            self._visible[agent_id] = {}
+            return PerceptionDiff([], list(previous), [])
+
+        current: Dict[str, int] = {}
+        entered: List[EntityView] = []
+        changed: List[EntityView] = []
+        for entity in world.get_entities_in_radius(agent.position, self._radii[agent_id]):
+            if entity.id == agent_id:
+                continue
+            current[entity.id] = entity.version
+            seen = previous.get(entity.id)
+            if seen is None:
+                entered.append(entity.view())
+            elif seen != entity.version:
+                changed.append(entity.view())
+        left = [entity_id for entity_id in previous if entity_id not in current]
+        self._visible[agent_id] = current
+        self.reported += len(entered) + len(changed)
+        return PerceptionDiff(entered, left, changed)
+
+    def update(self, current_time: Optional[int] = None) -> Dict[str, PerceptionDiff]:
+        """
+        Calcula os diffs de todos os agentes inscritos (pode ser registrado como
+        sistema da simulação).
+
+        Args:
+            current_time: Tempo atual (não utilizado; mantém a interface dos sistemas).
+
+        Returns:
+            Dicionário ID do agente -> diferença.
+        """
+        self.diffs = {agent_id: self.diff(agent_id) for agent_id in self._radii}
+        return self.diffs
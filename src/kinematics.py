@@ -0,0 +1,327 @@
+"""
+Módulo que implementa o movimento por velocidade das entidades do mundo.
+
+Em vez de teletransportar, uma entidade registrada caminha até um alvo (ou
+por uma sequência de pontos de passagem, ex: de `NavigationGraph.path`) com
+uma velocidade máxima. As posições, velocidades, alvos e velocidades
+máximas ficam em arrays densos do NumPy, e `step` integra todas as
+entidades em movimento de uma vez a cada atualização do mundo.
+
+A separação entre vizinhos (para a multidão não se sobrepor) usa o mesmo
+hashing por células da grade espacial do mundo, no plano x/y: as entidades
+são ordenadas pela chave da célula, e os pares das 9 células vizinhas são
+gerados com `searchsorted`, sem laços por entidade.
+"""
+
+from typing import Dict, List, Sequence, Tuple
+
+import numpy as np
+
+from src.world import WorldModule
+
+Position = Dict[str, float]
+
+
+class KinematicsSystem:
+    """
+    Velocidades e alvos das entidades que caminham, integrados em bloco.
+    """
+
+    def __init__(self, world: WorldModule, separation_radius: float = 1.0,
+                 separation_strength: float = 1.0, arrival_radius: float = 0.05,
+                 capacity: int = 64):
+        """
+        Inicializa o sistema e o liga ao mundo (`WorldModule.update` chama `step`).
+
+        Args:
+            world: Mundo cujas entidades se movem.
+            separation_radius: Distância abaixo da qual vizinhos se repelem (0 desliga).
+            separation_strength: Velocidade de repulsão entre dois vizinhos colados.
+            arrival_radius: Distância ao alvo considerada chegada.
+            capacity: Número inicial de linhas reservadas.
+        """
+        self.world = world
+        self.separation_radius = separation_radius
+        self.separation_strength = separation_strength
+        self.arrival_radius = arrival_radius
+        capacity = max(1, capacity)
+        self._positions = np.zeros((capacity, 3))
+        self._velocities = np.zeros((capacity, 3))
+        self._targets = np.zeros((capacity, 3))
+        self._speeds = np.zeros(capacity)
+        self._moving = np.zeros(capacity, dtype=bool)
+        self._ids: List[str] = []
+        self._index: Dict[str, int] = {}
+        # Pontos de passagem restantes depois do alvo atual
+        self._waypoints: Dict[str, List[Position]] = {}
+        self.pairs_checked = 0
+        world.kinematics = self
+
+    def __len__(self) -> int:
+        return len(self._ids)
+
+    def __contains__(self, entity_id: str) -> bool:
+        return entity_id in self._index
+
+    # Visões das linhas ocupadas
+    @property
+    def positions(self) -> np.ndarray:
+        return self._positions[:len(self._ids)]
+
+    @property
+    def velocities(self) -> np.ndarray:
+        return self._velocities[:len(self._ids)]
+
+    @property
+    def targets(self) -> np.ndarray:
+        return self._targets[:len(self._ids)]
+
+    @property
+    def speeds(self) -> np.ndarray:
+        return self._speeds[:len(self._ids)]
+
+    @property
+    def moving(self) -> np.ndarray:
+        return self._moving[:len(self._ids)]
+
+    def _grow(self) -> None:
+        capacity = len(self._speeds) * 2
+        for name in ("_positions", "_velocities", "_targets", "_speeds", "_moving"):
+            array = getattr(self, name)
+            grown = np.zeros((capacity,) + array.shape[1:], dtype=array.dtype)
+            grown[:len(array)] = array
+            setattr(self, name, grown)
+
+    def _register(self, entity_id: str) -> int:
+        row = self._index.get(entity_id)
+        if row is not None:
+            return row
+        entity = self.world.get_entity(entity_id)
+        if entity is None:
+            raise KeyError(f"Entity '{entity_id}' not found in the world.")
+        row = len(self._ids)
+        if row == len(self._speeds):
+            self._grow()
+        self._ids.append(entity_id)
+        self._index[entity_id] = row
+        position = entity.position
+        point = (position["x"], position["y"], position.get("z", 0.0))
+        self._positions[row] = point
+        self._targets[row] = point
+        self._velocities[row] = 0.0
+        self._speeds[row] = 0.0
+        self._moving[row] = False
+        return row
+
+    def remove(self, entity_id: str) -> None:
+        """
+        Deixa de mover uma entidade (a última linha ocupa o seu lugar).
+
+        Args:
+            entity_id: ID da entidade.
+        """
+        row = self._index.pop(entity_id, None)
+        if row is None:
+            return
+        self._waypoints.pop(entity_id, None)
+        last = len(self._ids) - 1
+        if row != last:
+            moved_id = self._ids[last]
+            self._ids[row] = moved_id
+            self._index[moved_id] = row
+            for array in (self._positions, self._velocities, self._targets, self._speeds, self._moving):
+                array[row] = array[last]
+        self._ids.pop()
+
+    def place(self, entity_id: str, position: Position) -> None:
+        """
+        Registra uma mudança de posição feita fora do sistema (ex: teletransporte
+        por `WorldModule.move_entity`). Uma entidade em movimento segue dali.
+
+        Args:
+            entity_id: ID da entidade.
+            position: Nova posição.
+        """
+        row = self._index.get(entity_id)
+        if row is not None:
+            self._positions[row] = (position["x"], position["y"], position.get("z", 0.0))
+
+    def walk_to(self, entity_id: str, target: Position, speed: float) -> None:
+        """
+        Faz uma entidade caminhar em linha reta até um alvo.
+
+        Args:
+            entity_id: ID da entidade.
+            target: Posição de destino.
+            speed: Velocidade máxima (distância por unidade de tempo).
+        """
+        self.follow(entity_id, [target], speed)
+
+    def follow(self, entity_id: str, waypoints: Sequence[Position], speed: float) -> None:
+        """
+        Faz uma entidade percorrer uma sequência de pontos de passagem.
+
+        Args:
+            entity_id: ID da entidade.
+            waypoints: Posições a visitar, em ordem.
+            speed: Velocidade máxima (distância por unidade de tempo).
+        """
+        if speed <= 0:
+            raise ValueError("A velocidade deve ser positiva.")
+        if not waypoints:
+            self.stop(entity_id)
+            return
+        row = self._register(entity_id)
+        first = waypoints[0]
+        self._targets[row] = (first["x"], first["y"], first.get("z", 0.0))
+        self._speeds[row] = speed
+        self._moving[row] = True
+        self._waypoints[entity_id] = list(waypoints[1:])
+
+    def stop(self, entity_id: str) -> None:
+        """
+        Para uma entidade onde ela estiver.
+
+        Args:
+            entity_id: ID da entidade.
+        """
+        row = self._index.get(entity_id)
+        if row is None:
+            return
+        self._moving[row] = False
+        self._velocities[row] = 0.0
+        self._waypoints.pop(entity_id, None)
+
+    def is_moving(self, entity_id: str) -> bool:
+        """
+        Verifica se uma entidade está caminhando.
+
+        Args:
+            entity_id: ID da entidade.
+
+        Returns:
+            True se a entidade tiver um alvo pendente.
+        """
+        row = self._index.get(entity_id)
+        return row is not None and bool(self._moving[row])
+
+    def _neighbor_pairs(self) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Pares (i, j) de entidades em células vizinhas no plano x/y.
+        """
+        count = len(self._ids)
+        cell_size = max(self.world.grid.cell_size, self.separation_radius)
+        cells = np.floor(self.positions[:, :2] / cell_size).astype(np.int64)
+        # Chave única por célula (deslocada para ser não negativa)
+        cells -= cells.min(axis=0) - 1
+        width = int(cells[:, 1].max()) + 2
+        keys = cells[:, 0] * width + cells[:, 1]
+        order = np.argsort(keys, kind="stable")
+        sorted_keys = keys[order]
+        firsts, seconds = [], []
+        for dx in (-1, 0, 1):
+            for dy in (-1, 0, 1):
+                wanted = keys + dx * width + dy
+                low = np.searchsorted(sorted_keys, wanted, side="left")
+                high = np.searchsorted(sorted_keys, wanted, side="right")
+                counts = high - low
+                total = int(counts.sum())
+                if total == 0:
+                    continue
+                first = np.repeat(np.arange(count), counts)
+                offsets = np.arange(total) - np.repeat(np.cumsum(counts) - counts, counts)
+                second = order[np.repeat(low, counts) + offsets]
+                keep = first != second
+                firsts.append(first[keep])
+                seconds.append(second[keep])
+        if not firsts:
+            return np.zeros(0, dtype=np.int64), np.zeros(0, dtype=np.int64)
+        return np.concatenate(firsts), np.concatenate(seconds)
+
+    def _separation(self) -> np.ndarray:
+        """
+        Velocidade de repulsão de cada entidade, somada sobre os vizinhos próximos.
+        """
+        push = np.zeros_like(self.positions)
+        radius = self.separation_radius
+        if radius <= 0 or len(self._ids) < 2:
+            return push
+        first, second = self._neighbor_pairs()
+        self.pairs_checked += len(first)
+        offsets = self.positions[first, :2] - self.positions[second, :2]
+        distances = np.linalg.norm(offsets, axis=1)
+        close = distances < radius
+        first, offsets, distances = first[close], offsets[close], distances[close]
+        # Entidades no mesmo ponto: empurra em uma direção determinada pelo índice
+        coincident = distances == 0
+        offsets[coincident] = np.column_stack((np.cos(first[coincident]), np.sin(first[coincident])))
+        distances[coincident] = 1.0
+        weights = self.separation_strength * (1.0 - distances / radius) / distances
+        for axis in range(2):
+            push[:, axis] = np.bincount(first, weights=offsets[:, axis] * weights,
+                                        minlength=len(self._ids))
+        # Em multidões densas a soma pode passar da velocidade máxima da entidade
+        magnitude = np.linalg.norm(push, axis=1)
+        limit = np.maximum(self.speeds, self.separation_strength)
+        scale = np.where(magnitude > limit, limit / np.where(magnitude > 0, magnitude, 1.0), 1.0)
+        return push * scale[:, None]
+
+    def step(self, elapsed: float = 1.0) -> List[str]:
+        """
+        Avança todas as entidades em movimento por `elapsed` unidades de tempo.
+
+        Args:
+            elapsed: Tempo decorrido.
+
+        Returns:
+            IDs das entidades que chegaram ao destino final neste passo.
+        """
+        count = len(self._ids)
+        if elapsed <= 0 or count == 0:
+            return []
+        moving = self.moving
+        if not moving.any():
+            return []
+        positions = self.positions
+        targets = self.targets
+
+        # Velocidade desejada: em direção ao alvo, sem passar dele
+        offsets = targets - positions
+        distances = np.linalg.norm(offsets, axis=1)
+        reach = np.minimum(self.speeds * elapsed, distances)
+        safe = np.where(distances > 0, distances, 1.0)
+        velocities = offsets * (reach / (safe * elapsed))[:, None]
+        velocities += self._separation()
+        velocities[~moving] = 0.0
+        self._velocities[:count] = velocities
+        positions += velocities * elapsed
+
+        # Chegadas: próximo ponto de passagem, ou parada
+        arrived = []
+        remaining = np.linalg.norm(targets - positions, axis=1)
+        rows = np.nonzero(moving)[0]
+        for row in np.nonzero(moving & (remaining <= self.arrival_radius))[0].tolist():
+            entity_id = self._ids[row]
+            waypoints = self._waypoints.get(entity_id)
+            if waypoints:
+                point = waypoints.pop(0)
+                targets[row] = (point["x"], point["y"], point.get("z", 0.0))
+            else:
+                positions[row] = targets[row]
+                moving[row] = False
+                self._velocities[row] = 0.0
+                self._waypoints.pop(entity_id, None)
+                arrived.append(entity_id)
+
+        # Escreve as novas posições nas entidades e na grade espacial
+        # (uma atribuição por entidade em movimento; o cálculo acima é um só)
+        entities = self.world.entities
+        grid = self.world.grid
+        ids = self._ids
+        for row, point in zip(rows.tolist(), positions[rows].tolist()):
+            entity = entities[ids[row]]
+            # Sem passar pelo setter de Entity.position (a grade é atualizada aqui)
+            entity._position = {"x": point[0], "y": point[1], "z": point[2]}
+            entity.version += 1
+            grid.move(entity.id, tuple(point))
+        return arrived
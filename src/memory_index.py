@@ -0,0 +1,185 @@
+"""
+Módulo que implementa o índice associativo de memórias.
+
+O índice invertido liga cada participante (ID de nó) e cada tag emocional
+às memórias (MemoryEdge) em que aparecem. Uma recuperação percorre apenas
+as listas dos estímulos percebidos, portanto seu custo depende do número de
+memórias que casam com eles, e não do total de memórias do personagem.
+"""
+
+from typing import Dict, List, Any, Optional, Iterable, Set, Tuple
+import heapq
+
+from src.hypergraph import Hypergraph
+
+
+class AssociativeMemoryIndex:
+    """
+    Índice invertido participante/emoção -> memórias, mantido pelos
+    ouvintes do hiper-grafo.
+
+    A pontuação de uma memória para um conjunto de estímulos é
+
+        relevância * (peso_saliência * saliência + peso_recência * recência)
+
+    onde a relevância é a fração dos estímulos presentes na memória e a
+    recência decai pela metade a cada `recency_half_life` ticks.
+    """
+
+    def __init__(self, graph: Hypergraph, memory_type: str = "Memory",
+                 recency_half_life: float = 50.0, salience_weight: float = 0.6,
+                 recency_weight: float = 0.4):
+        """
+        Inicializa o índice e indexa as memórias já existentes.
+
+        Args:
+            graph: Hiper-grafo de personagem.
+            memory_type: Tipo das hiper-arestas de memória.
+            recency_half_life: Meia-vida da recência, em ticks.
+            salience_weight: Peso da saliência na pontuação.
+            recency_weight: Peso da recência na pontuação.
+        """
+        self.graph = graph
+        self.memory_type = memory_type
+        self.recency_half_life = recency_half_life
+        self.salience_weight = salience_weight
+        self.recency_weight = recency_weight
+        self._by_node: Dict[str, Set[str]] = {}
+        self._by_tag: Dict[str, Set[str]] = {}
+        # Chaves sob as quais cada memória está indexada (para reindexação)
+        self._keys: Dict[str, Tuple[Tuple[str, ...], str]] = {}
+        self.postings_scanned = 0
+
+        for edge in graph.get_edges_by_type(memory_type):
+            self._add(edge)
+        graph.register_listener(self._on_graph_event)
+
+    def __len__(self) -> int:
+        return len(self._keys)
+
+    def detach(self) -> None:
+        """
+        Deixa de acompanhar as alterações do hiper-grafo.
+        """
+        self.graph.unregister_listener(self._on_graph_event)
+
+    def _on_graph_event(self, event: str, item: Any) -> None:
+        """
+        Mantém as listas invertidas a partir dos eventos do hiper-grafo.
+        """
+        if not event.startswith("edge_") or item.type != self.memory_type:
+            return
+        if event == "edge_added":
+            self._add(item)
+        elif event == "edge_removed":
+            self._remove(item.id)
+        elif event == "edge_updated":
+            if self._keys.get(item.id) != (tuple(item.nodes), item.emotion_tag):
+                self._remove(item.id)
+                self._add(item)
+
+    def _add(self, edge: Any) -> None:
+        """
+        Insere uma memória nas listas dos seus participantes e da sua tag.
+        """
+        nodes = tuple(edge.nodes)
+        tag = getattr(edge, "emotion_tag", "")
+        for node_id in nodes:
+            self._by_node.setdefault(node_id, set()).add(edge.id)
+        if tag:
+            self._by_tag.setdefault(tag, set()).add(edge.id)
+        self._keys[edge.id] = (nodes, tag)
+
+    def _remove(self, memory_id: str) -> None:
+        """
+        Retira uma memória de todas as listas.
+        """
+        keys = self._keys.pop(memory_id, None)
+        if keys is None:
+            return
+        nodes, tag = keys
+        for node_id in nodes:
+            postings = self._by_node.get(node_id)
+            if postings is not None:
+                postings.discard(memory_id)
+                if not postings:
+                    del self._by_node[node_id]
+        if tag:
+            postings = self._by_tag.get(tag)
+            if postings is not None:
+                postings.discard(memory_id)
+                if not postings:
+                    del self._by_tag[tag]
+
+    def memories_involving(self, node_id: str) -> Set[str]:
+        """
+        Obtém os IDs das memórias em que um nó participa.
+
+        Args:
+            node_id: ID do nó.
+
+        Returns:
+            Conjunto de IDs de memórias.
+        """
+        return set(self._by_node.get(node_id, ()))
+
+    def memories_tagged(self, emotion_tag: str) -> Set[str]:
+        """
+        Obtém os IDs das memórias com uma tag emocional.
+
+        Args:
+            emotion_tag: Tag emocional (ex: "Fear").
+
+        Returns:
+            Conjunto de IDs de memórias.
+        """
+        return set(self._by_tag.get(emotion_tag, ()))
+
+    def score(self, memory: Any, relevance: float, current_time: Optional[int] = None) -> float:
+        """
+        Calcula a pontuação de uma memória.
+
+        Args:
+            memory: Hiper-aresta de memória.
+            relevance: Fração dos estímulos presentes na memória (entre 0 e 1).
+            current_time: Tempo atual (None ignora a recência).
+
+        Returns:
+            A pontuação da memória.
+        """
+        recency = 1.0
+        timestamp = getattr(memory, "timestamp", None)
+        if current_time is not None and timestamp is not None and self.recency_half_life > 0:
+            recency = 0.5 ** (max(0, current_time - timestamp) / self.recency_half_life)
+        return relevance * (self.salience_weight * memory.salience + self.recency_weight * recency)
+
+    def retrieve(self, cues: Iterable[str] = (), emotion_tags: Iterable[str] = (),
+                 k: int = 5, current_time: Optional[int] = None) -> List[Tuple[Any, float]]:
+        """
+        Recupera as k memórias mais relevantes para um conjunto de estímulos.
+
+        Args:
+            cues: IDs dos nós percebidos (participantes).
+            emotion_tags: Tags emocionais de interesse.
+            k: Número de memórias.
+            current_time: Tempo atual, para o cálculo da recência.
+
+        Returns:
+            Lista de pares (memória, pontuação), da maior para a menor pontuação.
+        """
+        hits: Dict[str, int] = {}
+        total = 0
+        for lists, keys in ((self._by_node, cues), (self._by_tag, emotion_tags)):
+            for key in set(keys):
+                total += 1
+                postings = lists.get(key, ())
+                self.postings_scanned += len(postings)
+                for memory_id in postings:
+                    hits[memory_id] = hits.get(memory_id, 0) + 1
+        if not hits:
+            return []
+
+        edges = self.graph.edges
+        scored = ((edges[memory_id], self.score(edges[memory_id], count / total, current_time))
+                  for memory_id, count in hits.items())
+        return heapq.nlargest(k, scored, key=lambda pair: pair[1])
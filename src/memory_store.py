@@ -0,0 +1,419 @@
+"""
+Módulo que implementa a consolidação e o armazenamento em camadas das
+memórias de um personagem.
+
+As memórias (MemoryEdge) ficam em três situações:
+
+- camada quente: as recentes e as mais salientes ficam no hiper-grafo, em RAM;
+- camada fria: as pouco salientes são levadas para um banco SQLite em disco
+  quando o orçamento de RAM é excedido, e voltam ao grafo quando consultadas;
+- resumos: memórias quase idênticas (mesma tag emocional, mesmos
+  participantes e próximas no tempo) são fundidas em uma só.
+
+Memórias fundamentais (cornerstone) nunca saem da camada quente.
+"""
+
+from typing import Dict, List, Any, Optional, Iterable, Tuple, TYPE_CHECKING
+import json
+import os
+import sqlite3
+import sys
+import tempfile
+import weakref
+
+from src.edges import MemoryEdge
+
+if TYPE_CHECKING:
+    from src.psyche import PsycheModule
+
+
+def estimate_memory_size(edge: MemoryEdge) -> int:
+    """
+    Estima a memória ocupada por uma hiper-aresta de memória.
+
+    Args:
+        edge: Hiper-aresta de memória.
+
+    Returns:
+        Tamanho aproximado em bytes (objeto, atributos e lista de nós).
+    """
+    attributes = edge.__dict__
+    size = sys.getsizeof(edge) + sys.getsizeof(attributes)
+    for value in attributes.values():
+        size += sys.getsizeof(value)
+    for node_id in edge.nodes:
+        size += sys.getsizeof(node_id)
+    return size
+
+
+def _release_store(connection: sqlite3.Connection, path: Optional[str]) -> None:
+    """
+    Fecha a conexão da camada fria e apaga o arquivo temporário, se houver.
+    """
+    connection.close()
+    if path is not None and os.path.exists(path):
+        os.remove(path)
+
+
+class ColdMemoryStore:
+    """
+    Camada fria: memórias serializadas em um banco SQLite, indexadas por
+    tag emocional, saliência e participantes.
+    """
+
+    def __init__(self, path: Optional[str] = None):
+        """
+        Abre (ou cria) o banco da camada fria.
+
+        Args:
+            path: Caminho do arquivo SQLite. Se não fornecido, um arquivo
+                temporário é criado e apagado em `close` (ou quando o objeto
+                é coletado, se `close` não for chamado).
+        """
+        self._owns_file = path is None
+        if path is None:
+            handle, path = tempfile.mkstemp(prefix="memories_", suffix=".sqlite")
+            os.close(handle)
+        self.path = path
+        self._connection = sqlite3.connect(path)
+        self._finalizer = weakref.finalize(self, _release_store, self._connection,
+                                           path if self._owns_file else None)
+        self._connection.executescript("""
+            CREATE TABLE IF NOT EXISTS memories (
+                id TEXT PRIMARY KEY,
+                emotion_tag TEXT,
+                salience REAL,
+                timestamp INTEGER,
+                data TEXT
+            );
+            CREATE TABLE IF NOT EXISTS memory_nodes (
+                memory_id TEXT,
+                node_id TEXT
+            );
+            CREATE INDEX IF NOT EXISTS idx_memories_tag ON memories (emotion_tag);
+            CREATE INDEX IF NOT EXISTS idx_memories_salience ON memories (salience);
+            CREATE INDEX IF NOT EXISTS idx_memory_nodes_node ON memory_nodes (node_id);
+            CREATE INDEX IF NOT EXISTS idx_memory_nodes_memory ON memory_nodes (memory_id);
+        """)
+
+    def __len__(self) -> int:
+        return self._connection.execute("SELECT COUNT(*) FROM memories").fetchone()[0]
+
+    def __contains__(self, memory_id: str) -> bool:
+        return self._connection.execute(
+            "SELECT 1 FROM memories WHERE id = ?", (memory_id,)).fetchone() is not None
+
+    def put_many(self, edges: Iterable[MemoryEdge]) -> int:
+        """
+        Grava várias memórias em uma única transação.
+
+        Args:
+            edges: Hiper-arestas de memória.
+
+        Returns:
+            Número de memórias gravadas.
+        """
+        rows = []
+        links = []
+        for edge in edges:
+            rows.append((edge.id, edge.emotion_tag, edge.salience, edge.timestamp,
+                         json.dumps(edge.to_dict())))
+            links.extend((edge.id, node_id) for node_id in edge.nodes)
+        if not rows:
+            return 0
+        with self._connection:
+            ids = [(row[0],) for row in rows]
+            self._connection.executemany("DELETE FROM memory_nodes WHERE memory_id = ?", ids)
+            self._connection.executemany(
+                "INSERT OR REPLACE INTO memories VALUES (?, ?, ?, ?, ?)", rows)
+            self._connection.executemany("INSERT INTO memory_nodes VALUES (?, ?)", links)
+        return len(rows)
+
+    def remove_many(self, memory_ids: Iterable[str]) -> None:
+        """
+        Apaga várias memórias.
+
+        Args:
+            memory_ids: IDs das memórias.
+        """
+        ids = [(memory_id,) for memory_id in memory_ids]
+        with self._connection:
+            self._connection.executemany("DELETE FROM memories WHERE id = ?", ids)
+            self._connection.executemany("DELETE FROM memory_nodes WHERE memory_id = ?", ids)
+
+    def query(self, emotion_tag: Optional[str] = None, involving: Iterable[str] = (),
+              min_salience: Optional[float] = None,
+              limit: Optional[int] = None) -> List[Dict[str, Any]]:
+        """
+        Busca memórias na camada fria.
+
+        Args:
+            emotion_tag: Tag emocional exigida (opcional).
+            involving: IDs de nós que a memória deve conter.
+            min_salience: Saliência mínima (opcional).
+            limit: Número máximo de resultados.
+
+        Returns:
+            Dicionários das memórias (formato de `MemoryEdge.to_dict`),
+            da mais saliente para a menos saliente.
+        """
+        clauses = []
+        params: List[Any] = []
+        if emotion_tag is not None:
+            clauses.append("emotion_tag = ?")
+            params.append(emotion_tag)
+        if min_salience is not None:
+            clauses.append("salience >= ?")
+            params.append(min_salience)
+        for node_id in involving:
+            clauses.append("id IN (SELECT memory_id FROM memory_nodes WHERE node_id = ?)")
+            params.append(node_id)
+        sql = "SELECT data FROM memories"
+        if clauses:
+            sql += " WHERE " + " AND ".join(clauses)
+        sql += " ORDER BY salience DESC"
+        if limit is not None:
+            sql += " LIMIT ?"
+            params.append(limit)
+        return [json.loads(row[0]) for row in self._connection.execute(sql, params)]
+
+    def close(self) -> None:
+        """
+        Fecha o banco (e apaga o arquivo temporário, se foi criado aqui).
+        Chamadas repetidas não têm efeito.
+        """
+        self._finalizer()
+
+
+class MemoryConsolidator:
+    """
+    Consolida periodicamente as memórias de um personagem: funde memórias
+    quase idênticas e leva as menos salientes para a camada fria até que a
+    camada quente caiba no orçamento de RAM.
+    """
+
+    def __init__(self, psyche_module: 'PsycheModule', ram_budget_bytes: int = 1 << 20,
+                 cold_store: Optional[ColdMemoryStore] = None, hot_window: int = 10,
+                 merge_window: int = 5, interval: int = 1):
+        """
+        Inicializa o consolidador.
+
+        Args:
+            psyche_module: Personagem cujas memórias são consolidadas.
+            ram_budget_bytes: Orçamento de RAM da camada quente, em bytes.
+            cold_store: Camada fria. Se não fornecida, um banco temporário é criado.
+            hot_window: Memórias mais novas que este número de ticks nunca saem da camada quente.
+            merge_window: Distância máxima, em ticks, entre memórias fundidas.
+            interval: Intervalo, em ticks, entre consolidações feitas por `update`.
+        """
+        self.psyche_module = psyche_module
+        self.ram_budget_bytes = ram_budget_bytes
+        # Só fecha em `close` a camada fria que ele mesmo criou
+        self._owns_store = cold_store is None
+        self.cold_store = cold_store if cold_store is not None else ColdMemoryStore()
+        self.hot_window = hot_window
+        self.merge_window = merge_window
+        self.interval = max(1, interval)
+        self.last_consolidation: Optional[int] = None
+        self.hot_bytes = 0
+        self.total_merged = 0
+        self.total_spilled = 0
+        self.total_paged_in = 0
+
+    def __enter__(self) -> 'MemoryConsolidator':
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.close()
+
+    def close(self) -> None:
+        """
+        Libera a camada fria, se foi criada pelo consolidador (uma camada
+        fria fornecida pelo chamador continua aberta).
+        """
+        if self._owns_store:
+            self.cold_store.close()
+
+    def update(self, current_time: int) -> None:
+        """
+        Consolida as memórias se o intervalo configurado já passou.
+
+        Args:
+            current_time: Tempo atual da simulação.
+        """
+        if self.last_consolidation is None or current_time - self.last_consolidation >= self.interval:
+            self.consolidate(current_time)
+
+    def consolidate(self, current_time: int) -> Dict[str, int]:
+        """
+        Funde as memórias quase idênticas e aplica o orçamento de RAM.
+
+        Args:
+            current_time: Tempo atual da simulação.
+
+        Returns:
+            Dicionário com o número de memórias fundidas e levadas para a camada fria.
+        """
+        self.last_consolidation = current_time
+        merged = self.merge_duplicates()
+        spilled = self.enforce_budget(current_time)
+        return {"merged": merged, "spilled": spilled}
+
+    def merge_duplicates(self) -> int:
+        """
+        Funde memórias com a mesma tag emocional e os mesmos participantes,
+        ocorridas a até `merge_window` ticks uma da outra.
+
+        A memória mais saliente de cada grupo vira o resumo: fica com a maior
+        intensidade, a saliência combinada 1 - (1 - a)(1 - b) e a contagem
+        das memórias fundidas. As demais são removidas.
+
+        Returns:
+            Número de memórias removidas por fusão.
+        """
+        graph = self.psyche_module.psyche
+        groups: Dict[Tuple[str, frozenset], List[MemoryEdge]] = {}
+        for edge in graph.get_edges_by_type("Memory"):
+            if edge.is_cornerstone or edge.timestamp is None:
+                continue
+            groups.setdefault((edge.emotion_tag, frozenset(edge.nodes)), []).append(edge)
+
+        removed = 0
+        with graph.batch():
+            for edges in groups.values():
+                if len(edges) < 2:
+                    continue
+                edges.sort(key=lambda edge: edge.timestamp)
+                cluster = [edges[0]]
+                for edge in edges[1:]:
+                    if edge.timestamp - cluster[-1].timestamp <= self.merge_window:
+                        cluster.append(edge)
+                    else:
+                        removed += self._merge(cluster)
+                        cluster = [edge]
+                removed += self._merge(cluster)
+        self.total_merged += removed
+        return removed
+
+    def _merge(self, cluster: List[MemoryEdge]) -> int:
+        """
+        Funde um grupo de memórias na mais saliente delas.
+        """
+        if len(cluster) < 2:
+            return 0
+        graph = self.psyche_module.psyche
+        summary = max(cluster, key=lambda edge: edge.salience)
+        forgotten = 1.0
+        for edge in cluster:
+            forgotten *= 1.0 - edge.salience
+        count = sum(edge.merged_count for edge in cluster)
+        graph.update_edge(
+            summary.id,
+            intensity=max(edge.intensity for edge in cluster),
+            salience=1.0 - forgotten,
+            timestamp=max(edge.timestamp for edge in cluster),
+            merged_count=count,
+            description=summary.description or f"Resumo de {count} memórias de {summary.emotion_tag}"
+        )
+        for edge in cluster:
+            if edge is not summary:
+                graph.remove_edge(edge.id)
+        return len(cluster) - 1
+
+    def enforce_budget(self, current_time: int) -> int:
+        """
+        Leva memórias para a camada fria, da menos para a mais saliente,
+        até que a camada quente caiba no orçamento de RAM.
+
+        Memórias fundamentais e as mais novas que `hot_window` ficam na
+        camada quente mesmo que o orçamento continue excedido.
+
+        Args:
+            current_time: Tempo atual da simulação.
+
+        Returns:
+            Número de memórias levadas para a camada fria.
+        """
+        graph = self.psyche_module.psyche
+        memories = graph.get_edges_by_type("Memory")
+        sizes = {edge.id: estimate_memory_size(edge) for edge in memories}
+        self.hot_bytes = sum(sizes.values())
+        if self.hot_bytes <= self.ram_budget_bytes:
+            return 0
+
+        spill = []
+        excess = self.hot_bytes - self.ram_budget_bytes
+        for edge in graph.edges_in_range("Memory", "salience"):
+            if excess <= 0:
+                break
+            if edge.is_cornerstone:
+                continue
+            if edge.timestamp is not None and current_time - edge.timestamp < self.hot_window:
+                continue
+            spill.append(edge)
+            excess -= sizes[edge.id]
+
+        self.cold_store.put_many(spill)
+        for edge in spill:
+            graph.remove_edge(edge.id)
+            self.hot_bytes -= sizes[edge.id]
+        self.total_spilled += len(spill)
+        return len(spill)
+
+    def recall(self, emotion_tag: Optional[str] = None, involving: Iterable[str] = (),
+               min_salience: Optional[float] = None, page_in: bool = True) -> List[MemoryEdge]:
+        """
+        Busca memórias nas duas camadas.
+
+        As memórias encontradas na camada fria voltam para o grafo (a próxima
+        consolidação decide se continuam lá).
+
+        Args:
+            emotion_tag: Tag emocional exigida (opcional).
+            involving: IDs de nós que a memória deve conter.
+            min_salience: Saliência mínima (opcional).
+            page_in: Se False, as memórias frias são devolvidas sem voltar ao grafo.
+
+        Returns:
+            Hiper-arestas de memória, da mais saliente para a menos saliente.
+        """
+        graph = self.psyche_module.psyche
+        involving = list(involving)
+        query = graph.query_edges("Memory").involving(*involving)
+        if emotion_tag is not None:
+            query.where("emotion_tag", "==", emotion_tag)
+        if min_salience is not None:
+            query.where("salience", ">=", min_salience)
+        results = query.to_list()
+
+        cold = [MemoryEdge.from_dict(data) for data in
+                self.cold_store.query(emotion_tag, involving, min_salience)]
+        if cold and page_in:
+            for edge in cold:
+                # Participantes removidos do grafo enquanto a memória estava fria
+                edge.nodes = [node_id for node_id in edge.nodes if node_id in graph.nodes]
+            for edge in cold:
+                graph.add_edge(edge)
+            self.cold_store.remove_many(edge.id for edge in cold)
+            self.total_paged_in += len(cold)
+        results.extend(cold)
+        results.sort(key=lambda edge: edge.salience, reverse=True)
+        return results
+
+    def get_stats(self) -> Dict[str, Any]:
+        """
+        Obtém as estatísticas do consolidador.
+
+        Returns:
+            Dicionário com o tamanho das camadas e os totais de fusões,
+            transferências para a camada fria e retornos ao grafo.
+        """
+        return {
+            "hot_memories": len(self.psyche_module.psyche.get_edges_by_type("Memory")),
+            "cold_memories": len(self.cold_store),
+            "hot_bytes": self.hot_bytes,
+            "ram_budget_bytes": self.ram_budget_bytes,
+            "merged": self.total_merged,
+            "spilled": self.total_spilled,
+            "paged_in": self.total_paged_in
+        }
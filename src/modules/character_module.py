@@ -1,8 +1,11 @@
 from .data_structures import Hypergraph, Node, Hyperedge
+from .decision_trace import INFO
 
 class Character:
-    def __init__(self, id, archetype=None):
+    def __init__(self, id, archetype=None, trace=None):
         self.id = id
+        # Optional DecisionTrace shared with the character's CognitionModule
+        self.trace = trace
         self.p_npc = Hypergraph()  # P_NPC is an instance of Hypergraph
         self._initialize_from_archetype(archetype)
 
@@ -11,7 +14,8 @@ class Character:
         # In a real scenario, this would load predefined nodes and hyperedges
         # based on the archetype (e.g., 'hero', 'villain', 'commoner').
         if archetype:
-            print(f"Initializing character {self.id} with archetype: {archetype}")
+            if self.trace is not None:
+                self.trace.record(INFO, 0, "Initializing character %s with archetype: %s", self.id, archetype)
             # Example: Add a basic personality node
             if archetype == 'hero':
                 self.p_npc.add_node(Node('p_courage', 'Personality', trait='Courage', value=0.8))
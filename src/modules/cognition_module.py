@@ -1,99 +1,243 @@
+import time
+from collections import OrderedDict
+
 from .data_structures import Hypergraph, Node, Hyperedge
+from .decision_trace import DEBUG, INFO, WARNING
+from src.emotions import EmotionAccumulator
 
 class CognitionModule:
-    def __init__(self, character, world=None, relationship_module=None):
+    def __init__(self, character, world=None, relationship_module=None, rewrite_engine=None,
+                 memory_index=None, memory_k=5, budget=None, habit_threshold=0.8,
+                 reflex_rules=None, candidate_actions=None, outcome_model=None,
+                 outcome_cache_size=1024, trace=None):
         self.character = character
         self.world = world
         self.relationship_module = relationship_module
+        # Optional src.rewriting.RewriteEngine bound to the character's psyche
+        self.rewrite_engine = rewrite_engine
+        self.rule_firings = 0
+        # Optional src.memory_index.AssociativeMemoryIndex over the character's memories
+        self.memory_index = memory_index
+        self.memory_k = memory_k
+        self.perceived_ids = []
+        # World events delivered to this character's inbox (consumed on perception)
+        self.perceived_events = []
+        self.retrieved_memories = []
+        self.social_context = {}
+        # Anytime decision: seconds per act (None = unbounded). The deadline is checked between
+        # steps (and between outcome_model calls), so it is a target, not a hard limit
+        self.budget = budget
+        self._deadline = None
+        # Early exits: habits at least this strong, or active rules mapped to an action
+        self.habit_threshold = habit_threshold
+        self.reflex_rules = reflex_rules or {}
+        # candidate_actions: static options; outcome_model(state_key, option) -> predicted utility
+        self.candidate_actions = list(candidate_actions or [])
+        self.outcome_model = outcome_model
+        self.outcome_cache_size = outcome_cache_size
+        self._outcome_cache = OrderedDict()
+        self.outcome_cache_hits = 0
+        self.outcome_cache_misses = 0
+        self.options = []
+        self.predicted_outcomes = {}
+        self.selected_action = None
+        self.early_exit = None
+        self.skipped_steps = []
+        # Live emotions keyed by (emotion, target, cause): repeated appraisals merge into one edge
+        self.emotions = EmotionAccumulator(character.p_npc, edge_factory=self._make_emotion_edge,
+                                           decay_attribute="decayRate")
+        self._last_emotion_time = None
+        # Optional DecisionTrace (defaults to the character's); None skips all tracing
+        self.trace = trace if trace is not None else getattr(character, "trace", None)
 
-    def expanded_human_act(self):
-        # This method will encapsulate the 12 steps of the Expanded Human Act
-        # For now, it's a placeholder.
-        print(f"Character {self.character.id} is performing the Expanded Human Act.")
+    def expanded_human_act(self, budget=None):
+        # Anytime version of the 12 steps of the Expanded Human Act: perception always runs,
+        # a reflex (strong habit or rule) short-circuits deliberation, and optional steps are
+        # skipped once the budget is spent, as checked between steps. Execution and observation
+        # always run and a step already started is not interrupted, so an act can overrun the
+        # budget; it returns the best action found so far.
+        budget = self.budget if budget is None else budget
+        self._deadline = None if budget is None else time.perf_counter() + budget
+        self.early_exit = None
+        self.skipped_steps = []
+        self.options = []
+        self.predicted_outcomes = {}
+        if self.trace is not None:
+            self.trace.begin(getattr(self.world, "current_time", None),
+                             "Character %s is performing the Expanded Human Act.", self.character.id)
         # Step 1: Perceive Environment
         self._perceive_environment()
         # Step 2: Retrieve Memories/Knowledge
-        self._retrieve_memories_knowledge()
-        # Step 3: Evaluate Needs/Goals
-        self._evaluate_needs_goals()
-        # Step 4: Assess Emotions
-        self._assess_emotions()
-        # Step 5: Generate Options
-        self._generate_options()
-        # Step 6: Predict Outcomes
-        self._predict_outcomes()
-        # Step 7: Evaluate Options (including social considerations)
-        self._evaluate_options()
-        # Step 8: Select Action
-        self._select_action()
+        self._run_step(2, self._retrieve_memories_knowledge)
+        reflex = self._reflex_action()
+        if reflex is not None:
+            self.selected_action = reflex
+            self._log(INFO, 8, "Early exit (%s): %s", self.early_exit, self.selected_action)
+        else:
+            # Step 3: Evaluate Needs/Goals
+            self._run_step(3, self._evaluate_needs_goals)
+            # Step 4: Assess Emotions
+            self._run_step(4, self._assess_emotions)
+            # Step 5: Generate Options
+            self._run_step(5, self._generate_options)
+            # Step 6: Predict Outcomes
+            self._run_step(6, self._predict_outcomes)
+            # Step 7: Evaluate Options (including social considerations)
+            self._run_step(7, self._evaluate_options)
+            # Step 8: Select Action
+            self._select_action()
         # Step 9: Execute Action
         self._execute_action()
         # Step 10: Observe Consequences
         self._observe_consequences()
-        # Step 11: Learn/Update Internal State
-        self._learn_update_internal_state()
+        # Step 11: Learn/Update Internal State (pending rule activations wait for the next act)
+        self._run_step(11, self._learn_update_internal_state)
         # Step 12: Reflect/Metacognition
-        self._reflect_metacognition()
+        self._run_step(12, self._reflect_metacognition)
+        return self.selected_action
+
+    def _out_of_budget(self):
+        return self._deadline is not None and time.perf_counter() >= self._deadline
+
+    def _run_step(self, number, step):
+        if self._out_of_budget():
+            self.skipped_steps.append(number)
+            self._log(WARNING, number, "Skipped (budget exhausted)")
+            return
+        step()
+
+    def _log(self, level, step, message, *args, data=None):
+        trace = self.trace
+        if trace is not None and trace.enabled_for(level):
+            trace.record(level, step, message, *args, data=data)
+
+    def _reflex_action(self):
+        # Strongest habit above the threshold wins; otherwise the first active reflex rule
+        best = None
+        for node in self.character.p_npc.get_nodes_by_type("Habit"):
+            action = getattr(node, "action", None)
+            if not action:
+                continue
+            strength = getattr(node, "strength", 0.0)
+            if strength >= self.habit_threshold and (best is None or strength > best[0]):
+                best = (strength, action)
+        if best is not None:
+            self.early_exit = "habit"
+            return best[1]
+        if self.rewrite_engine and self.reflex_rules:
+            for rule_id in self.rewrite_engine.matcher.active_rules():
+                if rule_id in self.reflex_rules:
+                    self.early_exit = "rule"
+                    return self.reflex_rules[rule_id]
+        return None
+
+    def _state_key(self):
+        # Compact signature of what the prediction depends on
+        return (tuple(sorted(self.perceived_ids)),
+                tuple(sorted(memory.id for memory in self.retrieved_memories)))
 
     def _perceive_environment(self):
-        print("  Step 1: Perceiving environment...")
-        if self.world:
-            # Placeholder for actual perception logic
-            pass
+        self._log(DEBUG, 1, "Perceiving environment...")
+        self.perceived_ids = []
+        self.perceived_events = []
+        if self.world and hasattr(self.world, "perceive"):
+            perception = self.world.perceive(self.character.id)
+            self.perceived_ids = [entity["id"] for entity in perception.get("entities", [])]
+            self.perceived_events = perception.get("events", [])
+            if perception.get("location"):
+                self.perceived_ids.append(perception["location"]["id"])
 
     def _retrieve_memories_knowledge(self):
-        print("  Step 2: Retrieving memories/knowledge...")
-        # Placeholder for accessing character's P_NPC
-        pass
+        self._log(DEBUG, 2, "Retrieving memories/knowledge...")
+        # Memories involving the perceived entities, weighted by salience and recency.
+        # The index only touches the postings of the perceived ids.
+        self.retrieved_memories = []
+        if self.memory_index and self.perceived_ids:
+            current_time = getattr(self.world, "current_time", None)
+            self.retrieved_memories = [
+                memory for memory, _ in self.memory_index.retrieve(
+                    self.perceived_ids, k=self.memory_k, current_time=current_time)]
 
     def _evaluate_needs_goals(self):
-        print("  Step 3: Evaluating needs/goals...")
+        self._log(DEBUG, 3, "Evaluating needs/goals...")
         # Placeholder for evaluating needs and goals from P_NPC
         pass
 
     def _assess_emotions(self):
-        print("  Step 4: Assessing emotions...")
+        self._log(DEBUG, 4, "Assessing emotions...")
         # Placeholder for assessing emotions from P_NPC
         pass
 
     def _generate_options(self):
-        print("  Step 5: Generating options...")
-        # Placeholder for generating possible actions
-        pass
+        self._log(DEBUG, 5, "Generating options...")
+        # Static candidates plus the actions of the character's (weaker) habits
+        options = list(self.candidate_actions)
+        for node in self.character.p_npc.get_nodes_by_type("Habit"):
+            action = getattr(node, "action", None)
+            if action and action not in options:
+                options.append(action)
+        self.options = options
 
     def _predict_outcomes(self):
-        print("  Step 6: Predicting outcomes...")
-        # Placeholder for predicting outcomes of actions
-        pass
+        self._log(DEBUG, 6, "Predicting outcomes...")
+        # Options are scored one at a time until the deadline; (state, option) pairs
+        # seen before come from the LRU outcome cache.
+        if not self.outcome_model:
+            return
+        state_key = self._state_key()
+        cache = self._outcome_cache
+        for option in self.options:
+            if self._out_of_budget():
+                break
+            key = (state_key, option)
+            if key in cache:
+                cache.move_to_end(key)
+                self.outcome_cache_hits += 1
+            else:
+                self.outcome_cache_misses += 1
+                cache[key] = self.outcome_model(state_key, option)
+                if len(cache) > self.outcome_cache_size:
+                    cache.popitem(last=False)
+            self.predicted_outcomes[option] = cache[key]
 
     def _evaluate_options(self):
-        print("  Step 7: Evaluating options (including social considerations)...")
+        self._log(DEBUG, 7, "Evaluating options (including social considerations)...")
+        self.social_context = {}
         if self.relationship_module:
-            # Placeholder for social evaluation
-            pass
+            # Trust/debt towards perceived characters: O(1) pair lookups in the relationship store
+            for other_id in self.perceived_ids:
+                relationship = self.relationship_module.get(self.character.id, other_id)
+                if relationship is not None:
+                    self.social_context[other_id] = relationship
 
     def _select_action(self):
-        print("  Step 8: Selecting action based on emotional state and personality...")
+        self._log(DEBUG, 8, "Selecting action based on emotional state and personality...")
         # Placeholder for action selection logic
         # This would involve iterating through potential actions, evaluating them
         # based on current emotional state (EmotionEdges) and personality traits (PersonalityNodes)
         # from the character's P_NPC.
         selected_action = "do_nothing" # Default action
+        if self.predicted_outcomes:
+            # Best option among those evaluated before the deadline
+            selected_action = max(self.predicted_outcomes, key=self.predicted_outcomes.get)
+        elif self.options:
+            selected_action = self.options[0]
         # Example: If character is angry, they might choose an aggressive action
         # if self.character.p_npc.get_hyperedge("emotion_some_event_id") and \
         #    self.character.p_npc.get_hyperedge("emotion_some_event_id").properties["emotion"] == "Anger":
         #    selected_action = "shout"
         self.selected_action = selected_action
-        print(f"  Selected action: {self.selected_action}")
+        # predicted_outcomes is rebuilt on every act, so the trace can keep a reference
+        self._log(INFO, 8, "Selected action: %s", self.selected_action, data=self.predicted_outcomes)
 
     def _execute_action(self):
-        print("  Step 9: Executing action...")
+        self._log(DEBUG, 9, "Executing action...")
         if self.world:
             # Placeholder for sending action to World Module
             pass
 
     def _observe_consequences(self):
-        print("  Step 10: Observing consequences...")
+        self._log(DEBUG, 10, "Observing consequences...")
         # Placeholder for observing consequences of actions
         # This is where OCC model would be applied to generate EmotionEdges
         # For now, let's simulate a simple emotion generation
@@ -115,30 +259,43 @@ class CognitionModule:
         if not self.character.p_npc.get_node(target_id):
             self.character.p_npc.add_node(Node(target_id, "Target", name=target_id))
 
-        # Create a dummy EmotionEdge
-        emotion_edge = Hyperedge(
-            id=f"emotion_{event_id}",
+        # Decay the live emotions for the elapsed time (one step per act without a world clock),
+        # then merge this appraisal into the edge with the same (emotion, target, cause)
+        current_time = getattr(self.world, "current_time", None)
+        if self._last_emotion_time is not None:
+            elapsed = current_time - self._last_emotion_time if current_time is not None else 1
+            self.emotions.decay(elapsed)
+        self._last_emotion_time = current_time if current_time is not None else 0
+        emotion_edge = self.emotions.appraise(
+            emotion_type, intensity, target=target_id, cause=event_id,
+            nodes=[event_id, self.character.id, target_id], decay_rate=decay_rate)
+        self._log(DEBUG, 10, "Appraised EmotionEdge: %s", emotion_edge)
+
+    def _make_emotion_edge(self, key, nodes, intensity, decay_rate, current_time):
+        emotion, target, cause = key
+        return Hyperedge(
+            id=f"emotion_{cause}_{emotion}_{target}",
             type="EmotionEdge",
-            nodes=[event_id, self.character.id, target_id],
-            emotion=emotion_type,
+            nodes=nodes,
+            emotion=emotion,
             intensity=intensity,
             decayRate=decay_rate
         )
-        self.character.p_npc.add_hyperedge(emotion_edge)
-        print(f"  Generated EmotionEdge: {emotion_edge}")
 
     def _learn_update_internal_state(self):
-        print("  Step 11: Learning/Updating internal state (Hypergraph rewriting)...")
+        self._log(DEBUG, 11, "Learning/Updating internal state (Hypergraph rewriting)...")
         # Placeholder for the hypergraph rewriting system.
         # This is where the P_NPC would be updated based on the consequences of actions
         # and new memories/habits would be formed.
         # Example: If a positive outcome occurred, strengthen a related habit or value.
         # If a negative outcome, weaken a habit or adjust a belief.
         # This would involve applying 'RuleEdge's to modify the P_NPC.
-        pass
+        if self.rewrite_engine:
+            # All rule firings of this tick are applied as a single atomic batch
+            self.rule_firings = self.rewrite_engine.run_tick()
 
     def _reflect_metacognition(self):
-        print("  Step 12: Reflecting/Metacognition...")
+        self._log(DEBUG, 12, "Reflecting/Metacognition...")
         # Placeholder for higher-level reflection
         pass
 
@@ -1,51 +1,251 @@
-class Node:
+# Compatibility adapter: the src/modules API (kwargs properties, add_hyperedge) on top of
+# the core hypergraph in src/hypergraph.py, so both stacks share the type buckets, the
+# incidence and range indexes, listeners, queries and serialization.
+from collections.abc import MutableMapping
+
+from src.hypergraph import (Node as CoreNode, Hyperedge as CoreHyperedge,
+                            Hypergraph as CoreHypergraph, NODE_TYPES, EDGE_TYPES)
+import src.nodes  # noqa: F401 (registers the typed core classes in NODE_TYPES)
+import src.edges  # noqa: F401 (registers the typed core classes in EDGE_TYPES)
+
+
+def _check_property(item, name):
+    # Properties live next to the methods, so they must not shadow class attributes
+    if name in item._RESERVED or hasattr(type(item), name):
+        raise KeyError(f"'{name}' is not a valid property name.")
+
+
+def _notify_graph(item):
+    # Same effect as update_node/update_edge when the element is still in its graph
+    # (reindexes the range indexes and notifies the listeners)
+    graph = vars(item).get("_graph")
+    if graph is not None:
+        elements = graph.edges if isinstance(item, CoreHyperedge) else graph.nodes
+        if elements.get(item.id) is item:
+            graph.notify_changed(item)
+
+
+class PropertiesView(MutableMapping):
+    # Write-through dict view over an element's attributes (excluding the core fields).
+    # Writes made while the element is in a graph go through the graph, like update_node
+    # and update_edge, so indexes and listeners see them.
+    __slots__ = ("_item", "_reserved")
+
+    def __init__(self, item, reserved):
+        self._item = item
+        self._reserved = reserved
+
+    def __getitem__(self, key):
+        if key in self._reserved or key not in vars(self._item):
+            raise KeyError(key)
+        return vars(self._item)[key]
+
+    def __setitem__(self, key, value):
+        _check_property(self._item, key)
+        setattr(self._item, key, value)
+        _notify_graph(self._item)
+
+    def __delitem__(self, key):
+        if key in self._reserved or key not in vars(self._item):
+            raise KeyError(key)
+        delattr(self._item, key)
+        _notify_graph(self._item)
+
+    def __iter__(self):
+        reserved = self._reserved
+        return (key for key in vars(self._item) if key not in reserved)
+
+    def __len__(self):
+        reserved = self._reserved
+        return sum(1 for key in vars(self._item) if key not in reserved)
+
+    def __repr__(self):
+        return repr(dict(self))
+
+
+class Node(CoreNode):
+    # "_graph" is set by the adapter Hypergraph that holds the node
+    _RESERVED = frozenset(("id", "type", "_graph"))
+
     def __init__(self, id, type, **kwargs):
-        self.id = id
-        self.type = type
-        self.properties = kwargs
+        super().__init__(node_id=id, node_type=type)
+        # Properties are plain attributes, so the core range indexes can read them
+        for name, value in kwargs.items():
+            _check_property(self, name)
+            setattr(self, name, value)
+
+    @property
+    def INDEXED_ATTRIBUTES(self):
+        # Same indexed attributes as the typed core class for this type (e.g. Value.priority)
+        core = NODE_TYPES.get(self.type)
+        return core.INDEXED_ATTRIBUTES if core is not None else ()
+
+    @property
+    def properties(self):
+        return PropertiesView(self, self._RESERVED)
+
+    @properties.setter
+    def properties(self, values):
+        view = self.properties
+        view.clear()
+        view.update(values)
+
+    def to_dict(self):
+        return {"id": self.id, "type": self.type, **self.properties}
+
+    @classmethod
+    def from_dict(cls, data):
+        properties = {key: value for key, value in data.items() if key not in cls._RESERVED}
+        return cls(data.get("id"), data.get("type", "Node"), **properties)
 
     def __repr__(self):
-        return f"Node(id='{self.id}', type='{self.type}', properties={self.properties})"
+        return f"Node(id='{self.id}', type='{self.type}', properties={dict(self.properties)})"
+
+    __str__ = __repr__
+
+
+class Hyperedge(CoreHyperedge):
+    _RESERVED = frozenset(("id", "type", "nodes", "_graph"))
 
-class Hyperedge:
     def __init__(self, id, type, nodes, **kwargs):
-        self.id = id
-        self.type = type
+        super().__init__(edge_id=id, edge_type=type, nodes=nodes)
         self.nodes = nodes  # List of node IDs involved in the hyperedge
-        self.properties = kwargs
+        for name, value in kwargs.items():
+            _check_property(self, name)
+            setattr(self, name, value)
+
+    @property
+    def INDEXED_ATTRIBUTES(self):
+        core = EDGE_TYPES.get(self.type)
+        return core.INDEXED_ATTRIBUTES if core is not None else ()
+
+    @property
+    def properties(self):
+        return PropertiesView(self, self._RESERVED)
+
+    @properties.setter
+    def properties(self, values):
+        view = self.properties
+        view.clear()
+        view.update(values)
+
+    def to_dict(self):
+        return {"id": self.id, "type": self.type, "nodes": list(self.nodes), **self.properties}
+
+    @classmethod
+    def from_dict(cls, data):
+        properties = {key: value for key, value in data.items() if key not in cls._RESERVED}
+        return cls(data.get("id"), data.get("type", "Hyperedge"), list(data.get("nodes", [])),
+                   **properties)
 
     def __repr__(self):
-        return f"Hyperedge(id='{self.id}', type='{self.type}', nodes={self.nodes}, properties={self.properties})"
+        return (f"Hyperedge(id='{self.id}', type='{self.type}', nodes={self.nodes}, "
+                f"properties={dict(self.properties)})")
+
+    __str__ = __repr__
+
+
+class HyperedgeMap(MutableMapping):
+    # The old `hyperedges` dict: reads come from the core `edges`, writes and deletions
+    # go through add_hyperedge/remove_edge so the indexes stay consistent.
+    __slots__ = ("_graph",)
+
+    def __init__(self, graph):
+        self._graph = graph
+
+    def __getitem__(self, key):
+        return self._graph.edges[key]
+
+    def __setitem__(self, key, hyperedge):
+        if getattr(hyperedge, "id", None) != key:
+            raise ValueError(f"Hyperedge ID must match the key '{key}'.")
+        self._graph.remove_edge(key)
+        self._graph.add_hyperedge(hyperedge)
+
+    def __delitem__(self, key):
+        if key not in self._graph.edges:
+            raise KeyError(key)
+        self._graph.remove_edge(key)
+
+    def __iter__(self):
+        return iter(self._graph.edges)
+
+    def __len__(self):
+        return len(self._graph.edges)
+
+    def __contains__(self, key):
+        return key in self._graph.edges
 
-class Hypergraph:
-    def __init__(self):
-        self.nodes = {}
-        self.hyperedges = {}
+    def clear(self):
+        for edge_id in list(self._graph.edges):
+            self._graph.remove_edge(edge_id)
+
+    def __repr__(self):
+        return repr(self._graph.edges)
+
+
+class Hypergraph(CoreHypergraph):
+    def __init__(self, graph_id=None, name="Hypergraph"):
+        super().__init__(graph_id=graph_id, name=name)
+
+    @property
+    def hyperedges(self):
+        return HyperedgeMap(self)
+
+    def _attach(self, item):
+        # Lets the properties view of adapter elements write through this graph
+        if isinstance(item, (Node, Hyperedge)):
+            item._graph = self
+
+    def _index_node(self, node):
+        self._attach(node)
+        super()._index_node(node)
+
+    def _index_edge(self, edge):
+        self._attach(edge)
+        super()._index_edge(edge)
+
+    def _insert_nodes(self, nodes):
+        for node in nodes:
+            self._attach(node)
+        super()._insert_nodes(nodes)
+
+    def _insert_edges(self, edges):
+        for edge in edges:
+            self._attach(edge)
+        super()._insert_edges(edges)
 
     def add_node(self, node):
-        if not isinstance(node, Node):
+        if not isinstance(node, CoreNode):
             raise TypeError("Only Node objects can be added to the Hypergraph.")
         if node.id in self.nodes:
             raise ValueError(f"Node with ID '{node.id}' already exists.")
-        self.nodes[node.id] = node
+        self._index_node(node)
 
     def add_hyperedge(self, hyperedge):
-        if not isinstance(hyperedge, Hyperedge):
+        if not isinstance(hyperedge, CoreHyperedge):
             raise TypeError("Only Hyperedge objects can be added to the Hypergraph.")
         for node_id in hyperedge.nodes:
             if node_id not in self.nodes:
                 raise ValueError(f"Node with ID '{node_id}' not found in the Hypergraph.")
-        if hyperedge.id in self.hyperedges:
+        if hyperedge.id in self.edges:
             raise ValueError(f"Hyperedge with ID '{hyperedge.id}' already exists.")
-        self.hyperedges[hyperedge.id] = hyperedge
-
-    def get_node(self, node_id):
-        return self.nodes.get(node_id)
+        self._index_edge(hyperedge)
 
     def get_hyperedge(self, hyperedge_id):
-        return self.hyperedges.get(hyperedge_id)
+        return self.edges.get(hyperedge_id)
 
-    def __repr__(self):
-        return f"Hypergraph(nodes={len(self.nodes)}, hyperedges={len(self.hyperedges)})"
+    @classmethod
+    def from_dict(cls, data):
+        # Rebuilds adapter elements (the core registry maps types to the typed core classes)
+        graph = cls(graph_id=data.get("id"), name=data.get("name", "Hypergraph"))
+        for node_data in data.get("nodes", []):
+            graph._index_node(Node.from_dict(node_data))
+        for edge_data in data.get("edges", []):
+            graph._index_edge(Hyperedge.from_dict(edge_data))
+        return graph
 
+    def __repr__(self):
+        return f"Hypergraph(nodes={len(self.nodes)}, hyperedges={len(self.edges)})"
 
+    __str__ = __repr__
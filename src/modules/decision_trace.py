@@ -0,0 +1,107 @@
+from collections import namedtuple
+
+# Same numeric values as the stdlib logging levels
+DEBUG = 10
+INFO = 20
+WARNING = 30
+LEVEL_NAMES = {DEBUG: "DEBUG", INFO: "INFO", WARNING: "WARNING"}
+
+TraceEntry = namedtuple("TraceEntry", ["tick", "level", "step", "message", "data"])
+
+
+class DecisionTrace:
+    # Structured per-agent trace of the Expanded Human Act, backed by a preallocated
+    # ring buffer (the "Decision Log" panel reads from it). Messages are %-formatted
+    # lazily on read, and a disabled trace or a filtered level returns before storing.
+    def __init__(self, capacity=256, level=INFO, enabled=True, echo=False):
+        if capacity < 1:
+            raise ValueError("Trace capacity must be at least 1.")
+        self.capacity = capacity
+        self.level = level
+        self.enabled = enabled
+        # Also print each stored entry (for interactive debugging)
+        self.echo = echo
+        self.tick = None
+        self._ticks = [None] * capacity
+        self._levels = [0] * capacity
+        self._steps = [0] * capacity
+        self._messages = [None] * capacity
+        self._args = [None] * capacity
+        self._data = [None] * capacity
+        self._next = 0
+        self._count = 0
+        self._last_act = None
+        self.dropped = 0
+
+    def __len__(self):
+        return self._count
+
+    def enabled_for(self, level):
+        return self.enabled and level >= self.level
+
+    def begin(self, tick=None, message="Act started", *args):
+        # Marks the start of a decision; latest_decision() returns entries from here on
+        self.tick = tick
+        if self.enabled:
+            self._last_act = self._store(INFO, 0, message, args, None)
+
+    def record(self, level, step, message, *args, data=None):
+        if not self.enabled or level < self.level:
+            return
+        self._store(level, step, message, args, data)
+
+    def _store(self, level, step, message, args, data):
+        slot = self._next
+        self._ticks[slot] = self.tick
+        self._levels[slot] = level
+        self._steps[slot] = step
+        self._messages[slot] = message
+        self._args[slot] = args
+        self._data[slot] = data
+        self._next = (slot + 1) % self.capacity
+        if self._count < self.capacity:
+            self._count += 1
+        else:
+            self.dropped += 1
+            if self._last_act == slot:
+                self._last_act = None
+        if self.echo:
+            print(f"  [{LEVEL_NAMES.get(level, level)}] Step {step}: {self._format(slot)}")
+        return slot
+
+    def _format(self, slot):
+        message, args = self._messages[slot], self._args[slot]
+        return message % args if args else message
+
+    def _slots(self, start=None):
+        # Slots from oldest (or from `start`) to newest
+        first = (self._next - self._count) % self.capacity
+        offset = 0 if start is None else (start - first) % self.capacity
+        for i in range(offset, self._count):
+            yield (first + i) % self.capacity
+
+    def _entry(self, slot):
+        return TraceEntry(self._ticks[slot], self._levels[slot], self._steps[slot],
+                          self._format(slot), self._data[slot])
+
+    def entries(self, min_level=None):
+        return [self._entry(slot) for slot in self._slots()
+                if min_level is None or self._levels[slot] >= min_level]
+
+    def last(self, n):
+        entries = self.entries()
+        return entries[-n:] if n > 0 else []
+
+    def latest_decision(self):
+        if self._last_act is None:
+            return []
+        return [self._entry(slot) for slot in self._slots(self._last_act)]
+
+    def clear(self):
+        self._next = 0
+        self._count = 0
+        self._last_act = None
+        self.dropped = 0
+        for buffer in (self._messages, self._args, self._data):
+            for i in range(self.capacity):
+                buffer[i] = None
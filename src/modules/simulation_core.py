@@ -1,14 +1,28 @@
+from .decision_trace import DEBUG
+
+
 class SimulationCore:
-    def __init__(self):
+    def __init__(self, trace=None):
         self.agents = []
+        # Optional DecisionTrace for tick-level events; None skips tracing
+        self.trace = trace
+        # World-level systems (e.g. src.narrative.NarrativeDirector), updated before the agents
+        self.systems = []
         self.current_tick = 0
 
     def register_agent(self, agent):
         self.agents.append(agent)
 
+    def register_system(self, system):
+        self.systems.append(system)
+
     def tick(self):
         self.current_tick += 1
-        print(f"Simulation Tick: {self.current_tick}")
+        if self.trace is not None:
+            self.trace.tick = self.current_tick
+            self.trace.record(DEBUG, 0, "Simulation Tick: %d", self.current_tick)
+        for system in self.systems:
+            system.update(self.current_tick)
         for agent in self.agents:
             agent.update(self.current_tick)
 
@@ -0,0 +1,476 @@
+"""
+Módulo que implementa o Módulo Narrativo (Narrative Director) com um
+planejador HTN (Hierarchical Task Network).
+
+Tarefas primitivas têm pré-condições e efeitos sobre fatos (pares nome ->
+valor); tarefas compostas são decompostas pelo primeiro método aplicável.
+As decomposições são memorizadas por (arquétipo, tarefa, assinatura), onde
+a assinatura contém apenas os valores dos fatos lidos durante a
+decomposição. Assim, agentes do mesmo arquétipo com a mesma tarefa
+compartilham o plano enquanto os fatos de que ele depende forem iguais.
+
+O diretor mantém um índice fato -> agentes cujo plano depende do fato:
+alterar um fato do mundo marca para replanejamento apenas esses agentes.
+"""
+
+from typing import Dict, List, Any, Optional, Tuple, Mapping, Set, Sequence, TYPE_CHECKING
+from collections import ChainMap
+
+if TYPE_CHECKING:
+    from src.modules.simulation_core import SimulationCore
+
+Plan = Tuple[str, ...]
+Signature = Tuple[Tuple[str, Any], ...]
+
+
+class PrimitiveTask:
+    """
+    Tarefa executável diretamente por um agente.
+    """
+
+    def __init__(self, name: str, preconditions: Optional[Dict[str, Any]] = None,
+                 effects: Optional[Dict[str, Any]] = None):
+        """
+        Inicializa uma tarefa primitiva.
+
+        Args:
+            name: Nome da tarefa (ex: "Colher").
+            preconditions: Fatos exigidos (nome -> valor).
+            effects: Fatos alterados pela execução (nome -> valor).
+        """
+        self.name = name
+        self.preconditions = preconditions or {}
+        self.effects = effects or {}
+
+
+class Method:
+    """
+    Modo de decompor uma tarefa composta em subtarefas.
+    """
+
+    def __init__(self, name: str, subtasks: Sequence[str],
+                 preconditions: Optional[Dict[str, Any]] = None,
+                 archetypes: Optional[Sequence[str]] = None):
+        """
+        Inicializa um método.
+
+        Args:
+            name: Nome do método.
+            subtasks: Nomes das subtarefas, em ordem.
+            preconditions: Fatos exigidos (nome -> valor).
+            archetypes: Arquétipos que podem usar o método (None para todos).
+        """
+        self.name = name
+        self.subtasks = tuple(subtasks)
+        self.preconditions = preconditions or {}
+        self.archetypes = frozenset(archetypes) if archetypes is not None else None
+
+
+class CompoundTask:
+    """
+    Tarefa de alto nível (um "loop" narrativo), com métodos em ordem de preferência.
+    """
+
+    def __init__(self, name: str, methods: Sequence[Method]):
+        """
+        Inicializa uma tarefa composta.
+
+        Args:
+            name: Nome da tarefa (ex: "Trabalhar na fazenda").
+            methods: Métodos de decomposição, do preferido ao último recurso.
+        """
+        self.name = name
+        self.methods = list(methods)
+
+
+class HTNDomain:
+    """
+    Biblioteca de tarefas primitivas e compostas.
+    """
+
+    def __init__(self):
+        self.tasks: Dict[str, Any] = {}
+
+    def add_primitive(self, name: str, preconditions: Optional[Dict[str, Any]] = None,
+                      effects: Optional[Dict[str, Any]] = None) -> PrimitiveTask:
+        """
+        Adiciona uma tarefa primitiva.
+
+        Args:
+            name: Nome da tarefa.
+            preconditions: Fatos exigidos.
+            effects: Fatos alterados.
+
+        Returns:
+            A tarefa criada.
+        """
+        task = PrimitiveTask(name, preconditions, effects)
+        self.tasks[name] = task
+        return task
+
+    def add_compound(self, name: str, methods: Sequence[Method]) -> CompoundTask:
+        """
+        Adiciona uma tarefa composta.
+
+        Args:
+            name: Nome da tarefa.
+            methods: Métodos de decomposição.
+
+        Returns:
+            A tarefa criada.
+        """
+        task = CompoundTask(name, methods)
+        self.tasks[name] = task
+        return task
+
+
+class _TrackedState:
+    """
+    Estado simulado durante a decomposição, que registra os fatos do estado
+    inicial lidos (os fatos escritos por efeitos anteriores não contam).
+    """
+
+    __slots__ = ("state", "written", "reads")
+
+    def __init__(self, state: Mapping[str, Any]):
+        self.state = state
+        self.written: Dict[str, Any] = {}
+        self.reads: Dict[str, Any] = {}
+
+    def holds(self, conditions: Dict[str, Any]) -> bool:
+        for fact, expected in conditions.items():
+            if fact in self.written:
+                value = self.written[fact]
+            else:
+                value = self.state.get(fact)
+                self.reads[fact] = value
+            if value != expected:
+                return False
+        return True
+
+
+class HTNPlanner:
+    """
+    Planejador HTN de ordem total com decomposições memorizadas.
+    """
+
+    def __init__(self, domain: HTNDomain, max_depth: int = 64):
+        """
+        Inicializa o planejador.
+
+        Args:
+            domain: Biblioteca de tarefas.
+            max_depth: Profundidade máxima de decomposição.
+        """
+        self.domain = domain
+        self.max_depth = max_depth
+        # (arquétipo, tarefa) -> fatos lidos -> valores -> plano (None se não houver plano)
+        self._cache: Dict[Tuple[Optional[str], str], Dict[Tuple[str, ...], Dict[tuple, Optional[Plan]]]] = {}
+        # Fato -> chaves do cache cujas entradas dependem dele
+        self._fact_index: Dict[str, Set[Tuple[Optional[str], str]]] = {}
+        self.hits = 0
+        self.misses = 0
+
+    def __len__(self) -> int:
+        return sum(len(entries) for variants in self._cache.values() for entries in variants.values())
+
+    def plan(self, task: str, state: Mapping[str, Any],
+             archetype: Optional[str] = None) -> Tuple[Optional[Plan], Signature]:
+        """
+        Obtém o plano de uma tarefa, reutilizando uma decomposição memorizada
+        se os fatos de que ela depende tiverem os mesmos valores.
+
+        Args:
+            task: Nome da tarefa.
+            state: Fatos visíveis ao agente (nome -> valor).
+            archetype: Arquétipo do agente.
+
+        Returns:
+            Par (plano ou None se a tarefa não puder ser decomposta, assinatura
+            com os fatos de que o plano depende).
+        """
+        key = (archetype, task)
+        variants = self._cache.get(key)
+        if variants:
+            for facts, entries in variants.items():
+                values = tuple(state.get(fact) for fact in facts)
+                if values in entries:
+                    self.hits += 1
+                    return entries[values], tuple(zip(facts, values))
+
+        self.misses += 1
+        tracked = _TrackedState(state)
+        steps: List[str] = []
+        found = self._decompose(task, tracked, archetype, steps, 0)
+        plan = tuple(steps) if found else None
+        facts = tuple(sorted(tracked.reads))
+        values = tuple(tracked.reads[fact] for fact in facts)
+        self._cache.setdefault(key, {}).setdefault(facts, {})[values] = plan
+        for fact in facts:
+            self._fact_index.setdefault(fact, set()).add(key)
+        return plan, tuple(zip(facts, values))
+
+    def _decompose(self, task_name: str, tracked: _TrackedState, archetype: Optional[str],
+                   steps: List[str], depth: int) -> bool:
+        """
+        Decompõe uma tarefa em primitivas, com retrocesso entre os métodos.
+        """
+        if depth > self.max_depth:
+            return False
+        task = self.domain.tasks.get(task_name)
+        if task is None:
+            raise ValueError(f"Tarefa desconhecida: {task_name}")
+        if isinstance(task, PrimitiveTask):
+            if not tracked.holds(task.preconditions):
+                return False
+            tracked.written.update(task.effects)
+            steps.append(task.name)
+            return True
+
+        for method in task.methods:
+            if method.archetypes is not None and archetype not in method.archetypes:
+                continue
+            if not tracked.holds(method.preconditions):
+                continue
+            mark = len(steps)
+            written = dict(tracked.written)
+            if all(self._decompose(subtask, tracked, archetype, steps, depth + 1)
+                   for subtask in method.subtasks):
+                return True
+            del steps[mark:]
+            tracked.written = written
+        return False
+
+    def invalidate_fact(self, fact: str, value: Any) -> int:
+        """
+        Descarta as decomposições que dependem de um fato com valor diferente do novo.
+
+        Args:
+            fact: Nome do fato alterado.
+            value: Novo valor do fato.
+
+        Returns:
+            Número de entradas descartadas.
+        """
+        dropped = 0
+        for key in self._fact_index.pop(fact, ()):
+            variants = self._cache.get(key)
+            if not variants:
+                continue
+            keep_key = False
+            for facts in list(variants):
+                if fact not in facts:
+                    continue
+                position = facts.index(fact)
+                entries = variants[facts]
+                for values in [values for values in entries if values[position] != value]:
+                    del entries[values]
+                    dropped += 1
+                if entries:
+                    keep_key = True
+                else:
+                    del variants[facts]
+            if not variants:
+                del self._cache[key]
+            elif keep_key:
+                self._fact_index.setdefault(fact, set()).add(key)
+        return dropped
+
+    def clear(self) -> None:
+        """
+        Descarta todas as decomposições memorizadas.
+        """
+        self._cache.clear()
+        self._fact_index.clear()
+
+
+class NarrativeDirector:
+    """
+    Diretor narrativo: atribui tarefas de alto nível aos agentes e mantém os
+    seus planos atualizados quando os fatos mudam.
+    """
+
+    def __init__(self, domain: HTNDomain, simulation_core: Optional['SimulationCore'] = None,
+                 planner: Optional[HTNPlanner] = None):
+        """
+        Inicializa o diretor.
+
+        Args:
+            domain: Biblioteca de tarefas.
+            simulation_core: Núcleo da simulação; se fornecido, o diretor é
+                atualizado a cada tick, antes dos agentes.
+            planner: Planejador (um novo é criado se não fornecido).
+        """
+        self.planner = planner or HTNPlanner(domain)
+        self.world_facts: Dict[str, Any] = {}
+        self._agent_facts: Dict[str, Dict[str, Any]] = {}
+        self._assignments: Dict[str, Tuple[str, Optional[str]]] = {}
+        self._plans: Dict[str, Optional[Plan]] = {}
+        self._progress: Dict[str, int] = {}
+        self._dependencies: Dict[str, Tuple[str, ...]] = {}
+        # Fato do mundo -> agentes cujo plano depende dele
+        self._dependents: Dict[str, Set[str]] = {}
+        self._dirty: Set[str] = set()
+        self.replans = 0
+        if simulation_core is not None:
+            simulation_core.register_system(self)
+
+    def _state(self, agent_id: str) -> Mapping[str, Any]:
+        return ChainMap(self._agent_facts.get(agent_id, {}), self.world_facts)
+
+    def assign(self, agent_id: str, task: str, archetype: Optional[str] = None,
+               facts: Optional[Dict[str, Any]] = None) -> Optional[Plan]:
+        """
+        Atribui uma tarefa de alto nível a um agente e planeja imediatamente.
+
+        Args:
+            agent_id: ID do agente.
+            task: Nome da tarefa.
+            archetype: Arquétipo do agente (agentes do mesmo arquétipo compartilham planos).
+            facts: Fatos próprios do agente, que têm precedência sobre os do mundo.
+
+        Returns:
+            O plano, ou None se a tarefa não puder ser decomposta.
+        """
+        self._assignments[agent_id] = (task, archetype)
+        if facts is not None:
+            self._agent_facts[agent_id] = dict(facts)
+        return self._replan(agent_id)
+
+    def unassign(self, agent_id: str) -> None:
+        """
+        Retira a tarefa de um agente.
+
+        Args:
+            agent_id: ID do agente.
+        """
+        self._assignments.pop(agent_id, None)
+        self._agent_facts.pop(agent_id, None)
+        self._plans.pop(agent_id, None)
+        self._progress.pop(agent_id, None)
+        self._dirty.discard(agent_id)
+        self._set_dependencies(agent_id, ())
+
+    def _set_dependencies(self, agent_id: str, facts: Tuple[str, ...]) -> None:
+        """
+        Atualiza o índice fato -> agentes com as dependências do novo plano.
+        """
+        for fact in self._dependencies.pop(agent_id, ()):
+            agents = self._dependents.get(fact)
+            if agents is not None:
+                agents.discard(agent_id)
+                if not agents:
+                    del self._dependents[fact]
+        if facts:
+            self._dependencies[agent_id] = facts
+            for fact in facts:
+                self._dependents.setdefault(fact, set()).add(agent_id)
+
+    def _replan(self, agent_id: str) -> Optional[Plan]:
+        """
+        Recalcula o plano de um agente (normalmente um acerto no cache).
+        """
+        task, archetype = self._assignments[agent_id]
+        plan, signature = self.planner.plan(task, self._state(agent_id), archetype)
+        self._plans[agent_id] = plan
+        self._progress[agent_id] = 0
+        self._set_dependencies(agent_id, tuple(fact for fact, _ in signature))
+        self._dirty.discard(agent_id)
+        self.replans += 1
+        return plan
+
+    def set_world_fact(self, fact: str, value: Any) -> None:
+        """
+        Altera um fato do mundo, marcando para replanejamento apenas os agentes
+        cujo plano depende dele.
+
+        Args:
+            fact: Nome do fato.
+            value: Novo valor.
+        """
+        if fact in self.world_facts and self.world_facts[fact] == value:
+            return
+        self.world_facts[fact] = value
+        self.planner.invalidate_fact(fact, value)
+        for agent_id in self._dependents.get(fact, ()):
+            if fact not in self._agent_facts.get(agent_id, {}):
+                self._dirty.add(agent_id)
+
+    def set_agent_fact(self, agent_id: str, fact: str, value: Any) -> None:
+        """
+        Altera um fato próprio de um agente.
+
+        Args:
+            agent_id: ID do agente.
+            fact: Nome do fato.
+            value: Novo valor.
+        """
+        facts = self._agent_facts.setdefault(agent_id, {})
+        if fact in facts and facts[fact] == value:
+            return
+        facts[fact] = value
+        if fact in self._dependencies.get(agent_id, ()):
+            self._dirty.add(agent_id)
+
+    def update(self, current_tick: int) -> int:
+        """
+        Replaneja os agentes afetados por fatos alterados desde o último tick.
+
+        Args:
+            current_tick: Tick atual da simulação.
+
+        Returns:
+            Número de agentes replanejados.
+        """
+        dirty = [agent_id for agent_id in self._dirty if agent_id in self._assignments]
+        for agent_id in dirty:
+            self._replan(agent_id)
+        self._dirty.clear()
+        return len(dirty)
+
+    def get_plan(self, agent_id: str) -> Optional[Plan]:
+        """
+        Obtém o plano atual de um agente.
+
+        Args:
+            agent_id: ID do agente.
+
+        Returns:
+            Tupla com os nomes das tarefas primitivas, ou None.
+        """
+        return self._plans.get(agent_id)
+
+    def next_task(self, agent_id: str) -> Optional[str]:
+        """
+        Obtém a próxima tarefa primitiva do plano de um agente.
+
+        Args:
+            agent_id: ID do agente.
+
+        Returns:
+            Nome da tarefa, ou None se o plano acabou ou não existe.
+        """
+        plan = self._plans.get(agent_id)
+        if not plan:
+            return None
+        step = self._progress.get(agent_id, 0)
+        return plan[step] if step < len(plan) else None
+
+    def complete_task(self, agent_id: str) -> Optional[str]:
+        """
+        Marca a tarefa atual de um agente como concluída, aplicando os seus
+        efeitos aos fatos próprios do agente.
+
+        Args:
+            agent_id: ID do agente.
+
+        Returns:
+            Nome da próxima tarefa, ou None se o plano acabou.
+        """
+        task_name = self.next_task(agent_id)
+        if task_name is None:
+            return None
+        self._progress[agent_id] += 1
+        facts = self._agent_facts.setdefault(agent_id, {})
+        facts.update(self.planner.domain.tasks[task_name].effects)
+        return self.next_task(agent_id)
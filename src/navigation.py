@@ -0,0 +1,294 @@
+"""
+Módulo que implementa a navegação entre os locais do mundo.
+
+Os locais (caixas alinhadas aos eixos, como em `Location.contains`) formam um
+grafo: dois locais são adjacentes se as suas áreas compartilham uma face ou se
+sobrepõem (ou ficam a no máximo `margin` de distância). A passagem entre eles (portal)
+é o centro da região de contato.
+
+As rotas de todos os pares são pré-calculadas de uma vez (Floyd-Warshall
+vetorizado com NumPy), guardando a distância e o próximo salto de cada par;
+uma rota é então lida seguindo os próximos saltos. As rotas lidas ficam em
+um cache LRU. Tudo é recalculado, de forma preguiçosa, quando os locais do
+mundo mudam (`WorldModule.locations_version`) ou quando uma passagem é
+bloqueada ou desbloqueada.
+"""
+
+from typing import Dict, List, Any, Optional, Sequence, Tuple, Set, FrozenSet
+from collections import OrderedDict
+
+import numpy as np
+
+from src.world import WorldModule, Location
+
+Position = Dict[str, float]
+
+
+def _box(location: Location) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Limites (mínimo, máximo) da área de um local.
+    """
+    center = np.array([location.position["x"], location.position["y"], location.position["z"]])
+    half = np.array([location.area["width"], location.area["height"], location.area["depth"]]) / 2
+    return center - half, center + half
+
+
+def _as_position(point: np.ndarray) -> Position:
+    return {"x": float(point[0]), "y": float(point[1]), "z": float(point[2])}
+
+
+class NavigationGraph:
+    """
+    Grafo de adjacência dos locais com rotas pré-calculadas para todos os pares.
+    """
+
+    def __init__(self, world: WorldModule, margin: float = 0.0, cache_size: int = 4096):
+        """
+        Inicializa a navegação (as rotas são calculadas na primeira consulta).
+
+        Args:
+            world: Mundo cujos locais são navegados.
+            margin: Distância máxima entre duas áreas para considerá-las ligadas.
+            cache_size: Número máximo de rotas no cache.
+        """
+        self.world = world
+        self.margin = margin
+        self.cache_size = cache_size
+        self._blocked: Set[FrozenSet[str]] = set()
+        self._built_version: Optional[int] = None
+        self._ids: List[str] = []
+        self._index: Dict[str, int] = {}
+        self._mins = np.zeros((0, 3))
+        self._maxs = np.zeros((0, 3))
+        self._portals: Dict[Tuple[int, int], Position] = {}
+        self._distances = np.zeros((0, 0))
+        self._next = np.zeros((0, 0), dtype=np.int64)
+        self._routes: "OrderedDict[Tuple[str, str], Optional[Tuple[str, ...]]]" = OrderedDict()
+        self.builds = 0
+        self.cache_hits = 0
+        self.cache_misses = 0
+
+    def invalidate(self) -> None:
+        """
+        Descarta as rotas; elas são recalculadas na próxima consulta.
+        """
+        self._built_version = None
+        self._routes.clear()
+
+    def block(self, location_a: str, location_b: str) -> None:
+        """
+        Bloqueia a passagem entre dois locais (ex: uma porta fechada).
+
+        Args:
+            location_a: ID de um local.
+            location_b: ID do outro local.
+        """
+        self._blocked.add(frozenset((location_a, location_b)))
+        self.invalidate()
+
+    def unblock(self, location_a: str, location_b: str) -> None:
+        """
+        Desbloqueia a passagem entre dois locais.
+
+        Args:
+            location_a: ID de um local.
+            location_b: ID do outro local.
+        """
+        self._blocked.discard(frozenset((location_a, location_b)))
+        self.invalidate()
+
+    def _ensure_built(self) -> None:
+        if self._built_version != self.world.locations_version:
+            self._build()
+
+    def _build(self) -> None:
+        """
+        Monta o grafo de adjacência e calcula as rotas de todos os pares.
+        """
+        locations = list(self.world.locations.values())
+        count = len(locations)
+        self._ids = [location.id for location in locations]
+        self._index = {location_id: i for i, location_id in enumerate(self._ids)}
+        boxes = [_box(location) for location in locations]
+        self._mins = np.array([low for low, _ in boxes]).reshape(count, 3)
+        self._maxs = np.array([high for _, high in boxes]).reshape(count, 3)
+
+        # Adjacência: as caixas (ampliadas pela margem) se intersectam em todos os eixos
+        # e o contato é uma face (extensão positiva em pelo menos dois eixos), não uma quina
+        low = np.maximum(self._mins[:, None, :], self._mins[None, :, :])
+        high = np.minimum(self._maxs[:, None, :], self._maxs[None, :, :])
+        adjacent = (np.all(low <= high + self.margin, axis=2) &
+                    (np.count_nonzero(high > low, axis=2) >= 2))
+        np.fill_diagonal(adjacent, False)
+        for pair in self._blocked:
+            a, b = (self._index.get(location_id) for location_id in pair)
+            if a is not None and b is not None:
+                adjacent[a, b] = adjacent[b, a] = False
+
+        centers = (self._mins + self._maxs) / 2
+        gaps = np.linalg.norm(centers[:, None, :] - centers[None, :, :], axis=2)
+        distances = np.where(adjacent, gaps, np.inf)
+        np.fill_diagonal(distances, 0.0)
+        next_hop = np.where(adjacent, np.arange(count)[None, :], -1)
+        np.fill_diagonal(next_hop, np.arange(count))
+
+        # Floyd-Warshall: uma passada vetorizada por nó intermediário
+        for k in range(count):
+            through = distances[:, k, None] + distances[None, k, :]
+            shorter = through < distances
+            distances = np.where(shorter, through, distances)
+            next_hop = np.where(shorter, next_hop[:, k, None], next_hop)
+
+        self._distances = distances
+        self._next = next_hop
+        self._portals = {}
+        for a, b in zip(*np.nonzero(adjacent)):
+            self._portals[(int(a), int(b))] = _as_position((low[a, b] + high[a, b]) / 2)
+        self._routes.clear()
+        self._built_version = self.world.locations_version
+        self.builds += 1
+
+    def neighbors(self, location_id: str) -> List[str]:
+        """
+        Obtém os locais ligados diretamente a um local.
+
+        Args:
+            location_id: ID do local.
+
+        Returns:
+            Lista de IDs.
+        """
+        self._ensure_built()
+        i = self._index.get(location_id)
+        if i is None:
+            return []
+        return [self._ids[b] for a, b in self._portals if a == i]
+
+    def distance(self, from_location: str, to_location: str) -> float:
+        """
+        Obtém o comprimento da melhor rota entre dois locais.
+
+        Args:
+            from_location: ID do local de origem.
+            to_location: ID do local de destino.
+
+        Returns:
+            A distância (inf se não houver rota).
+        """
+        self._ensure_built()
+        a, b = self._index.get(from_location), self._index.get(to_location)
+        if a is None or b is None:
+            return float("inf")
+        return float(self._distances[a, b])
+
+    def route(self, from_location: str, to_location: str) -> Optional[List[str]]:
+        """
+        Obtém a sequência de locais da melhor rota (incluindo origem e destino).
+
+        Args:
+            from_location: ID do local de origem.
+            to_location: ID do local de destino.
+
+        Returns:
+            Lista de IDs, ou None se não houver rota.
+        """
+        self._ensure_built()
+        key = (from_location, to_location)
+        if key in self._routes:
+            self.cache_hits += 1
+            self._routes.move_to_end(key)
+            route = self._routes[key]
+            return list(route) if route is not None else None
+        self.cache_misses += 1
+
+        a, b = self._index.get(from_location), self._index.get(to_location)
+        route = None
+        if a is not None and b is not None and self._next[a, b] >= 0:
+            hops = [a]
+            while hops[-1] != b:
+                hops.append(int(self._next[hops[-1], b]))
+            route = tuple(self._ids[i] for i in hops)
+        self._routes[key] = route
+        if len(self._routes) > self.cache_size:
+            self._routes.popitem(last=False)
+        return list(route) if route is not None else None
+
+    def locate(self, positions: Sequence[Position]) -> List[Optional[str]]:
+        """
+        Obtém o local de várias posições de uma vez (o primeiro que as contém,
+        na mesma ordem de `WorldModule.get_location_of_entity`).
+
+        Args:
+            positions: Posições.
+
+        Returns:
+            Lista de IDs de locais (None para posições fora de todos os locais).
+        """
+        self._ensure_built()
+        if not positions or not self._ids:
+            return [None] * len(positions)
+        points = np.array([[p["x"], p["y"], p["z"]] for p in positions])
+        inside = np.all((points[:, None, :] >= self._mins[None]) &
+                        (points[:, None, :] <= self._maxs[None]), axis=2)
+        first = inside.argmax(axis=1)
+        found = inside[np.arange(len(points)), first]
+        return [self._ids[i] if ok else None for i, ok in zip(first, found)]
+
+    def _waypoints(self, start: Position, goal: Position,
+                   start_location: Optional[str], goal_location: Optional[str]) -> Optional[List[Position]]:
+        if start_location is None or goal_location is None:
+            # Fora dos locais: terreno aberto, linha reta
+            return [start, goal]
+        route = self.route(start_location, goal_location)
+        if route is None:
+            return None
+        index = self._index
+        portals = [self._portals[(index[a], index[b])] for a, b in zip(route, route[1:])]
+        return [start] + portals + [goal]
+
+    def path(self, start: Position, goal: Position) -> Optional[List[Position]]:
+        """
+        Obtém os pontos de passagem de uma posição a outra.
+
+        Args:
+            start: Posição inicial.
+            goal: Posição de destino.
+
+        Returns:
+            Lista de posições (início, portais, destino), ou None se os dois
+            pontos estiverem em locais sem rota entre si.
+        """
+        start_location, goal_location = self.locate([start, goal])
+        return self._waypoints(start, goal, start_location, goal_location)
+
+    def plan_paths(self, requests: Sequence[Tuple[str, Position]]) -> Dict[str, Optional[List[Position]]]:
+        """
+        Calcula os caminhos de muitos agentes de uma vez: todas as posições são
+        localizadas em uma única operação e cada par de locais é roteado uma vez.
+
+        Args:
+            requests: Pares (ID do agente, posição de destino).
+
+        Returns:
+            Dicionário ID do agente -> pontos de passagem (ou None sem rota).
+            Agentes que não existem no mundo são omitidos.
+        """
+        entities = self.world.entities
+        known = [(agent_id, goal) for agent_id, goal in requests if agent_id in entities]
+        starts = [entities[agent_id].position for agent_id, _ in known]
+        located = self.locate(starts + [goal for _, goal in known])
+        count = len(known)
+        return {agent_id: self._waypoints(start, goal, located[i], located[count + i])
+                for i, ((agent_id, goal), start) in enumerate(zip(known, starts))}
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Obtém as contagens da navegação.
+
+        Returns:
+            Dicionário com locais, passagens, recálculos e uso do cache.
+        """
+        self._ensure_built()
+        return {"locations": len(self._ids), "portals": len(self._portals) // 2,
+                "builds": self.builds, "cached_routes": len(self._routes),
+                "cache_hits": self.cache_hits, "cache_misses": self.cache_misses}
@@ -3,14 +3,17 @@ Módulo que implementa os tipos específicos de nós para o hiper-grafo de perso
 """
 
 from typing import Dict, List, Any, Optional, Union
-from src.hypergraph import Node
+from src.hypergraph import Node, register_node_type
 
 
+@register_node_type("Personality")
 class PersonalityNode(Node):
     """
     Representa um traço de personalidade do modelo FFM/HEXACO.
     """
     
+    INDEXED_ATTRIBUTES = ("value",)
+    
     def __init__(self, node_id: Optional[str] = None, trait: str = "", value: float = 0.5):
         """
         Inicializa um nó de personalidade.
@@ -59,11 +62,14 @@ class PersonalityNode(Node):
         return f"PersonalityNode(id={self.id}, trait={self.trait}, value={self.value:.2f})"
 
 
+@register_node_type("Value")
 class ValueNode(Node):
     """
     Representa um valor do modelo de Schwartz/Scheler.
     """
     
+    INDEXED_ATTRIBUTES = ("priority",)
+    
     def __init__(self, node_id: Optional[str] = None, value_name: str = "", priority: float = 0.5):
         """
         Inicializa um nó de valor.
@@ -112,11 +118,14 @@ class ValueNode(Node):
         return f"ValueNode(id={self.id}, value_name={self.value_name}, priority={self.priority:.2f})"
 
 
+@register_node_type("Need")
 class NeedNode(Node):
     """
     Representa uma necessidade do modelo de Maslow/Bens Básicos.
     """
     
+    INDEXED_ATTRIBUTES = ("satisfaction",)
+    
     def __init__(self, node_id: Optional[str] = None, need_name: str = "", satisfaction: float = 0.5):
         """
         Inicializa um nó de necessidade.
@@ -165,11 +174,14 @@ class NeedNode(Node):
         return f"NeedNode(id={self.id}, need_name={self.need_name}, satisfaction={self.satisfaction:.2f})"
 
 
+@register_node_type("Habit")
 class HabitNode(Node):
     """
     Representa uma virtude ou vício (hábito).
     """
     
+    INDEXED_ATTRIBUTES = ("strength",)
+    
     def __init__(self, node_id: Optional[str] = None, habit_name: str = "", strength: float = 0.5):
         """
         Inicializa um nó de hábito.
@@ -218,12 +230,16 @@ class HabitNode(Node):
         return f"HabitNode(id={self.id}, habit_name={self.habit_name}, strength={self.strength:.2f})"
 
 
+@register_node_type("Belief")
 class BeliefNode(Node):
     """
     Representa uma crença formada sobre o mundo ou sobre si mesmo.
     """
     
-    def __init__(self, node_id: Optional[str] = None, content: str = "", confidence: float = 0.5):
+    INDEXED_ATTRIBUTES = ("confidence",)
+    
+    def __init__(self, node_id: Optional[str] = None, content: str = "", confidence: float = 0.5,
+                 embedding: Optional[List[float]] = None):
         """
         Inicializa um nó de crença.
         
@@ -231,10 +247,12 @@ class BeliefNode(Node):
             node_id: ID único do nó. Se não fornecido, um UUID será gerado.
             content: Conteúdo da crença (ex: "O mundo é perigoso").
             confidence: Nível de confiança na crença (entre 0 e 1).
+            embedding: Vetor de características do conteúdo (opcional, ver src.embeddings).
         """
         super().__init__(node_id=node_id, node_type="Belief")
         self.content = content
         self.confidence = max(0.0, min(1.0, confidence))  # Garante que a confiança esteja entre 0 e 1
+        self.embedding = embedding
         
     def to_dict(self) -> Dict[str, Any]:
         """
@@ -246,7 +264,8 @@ class BeliefNode(Node):
         data = super().to_dict()
         data.update({
             "content": self.content,
-            "confidence": self.confidence
+            "confidence": self.confidence,
+            "embedding": [float(x) for x in self.embedding] if self.embedding is not None else None
         })
         return data
     
@@ -264,7 +283,8 @@ class BeliefNode(Node):
         return cls(
             node_id=data.get("id"),
             content=data.get("content", ""),
-            confidence=data.get("confidence", 0.5)
+            confidence=data.get("confidence", 0.5),
+            embedding=data.get("embedding")
         )
     
     def __str__(self) -> str:
@@ -0,0 +1,374 @@
+"""
+Módulo que implementa hiper-grafos em camadas com cópia na escrita.
+
+Um OverlayHypergraph fica sobre um hiper-grafo base congelado (por exemplo,
+o template de um arquétipo compartilhado por milhares de personagens) e
+guarda apenas o que difere dele: os elementos adicionados, as cópias dos
+elementos alterados e o conjunto dos elementos da base que foram removidos
+(sombreados). As consultas combinam os índices da base com os locais.
+
+Elementos da base devem ser alterados por `update_node`/`update_edge`, que
+copiam o elemento para a camada local antes da escrita. Alterar um elemento
+da base diretamente (setattr) altera o template de todos os personagens.
+"""
+
+from typing import Dict, List, Any, Optional, Set, Iterator, Mapping, MutableMapping, Tuple
+from collections import defaultdict
+from heapq import merge
+from itertools import islice
+import copy
+
+from src.hypergraph import Hypergraph, Node, Hyperedge
+from src.indexes import SortedAttributeIndex
+
+
+_NO_KEYS = frozenset()
+
+
+class LayeredMapping(MutableMapping):
+    """
+    Dicionário em duas camadas: as chaves locais têm precedência e as chaves
+    da base podem ser escondidas sem alterar a base.
+
+    Visões derivadas (os baldes por tipo) compartilham o conjunto de chaves
+    escondidas do dicionário dono, criado só na primeira remoção.
+    """
+
+    __slots__ = ("base", "local", "_hidden", "_owner")
+
+    def __init__(self, base: Mapping, local: Optional[dict] = None,
+                 owner: Optional['LayeredMapping'] = None):
+        """
+        Inicializa o dicionário em camadas.
+
+        Args:
+            base: Dicionário da base (somente leitura).
+            local: Dicionário local.
+            owner: Dicionário cujo conjunto de chaves escondidas é usado (None para o próprio).
+        """
+        self.base = base
+        self.local = local if local is not None else {}
+        self._hidden: Optional[Set] = None
+        self._owner = owner
+
+    @property
+    def hidden(self) -> Set:
+        """Chaves da base escondidas (removidas ou substituídas localmente)."""
+        owner = self._owner or self
+        return owner._hidden if owner._hidden is not None else _NO_KEYS
+
+    def hide(self, key: Any) -> None:
+        """
+        Esconde uma chave da base.
+
+        Args:
+            key: Chave a ser escondida.
+        """
+        owner = self._owner or self
+        if owner._hidden is None:
+            owner._hidden = set()
+        owner._hidden.add(key)
+
+    def __getitem__(self, key: Any) -> Any:
+        local = self.local
+        if key in local:
+            return local[key]
+        if key in self.hidden:
+            raise KeyError(key)
+        return self.base[key]
+
+    def get(self, key: Any, default: Any = None) -> Any:
+        local = self.local
+        if key in local:
+            return local[key]
+        if key in self.hidden:
+            return default
+        return self.base.get(key, default)
+
+    def __contains__(self, key: Any) -> bool:
+        return key in self.local or (key in self.base and key not in self.hidden)
+
+    def __setitem__(self, key: Any, value: Any) -> None:
+        if key in self.base:
+            self.hide(key)
+        self.local[key] = value
+
+    def __delitem__(self, key: Any) -> None:
+        if key in self.local:
+            del self.local[key]
+            return
+        if key in self.base and key not in self.hidden:
+            self.hide(key)
+            return
+        raise KeyError(key)
+
+    def __iter__(self) -> Iterator[Any]:
+        yield from self.local
+        hidden = self.hidden
+        for key in self.base:
+            if key not in hidden:
+                yield key
+
+    def __len__(self) -> int:
+        base = self.base
+        hidden_in_base = sum(1 for key in self.hidden if key in base)
+        return len(self.local) + len(base) - hidden_in_base
+
+
+class LayeredBuckets:
+    """
+    Baldes por tipo em duas camadas (tipo -> LayeredMapping), usando as
+    chaves escondidas do dicionário principal.
+    """
+
+    __slots__ = ("base", "local", "owner")
+
+    def __init__(self, base: Mapping[str, Mapping], owner: LayeredMapping):
+        self.base = base
+        self.local: Dict[str, dict] = {}
+        self.owner = owner
+
+    def get(self, item_type: str, default: Any = None) -> Any:
+        base_bucket = self.base.get(item_type)
+        local_bucket = self.local.get(item_type)
+        if base_bucket is None:
+            return local_bucket if local_bucket is not None else default
+        if local_bucket is None:
+            local_bucket = self.local[item_type] = {}
+        return LayeredMapping(base_bucket, local_bucket, self.owner)
+
+    def __getitem__(self, item_type: str) -> Any:
+        bucket = self.get(item_type)
+        if bucket is None:
+            raise KeyError(item_type)
+        return bucket
+
+    def __setitem__(self, item_type: str, bucket: dict) -> None:
+        self.local[item_type] = bucket
+
+    def __contains__(self, item_type: str) -> bool:
+        return item_type in self.local or item_type in self.base
+
+
+class LayeredIncidence:
+    """
+    Índice de incidência em duas camadas: as hiper-arestas locais ficam em
+    listas locais e as da base são filtradas pelas hiper-arestas escondidas.
+    """
+
+    __slots__ = ("base", "local", "edges")
+
+    def __init__(self, base: Mapping[str, Set[str]], edges: LayeredMapping):
+        self.base = base
+        self.local: Dict[str, Set[str]] = defaultdict(set)
+        self.edges = edges
+
+    def __getitem__(self, node_id: str) -> Set[str]:
+        # Usado apenas para escrita (incidence[nó].add(aresta)): vai para a camada local
+        return self.local[node_id]
+
+    def get(self, node_id: str, default: Any = None) -> Any:
+        base_set = self.base.get(node_id)
+        local_set = self.local.get(node_id)
+        if base_set is None:
+            return local_set if local_set is not None else default
+        hidden = self.edges.hidden
+        merged = {edge_id for edge_id in base_set if edge_id not in hidden}
+        if local_set:
+            merged |= local_set
+        return merged if merged or default is None else default
+
+    def __contains__(self, node_id: str) -> bool:
+        return bool(self.get(node_id))
+
+
+class LayeredRangeIndex:
+    """
+    Visão somente leitura que combina o índice ordenado da base (sem os
+    elementos escondidos) com o índice local.
+    """
+
+    def __init__(self, base: Optional[SortedAttributeIndex], local: Optional[SortedAttributeIndex],
+                 hidden: Set[str]):
+        self.base = base
+        self.local = local
+        self.hidden = hidden
+
+    def __len__(self) -> int:
+        return sum(1 for _ in self.range())
+
+    def __contains__(self, item_id: str) -> bool:
+        return self.get(item_id) is not None
+
+    def get(self, item_id: str) -> Optional[float]:
+        if self.local is not None and item_id in self.local:
+            return self.local.get(item_id)
+        if self.base is None or item_id in self.hidden:
+            return None
+        return self.base.get(item_id)
+
+    def count_range(self, low: Optional[float] = None, high: Optional[float] = None,
+                    include_low: bool = True, include_high: bool = True) -> int:
+        """
+        Estima (por cima) o número de elementos no intervalo em O(log n).
+        """
+        return sum(index.count_range(low, high, include_low, include_high)
+                   for index in (self.base, self.local) if index is not None)
+
+    def range(self, low: Optional[float] = None, high: Optional[float] = None,
+              include_low: bool = True, include_high: bool = True,
+              descending: bool = False) -> Iterator[str]:
+        """
+        Percorre os IDs no intervalo, intercalando as duas camadas em ordem de valor.
+        """
+        hidden = self.hidden
+        streams = []
+        if self.base is not None:
+            base = self.base
+            streams.append(((base.get(item_id), item_id)
+                            for item_id in base.range(low, high, include_low, include_high, descending)
+                            if item_id not in hidden))
+        if self.local is not None:
+            local = self.local
+            streams.append(((local.get(item_id), item_id)
+                            for item_id in local.range(low, high, include_low, include_high, descending)))
+        for _, item_id in merge(*streams, reverse=descending):
+            yield item_id
+
+    def top_k(self, k: int) -> List[str]:
+        return list(islice(self.range(descending=True), max(0, k)))
+
+    def bottom_k(self, k: int) -> List[str]:
+        return list(islice(self.range(), max(0, k)))
+
+
+class OverlayHypergraph(Hypergraph):
+    """
+    Hiper-grafo com cópia na escrita sobre um hiper-grafo base congelado.
+    """
+
+    def __init__(self, base: Hypergraph, graph_id: Optional[str] = None, name: str = "Hypergraph"):
+        """
+        Inicializa uma camada vazia sobre a base.
+
+        Args:
+            base: Hiper-grafo base (não deve ser alterado depois disso).
+            graph_id: ID único do hiper-grafo. Se não fornecido, um UUID será gerado.
+            name: Nome do hiper-grafo.
+        """
+        super().__init__(graph_id=graph_id, name=name)
+        self.base = base
+        self.nodes = LayeredMapping(base.nodes)
+        self.edges = LayeredMapping(base.edges)
+        self._nodes_by_type = LayeredBuckets(base._nodes_by_type, self.nodes)
+        self._edges_by_type = LayeredBuckets(base._edges_by_type, self.edges)
+        self._incidence = LayeredIncidence(base._incidence, self.edges)
+
+    @property
+    def shadowed_nodes(self) -> Set[str]:
+        """IDs dos nós da base removidos ou substituídos localmente."""
+        return self.nodes.hidden
+
+    @property
+    def shadowed_edges(self) -> Set[str]:
+        """IDs das hiper-arestas da base removidas ou substituídas localmente."""
+        return self.edges.hidden
+
+    def local_size(self) -> Tuple[int, int]:
+        """
+        Conta os elementos guardados na camada local.
+
+        Returns:
+            Par (nós locais, hiper-arestas locais).
+        """
+        return len(self.nodes.local), len(self.edges.local)
+
+    def _remove_incidence(self, edge: Hyperedge) -> None:
+        """
+        Remove uma hiper-aresta das listas locais (as da base ficam escondidas).
+        """
+        local = self._incidence.local
+        for node_id in edge.nodes:
+            incident = local.get(node_id)
+            if incident is not None:
+                incident.discard(edge.id)
+                if not incident:
+                    del local[node_id]
+
+    def get_range_index(self, kind: str, item_type: str, attribute: str) -> Any:
+        """
+        Obtém o índice ordenado de um atributo, combinando a base e a camada local.
+
+        Args:
+            kind: "node" ou "edge".
+            item_type: Tipo dos elementos.
+            attribute: Nome do atributo.
+
+        Returns:
+            Uma visão combinada dos índices, ou None se o atributo não for indexado.
+        """
+        base = self.base.get_range_index(kind, item_type, attribute)
+        local = self._range_indexes.get((kind, item_type, attribute))
+        if base is None:
+            return local
+        hidden = self.edges.hidden if kind == "edge" else self.nodes.hidden
+        return LayeredRangeIndex(base, local, hidden)
+
+    def _copy_on_write(self, kind: str, item_id: str) -> Any:
+        """
+        Garante que o elemento esteja na camada local, copiando-o da base se preciso.
+
+        A cópia substitui o original nos índices locais sem gerar eventos de
+        inserção ou remoção: para os ouvintes é o mesmo elemento.
+        """
+        elements = self.edges if kind == "edge" else self.nodes
+        if item_id in elements.local or item_id not in elements:
+            return elements.get(item_id)
+        original = elements[item_id]
+        item = copy.copy(original)
+        if kind == "edge":
+            item.nodes = list(original.nodes)
+            for node_id in item.nodes:
+                self._incidence.local[node_id].add(item_id)
+        elements[item_id] = item
+        buckets = self._edges_by_type if kind == "edge" else self._nodes_by_type
+        buckets[item.type][item_id] = item
+        self._index_attributes(kind, item)
+        return item
+
+    def update_node(self, node_id: str, **attributes: Any) -> Node:
+        """
+        Altera atributos de um nó, copiando-o da base antes da escrita.
+
+        Args:
+            node_id: ID do nó.
+            **attributes: Atributos a serem alterados.
+
+        Returns:
+            O nó alterado (a cópia local, se o nó vinha da base).
+        """
+        self._copy_on_write("node", node_id)
+        return super().update_node(node_id, **attributes)
+
+    def update_edge(self, edge_id: str, **attributes: Any) -> Hyperedge:
+        """
+        Altera atributos de uma hiper-aresta, copiando-a da base antes da escrita.
+
+        Args:
+            edge_id: ID da hiper-aresta.
+            **attributes: Atributos a serem alterados.
+
+        Returns:
+            A hiper-aresta alterada (a cópia local, se ela vinha da base).
+        """
+        self._copy_on_write("edge", edge_id)
+        return super().update_edge(edge_id, **attributes)
+
+    def flatten(self) -> Hypergraph:
+        """
+        Cria um hiper-grafo independente com o conteúdo visível da camada.
+
+        Returns:
+            Um Hypergraph comum, sem ligação com a base.
+        """
+        return Hypergraph.from_dict(self.to_dict())
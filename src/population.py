@@ -0,0 +1,325 @@
+"""
+Módulo que implementa o registro de população.
+
+O registro espelha os escalares das psiques (valor dos traços, prioridade
+dos valores, satisfação das necessidades e força dos hábitos) em uma matriz
+densa agentes x atributos do NumPy, mantida em sincronia pelos ouvintes dos
+hiper-grafos. Consultas sobre a multidão ("todos com Extraversion > 0.7 e
+Belonging insatisfeito"), agregados e histogramas são então vetorizados.
+
+Atributos que um agente não possui ficam como NaN e nunca satisfazem uma
+condição.
+"""
+
+from typing import Dict, List, Any, Optional, Sequence, Tuple, Callable, TYPE_CHECKING
+
+import numpy as np
+
+from src.psyche import ARCHETYPE_SECTIONS
+from src.rules import OPERATORS
+
+if TYPE_CHECKING:
+    from src.psyche import PsycheModule
+
+# Tipo de nó -> (atributo do nome, atributo do nível)
+TRACKED_TYPES: Dict[str, Tuple[str, str]] = {
+    node_type: (name_attr, level_attr) for node_type, _, name_attr, level_attr in ARCHETYPE_SECTIONS
+}
+
+Condition = Tuple[str, str, str, float]
+
+
+class PopulationRegistry:
+    """
+    Matriz agentes x atributos com os escalares das psiques registradas.
+    """
+
+    def __init__(self, capacity: int = 64):
+        """
+        Inicializa um registro vazio.
+
+        Args:
+            capacity: Número inicial de linhas reservadas.
+        """
+        self.matrix = np.full((max(1, capacity), 8), np.nan)
+        self.agent_ids: List[str] = []
+        self._rows: Dict[str, int] = {}
+        self._columns: Dict[Tuple[str, str], int] = {}
+        self._listeners: Dict[str, Tuple['PsycheModule', Callable[[str, Any], None]]] = {}
+
+    def __len__(self) -> int:
+        return len(self.agent_ids)
+
+    def __contains__(self, agent_id: str) -> bool:
+        return agent_id in self._rows
+
+    @property
+    def columns(self) -> List[Tuple[str, str]]:
+        """Atributos espelhados, na ordem das colunas: pares (tipo, nome)."""
+        return sorted(self._columns, key=self._columns.get)
+
+    def _column(self, node_type: str, name: str, create: bool = False) -> Optional[int]:
+        """
+        Obtém a coluna de um atributo, criando-a se pedido.
+        """
+        key = (node_type, name)
+        column = self._columns.get(key)
+        if column is None and create:
+            column = len(self._columns)
+            if column == self.matrix.shape[1]:
+                extra = np.full((self.matrix.shape[0], self.matrix.shape[1]), np.nan)
+                self.matrix = np.hstack([self.matrix, extra])
+            self._columns[key] = column
+        return column
+
+    def column(self, node_type: str, name: str) -> Optional[int]:
+        """
+        Obtém a coluna da matriz de um atributo.
+
+        Args:
+            node_type: Tipo do nó (ex: "Value").
+            name: Nome do atributo (ex: "Security").
+
+        Returns:
+            O índice da coluna, ou None se nenhum agente tiver o atributo.
+        """
+        return self._columns.get((node_type, name))
+
+    def row(self, agent_id: str) -> Optional[int]:
+        """
+        Obtém a linha da matriz de um agente.
+
+        Args:
+            agent_id: ID do agente.
+
+        Returns:
+            O índice da linha, ou None se o agente não estiver registrado.
+        """
+        return self._rows.get(agent_id)
+
+    def psyche(self, agent_id: str) -> Optional['PsycheModule']:
+        """
+        Obtém a psique registrada de um agente.
+
+        Args:
+            agent_id: ID do agente.
+
+        Returns:
+            O PsycheModule, ou None se o agente não estiver registrado.
+        """
+        entry = self._listeners.get(agent_id)
+        return entry[0] if entry is not None else None
+
+    def _cell(self, node: Any) -> Optional[Tuple[int, float]]:
+        """
+        Obtém a coluna e o valor espelhados por um nó (None se o tipo não for acompanhado).
+        """
+        attrs = TRACKED_TYPES.get(node.type)
+        if attrs is None:
+            return None
+        name = getattr(node, attrs[0], None)
+        value = getattr(node, attrs[1], None)
+        if not name or value is None:
+            return None
+        return self._column(node.type, name, create=True), float(value)
+
+    def add_agent(self, agent_id: str, psyche_module: 'PsycheModule') -> int:
+        """
+        Registra um agente e passa a acompanhar as mutações da sua psique.
+
+        Args:
+            agent_id: ID do agente.
+            psyche_module: Psique do agente.
+
+        Returns:
+            A linha do agente na matriz.
+        """
+        if agent_id in self._rows:
+            raise ValueError(f"Agente {agent_id} já está registrado.")
+        row = len(self.agent_ids)
+        if row == self.matrix.shape[0]:
+            extra = np.full((self.matrix.shape[0], self.matrix.shape[1]), np.nan)
+            self.matrix = np.vstack([self.matrix, extra])
+        self.agent_ids.append(agent_id)
+        self._rows[agent_id] = row
+
+        graph = psyche_module.psyche
+        for node_type in TRACKED_TYPES:
+            for node in graph.get_nodes_by_type(node_type):
+                cell = self._cell(node)
+                if cell is not None:
+                    self.matrix[row, cell[0]] = cell[1]
+
+        def listener(event: str, item: Any) -> None:
+            if event.startswith("node_"):
+                self._on_node_event(agent_id, event, item)
+
+        graph.register_listener(listener)
+        self._listeners[agent_id] = (psyche_module, listener)
+        return row
+
+    def remove_agent(self, agent_id: str) -> None:
+        """
+        Retira um agente (a última linha ocupa o lugar da removida).
+
+        Args:
+            agent_id: ID do agente.
+        """
+        row = self._rows.pop(agent_id, None)
+        if row is None:
+            return
+        psyche_module, listener = self._listeners.pop(agent_id)
+        psyche_module.psyche.unregister_listener(listener)
+        last = len(self.agent_ids) - 1
+        if row != last:
+            moved = self.agent_ids[last]
+            self.agent_ids[row] = moved
+            self._rows[moved] = row
+            self.matrix[row] = self.matrix[last]
+        self.matrix[last] = np.nan
+        self.agent_ids.pop()
+
+    def _on_node_event(self, agent_id: str, event: str, node: Any) -> None:
+        """
+        Atualiza a célula espelhada por um nó.
+        """
+        cell = self._cell(node)
+        if cell is None:
+            return
+        row = self._rows[agent_id]
+        self.matrix[row, cell[0]] = np.nan if event == "node_removed" else cell[1]
+
+    def values(self, node_type: str, name: str) -> np.ndarray:
+        """
+        Obtém a coluna de um atributo para todos os agentes.
+
+        Args:
+            node_type: Tipo do nó (ex: "Personality").
+            name: Nome do atributo (ex: "Extraversion").
+
+        Returns:
+            Visão da coluna (NaN para agentes sem o atributo), na ordem de `agent_ids`.
+        """
+        column = self._column(node_type, name)
+        if column is None:
+            return np.full(len(self.agent_ids), np.nan)
+        return self.matrix[:len(self.agent_ids), column]
+
+    def get(self, agent_id: str, node_type: str, name: str) -> Optional[float]:
+        """
+        Obtém o valor espelhado de um atributo de um agente.
+
+        Args:
+            agent_id: ID do agente.
+            node_type: Tipo do nó.
+            name: Nome do atributo.
+
+        Returns:
+            O valor, ou None se o agente não tiver o atributo.
+        """
+        column = self._column(node_type, name)
+        row = self._rows.get(agent_id)
+        if column is None or row is None or np.isnan(self.matrix[row, column]):
+            return None
+        return float(self.matrix[row, column])
+
+    def mask(self, *conditions: Condition) -> np.ndarray:
+        """
+        Calcula a máscara dos agentes que satisfazem todas as condições.
+
+        Args:
+            *conditions: Tuplas (tipo, nome, operador, valor), como
+                ("Personality", "Extraversion", ">", 0.7).
+
+        Returns:
+            Vetor booleano na ordem de `agent_ids`.
+        """
+        result = np.ones(len(self.agent_ids), dtype=bool)
+        for node_type, name, operator, value in conditions:
+            compare = OPERATORS.get(operator)
+            if compare is None:
+                raise ValueError(f"Operador inválido: {operator}")
+            # NaN nunca satisfaz uma condição (nem !=)
+            column = self.values(node_type, name)
+            result &= compare(column, value) & ~np.isnan(column)
+        return result
+
+    def select(self, *conditions: Condition) -> List[str]:
+        """
+        Obtém os agentes que satisfazem todas as condições.
+
+        Args:
+            *conditions: Tuplas (tipo, nome, operador, valor).
+
+        Returns:
+            Lista de IDs dos agentes.
+        """
+        agent_ids = self.agent_ids
+        return [agent_ids[row] for row in np.flatnonzero(self.mask(*conditions))]
+
+    def count(self, *conditions: Condition) -> int:
+        """
+        Conta os agentes que satisfazem todas as condições.
+
+        Args:
+            *conditions: Tuplas (tipo, nome, operador, valor).
+
+        Returns:
+            Número de agentes.
+        """
+        return int(np.count_nonzero(self.mask(*conditions)))
+
+    def aggregate(self, node_type: str, name: str, function: str = "mean",
+                  conditions: Sequence[Condition] = ()) -> Optional[float]:
+        """
+        Calcula um agregado de um atributo, ignorando os agentes sem ele.
+
+        Args:
+            node_type: Tipo do nó.
+            name: Nome do atributo.
+            function: "mean", "median", "std", "min", "max" ou "sum".
+            conditions: Condições que restringem os agentes considerados.
+
+        Returns:
+            O agregado, ou None se nenhum agente tiver o atributo.
+        """
+        functions = {"mean": np.mean, "median": np.median, "std": np.std,
+                     "min": np.min, "max": np.max, "sum": np.sum}
+        if function not in functions:
+            raise ValueError(f"Agregado inválido: {function}")
+        column = self.values(node_type, name)
+        if conditions:
+            column = column[self.mask(*conditions)]
+        column = column[~np.isnan(column)]
+        if len(column) == 0:
+            return None
+        return float(functions[function](column))
+
+    def histogram(self, node_type: str, name: str, bins: int = 10,
+                  value_range: Tuple[float, float] = (0.0, 1.0)) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Calcula o histograma de um atributo.
+
+        Args:
+            node_type: Tipo do nó.
+            name: Nome do atributo.
+            bins: Número de faixas.
+            value_range: Intervalo coberto pelas faixas.
+
+        Returns:
+            Par (contagens, limites das faixas), como em `numpy.histogram`.
+        """
+        column = self.values(node_type, name)
+        return np.histogram(column[~np.isnan(column)], bins=bins, range=value_range)
+
+    def detach(self) -> None:
+        """
+        Deixa de acompanhar todas as psiques registradas e esvazia o registro
+        (as linhas deixariam de refletir as psiques).
+        """
+        for psyche_module, listener in self._listeners.values():
+            psyche_module.psyche.unregister_listener(listener)
+        self._listeners.clear()
+        self._rows.clear()
+        self.agent_ids.clear()
+        self.matrix[:] = np.nan
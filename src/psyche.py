@@ -6,6 +6,46 @@ from typing import Dict, List, Any, Optional, Set, Union
 from src.hypergraph import Hypergraph
 from src.nodes import PersonalityNode, ValueNode, NeedNode, HabitNode, BeliefNode
 from src.edges import MemoryEdge, EmotionEdge, RuleEdge
+from src.memory_store import MemoryConsolidator
+from src.overlay import OverlayHypergraph
+
+
+# Seções do arquétipo inseridas coluna a coluna: (tipo, chave, atributo do nome, atributo do nível)
+ARCHETYPE_SECTIONS = [
+    ("Personality", "personality", "trait", "value"),
+    ("Value", "values", "value_name", "priority"),
+    ("Need", "needs", "need_name", "satisfaction"),
+    ("Habit", "habits", "habit_name", "strength"),
+]
+
+
+def populate_from_archetype(graph: Hypergraph, archetype: Dict[str, Any]) -> None:
+    """
+    Insere no hiper-grafo os nós descritos por um arquétipo.
+    
+    Args:
+        graph: Hiper-grafo de personagem.
+        archetype: Dicionário descrevendo o arquétipo do personagem.
+    """
+    # Cada seção do arquétipo é inserida em lote, coluna a coluna
+    for node_type, key, name_attr, level_attr in ARCHETYPE_SECTIONS:
+        entries = archetype.get(key, {})
+        if entries:
+            graph.add_nodes_bulk(
+                [None] * len(entries),
+                node_type,
+                {name_attr: list(entries.keys()), level_attr: list(entries.values())}
+            )
+            
+    # Adiciona crenças
+    beliefs = archetype.get("beliefs", [])
+    if beliefs:
+        graph.add_nodes_bulk(
+            [None] * len(beliefs),
+            "Belief",
+            {"content": [belief["content"] for belief in beliefs],
+             "confidence": [belief["confidence"] for belief in beliefs]}
+        )
 
 
 class PsycheModule:
@@ -26,6 +66,8 @@ class PsycheModule:
         self.name = name
         self.psyche = Hypergraph(graph_id=f"psyche_{character_id}", name=f"Psyche of {name}")
         self.current_time = 0
+        # Consolidador de memórias (ver src.memory_store), opcional
+        self.memory_consolidator: Optional[MemoryConsolidator] = None
         
     def add_personality_trait(self, trait: str, value: float) -> PersonalityNode:
         """
@@ -187,8 +229,7 @@ class PsycheModule:
         Returns:
             Lista de nós de personalidade.
         """
-        return [node for node in self.psyche.nodes.values() 
-                if isinstance(node, PersonalityNode)]
+        return self.psyche.get_nodes_by_type("Personality")
     
     def get_values(self) -> List[ValueNode]:
         """
@@ -197,8 +238,7 @@ class PsycheModule:
         Returns:
             Lista de nós de valor.
         """
-        return [node for node in self.psyche.nodes.values() 
-                if isinstance(node, ValueNode)]
+        return self.psyche.get_nodes_by_type("Value")
     
     def get_needs(self) -> List[NeedNode]:
         """
@@ -207,8 +247,7 @@ class PsycheModule:
         Returns:
             Lista de nós de necessidade.
         """
-        return [node for node in self.psyche.nodes.values() 
-                if isinstance(node, NeedNode)]
+        return self.psyche.get_nodes_by_type("Need")
     
     def get_habits(self) -> List[HabitNode]:
         """
@@ -217,8 +256,7 @@ class PsycheModule:
         Returns:
             Lista de nós de hábito.
         """
-        return [node for node in self.psyche.nodes.values() 
-                if isinstance(node, HabitNode)]
+        return self.psyche.get_nodes_by_type("Habit")
     
     def get_beliefs(self) -> List[BeliefNode]:
         """
@@ -227,8 +265,7 @@ class PsycheModule:
         Returns:
             Lista de nós de crença.
         """
-        return [node for node in self.psyche.nodes.values() 
-                if isinstance(node, BeliefNode)]
+        return self.psyche.get_nodes_by_type("Belief")
     
     def get_memories(self) -> List[MemoryEdge]:
         """
@@ -237,8 +274,7 @@ class PsycheModule:
         Returns:
             Lista de hiper-arestas de memória.
         """
-        return [edge for edge in self.psyche.edges.values() 
-                if isinstance(edge, MemoryEdge)]
+        return self.psyche.get_edges_by_type("Memory")
     
     def get_emotions(self) -> List[EmotionEdge]:
         """
@@ -247,8 +283,7 @@ class PsycheModule:
         Returns:
             Lista de hiper-arestas de emoção.
         """
-        return [edge for edge in self.psyche.edges.values() 
-                if isinstance(edge, EmotionEdge)]
+        return self.psyche.get_edges_by_type("Emotion")
     
     def get_rules(self) -> List[RuleEdge]:
         """
@@ -257,8 +292,7 @@ class PsycheModule:
         Returns:
             Lista de hiper-arestas de regra.
         """
-        return [edge for edge in self.psyche.edges.values() 
-                if isinstance(edge, RuleEdge)]
+        return self.psyche.get_edges_by_type("Rule")
     
     def get_cornerstone_memories(self) -> List[MemoryEdge]:
         """
@@ -274,12 +308,40 @@ class PsycheModule:
         """
         Obtém as emoções atuais do personagem (com intensidade significativa).
         
+        Lê a intensidade atual de cada emoção (e não o índice de intensidade),
+        então inclui emoções alteradas diretamente, sem `notify_changed`.
+        
         Returns:
-            Lista de hiper-arestas de emoção atuais.
+            Lista de hiper-arestas de emoção atuais, na ordem de inserção.
         """
         return [edge for edge in self.get_emotions() 
                 if edge.intensity > 0.1]  # Limiar arbitrário
     
+    def get_top_memories(self, k: int, attribute: str = "salience") -> List[MemoryEdge]:
+        """
+        Obtém as k memórias mais marcantes do personagem.
+        
+        Args:
+            k: Número de memórias.
+            attribute: Atributo usado na ordenação ("salience", "intensity" ou "timestamp").
+            
+        Returns:
+            Lista de hiper-arestas de memória em ordem decrescente do atributo.
+        """
+        return self.psyche.top_edges("Memory", attribute, k)
+    
+    def get_top_values(self, k: int) -> List[ValueNode]:
+        """
+        Obtém os k valores de maior prioridade do personagem.
+        
+        Args:
+            k: Número de valores.
+            
+        Returns:
+            Lista de nós de valor em ordem decrescente de prioridade.
+        """
+        return self.psyche.top_nodes("Value", "priority", k)
+    
     def update(self, current_time: int) -> None:
         """
         Atualiza o estado interno do personagem.
@@ -290,8 +352,61 @@ class PsycheModule:
         self.current_time = current_time
         
         # Atualiza a intensidade das emoções com base no tempo decorrido
-        for emotion in self.get_emotions():
-            emotion.update_intensity(current_time)
+        # (em lote: o índice de intensidade é reordenado uma única vez)
+        with self.psyche.batch():
+            for emotion in self.get_emotions():
+                emotion.update_intensity(current_time)
+                self.psyche.notify_changed(emotion)
+                
+        # Consolida as memórias (fusão e camada fria), se configurado
+        if self.memory_consolidator is not None:
+            self.memory_consolidator.update(current_time)
+            
+    def enable_memory_consolidation(self, ram_budget_bytes: int = 1 << 20, **kwargs: Any) -> MemoryConsolidator:
+        """
+        Ativa a consolidação e o armazenamento em camadas das memórias.
+        
+        Args:
+            ram_budget_bytes: Orçamento de RAM das memórias em RAM, em bytes.
+            **kwargs: Demais parâmetros de MemoryConsolidator (ex: cold_store, hot_window).
+            
+        Returns:
+            O consolidador criado.
+        """
+        self.close()
+        self.memory_consolidator = MemoryConsolidator(self, ram_budget_bytes=ram_budget_bytes, **kwargs)
+        return self.memory_consolidator
+
+    def close(self) -> None:
+        """
+        Desativa a consolidação de memórias e libera a camada fria (arquivo e conexão).
+        """
+        if self.memory_consolidator is not None:
+            self.memory_consolidator.close()
+            self.memory_consolidator = None
+    
+    def recall_memories(self, emotion_tag: Optional[str] = None, involving: Optional[List[str]] = None,
+                        min_salience: Optional[float] = None) -> List[MemoryEdge]:
+        """
+        Busca memórias, incluindo as que estão na camada fria.
+        
+        Args:
+            emotion_tag: Tag emocional exigida (opcional).
+            involving: IDs de nós que a memória deve conter (opcional).
+            min_salience: Saliência mínima (opcional).
+            
+        Returns:
+            Lista de hiper-arestas de memória, da mais saliente para a menos saliente.
+        """
+        involving = involving or []
+        if self.memory_consolidator is not None:
+            return self.memory_consolidator.recall(emotion_tag, involving, min_salience)
+        query = self.psyche.query_edges("Memory").involving(*involving)
+        if emotion_tag is not None:
+            query.where("emotion_tag", "==", emotion_tag)
+        if min_salience is not None:
+            query.where("salience", ">=", min_salience)
+        return sorted(query, key=lambda edge: edge.salience, reverse=True)
             
     def create_from_archetype(self, archetype: Dict[str, Any]) -> None:
         """
@@ -300,26 +415,29 @@ class PsycheModule:
         Args:
             archetype: Dicionário descrevendo o arquétipo do personagem.
         """
-        # Adiciona traços de personalidade
-        for trait, value in archetype.get("personality", {}).items():
-            self.add_personality_trait(trait, value)
-            
-        # Adiciona valores
-        for value_name, priority in archetype.get("values", {}).items():
-            self.add_value(value_name, priority)
-            
-        # Adiciona necessidades
-        for need_name, satisfaction in archetype.get("needs", {}).items():
-            self.add_need(need_name, satisfaction)
+        populate_from_archetype(self.psyche, archetype)
             
-        # Adiciona hábitos
-        for habit_name, strength in archetype.get("habits", {}).items():
-            self.add_habit(habit_name, strength)
-            
-        # Adiciona crenças
-        for belief in archetype.get("beliefs", []):
-            self.add_belief(belief["content"], belief["confidence"])
+    @classmethod
+    def from_template(cls, template: Any, character_id: str, name: str) -> 'PsycheModule':
+        """
+        Cria um personagem sobre um template de arquétipo compartilhado.
+        
+        A psique é uma camada com cópia na escrita sobre o hiper-grafo do
+        template: guarda apenas o que o personagem tiver de diferente.
+        
+        Args:
+            template: Template de arquétipo (ver src.archetypes.ArchetypeTemplate).
+            character_id: ID único do personagem.
+            name: Nome do personagem.
             
+        Returns:
+            Uma instância de PsycheModule.
+        """
+        psyche_module = cls(character_id=character_id, name=name)
+        psyche_module.psyche = OverlayHypergraph(template.graph, graph_id=f"psyche_{character_id}",
+                                                 name=f"Psyche of {name}")
+        return psyche_module
+    
     def save_to_file(self, filepath: str) -> None:
         """
         Salva o estado do personagem em um arquivo.
@@ -0,0 +1,371 @@
+"""
+Módulo que implementa consultas declarativas sobre o hiper-grafo.
+
+Uma consulta combina restrições de tipo, predicados sobre atributos e
+restrições de pertinência (quais nós uma hiper-aresta deve conter). O
+planejador escolhe o índice mais seletivo como ponto de partida (balde do
+tipo, lista de incidência ou índice ordenado de um atributo) e aplica as demais restrições como filtros.
+Os resultados são produzidos sob demanda por geradores; como em um
+dicionário, o grafo não deve receber inserções ou remoções enquanto uma
+consulta é consumida (alterar atributos é permitido).
+
+Exemplo: memórias de medo que envolvem o personagem X e algum valor com
+prioridade acima de 0.8:
+
+    graph.query_edges("Memory") \\
+        .where("emotion_tag", "==", "Fear") \\
+        .involving("char_x") \\
+        .involving_match("ValueNode(priority>0.8)")
+"""
+
+from typing import Dict, List, Any, Optional, Iterator, Callable, Tuple, Union, TYPE_CHECKING
+
+from src.rules import Condition, Pattern, parse_pattern, parse_condition
+from src.indexes import is_indexable
+
+if TYPE_CHECKING:
+    from src.hypergraph import Hypergraph
+
+
+# Limites (inferior, superior) de cada operador: None indica sem limite,
+# True um limite inclusivo e False um limite exclusivo
+_RANGE_BOUNDS = {
+    "<": (None, False),
+    "<=": (None, True),
+    ">": (False, None),
+    ">=": (True, None),
+    "==": (True, True),
+    "=": (True, True),
+}
+
+
+class AccessPath:
+    """
+    Um ponto de partida possível para uma consulta, com o custo estimado.
+    """
+
+    __slots__ = ("cost", "description", "source", "covers")
+
+    def __init__(self, cost: int, description: str, source: Callable[[], Iterator[Any]],
+                 covers: Tuple[Any, ...] = ()):
+        """
+        Inicializa um caminho de acesso.
+
+        Args:
+            cost: Número estimado de candidatos produzidos.
+            description: Descrição legível (usada por `explain`).
+            source: Função que produz os candidatos.
+            covers: Restrições já garantidas por este caminho (não precisam ser refiltradas).
+        """
+        self.cost = cost
+        self.description = description
+        self.source = source
+        self.covers = covers
+
+
+class Query:
+    """
+    Consulta declarativa sobre nós ou hiper-arestas de um hiper-grafo.
+    """
+
+    def __init__(self, graph: 'Hypergraph', kind: str, element_type: Optional[str] = None):
+        """
+        Inicializa uma consulta.
+
+        Args:
+            graph: Hiper-grafo consultado.
+            kind: "node" ou "edge".
+            element_type: Tipo dos elementos (None para qualquer tipo).
+        """
+        if kind not in ("node", "edge"):
+            raise ValueError(f"Natureza de consulta inválida: {kind}")
+        self.graph = graph
+        self.kind = kind
+        self.element_type = element_type
+        self.conditions: List[Condition] = []
+        self.members: List[str] = []
+        self.member_patterns: List[Pattern] = []
+        self.neighbors: List[str] = []
+        self._limit: Optional[int] = None
+
+    @classmethod
+    def from_pattern(cls, graph: 'Hypergraph', pattern: str) -> 'Query':
+        """
+        Cria uma consulta a partir da notação das regras, como `ValueNode(priority>0.8)`.
+
+        Args:
+            graph: Hiper-grafo consultado.
+            pattern: Texto do padrão.
+
+        Returns:
+            A consulta equivalente.
+        """
+        compiled = parse_pattern(pattern)
+        query = cls(graph, compiled.kind, compiled.element_type)
+        query.conditions.extend(compiled.conditions)
+        return query
+
+    def where(self, attribute: str, operator: Optional[str] = None, value: Any = None) -> 'Query':
+        """
+        Adiciona um predicado sobre um atributo.
+
+        Args:
+            attribute: Nome do atributo, ou uma condição completa como "priority>0.8".
+            operator: Operador de comparação (=, ==, !=, <, <=, >, >=).
+            value: Valor de referência.
+
+        Returns:
+            A própria consulta, para encadeamento.
+        """
+        if operator is None:
+            self.conditions.append(parse_condition(attribute, self.element_type))
+        else:
+            self.conditions.append(Condition(attribute, operator, value))
+        return self
+
+    def involving(self, *node_ids: str) -> 'Query':
+        """
+        Exige que as hiper-arestas contenham todos os nós indicados.
+
+        Args:
+            *node_ids: IDs dos nós.
+
+        Returns:
+            A própria consulta, para encadeamento.
+        """
+        self._require_edges("involving")
+        self.members.extend(node_ids)
+        return self
+
+    def involving_match(self, pattern: Union[str, Pattern]) -> 'Query':
+        """
+        Exige que as hiper-arestas contenham algum nó que satisfaça o padrão.
+
+        Args:
+            pattern: Padrão de nó (ex: "ValueNode(priority>0.8)").
+
+        Returns:
+            A própria consulta, para encadeamento.
+        """
+        self._require_edges("involving_match")
+        compiled = parse_pattern(pattern) if isinstance(pattern, str) else pattern
+        if compiled.kind != "node":
+            raise ValueError("involving_match aceita apenas padrões de nó.")
+        self.member_patterns.append(compiled)
+        return self
+
+    def connected_to(self, *node_ids: str) -> 'Query':
+        """
+        Exige que os nós compartilhem alguma hiper-aresta com cada um dos nós indicados.
+
+        Args:
+            *node_ids: IDs dos nós vizinhos.
+
+        Returns:
+            A própria consulta, para encadeamento.
+        """
+        if self.kind != "node":
+            raise ValueError("connected_to só se aplica a consultas de nós.")
+        self.neighbors.extend(node_ids)
+        return self
+
+    def limit(self, count: int) -> 'Query':
+        """
+        Limita o número de resultados.
+
+        Args:
+            count: Número máximo de resultados.
+
+        Returns:
+            A própria consulta, para encadeamento.
+        """
+        self._limit = count
+        return self
+
+    def _require_edges(self, method: str) -> None:
+        if self.kind != "edge":
+            raise ValueError(f"{method} só se aplica a consultas de hiper-arestas.")
+
+    def access_paths(self) -> List[AccessPath]:
+        """
+        Enumera os caminhos de acesso possíveis para esta consulta.
+
+        Returns:
+            Lista de caminhos de acesso com custo estimado.
+        """
+        graph = self.graph
+        elements = graph.edges if self.kind == "edge" else graph.nodes
+        paths = []
+
+        if self.element_type is None:
+            paths.append(AccessPath(len(elements), "varredura completa",
+                                    lambda: iter(elements.values())))
+        else:
+            buckets = graph._edges_by_type if self.kind == "edge" else graph._nodes_by_type
+            bucket = buckets.get(self.element_type, {})
+            paths.append(AccessPath(len(bucket), f"balde do tipo {self.element_type}",
+                                    lambda bucket=bucket: iter(bucket.values()), ("type",)))
+
+        if self.element_type is not None:
+            for condition in self.conditions:
+                path = self._range_path(condition)
+                if path is not None:
+                    paths.append(path)
+
+        incidence = graph._incidence
+        for node_id in self.members:
+            incident = incidence.get(node_id, ())
+            paths.append(AccessPath(
+                len(incident), f"incidência de {node_id}",
+                lambda incident=incident: (graph.edges[edge_id] for edge_id in incident),
+                (("member", node_id),)))
+
+        for pattern in self.member_patterns:
+            bucket = graph._nodes_by_type.get(pattern.element_type, {})
+            paths.append(AccessPath(
+                len(bucket), f"incidência dos nós {pattern}",
+                lambda pattern=pattern, bucket=bucket: self._edges_of_matching_nodes(pattern, bucket),
+                (("pattern", pattern),)))
+
+        for node_id in self.neighbors:
+            incident = incidence.get(node_id, ())
+            paths.append(AccessPath(
+                sum(len(graph.edges[edge_id].nodes) for edge_id in incident),
+                f"vizinhos de {node_id}",
+                lambda node_id=node_id: (graph.nodes[n] for n in graph.get_connected_nodes(node_id)
+                                         if n in graph.nodes),
+                (("neighbor", node_id),)))
+        return paths
+
+    def _range_path(self, condition: Condition) -> Optional[AccessPath]:
+        """
+        Monta o caminho de acesso pelo índice ordenado de um atributo, se houver.
+        """
+        bounds = _RANGE_BOUNDS.get(condition.operator)
+        if bounds is None or not is_indexable(condition.value):
+            return None
+        index = self.graph.get_range_index(self.kind, self.element_type, condition.attribute)
+        if index is None:
+            return None
+        value = condition.value
+        low = value if bounds[0] is not None else None
+        high = value if bounds[1] is not None else None
+        include_low = bool(bounds[0])
+        include_high = bool(bounds[1])
+        elements = self.graph.edges if self.kind == "edge" else self.graph.nodes
+        return AccessPath(
+            index.count_range(low, high, include_low, include_high),
+            f"índice ordenado de {condition.attribute} ({condition.operator} {value})",
+            lambda: (elements[item_id] for item_id in index.range(low, high, include_low, include_high)),
+            ("type", ("condition", condition)))
+
+    def _edges_of_matching_nodes(self, pattern: Pattern, bucket: Dict[str, Any]) -> Iterator[Any]:
+        """
+        Produz, sem repetição, as hiper-arestas incidentes aos nós que satisfazem o padrão.
+        """
+        graph = self.graph
+        seen = set()
+        for node in bucket.values():
+            if not pattern.matches(node):
+                continue
+            for edge_id in graph._incidence.get(node.id, ()):
+                if edge_id not in seen:
+                    seen.add(edge_id)
+                    yield graph.edges[edge_id]
+
+    def plan(self) -> AccessPath:
+        """
+        Escolhe o caminho de acesso mais seletivo.
+
+        Returns:
+            O caminho de acesso de menor custo estimado.
+        """
+        return min(self.access_paths(), key=lambda path: path.cost)
+
+    def explain(self) -> str:
+        """
+        Descreve o plano escolhido.
+
+        Returns:
+            Texto com o caminho de acesso e seu custo estimado.
+        """
+        path = self.plan()
+        return f"{path.description} (custo estimado {path.cost})"
+
+    def _filter(self, covers: Tuple[Any, ...]) -> Callable[[Any], bool]:
+        """
+        Monta o filtro das restrições não garantidas pelo caminho de acesso.
+        """
+        graph = self.graph
+        element_type = None if "type" in covers else self.element_type
+        conditions = [condition for condition in self.conditions
+                      if ("condition", condition) not in covers]
+        members = [node_id for node_id in self.members if ("member", node_id) not in covers]
+        patterns = [pattern for pattern in self.member_patterns if ("pattern", pattern) not in covers]
+        neighbors = [node_id for node_id in self.neighbors if ("neighbor", node_id) not in covers]
+
+        def accept(item: Any) -> bool:
+            if element_type is not None and item.type != element_type:
+                return False
+            for condition in conditions:
+                if not condition.matches(item):
+                    return False
+            for node_id in members:
+                if node_id not in item.nodes:
+                    return False
+            for pattern in patterns:
+                if not any(node is not None and pattern.matches(node)
+                           for node in map(graph.nodes.get, item.nodes)):
+                    return False
+            for node_id in neighbors:
+                if item.id == node_id or node_id not in graph.get_connected_nodes(item.id):
+                    return False
+            return True
+        return accept
+
+    def __iter__(self) -> Iterator[Any]:
+        """
+        Executa a consulta de forma preguiçosa.
+
+        Returns:
+            Gerador dos elementos que satisfazem todas as restrições.
+        """
+        path = self.plan()
+        accept = self._filter(path.covers)
+        remaining = self._limit
+        if remaining is not None and remaining <= 0:
+            return
+        for item in path.source():
+            if accept(item):
+                yield item
+                if remaining is not None:
+                    remaining -= 1
+                    if remaining == 0:
+                        return
+
+    def first(self) -> Optional[Any]:
+        """
+        Obtém o primeiro resultado.
+
+        Returns:
+            O primeiro elemento encontrado, ou None.
+        """
+        return next(iter(self), None)
+
+    def count(self) -> int:
+        """
+        Conta os resultados.
+
+        Returns:
+            Número de elementos que satisfazem a consulta.
+        """
+        return sum(1 for _ in self)
+
+    def to_list(self) -> List[Any]:
+        """
+        Materializa os resultados.
+
+        Returns:
+            Lista de elementos.
+        """
+        return list(self)
@@ -0,0 +1,422 @@
+"""
+Módulo que implementa o armazenamento dos relacionamentos (Módulo de
+Relacionamento, R_AB).
+
+Em vez de um hiper-grafo por par de personagens (O(N²) objetos), apenas os
+pares com relacionamento existem: uma adjacência em dicionário de
+dicionários (origem -> destino -> linha) aponta para linhas de colunas do
+NumPy com a confiança, a dívida (Teoria da Troca Social) e o estágio de
+Knapp de cada relacionamento. A busca de um par é O(1), a iteração pelos
+vizinhos é O(grau) e o decaimento de confiança e dívida é vetorizado.
+
+Os relacionamentos são direcionados: a confiança de A em B não é a de B em
+A, e a dívida de A com B é registrada no par (A, B).
+"""
+
+from typing import Dict, List, Any, Optional, Iterator, Tuple
+
+import numpy as np
+
+# Estágios do modelo de Knapp: cinco de aproximação e cinco de afastamento
+KNAPP_STAGES = (
+    "Initiating", "Experimenting", "Intensifying", "Integrating", "Bonding",
+    "Differentiating", "Circumscribing", "Stagnating", "Avoiding", "Terminating",
+)
+STAGE_CODES = {name: code for code, name in enumerate(KNAPP_STAGES)}
+
+# Confiança mínima para cada estágio de aproximação
+_COMING_TOGETHER = ((0.85, "Bonding"), (0.7, "Integrating"), (0.55, "Intensifying"),
+                    (0.35, "Experimenting"), (0.0, "Initiating"))
+# Confiança mínima para cada estágio de afastamento (depois de um vínculo)
+_COMING_APART = ((0.6, "Differentiating"), (0.45, "Circumscribing"), (0.3, "Stagnating"),
+                 (0.15, "Avoiding"), (0.0, "Terminating"))
+
+# Recursos de Foa & Foa e o peso de cada um na confiança
+EXCHANGE_RESOURCES = {"love": 1.0, "status": 0.8, "information": 0.6,
+                      "services": 0.6, "goods": 0.4, "money": 0.3}
+
+
+class RelationshipStore:
+    """
+    Relacionamentos esparsos entre personagens, com colunas de confiança,
+    dívida e estágio de Knapp.
+    """
+
+    def __init__(self, trust_decay: float = 0.01, debt_decay: float = 0.005,
+                 initial_trust: float = 0.3, capacity: int = 64, max_changes: int = 10000):
+        """
+        Inicializa um armazenamento vazio.
+
+        Args:
+            trust_decay: Fração da confiança perdida a cada tick.
+            debt_decay: Fração da dívida perdoada a cada tick.
+            initial_trust: Confiança de um relacionamento recém-criado.
+            capacity: Número inicial de linhas reservadas.
+            max_changes: Tamanho máximo do registro de alterações entre duas
+                chamadas de `drain_changes`.
+        """
+        self.trust_decay = trust_decay
+        self.debt_decay = debt_decay
+        self.initial_trust = initial_trust
+        capacity = max(1, capacity)
+        self.trust = np.zeros(capacity)
+        self.debt = np.zeros(capacity)
+        self.stage = np.zeros(capacity, dtype=np.uint8)
+        self.last_interaction = np.zeros(capacity, dtype=np.int64)
+        self._out: Dict[str, Dict[str, int]] = {}
+        self._in: Dict[str, Dict[str, int]] = {}
+        self._pairs: List[Optional[Tuple[str, str]]] = []
+        self._free: List[int] = []
+        self.current_time = 0
+        # Registro das alterações: (evento, origem, destino, confiança anterior, nova confiança).
+        # O decaimento global é registrado como ("decay", None, None, fator, fator).
+        self._changes: List[Tuple[str, Optional[str], Optional[str], float, float]] = []
+        # Sem consumidor o registro não cresce sem limite: ao passar de `max_changes`
+        # ele é descartado e `changes_overflowed` pede um recálculo completo
+        self.max_changes = max_changes
+        self.changes_overflowed = False
+
+    def __len__(self) -> int:
+        return len(self._pairs) - len(self._free)
+
+    def _log_change(self, change: Tuple[str, Optional[str], Optional[str], float, float]) -> None:
+        if self.changes_overflowed:
+            return
+        if len(self._changes) >= self.max_changes:
+            self._changes = []
+            self.changes_overflowed = True
+            return
+        self._changes.append(change)
+
+    def __contains__(self, pair: Tuple[str, str]) -> bool:
+        source, target = pair
+        return target in self._out.get(source, ())
+
+    def _row(self, source: str, target: str) -> Optional[int]:
+        return self._out.get(source, {}).get(target)
+
+    def _allocate(self, source: str, target: str) -> int:
+        """
+        Reserva uma linha para um novo par, reaproveitando linhas livres.
+        """
+        if self._free:
+            row = self._free.pop()
+            self._pairs[row] = (source, target)
+        else:
+            row = len(self._pairs)
+            if row == len(self.trust):
+                self._grow()
+            self._pairs.append((source, target))
+        self._out.setdefault(source, {})[target] = row
+        self._in.setdefault(target, {})[source] = row
+        return row
+
+    def _grow(self) -> None:
+        """
+        Dobra a capacidade das colunas.
+        """
+        size = 2 * len(self.trust)
+        for name in ("trust", "debt", "stage", "last_interaction"):
+            column = getattr(self, name)
+            grown = np.zeros(size, dtype=column.dtype)
+            grown[:len(column)] = column
+            setattr(self, name, grown)
+
+    def add(self, source: str, target: str, trust: Optional[float] = None,
+            debt: float = 0.0, stage: str = "Initiating") -> int:
+        """
+        Cria (ou redefine) o relacionamento de um personagem com outro.
+
+        Args:
+            source: ID do personagem que sente a confiança / deve.
+            target: ID do outro personagem.
+            trust: Confiança inicial (entre 0 e 1). Se não fornecida, usa `initial_trust`.
+            debt: Dívida inicial de `source` com `target`.
+            stage: Estágio de Knapp inicial.
+
+        Returns:
+            A linha do relacionamento.
+        """
+        if source == target:
+            raise ValueError("Um personagem não tem relacionamento consigo mesmo.")
+        if stage not in STAGE_CODES:
+            raise ValueError(f"Estágio de Knapp inválido: {stage}")
+        row = self._row(source, target)
+        old_trust = float(self.trust[row]) if row is not None else 0.0
+        event = "updated" if row is not None else "added"
+        if row is None:
+            row = self._allocate(source, target)
+        value = self.initial_trust if trust is None else trust
+        self.trust[row] = max(0.0, min(1.0, value))
+        self.debt[row] = debt
+        self.stage[row] = STAGE_CODES[stage]
+        self.last_interaction[row] = self.current_time
+        self._log_change((event, source, target, old_trust, float(self.trust[row])))
+        return row
+
+    def remove(self, source: str, target: str) -> None:
+        """
+        Apaga um relacionamento.
+
+        Args:
+            source: ID do personagem de origem.
+            target: ID do personagem de destino.
+        """
+        row = self._row(source, target)
+        if row is None:
+            return
+        old_trust = float(self.trust[row])
+        del self._out[source][target]
+        if not self._out[source]:
+            del self._out[source]
+        del self._in[target][source]
+        if not self._in[target]:
+            del self._in[target]
+        self._pairs[row] = None
+        self.trust[row] = 0.0
+        self.debt[row] = 0.0
+        self.stage[row] = 0
+        self._free.append(row)
+        self._log_change(("removed", source, target, old_trust, 0.0))
+
+    def get(self, source: str, target: str) -> Optional[Dict[str, Any]]:
+        """
+        Obtém o relacionamento de um personagem com outro.
+
+        Args:
+            source: ID do personagem de origem.
+            target: ID do personagem de destino.
+
+        Returns:
+            Dicionário com confiança, dívida, estágio e última interação, ou None.
+        """
+        row = self._row(source, target)
+        if row is None:
+            return None
+        return {
+            "source": source,
+            "target": target,
+            "trust": float(self.trust[row]),
+            "debt": float(self.debt[row]),
+            "stage": KNAPP_STAGES[self.stage[row]],
+            "last_interaction": int(self.last_interaction[row])
+        }
+
+    def get_trust(self, source: str, target: str, default: float = 0.0) -> float:
+        """
+        Obtém a confiança de um personagem em outro em O(1).
+
+        Args:
+            source: ID do personagem de origem.
+            target: ID do personagem de destino.
+            default: Valor devolvido se não houver relacionamento.
+
+        Returns:
+            A confiança.
+        """
+        row = self._row(source, target)
+        return float(self.trust[row]) if row is not None else default
+
+    def get_debt(self, source: str, target: str) -> float:
+        """
+        Obtém a dívida de um personagem com outro em O(1).
+
+        Args:
+            source: ID do devedor.
+            target: ID do credor.
+
+        Returns:
+            A dívida (0 se não houver relacionamento).
+        """
+        row = self._row(source, target)
+        return float(self.debt[row]) if row is not None else 0.0
+
+    def get_stage(self, source: str, target: str) -> Optional[str]:
+        """
+        Obtém o estágio de Knapp de um relacionamento.
+
+        Args:
+            source: ID do personagem de origem.
+            target: ID do personagem de destino.
+
+        Returns:
+            O nome do estágio, ou None se não houver relacionamento.
+        """
+        row = self._row(source, target)
+        return KNAPP_STAGES[self.stage[row]] if row is not None else None
+
+    def neighbors(self, source: str) -> Iterator[Tuple[str, float]]:
+        """
+        Percorre os relacionamentos de um personagem em O(grau).
+
+        Args:
+            source: ID do personagem.
+
+        Returns:
+            Gerador de pares (ID do outro personagem, confiança).
+        """
+        trust = self.trust
+        for target, row in self._out.get(source, {}).items():
+            yield target, float(trust[row])
+
+    def incoming(self, target: str) -> Iterator[Tuple[str, float]]:
+        """
+        Percorre quem tem relacionamento com um personagem em O(grau).
+
+        Args:
+            target: ID do personagem.
+
+        Returns:
+            Gerador de pares (ID do outro personagem, confiança dele neste).
+        """
+        trust = self.trust
+        for source, row in self._in.get(target, {}).items():
+            yield source, float(trust[row])
+
+    def characters(self) -> List[str]:
+        """
+        Obtém todos os personagens com algum relacionamento.
+
+        Returns:
+            Lista de IDs.
+        """
+        return list(self._out.keys() | self._in.keys())
+
+    def pairs(self) -> Iterator[Tuple[str, str, float]]:
+        """
+        Percorre todos os relacionamentos.
+
+        Returns:
+            Gerador de triplas (origem, destino, confiança).
+        """
+        trust = self.trust
+        for row, pair in enumerate(self._pairs):
+            if pair is not None:
+                yield pair[0], pair[1], float(trust[row])
+
+    def adjust(self, source: str, target: str, trust_delta: float = 0.0,
+               debt_delta: float = 0.0) -> int:
+        """
+        Altera a confiança e a dívida de um relacionamento (criando-o se preciso)
+        e atualiza o estágio de Knapp.
+
+        Args:
+            source: ID do personagem de origem.
+            target: ID do personagem de destino.
+            trust_delta: Variação da confiança.
+            debt_delta: Variação da dívida.
+
+        Returns:
+            A linha do relacionamento.
+        """
+        row = self._row(source, target)
+        if row is None:
+            row = self.add(source, target)
+        old_trust = float(self.trust[row])
+        self.trust[row] = max(0.0, min(1.0, old_trust + trust_delta))
+        self.debt[row] += debt_delta
+        self.last_interaction[row] = self.current_time
+        self._update_stage(row)
+        self._log_change(("updated", source, target, old_trust, float(self.trust[row])))
+        return row
+
+    def _update_stage(self, row: int) -> None:
+        """
+        Recalcula o estágio de Knapp pela confiança: antes de um vínculo os
+        estágios são de aproximação; depois, quedas de confiança levam aos de
+        afastamento.
+        """
+        trust = self.trust[row]
+        stage = self.stage[row]
+        bonded = stage >= STAGE_CODES["Integrating"]
+        if bonded and trust < 0.7:
+            thresholds = _COMING_APART
+        else:
+            thresholds = _COMING_TOGETHER
+        for minimum, name in thresholds:
+            if trust >= minimum:
+                self.stage[row] = STAGE_CODES[name]
+                return
+
+    def record_exchange(self, giver: str, receiver: str, resources: Dict[str, float]) -> float:
+        """
+        Registra uma troca social (SET): quem recebe passa a confiar mais em
+        quem deu e fica devendo o valor recebido; quem deu tem a sua dívida
+        com o outro abatida.
+
+        Args:
+            giver: ID de quem dá os recursos.
+            receiver: ID de quem recebe.
+            resources: Recurso de Foa & Foa -> quantidade (negativa para perdas).
+
+        Returns:
+            O valor da troca (soma ponderada dos recursos).
+        """
+        value = sum(EXCHANGE_RESOURCES.get(name, 0.5) * amount for name, amount in resources.items())
+        self.adjust(receiver, giver, trust_delta=0.1 * value, debt_delta=value)
+        if self._row(giver, receiver) is not None:
+            self.adjust(giver, receiver, debt_delta=-value)
+        return value
+
+    def decay(self, steps: int = 1) -> None:
+        """
+        Aplica o decaimento multiplicativo da confiança e da dívida a todos os
+        relacionamentos de uma vez.
+
+        Args:
+            steps: Número de ticks decorridos.
+        """
+        count = len(self._pairs)
+        trust_factor = (1.0 - self.trust_decay) ** steps
+        debt_factor = (1.0 - self.debt_decay) ** steps
+        self.trust[:count] *= trust_factor
+        self.debt[:count] *= debt_factor
+        self._log_change(("decay", None, None, trust_factor, trust_factor))
+
+    def update(self, current_time: int) -> None:
+        """
+        Avança o relógio dos relacionamentos e aplica o decaimento do período.
+
+        Args:
+            current_time: Tempo atual da simulação.
+        """
+        steps = int(current_time - self.current_time)
+        self.current_time = current_time
+        if steps > 0:
+            self.decay(steps)
+
+    def drain_changes(self) -> List[Tuple[str, Optional[str], Optional[str], float, float]]:
+        """
+        Obtém e limpa o registro de alterações desde a última chamada.
+
+        Se `changes_overflowed` estiver ligado, alterações foram descartadas: o
+        consumidor deve recalcular tudo a partir de `pairs()`. A chamada desliga
+        o indicador.
+
+        Returns:
+            Lista de (evento, origem, destino, confiança anterior, nova confiança).
+        """
+        changes = self._changes
+        self._changes = []
+        self.changes_overflowed = False
+        return changes
+
+    def to_csr(self) -> Tuple[List[str], np.ndarray, np.ndarray, np.ndarray]:
+        """
+        Exporta a adjacência no formato CSR (linhas comprimidas).
+
+        Returns:
+            Tupla (IDs dos personagens, indptr, índices dos destinos, confianças).
+        """
+        characters = sorted(self.characters())
+        position = {character: i for i, character in enumerate(characters)}
+        indptr = np.zeros(len(characters) + 1, dtype=np.int64)
+        indices = []
+        rows = []
+        for i, character in enumerate(characters):
+            targets = self._out.get(character, {})
+            indices.extend(position[target] for target in targets)
+            rows.extend(targets.values())
+            indptr[i + 1] = len(indices)
+        return (characters, indptr, np.asarray(indices, dtype=np.int64),
+                self.trust[np.asarray(rows, dtype=np.int64)])
@@ -0,0 +1,393 @@
+"""
+Módulo que implementa o motor de reescrita do hiper-grafo de personagem
+(Módulo de Aprendizagem).
+
+Os disparos de regras de um tick são reunidos em um conjunto de mudanças
+(ChangeSet) e aplicados de uma só vez, dentro de um lote do hiper-grafo:
+cada elemento alterado é notificado uma única vez e, em caso de conflito,
+todas as edições do lote são desfeitas.
+"""
+
+from typing import Dict, List, Any, Optional, Tuple, Union
+import time
+
+from src.hypergraph import Hypergraph, Node, Hyperedge
+from src.rules import RuleMatcher, parse_action, RuleSyntaxError
+
+
+class RewriteConflict(Exception):
+    """
+    Erro levantado quando as edições de um lote não podem ser aplicadas juntas.
+    """
+
+
+def _clamp(value: float) -> float:
+    """
+    Limita um valor ao intervalo [0, 1], como fazem os construtores dos nós e arestas.
+    """
+    return max(0.0, min(1.0, value))
+
+
+class ChangeSet:
+    """
+    Conjunto de edições primitivas a serem aplicadas atomicamente.
+
+    Incrementos sobre o mesmo atributo são somados (são comutativos);
+    duas atribuições diferentes ao mesmo atributo, ou uma atribuição junto
+    com um incremento, são um conflito.
+    """
+
+    def __init__(self):
+        """
+        Inicializa um conjunto de mudanças vazio.
+        """
+        self.deltas: Dict[Tuple[str, str, str], float] = {}
+        self.assignments: Dict[Tuple[str, str, str], Any] = {}
+        self.added_nodes: List[Node] = []
+        self.added_edges: List[Hyperedge] = []
+        self.removed_edges: List[str] = []
+        self.firings: List[str] = []
+
+    def add_delta(self, kind: str, element_id: str, attribute: str, amount: float) -> None:
+        """
+        Registra um incremento (ou decremento) em um atributo.
+
+        Args:
+            kind: "node" ou "edge".
+            element_id: ID do elemento.
+            attribute: Nome do atributo.
+            amount: Quantidade a ser somada.
+        """
+        key = (kind, element_id, attribute)
+        if key in self.assignments:
+            raise RewriteConflict(f"Atributo {attribute} de {element_id} é atribuído e incrementado no mesmo lote.")
+        self.deltas[key] = self.deltas.get(key, 0.0) + amount
+
+    def set_attribute(self, kind: str, element_id: str, attribute: str, value: Any) -> None:
+        """
+        Registra uma atribuição a um atributo.
+
+        Args:
+            kind: "node" ou "edge".
+            element_id: ID do elemento.
+            attribute: Nome do atributo.
+            value: Novo valor.
+        """
+        key = (kind, element_id, attribute)
+        if key in self.deltas:
+            raise RewriteConflict(f"Atributo {attribute} de {element_id} é atribuído e incrementado no mesmo lote.")
+        if key in self.assignments and self.assignments[key] != value:
+            raise RewriteConflict(f"Atribuições divergentes para {attribute} de {element_id}.")
+        self.assignments[key] = value
+
+    def add_node(self, node: Node) -> None:
+        """
+        Registra a inserção de um nó.
+
+        Args:
+            node: Nó a ser inserido.
+        """
+        self.added_nodes.append(node)
+
+    def add_edge(self, edge: Hyperedge) -> None:
+        """
+        Registra a inserção de uma hiper-aresta.
+
+        Args:
+            edge: Hiper-aresta a ser inserida.
+        """
+        self.added_edges.append(edge)
+
+    def remove_edge(self, edge_id: str) -> None:
+        """
+        Registra a remoção de uma hiper-aresta.
+
+        Args:
+            edge_id: ID da hiper-aresta.
+        """
+        self.removed_edges.append(edge_id)
+
+    def merge(self, other: "ChangeSet") -> None:
+        """
+        Incorpora as edições de outro conjunto. A verificação de conflitos é
+        feita antes de qualquer alteração: se houver conflito, este conjunto
+        fica intacto.
+
+        Args:
+            other: Conjunto de mudanças a ser incorporado.
+        """
+        for key in other.deltas:
+            if key in self.assignments:
+                raise RewriteConflict(f"Atributo {key[2]} de {key[1]} é atribuído e incrementado no mesmo lote.")
+        for key, value in other.assignments.items():
+            if key in self.deltas:
+                raise RewriteConflict(f"Atributo {key[2]} de {key[1]} é atribuído e incrementado no mesmo lote.")
+            if key in self.assignments and self.assignments[key] != value:
+                raise RewriteConflict(f"Atribuições divergentes para {key[2]} de {key[1]}.")
+        added_nodes = {node.id for node in self.added_nodes}
+        added_edges = {edge.id for edge in self.added_edges}
+        for node in other.added_nodes:
+            if node.id in added_nodes:
+                raise RewriteConflict(f"Nó {node.id} é inserido duas vezes no mesmo lote.")
+        for edge in other.added_edges:
+            if edge.id in added_edges:
+                raise RewriteConflict(f"Hiper-aresta {edge.id} é inserida duas vezes no mesmo lote.")
+        for edge_id in other.removed_edges:
+            if edge_id in self.removed_edges:
+                raise RewriteConflict(f"Hiper-aresta {edge_id} é removida duas vezes no mesmo lote.")
+
+        for key, amount in other.deltas.items():
+            self.deltas[key] = self.deltas.get(key, 0.0) + amount
+        self.assignments.update(other.assignments)
+        self.added_nodes.extend(other.added_nodes)
+        self.added_edges.extend(other.added_edges)
+        self.removed_edges.extend(other.removed_edges)
+        self.firings.extend(other.firings)
+
+    def __len__(self) -> int:
+        return (len(self.deltas) + len(self.assignments) + len(self.added_nodes)
+                + len(self.added_edges) + len(self.removed_edges))
+
+    def apply(self, graph: Hypergraph) -> None:
+        """
+        Aplica todas as edições dentro de um lote do grafo.
+
+        Se qualquer edição falhar, as já aplicadas são desfeitas na ordem
+        inversa e o erro é propagado como RewriteConflict.
+
+        Args:
+            graph: Hiper-grafo a ser alterado.
+        """
+        undo: List[Tuple[str, Any, Any, Any]] = []
+        with graph.batch():
+            try:
+                for node in self.added_nodes:
+                    if node.id in graph.nodes:
+                        raise RewriteConflict(f"Nó {node.id} já existe no grafo.")
+                    graph.add_node(node)
+                    undo.append(("remove_node", node.id, None, None))
+
+                for edge in self.added_edges:
+                    if edge.id in graph.edges:
+                        raise RewriteConflict(f"Hiper-aresta {edge.id} já existe no grafo.")
+                    graph.add_edge(edge)
+                    undo.append(("remove_edge", edge.id, None, None))
+
+                for key in list(self.deltas) + list(self.assignments):
+                    kind, element_id, attribute = key
+                    item = graph.edges.get(element_id) if kind == "edge" else graph.nodes.get(element_id)
+                    if item is None:
+                        raise RewriteConflict(f"Elemento {element_id} não existe no grafo.")
+                    old_value = getattr(item, attribute, None)
+                    if key in self.deltas:
+                        if not isinstance(old_value, (int, float)):
+                            raise RewriteConflict(f"Atributo {attribute} de {element_id} não é numérico.")
+                        new_value = _clamp(old_value + self.deltas[key])
+                    else:
+                        new_value = self.assignments[key]
+                    undo.append(("set", key, attribute, old_value))
+                    # Pelas APIs do grafo, para respeitar a cópia na escrita das psiques em camadas
+                    if kind == "edge":
+                        graph.update_edge(element_id, **{attribute: new_value})
+                    else:
+                        graph.update_node(element_id, **{attribute: new_value})
+
+                for edge_id in self.removed_edges:
+                    edge = graph.edges.get(edge_id)
+                    if edge is None:
+                        raise RewriteConflict(f"Hiper-aresta {edge_id} não existe no grafo.")
+                    graph.remove_edge(edge_id)
+                    undo.append(("add_edge", edge, None, None))
+            except Exception as error:
+                self._rollback(graph, undo)
+                if isinstance(error, RewriteConflict):
+                    raise
+                raise RewriteConflict(str(error)) from error
+
+    @staticmethod
+    def _rollback(graph: Hypergraph, undo: List[Tuple[str, Any, Any, Any]]) -> None:
+        """
+        Desfaz as edições registradas, da última para a primeira.
+        """
+        for operation, target, attribute, old_value in reversed(undo):
+            if operation == "set":
+                kind, element_id, _ = target
+                if kind == "edge":
+                    graph.update_edge(element_id, **{attribute: old_value})
+                else:
+                    graph.update_node(element_id, **{attribute: old_value})
+            elif operation == "remove_node":
+                graph.remove_node(target)
+            elif operation == "remove_edge":
+                graph.remove_edge(target)
+            elif operation == "add_edge":
+                graph.add_edge(target)
+
+
+class RewriteEngine:
+    """
+    Motor de reescrita: transforma as regras ativadas em um ChangeSet por
+    tick e o aplica atomicamente ao hiper-grafo.
+    """
+
+    def __init__(self, graph: Hypergraph, matcher: Optional[RuleMatcher] = None,
+                 min_confidence: float = 0.0):
+        """
+        Inicializa o motor de reescrita.
+
+        Args:
+            graph: Hiper-grafo de personagem.
+            matcher: Casador de regras. Se não fornecido, um novo é criado.
+            min_confidence: Confiança mínima de uma regra para que ela dispare.
+        """
+        self.graph = graph
+        self.matcher = matcher if matcher else RuleMatcher(graph)
+        self.min_confidence = min_confidence
+        self.total_firings = 0
+        self.total_batches = 0
+        self.rolled_back_batches = 0
+        self.total_time = 0.0
+        self.last_error: Optional[str] = None
+        # Regras puladas por ação malformada: ID -> mensagem do erro
+        self.invalid_rules: Dict[str, str] = {}
+        # Disparos descartados por conflito no tick: ID -> mensagem do erro
+        self.conflicted_rules: Dict[str, str] = {}
+
+    def collect(self, activations: Optional[List[str]] = None) -> ChangeSet:
+        """
+        Reúne em um ChangeSet as ações das regras ativadas desde a última coleta.
+
+        Uma regra cuja ação não pode ser interpretada é pulada e registrada em
+        `invalid_rules`. Uma regra cujas edições conflitam com as de regras
+        anteriores da agenda é descartada e registrada em `conflicted_rules`
+        (vence a primeira na ordem de ativação); as demais seguem no lote.
+
+        Args:
+            activations: IDs das regras ativadas. Se não fornecidos, a agenda
+                do casador é consumida.
+
+        Returns:
+            O conjunto de mudanças do tick.
+        """
+        changeset = ChangeSet()
+        for rule_id, rule_changes in self._collect_rules(activations):
+            self._merge_rule(changeset, rule_id, rule_changes)
+        return changeset
+
+    def _collect_rules(self, activations: Optional[List[str]]) -> List[Tuple[str, ChangeSet]]:
+        """
+        Traduz cada regra ativada em seu próprio ChangeSet, na ordem da agenda.
+        """
+        if activations is None:
+            activations = self.matcher.pop_activations()
+        collected = []
+        for rule_id in activations:
+            rule = self.graph.get_edge(rule_id)
+            if rule is None or getattr(rule, "confidence", 1.0) < self.min_confidence:
+                continue
+            try:
+                operations = parse_action(getattr(rule, "action", ""))
+            except RuleSyntaxError as error:
+                self.invalid_rules[rule_id] = str(error)
+                self.last_error = str(error)
+                continue
+            self.invalid_rules.pop(rule_id, None)
+            rule_changes = ChangeSet()
+            try:
+                for op in operations:
+                    for target in op.select_targets(self.graph):
+                        if op.verb == "set":
+                            rule_changes.set_attribute(op.kind, target.id, op.attribute, op.amount)
+                        else:
+                            amount = op.amount if op.verb == "increase" else -op.amount
+                            rule_changes.add_delta(op.kind, target.id, op.attribute, amount)
+            except RewriteConflict as error:
+                self._drop_rule(rule_id, error)
+                continue
+            rule_changes.firings.append(rule_id)
+            collected.append((rule_id, rule_changes))
+        return collected
+
+    def _merge_rule(self, changeset: ChangeSet, rule_id: str, rule_changes: ChangeSet) -> bool:
+        """
+        Incorpora as edições de uma regra ao lote, descartando-a em caso de conflito.
+        """
+        try:
+            changeset.merge(rule_changes)
+        except RewriteConflict as error:
+            self._drop_rule(rule_id, error)
+            return False
+        self.conflicted_rules.pop(rule_id, None)
+        return True
+
+    def _drop_rule(self, rule_id: str, error: RewriteConflict) -> None:
+        """
+        Descarta o disparo de uma regra, registrando o motivo em `conflicted_rules`.
+        """
+        self.conflicted_rules[rule_id] = str(error)
+        self.last_error = str(error)
+
+    def run_tick(self) -> int:
+        """
+        Coleta e aplica os disparos do tick.
+
+        Regras que conflitam com disparos anteriores do mesmo tick são
+        descartadas na coleta (ver `collect`). Se ainda assim o lote falhar ao
+        ser aplicado (ex: atributo não numérico), ele é desfeito e as regras
+        são reaplicadas uma a uma: as que falham são descartadas e as demais
+        entram no grafo.
+
+        Returns:
+            Número de regras aplicadas.
+        """
+        start = time.perf_counter()
+        collected = self._collect_rules(None)
+        changeset = ChangeSet()
+        collected = [(rule_id, rule_changes) for rule_id, rule_changes in collected
+                     if self._merge_rule(changeset, rule_id, rule_changes)]
+        try:
+            if changeset.firings:
+                changeset.apply(self.graph)
+            applied = len(changeset.firings)
+        except RewriteConflict as error:
+            self.rolled_back_batches += 1
+            self.last_error = str(error)
+            applied = 0
+            with self.graph.batch():
+                for rule_id, rule_changes in collected:
+                    try:
+                        rule_changes.apply(self.graph)
+                    except RewriteConflict as rule_error:
+                        self._drop_rule(rule_id, rule_error)
+                        continue
+                    self.conflicted_rules.pop(rule_id, None)
+                    applied += 1
+        self.total_time += time.perf_counter() - start
+        self.total_batches += 1
+        self.total_firings += applied
+        return applied
+
+    def firings_per_second(self) -> float:
+        """
+        Calcula a vazão do motor.
+
+        Returns:
+            Regras aplicadas por segundo de processamento (0 se nada rodou).
+        """
+        return self.total_firings / self.total_time if self.total_time > 0 else 0.0
+
+    def get_stats(self) -> Dict[str, Any]:
+        """
+        Obtém as estatísticas acumuladas do motor.
+
+        Returns:
+            Dicionário com disparos, lotes, lotes desfeitos, disparos descartados, tempo e vazão.
+        """
+        return {
+            "firings": self.total_firings,
+            "batches": self.total_batches,
+            "rolled_back": self.rolled_back_batches,
+            "conflicted": len(self.conflicted_rules),
+            "time": self.total_time,
+            "firings_per_second": self.firings_per_second()
+        }
@@ -0,0 +1,621 @@
+"""
+Módulo que compila os gatilhos e ações das regras de reescrita (RuleEdge) e
+avalia os gatilhos incrementalmente sobre o hiper-grafo de personagem.
+
+Um gatilho tem a forma
+`[MemoryEdge(type=Betrayal), ValueNode(valueName=Benevolence, priority>0.8)]`:
+uma conjunção de padrões, cada um satisfeito por pelo menos um elemento do
+grafo. O casador segue a ideia da rede Rete: cada padrão mantém sua "memória
+alfa" (os elementos que o satisfazem) e uma mutação reavalia apenas os
+padrões cujo tipo é o do elemento alterado.
+"""
+
+from typing import Dict, List, Any, Optional, Set, Tuple, Union
+from functools import lru_cache
+import operator
+import re
+
+from src.hypergraph import Hypergraph, Node, Hyperedge
+
+
+class RuleSyntaxError(ValueError):
+    """
+    Erro levantado quando um gatilho ou ação de regra não pode ser interpretado.
+    """
+
+
+# Operadores aceitos nas condições, do mais longo para o mais curto
+OPERATORS = {
+    "<=": operator.le,
+    ">=": operator.ge,
+    "!=": operator.ne,
+    "==": operator.eq,
+    "=": operator.eq,
+    "<": operator.lt,
+    ">": operator.gt,
+}
+
+# Atributos com nome diferente na notação das regras. O tipo de uma memória
+# ("Betrayal") é a sua tag emocional, pois `type` é sempre "Memory".
+ATTRIBUTE_ALIASES = {
+    ("Memory", "type"): "emotion_tag",
+    ("Emotion", "type"): "emotion",
+}
+
+# Atributo que identifica um elemento pelo nome nas ações (ex: ValueNode:Benevolence)
+KEY_ATTRIBUTES = {
+    "Personality": "trait",
+    "Value": "value_name",
+    "Need": "need_name",
+    "Habit": "habit_name",
+    "Belief": "content",
+    "Memory": "emotion_tag",
+    "Emotion": "emotion",
+}
+
+_ACTION_PATTERN = re.compile(r"^\s*(increase|decrease|set)_([A-Za-z_][A-Za-z0-9_]*)\s*\((.*)\)\s*$", re.DOTALL)
+_CONDITION_PATTERN = re.compile(r"^\s*([A-Za-z_][A-Za-z0-9_]*)\s*(<=|>=|!=|==|=|<|>)\s*(.+?)\s*$")
+_ELEMENT_PATTERN = re.compile(r"^\s*([A-Za-z_][A-Za-z0-9_]*)\s*(?:\((.*)\))?\s*$", re.DOTALL)
+_CAMEL_BOUNDARY = re.compile(r"(?<=[a-z0-9])([A-Z])")
+
+
+def to_snake_case(name: str) -> str:
+    """
+    Converte um nome camelCase da notação das regras para o atributo Python.
+
+    Args:
+        name: Nome do atributo (ex: "valueName").
+
+    Returns:
+        O nome em snake_case (ex: "value_name").
+    """
+    return _CAMEL_BOUNDARY.sub(r"_\1", name).lower()
+
+
+def parse_literal(text: str) -> Any:
+    """
+    Interpreta um valor literal de uma condição ou ação.
+
+    Args:
+        text: Texto do valor (número, true/false, texto com ou sem aspas).
+
+    Returns:
+        O valor convertido.
+    """
+    text = text.strip()
+    if len(text) >= 2 and text[0] == text[-1] and text[0] in "'\"":
+        return text[1:-1]
+    lowered = text.lower()
+    if lowered == "true":
+        return True
+    if lowered == "false":
+        return False
+    try:
+        return float(text) if any(c in text for c in ".eE") else int(text)
+    except ValueError:
+        return text
+
+
+def split_top_level(text: str, separator: str = ",") -> List[str]:
+    """
+    Divide um texto pelo separador, ignorando separadores entre parênteses ou aspas.
+
+    Args:
+        text: Texto a ser dividido.
+        separator: Caractere separador.
+
+    Returns:
+        Lista das partes não vazias, sem espaços nas bordas.
+    """
+    parts = []
+    depth = 0
+    quote = None
+    current = []
+    for char in text:
+        if quote:
+            if char == quote:
+                quote = None
+        elif char in "'\"":
+            quote = char
+        elif char in "([":
+            depth += 1
+        elif char in ")]":
+            depth -= 1
+        elif char == separator and depth == 0:
+            parts.append("".join(current).strip())
+            current = []
+            continue
+        current.append(char)
+    parts.append("".join(current).strip())
+    return [part for part in parts if part]
+
+
+def resolve_element_name(name: str) -> Tuple[str, str]:
+    """
+    Traduz o nome de classe usado nas regras para (natureza, tipo).
+
+    Args:
+        name: Nome da classe (ex: "ValueNode", "MemoryEdge").
+
+    Returns:
+        Tupla ("node" ou "edge", tipo do elemento no grafo).
+    """
+    if name.endswith("Node") and len(name) > 4:
+        return "node", name[:-4]
+    if name.endswith("Edge") and len(name) > 4:
+        return "edge", name[:-4]
+    raise RuleSyntaxError(f"Elemento desconhecido na regra: {name}")
+
+
+class Condition:
+    """
+    Uma restrição sobre um atributo de um elemento (ex: priority>0.8).
+    """
+
+    __slots__ = ("attribute", "operator", "value", "_compare")
+
+    def __init__(self, attribute: str, operator: str, value: Any):
+        """
+        Inicializa uma condição.
+
+        Args:
+            attribute: Nome do atributo Python do elemento.
+            operator: Operador de comparação (=, ==, !=, <, <=, >, >=).
+            value: Valor de referência.
+        """
+        if operator not in OPERATORS:
+            raise RuleSyntaxError(f"Operador desconhecido: {operator}")
+        self.attribute = attribute
+        self.operator = "==" if operator == "=" else operator
+        self.value = value
+        self._compare = OPERATORS[operator]
+
+    def matches(self, item: Any) -> bool:
+        """
+        Verifica se um elemento satisfaz a condição.
+
+        Args:
+            item: Nó ou hiper-aresta.
+
+        Returns:
+            True se o atributo existir e a comparação for verdadeira.
+        """
+        current = getattr(item, self.attribute, None)
+        if current is None:
+            return False
+        try:
+            return bool(self._compare(current, self.value))
+        except TypeError:
+            return False
+
+    def __eq__(self, other: object) -> bool:
+        return (isinstance(other, Condition) and self.attribute == other.attribute
+                and self.operator == other.operator and self.value == other.value)
+
+    def __hash__(self) -> int:
+        return hash((self.attribute, self.operator, self.value))
+
+    def __str__(self) -> str:
+        return f"{self.attribute}{self.operator}{self.value}"
+
+    def __repr__(self) -> str:
+        return f"Condition({self})"
+
+
+class Pattern:
+    """
+    Padrão que descreve um elemento do grafo: natureza, tipo e condições.
+    """
+
+    __slots__ = ("kind", "element_type", "conditions")
+
+    def __init__(self, kind: str, element_type: str, conditions: Tuple[Condition, ...] = ()):
+        """
+        Inicializa um padrão.
+
+        Args:
+            kind: "node" ou "edge".
+            element_type: Tipo do elemento no grafo (ex: "Value").
+            conditions: Condições que o elemento deve satisfazer.
+        """
+        self.kind = kind
+        self.element_type = element_type
+        self.conditions = tuple(conditions)
+
+    def matches(self, item: Any) -> bool:
+        """
+        Verifica se um elemento satisfaz o padrão.
+
+        Args:
+            item: Nó ou hiper-aresta.
+
+        Returns:
+            True se o tipo corresponder e todas as condições forem satisfeitas.
+        """
+        if item.type != self.element_type:
+            return False
+        for condition in self.conditions:
+            if not condition.matches(item):
+                return False
+        return True
+
+    def __str__(self) -> str:
+        suffix = "Node" if self.kind == "node" else "Edge"
+        conditions = ", ".join(str(condition) for condition in self.conditions)
+        return f"{self.element_type}{suffix}({conditions})"
+
+    def __repr__(self) -> str:
+        return f"Pattern({self})"
+
+
+class CompiledTrigger:
+    """
+    Gatilho compilado: conjunção de padrões.
+    """
+
+    __slots__ = ("source", "patterns")
+
+    def __init__(self, source: str, patterns: Tuple[Pattern, ...]):
+        """
+        Inicializa um gatilho compilado.
+
+        Args:
+            source: Texto original do gatilho.
+            patterns: Padrões que devem ser todos satisfeitos.
+        """
+        self.source = source
+        self.patterns = tuple(patterns)
+
+    def element_types(self) -> Set[Tuple[str, str]]:
+        """
+        Obtém os pares (natureza, tipo) tocados pelo gatilho.
+
+        Returns:
+            Conjunto de pares (natureza, tipo).
+        """
+        return {(pattern.kind, pattern.element_type) for pattern in self.patterns}
+
+    def __str__(self) -> str:
+        return "[" + ", ".join(str(pattern) for pattern in self.patterns) + "]"
+
+    def __repr__(self) -> str:
+        return f"CompiledTrigger({self})"
+
+
+def parse_pattern(text: str) -> Pattern:
+    """
+    Compila um único padrão, como `ValueNode(valueName=Benevolence, priority>0.8)`.
+
+    Args:
+        text: Texto do padrão.
+
+    Returns:
+        O padrão compilado.
+    """
+    match = _ELEMENT_PATTERN.match(text)
+    if not match:
+        raise RuleSyntaxError(f"Padrão inválido: {text}")
+    kind, element_type = resolve_element_name(match.group(1))
+    conditions = tuple(parse_condition(part, element_type)
+                       for part in split_top_level(match.group(2) or ""))
+    return Pattern(kind, element_type, conditions)
+
+
+def parse_condition(text: str, element_type: Optional[str] = None) -> Condition:
+    """
+    Compila uma condição, como `priority>0.8` ou `valueName=Benevolence`.
+
+    Args:
+        text: Texto da condição.
+        element_type: Tipo do elemento, usado para resolver apelidos de atributos.
+
+    Returns:
+        A condição compilada.
+    """
+    match = _CONDITION_PATTERN.match(text)
+    if not match:
+        raise RuleSyntaxError(f"Condição inválida: {text}")
+    name, op, literal = match.groups()
+    attribute = ATTRIBUTE_ALIASES.get((element_type, name), to_snake_case(name))
+    return Condition(attribute, op, parse_literal(literal))
+
+
+@lru_cache(maxsize=1024)
+def parse_trigger(text: str) -> CompiledTrigger:
+    """
+    Compila o texto de um gatilho. Resultados são memorizados, já que muitas
+    regras compartilham o mesmo gatilho.
+
+    Args:
+        text: Texto do gatilho. Colchetes externos são opcionais.
+
+    Returns:
+        O gatilho compilado. Um texto vazio produz um gatilho sem padrões,
+        que nunca é ativado.
+    """
+    body = text.strip()
+    if body.startswith("[") and body.endswith("]"):
+        body = body[1:-1]
+    patterns = tuple(parse_pattern(part) for part in split_top_level(body))
+    return CompiledTrigger(text, patterns)
+
+
+class ActionOp:
+    """
+    Operação primitiva de uma ação de regra, como
+    `decrease_priority(ValueNode:Benevolence, 0.2)`.
+    """
+
+    __slots__ = ("verb", "attribute", "kind", "element_type", "key", "amount")
+
+    def __init__(self, verb: str, attribute: str, kind: str, element_type: str,
+                 key: Optional[str], amount: Any):
+        """
+        Inicializa uma operação.
+
+        Args:
+            verb: "increase", "decrease" ou "set".
+            attribute: Atributo Python alterado (ex: "priority").
+            kind: "node" ou "edge".
+            element_type: Tipo dos elementos alvo (ex: "Value").
+            key: Nome que identifica o alvo (ex: "Benevolence"); None para todos do tipo.
+            amount: Quantidade somada/subtraída, ou valor atribuído.
+        """
+        self.verb = verb
+        self.attribute = attribute
+        self.kind = kind
+        self.element_type = element_type
+        self.key = key
+        self.amount = amount
+
+    def select_targets(self, graph: Hypergraph) -> List[Union[Node, Hyperedge]]:
+        """
+        Encontra os elementos do grafo afetados pela operação.
+
+        Args:
+            graph: Hiper-grafo de personagem.
+
+        Returns:
+            Lista de nós ou hiper-arestas alvo.
+        """
+        candidates = (graph.get_nodes_by_type(self.element_type) if self.kind == "node"
+                      else graph.get_edges_by_type(self.element_type))
+        if self.key is None:
+            return candidates
+        key_attribute = KEY_ATTRIBUTES.get(self.element_type, "id")
+        return [item for item in candidates if getattr(item, key_attribute, None) == self.key]
+
+    def __str__(self) -> str:
+        suffix = "Node" if self.kind == "node" else "Edge"
+        target = f"{self.element_type}{suffix}" + (f":{self.key}" if self.key is not None else "")
+        return f"{self.verb}_{self.attribute}({target}, {self.amount})"
+
+    def __repr__(self) -> str:
+        return f"ActionOp({self})"
+
+
+@lru_cache(maxsize=1024)
+def parse_action(text: str) -> Tuple[ActionOp, ...]:
+    """
+    Compila o texto de uma ação em operações primitivas.
+
+    Args:
+        text: Operações separadas por ";", como
+            `decrease_priority(ValueNode:Benevolence, 0.2); increase_priority(ValueNode:Security, 0.3)`.
+
+    Returns:
+        Tupla de operações, na ordem do texto.
+    """
+    operations = []
+    for statement in split_top_level(text, ";"):
+        match = _ACTION_PATTERN.match(statement)
+        if not match:
+            raise RuleSyntaxError(f"Ação inválida: {statement}")
+        verb, name, arguments = match.groups()
+        arguments = split_top_level(arguments)
+        if len(arguments) != 2:
+            raise RuleSyntaxError(f"Ação deve ter alvo e valor: {statement}")
+        element, _, key = arguments[0].partition(":")
+        kind, element_type = resolve_element_name(element.strip())
+        attribute = ATTRIBUTE_ALIASES.get((element_type, name), to_snake_case(name))
+        amount = parse_literal(arguments[1])
+        if verb != "set" and not isinstance(amount, (int, float)):
+            raise RuleSyntaxError(f"Quantidade não numérica: {statement}")
+        operations.append(ActionOp(verb, attribute, kind, element_type,
+                                   parse_literal(key) if key.strip() else None, amount))
+    return tuple(operations)
+
+
+class RuleMatcher:
+    """
+    Casador incremental (estilo Rete) de gatilhos sobre um hiper-grafo.
+
+    As RuleEdges do grafo são compiladas e acompanhadas automaticamente. Cada
+    mutação reavalia apenas os padrões do mesmo tipo do elemento alterado e
+    atualiza as memórias alfa. Uma regra é ativada quando todas as suas
+    memórias alfa ficam não vazias; as novas ativações ficam na agenda até
+    serem consumidas por `pop_activations`.
+    """
+
+    def __init__(self, graph: Hypergraph, rule_type: str = "Rule"):
+        """
+        Inicializa o casador e o conecta ao grafo.
+
+        Args:
+            graph: Hiper-grafo observado.
+            rule_type: Tipo das hiper-arestas que contêm regras.
+        """
+        self.graph = graph
+        self.rule_type = rule_type
+        self.triggers: Dict[str, CompiledTrigger] = {}
+        self._alpha: Dict[str, List[Set[str]]] = {}
+        self._patterns_by_type: Dict[Tuple[str, str], List[Tuple[str, int, Pattern]]] = {}
+        self._active: Set[str] = set()
+        self._agenda: Dict[str, None] = {}
+        # RuleEdges do grafo com gatilho malformado: ID -> mensagem do erro
+        self.invalid_rules: Dict[str, str] = {}
+        self.pattern_checks = 0
+
+        graph.register_listener(self._on_graph_event)
+        for rule in graph.get_edges_by_type(rule_type):
+            self._track_rule(rule)
+
+    def detach(self) -> None:
+        """
+        Desconecta o casador do grafo.
+        """
+        self.graph.unregister_listener(self._on_graph_event)
+
+    def add_rule(self, rule_id: str, trigger: Union[str, CompiledTrigger]) -> CompiledTrigger:
+        """
+        Registra (ou substitui) uma regra e calcula suas memórias alfa iniciais.
+
+        Args:
+            rule_id: ID da regra.
+            trigger: Texto do gatilho ou gatilho já compilado.
+
+        Returns:
+            O gatilho compilado.
+        """
+        if rule_id in self.triggers:
+            self.remove_rule(rule_id)
+        compiled = parse_trigger(trigger) if isinstance(trigger, str) else trigger
+        self.triggers[rule_id] = compiled
+
+        memories = []
+        for index, pattern in enumerate(compiled.patterns):
+            self._patterns_by_type.setdefault((pattern.kind, pattern.element_type), []).append(
+                (rule_id, index, pattern))
+            candidates = (self.graph.get_nodes_by_type(pattern.element_type) if pattern.kind == "node"
+                          else self.graph.get_edges_by_type(pattern.element_type))
+            self.pattern_checks += len(candidates)
+            memories.append({item.id for item in candidates if pattern.matches(item)})
+        self._alpha[rule_id] = memories
+        self._refresh_activation(rule_id)
+        return compiled
+
+    def _track_rule(self, rule: Hyperedge) -> None:
+        """
+        Registra uma RuleEdge do grafo. Um gatilho malformado não interrompe a
+        mutação do grafo: a regra fica fora do casador e o erro em `invalid_rules`.
+        """
+        try:
+            self.add_rule(rule.id, rule.trigger)
+        except RuleSyntaxError as error:
+            self.remove_rule(rule.id)
+            self.invalid_rules[rule.id] = str(error)
+        else:
+            self.invalid_rules.pop(rule.id, None)
+
+    def remove_rule(self, rule_id: str) -> None:
+        """
+        Remove uma regra do casador.
+
+        Args:
+            rule_id: ID da regra.
+        """
+        compiled = self.triggers.pop(rule_id, None)
+        if compiled is None:
+            return
+        for key in compiled.element_types():
+            entries = [entry for entry in self._patterns_by_type.get(key, []) if entry[0] != rule_id]
+            if entries:
+                self._patterns_by_type[key] = entries
+            else:
+                self._patterns_by_type.pop(key, None)
+        self._alpha.pop(rule_id, None)
+        self._active.discard(rule_id)
+        self._agenda.pop(rule_id, None)
+
+    def is_active(self, rule_id: str) -> bool:
+        """
+        Verifica se o gatilho de uma regra está satisfeito.
+
+        Args:
+            rule_id: ID da regra.
+
+        Returns:
+            True se todos os padrões têm ao menos um elemento correspondente.
+        """
+        return rule_id in self._active
+
+    def active_rules(self) -> List[str]:
+        """
+        Obtém as regras cujo gatilho está satisfeito.
+
+        Returns:
+            Lista de IDs de regras ativas.
+        """
+        return list(self._active)
+
+    def get_matches(self, rule_id: str) -> List[Set[str]]:
+        """
+        Obtém os elementos que satisfazem cada padrão de uma regra.
+
+        Args:
+            rule_id: ID da regra.
+
+        Returns:
+            Lista (um item por padrão) de conjuntos de IDs de elementos.
+        """
+        return [set(memory) for memory in self._alpha.get(rule_id, [])]
+
+    def pop_activations(self) -> List[str]:
+        """
+        Consome a agenda de regras que passaram a estar satisfeitas.
+
+        Uma regra só volta à agenda depois de deixar de estar satisfeita e
+        ser satisfeita novamente.
+
+        Returns:
+            Lista de IDs de regras, na ordem de ativação.
+        """
+        activations = list(self._agenda)
+        self._agenda.clear()
+        return activations
+
+    def _refresh_activation(self, rule_id: str) -> None:
+        """
+        Recalcula se uma regra está ativa e atualiza a agenda.
+        """
+        memories = self._alpha[rule_id]
+        satisfied = bool(memories) and all(memories)
+        if satisfied and rule_id not in self._active:
+            self._active.add(rule_id)
+            self._agenda[rule_id] = None
+        elif not satisfied and rule_id in self._active:
+            self._active.discard(rule_id)
+            self._agenda.pop(rule_id, None)
+
+    def _on_graph_event(self, event: str, item: Union[Node, Hyperedge]) -> None:
+        """
+        Ouvinte das mutações do grafo.
+        """
+        kind, _, change = event.partition("_")
+
+        if kind == "edge" and item.type == self.rule_type:
+            if change == "removed":
+                self.remove_rule(item.id)
+                self.invalid_rules.pop(item.id, None)
+            else:
+                compiled = self.triggers.get(item.id)
+                if compiled is None or compiled.source != item.trigger:
+                    self._track_rule(item)
+
+        entries = self._patterns_by_type.get((kind, item.type))
+        if not entries:
+            return
+        touched = set()
+        for rule_id, index, pattern in entries:
+            memory = self._alpha[rule_id][index]
+            if change != "removed":
+                self.pattern_checks += 1
+                if pattern.matches(item):
+                    memory.add(item.id)
+                    touched.add(rule_id)
+                    continue
+            if item.id in memory:
+                memory.discard(item.id)
+                touched.add(rule_id)
+        for rule_id in touched:
+            self._refresh_activation(rule_id)
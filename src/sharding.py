@@ -0,0 +1,647 @@
+"""
+Módulo que implementa o particionamento espacial do mundo em shards.
+
+O eixo x é dividido em faixas contíguas, e cada faixa pertence a um shard
+com o seu próprio WorldModule (no mesmo processo ou em um processo próprio).
+Perto das fronteiras, cada entidade também é replicada como "fantasma"
+(ghost) nos shards vizinhos cuja faixa está a no máximo `halo` de distância,
+então `perceive` funciona perto das bordas sem consultar outros shards.
+Os fantasmas levam a versão da entidade (usada por InterestManager), e os
+eventos ambientais emitidos pelo coordenador são repassados a todos os
+shards que o seu raio alcança; cada shard os entrega só às entidades próprias.
+
+Um movimento que cruza a fronteira é repassado (handoff): o shard de origem
+retira a entidade e devolve os seus dados; o coordenador a insere no shard
+de destino e atualiza os fantasmas. Um passo tem três fases, cada uma com
+uma mensagem por shard processada em paralelo: ações, handoffs e fantasmas,
+percepções (que portanto já veem o estado de todas as ações do passo).
+"""
+
+from typing import Dict, List, Any, Optional, Set, Tuple, Sequence, Iterable
+from collections import deque
+import multiprocessing
+
+from src.world import Entity, WorldModule, WorldEvent, entity_from_dict
+
+Action = Tuple[str, Dict[str, Any]]
+
+
+class StripPartition:
+    """
+    Divisão do eixo x em faixas de mesma largura, uma por shard.
+    """
+
+    def __init__(self, min_x: float, max_x: float, shard_count: int, halo: float = 10.0):
+        """
+        Inicializa a partição.
+
+        Args:
+            min_x: Início do mundo no eixo x (posições menores ficam no primeiro shard).
+            max_x: Fim do mundo no eixo x (posições maiores ficam no último shard).
+            shard_count: Número de shards.
+            halo: Distância das fronteiras em que as entidades são replicadas
+                (deve cobrir o raio de percepção e a metade do maior local).
+        """
+        if shard_count < 1:
+            raise ValueError("O número de shards deve ser pelo menos 1.")
+        if max_x <= min_x:
+            raise ValueError("O fim do mundo deve ser maior que o início.")
+        self.min_x = min_x
+        self.max_x = max_x
+        self.shard_count = shard_count
+        self.halo = halo
+        self.width = (max_x - min_x) / shard_count
+
+    def shard_of(self, position: Dict[str, float]) -> int:
+        """
+        Obtém o shard dono de uma posição.
+
+        Args:
+            position: Posição (dicionário com coordenadas).
+
+        Returns:
+            Índice do shard.
+        """
+        index = int((position["x"] - self.min_x) // self.width)
+        return min(max(index, 0), self.shard_count - 1)
+
+    def shards_near(self, position: Dict[str, float]) -> Set[int]:
+        """
+        Obtém os shards cuja faixa (ampliada pelo halo) contém uma posição.
+
+        Args:
+            position: Posição (dicionário com coordenadas).
+
+        Returns:
+            Conjunto de índices (sempre inclui o dono).
+        """
+        return self.shards_within(position, self.halo)
+
+    def shards_within(self, position: Dict[str, float], radius: float) -> Set[int]:
+        """
+        Obtém os shards cuja faixa fica a no máximo `radius` de uma posição.
+
+        Args:
+            position: Posição (dicionário com coordenadas).
+            radius: Distância no eixo x.
+
+        Returns:
+            Conjunto de índices (sempre inclui o dono).
+        """
+        x = position["x"]
+        first = self.shard_of({"x": x - radius})
+        last = self.shard_of({"x": x + radius})
+        return set(range(first, last + 1))
+
+
+def _entity_data(entity: Entity) -> Dict[str, Any]:
+    """
+    Dados de uma entidade para os shards: `to_dict()` mais a versão.
+    """
+    data = entity.to_dict()
+    data["version"] = entity.version
+    return data
+
+
+class Shard:
+    """
+    Região do mundo: entidades próprias e fantasmas das regiões vizinhas.
+    """
+
+    # Comandos aceitos pelos transportes
+    COMMANDS = frozenset(("apply", "perceive", "perceive_many", "act", "step", "update",
+                          "locations", "stats"))
+
+    def __init__(self, index: int, partition: StripPartition, cell_size: float = 10.0):
+        """
+        Inicializa um shard vazio.
+
+        Args:
+            index: Índice do shard na partição.
+            partition: Partição do mundo.
+            cell_size: Lado das células da grade espacial do shard.
+        """
+        self.index = index
+        self.partition = partition
+        self.world = WorldModule(cell_size)
+        self.ghosts: Set[str] = set()
+
+    def handle(self, command: str, args: Sequence[Any]) -> Any:
+        """
+        Executa um comando recebido pelo transporte.
+
+        Args:
+            command: Nome do comando (um de COMMANDS).
+            args: Argumentos do comando.
+
+        Returns:
+            O resultado do comando (serializável).
+        """
+        if command not in self.COMMANDS:
+            raise ValueError(f"Unknown shard command: {command}")
+        return getattr(self, command)(*args)
+
+    def owns(self, entity_id: str) -> bool:
+        """
+        Verifica se uma entidade pertence a este shard (e não é um fantasma).
+
+        Args:
+            entity_id: ID da entidade.
+
+        Returns:
+            True se a entidade for própria do shard.
+        """
+        return entity_id in self.world.entities and entity_id not in self.ghosts
+
+    def apply(self, operations: Iterable[Tuple[Any, ...]]) -> None:
+        """
+        Aplica operações do coordenador, em ordem.
+
+        Args:
+            operations: Tuplas ("add", dados, fantasma) - insere ou substitui;
+                uma entidade própria recebe também a caixa de entrada em
+                `dados["inbox"]`, se houver -, ("remove", ID da entidade) e
+                ("event", dados do evento).
+        """
+        world = self.world
+        for operation in operations:
+            if operation[0] == "add":
+                _, data, ghost = operation
+                world.remove_entity(data["id"])
+                entity = entity_from_dict(data)
+                entity.version = data.get("version", 0)
+                world.add_entity(entity)
+                if ghost:
+                    self.ghosts.add(data["id"])
+                else:
+                    self.ghosts.discard(data["id"])
+                    if data.get("inbox"):
+                        world.inboxes[data["id"]] = [WorldEvent.from_dict(event) for event in data["inbox"]]
+            elif operation[0] == "remove":
+                world.remove_entity(operation[1])
+                self.ghosts.discard(operation[1])
+            elif operation[0] == "event":
+                world.emit_event(WorldEvent.from_dict(operation[1]))
+            else:
+                raise ValueError(f"Unknown shard operation: {operation[0]}")
+
+    def perceive(self, agent_id: str) -> Dict[str, Any]:
+        """
+        Percepção de um agente do shard, serializada.
+
+        Args:
+            agent_id: ID do agente.
+
+        Returns:
+            O mesmo dicionário de WorldModule.perceive, com entidades em `to_dict()`.
+        """
+        perception = self.world.perceive(agent_id)
+        if "error" in perception:
+            return perception
+        location = perception["location"]
+        return {
+            "time": perception["time"],
+            "position": dict(perception["position"]),
+            "location": location.to_dict() if location is not None else None,
+            "entities": [view.to_dict() for view in perception["entities"]],
+            "events": perception["events"]
+        }
+
+    def perceive_many(self, agent_ids: Sequence[str]) -> Dict[str, Dict[str, Any]]:
+        """
+        Percepções de vários agentes do shard.
+
+        Args:
+            agent_ids: IDs dos agentes.
+
+        Returns:
+            Dicionário ID -> percepção serializada.
+        """
+        return {agent_id: self.perceive(agent_id) for agent_id in agent_ids}
+
+    def act(self, agent_id: str,
+            action: Dict[str, Any]) -> Tuple[Dict[str, Any], Optional[Dict[str, Any]], Optional[int]]:
+        """
+        Executa a ação de um agente do shard.
+
+        Args:
+            agent_id: ID do agente.
+            action: Dicionário descrevendo a ação.
+
+        Returns:
+            Tupla (resultado serializado, dados da entidade se ela se moveu,
+            shard de destino se o movimento cruzou a fronteira).
+        """
+        if not self.owns(agent_id):
+            return {"success": False, "error": "Agent not found"}, None, None
+        world = self.world
+        result = world.act(agent_id, action)
+        if not result.get("success"):
+            return result, None, None
+        if action.get("type") == "interact":
+            result["target"] = result["target"].to_dict()
+            return result, None, None
+        if action.get("type") != "move":
+            return result, None, None
+
+        data = _entity_data(world.get_entity(agent_id))
+        owner = self.partition.shard_of(result["new_position"])
+        if owner != self.index:
+            # Handoff: o local é resolvido pelo coordenador no shard de destino, e os
+            # eventos ainda não lidos seguem com o agente
+            inbox = world.inboxes.get(agent_id)
+            if inbox:
+                data["inbox"] = [event.to_dict() for event in inbox]
+            world.remove_entity(agent_id)
+            result["location"] = None
+            return result, data, owner
+        location = result["location"]
+        result["location"] = location.to_dict() if location is not None else None
+        return result, data, None
+
+    def step(self, actions: Sequence[Action]) -> Dict[str, Any]:
+        """
+        Executa um lote de ações.
+
+        Args:
+            actions: Pares (ID do agente, ação).
+
+        Returns:
+            Dicionário com "results" (na ordem das ações) e "moved" (pares
+            (dados, shard de destino ou None)).
+        """
+        results = []
+        moved = []
+        for agent_id, action in actions:
+            result, data, destination = self.act(agent_id, action)
+            results.append(result)
+            if data is not None:
+                moved.append((data, destination))
+        return {"results": results, "moved": moved}
+
+    def update(self, current_time: int) -> None:
+        """
+        Atualiza o mundo do shard.
+
+        Args:
+            current_time: Tempo atual da simulação.
+        """
+        world = self.world
+        world.update(current_time)
+        # Os eventos dos fantasmas são entregues pelo shard dono
+        for entity_id in self.ghosts.intersection(world.inboxes):
+            del world.inboxes[entity_id]
+
+    def locations(self, entity_ids: Sequence[str]) -> Dict[str, Optional[Dict[str, Any]]]:
+        """
+        Obtém os locais de várias entidades, serializados.
+
+        Args:
+            entity_ids: IDs das entidades.
+
+        Returns:
+            Dicionário ID -> local (ou None).
+        """
+        found = {}
+        for entity_id in entity_ids:
+            location = self.world.get_location_of_entity(entity_id)
+            found[entity_id] = location.to_dict() if location is not None else None
+        return found
+
+    def stats(self) -> Dict[str, int]:
+        """
+        Obtém as contagens do shard.
+
+        Returns:
+            Dicionário com "owned" e "ghosts".
+        """
+        return {"owned": len(self.world.entities) - len(self.ghosts), "ghosts": len(self.ghosts)}
+
+
+class LocalTransport:
+    """
+    Transporte no mesmo processo: executa os comandos imediatamente.
+    """
+
+    def __init__(self, shard: Shard):
+        self.shard = shard
+        self._replies: deque = deque()
+
+    def send(self, command: str, *args: Any) -> None:
+        self._replies.append(self.shard.handle(command, args))
+
+    def receive(self) -> Any:
+        return self._replies.popleft()
+
+    def close(self) -> None:
+        pass
+
+
+def _serve(connection: Any, index: int, partition: StripPartition, cell_size: float) -> None:
+    """
+    Laço de um processo de shard: recebe (comando, argumentos), responde (ok, valor).
+    """
+    shard = Shard(index, partition, cell_size)
+    while True:
+        message = connection.recv()
+        if message is None:
+            break
+        command, args = message
+        try:
+            connection.send((True, shard.handle(command, args)))
+        except Exception as error:
+            connection.send((False, f"{type(error).__name__}: {error}"))
+    connection.close()
+
+
+class ProcessTransport:
+    """
+    Transporte para um shard em um processo próprio (multiprocessing.Pipe).
+
+    `send` não espera a resposta, então o coordenador envia um comando a todos
+    os shards antes de receber, e eles trabalham em paralelo.
+    """
+
+    def __init__(self, index: int, partition: StripPartition, cell_size: float = 10.0,
+                 context: Optional[str] = None):
+        ctx = multiprocessing.get_context(context)
+        self._connection, child = ctx.Pipe()
+        self.process = ctx.Process(target=_serve, args=(child, index, partition, cell_size),
+                                   daemon=True)
+        self.process.start()
+        child.close()
+
+    def send(self, command: str, *args: Any) -> None:
+        self._connection.send((command, args))
+
+    def receive(self) -> Any:
+        ok, value = self._connection.recv()
+        if not ok:
+            raise RuntimeError(f"Shard error: {value}")
+        return value
+
+    def close(self) -> None:
+        if self.process.is_alive():
+            self._connection.send(None)
+            self.process.join(timeout=5)
+        self._connection.close()
+
+
+class ShardedWorld:
+    """
+    Coordenador de um mundo particionado: roteia ações e percepções para o
+    shard dono de cada agente e mantém os fantasmas e os handoffs.
+    """
+
+    def __init__(self, partition: StripPartition, transport: str = "local",
+                 cell_size: float = 10.0, context: Optional[str] = None):
+        """
+        Inicializa o mundo e os shards.
+
+        Args:
+            partition: Partição do mundo.
+            transport: "local" (mesmo processo) ou "process" (um processo por shard).
+            cell_size: Lado das células da grade espacial de cada shard.
+            context: Método de início dos processos (ex: "fork", "spawn"); padrão do sistema.
+        """
+        self.partition = partition
+        if transport == "local":
+            self.transports = [LocalTransport(Shard(index, partition, cell_size))
+                               for index in range(partition.shard_count)]
+        elif transport == "process":
+            self.transports = [ProcessTransport(index, partition, cell_size, context)
+                               for index in range(partition.shard_count)]
+        else:
+            raise ValueError(f"Unknown transport: {transport}")
+        self._owner: Dict[str, int] = {}
+        self._ghosted: Dict[str, Set[int]] = {}
+        self.current_time = 0
+        self.handoffs = 0
+
+    def __enter__(self) -> 'ShardedWorld':
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.close()
+
+    def close(self) -> None:
+        """
+        Encerra os transportes (e os processos dos shards).
+        """
+        for transport in self.transports:
+            transport.close()
+
+    def _request(self, index: int, command: str, *args: Any) -> Any:
+        transport = self.transports[index]
+        transport.send(command, *args)
+        return transport.receive()
+
+    def _broadcast(self, commands: Dict[int, Tuple[str, Tuple[Any, ...]]]) -> Dict[int, Any]:
+        """
+        Envia um comando a cada shard e só então recebe as respostas.
+        """
+        for index, (command, args) in commands.items():
+            self.transports[index].send(command, *args)
+        return {index: self.transports[index].receive() for index in commands}
+
+    def _flush(self, operations: Dict[int, List[Tuple[Any, ...]]]) -> None:
+        self._broadcast({index: ("apply", (ops,)) for index, ops in operations.items() if ops})
+
+    def _place(self, data: Dict[str, Any], owner: int,
+               operations: Dict[int, List[Tuple[Any, ...]]]) -> None:
+        """
+        Agenda as operações que põem a entidade no dono e nos fantasmas certos.
+        """
+        entity_id = data["id"]
+        near = self.partition.shards_near(data["position"])
+        near.discard(owner)
+        for index in self._ghosted.get(entity_id, set()) - near:
+            if index != owner:
+                operations.setdefault(index, []).append(("remove", entity_id))
+        for index in near:
+            operations.setdefault(index, []).append(("add", data, True))
+        self._owner[entity_id] = owner
+        self._ghosted[entity_id] = near
+
+    def owner_of(self, entity_id: str) -> Optional[int]:
+        """
+        Obtém o shard dono de uma entidade.
+
+        Args:
+            entity_id: ID da entidade.
+
+        Returns:
+            Índice do shard, ou None se a entidade não existir.
+        """
+        return self._owner.get(entity_id)
+
+    def add_entity(self, entity: Entity) -> None:
+        """
+        Adiciona uma entidade ao shard dono da sua posição (e aos vizinhos, como fantasma).
+
+        Args:
+            entity: Entidade a ser adicionada.
+        """
+        self.add_entities([entity])
+
+    def add_entities(self, entities: Iterable[Entity]) -> None:
+        """
+        Adiciona várias entidades com uma mensagem por shard.
+
+        Args:
+            entities: Entidades a serem adicionadas.
+        """
+        operations: Dict[int, List[Tuple[Any, ...]]] = {}
+        for entity in entities:
+            data = _entity_data(entity)
+            owner = self.partition.shard_of(entity.position)
+            previous = self._owner.get(entity.id)
+            if previous is not None and previous != owner:
+                operations.setdefault(previous, []).append(("remove", entity.id))
+            operations.setdefault(owner, []).append(("add", data, False))
+            self._place(data, owner, operations)
+        self._flush(operations)
+
+    def remove_entity(self, entity_id: str) -> None:
+        """
+        Remove uma entidade do dono e dos fantasmas.
+
+        Args:
+            entity_id: ID da entidade.
+        """
+        owner = self._owner.pop(entity_id, None)
+        if owner is None:
+            return
+        operations = {index: [("remove", entity_id)]
+                      for index in self._ghosted.pop(entity_id, set()) | {owner}}
+        self._flush(operations)
+
+    def emit_event(self, event: WorldEvent) -> WorldEvent:
+        """
+        Emite um evento ambiental em todos os shards que o seu raio alcança;
+        ele é entregue na próxima atualização.
+
+        Args:
+            event: Evento a ser emitido.
+
+        Returns:
+            O evento emitido.
+        """
+        data = event.to_dict()
+        self._flush({index: [("event", data)]
+                     for index in self.partition.shards_within(event.position, event.radius)})
+        return event
+
+    def perceive(self, agent_id: str) -> Dict[str, Any]:
+        """
+        Retorna a percepção do mundo para um agente (calculada pelo shard dono).
+
+        Args:
+            agent_id: ID do agente.
+
+        Returns:
+            O mesmo dicionário de WorldModule.perceive, com entidades em `to_dict()`.
+        """
+        owner = self._owner.get(agent_id)
+        if owner is None:
+            return {"error": "Agent not found"}
+        return self._request(owner, "perceive", agent_id)
+
+    def act(self, agent_id: str, action: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Executa uma ação de um agente no shard dono.
+
+        Args:
+            agent_id: ID do agente.
+            action: Dicionário descrevendo a ação.
+
+        Returns:
+            O resultado da ação (o local de um movimento vem serializado).
+        """
+        return self.step([(agent_id, action)])["results"][0]
+
+    def step(self, actions: Sequence[Action], perceivers: Sequence[str] = ()) -> Dict[str, Any]:
+        """
+        Executa um passo: os shards processam as suas ações em paralelo, o
+        coordenador aplica os handoffs e os fantasmas, e então os shards
+        calculam as percepções pedidas em paralelo.
+
+        Args:
+            actions: Pares (ID do agente, ação).
+            perceivers: IDs dos agentes que percebem o mundo depois das ações.
+
+        Returns:
+            Dicionário com "results" (na ordem das ações) e "perceptions" (ID -> percepção).
+        """
+        results: List[Optional[Dict[str, Any]]] = [None] * len(actions)
+        batches: Dict[int, List[Action]] = {}
+        positions: Dict[int, List[int]] = {}
+        for i, (agent_id, action) in enumerate(actions):
+            owner = self._owner.get(agent_id)
+            if owner is None:
+                results[i] = {"success": False, "error": "Agent not found"}
+                continue
+            batches.setdefault(owner, []).append((agent_id, action))
+            positions.setdefault(owner, []).append(i)
+
+        replies = self._broadcast({index: ("step", (batch,)) for index, batch in batches.items()})
+
+        operations: Dict[int, List[Tuple[Any, ...]]] = {}
+        arrivals: Dict[int, List[str]] = {}
+        for index, reply in replies.items():
+            for i, result in zip(positions[index], reply["results"]):
+                results[i] = result
+            for data, destination in reply["moved"]:
+                owner = index
+                if destination is not None:
+                    owner = destination
+                    operations.setdefault(owner, []).append(("add", data, False))
+                    arrivals.setdefault(owner, []).append(data["id"])
+                    self.handoffs += 1
+                self._place(data, owner, operations)
+        self._flush(operations)
+
+        requests: Dict[int, Tuple[str, Tuple[Any, ...]]] = {}
+        if arrivals:
+            # Local dos agentes repassados, resolvido no shard de destino
+            for index, ids in arrivals.items():
+                requests[index] = ("locations", (ids,))
+            found: Dict[str, Optional[Dict[str, Any]]] = {}
+            for reply in self._broadcast(requests).values():
+                found.update(reply)
+            for (agent_id, action), result in zip(actions, results):
+                if agent_id in found and action.get("type") == "move" and result.get("success"):
+                    result["location"] = found[agent_id]
+
+        perceptions: Dict[str, Dict[str, Any]] = {}
+        groups: Dict[int, List[str]] = {}
+        for agent_id in perceivers:
+            owner = self._owner.get(agent_id)
+            if owner is None:
+                perceptions[agent_id] = {"error": "Agent not found"}
+            else:
+                groups.setdefault(owner, []).append(agent_id)
+        for reply in self._broadcast({index: ("perceive_many", (ids,))
+                                      for index, ids in groups.items()}).values():
+            perceptions.update(reply)
+        return {"results": results, "perceptions": perceptions}
+
+    def update(self, current_time: int) -> None:
+        """
+        Atualiza todos os shards.
+
+        Args:
+            current_time: Tempo atual da simulação.
+        """
+        self.current_time = current_time
+        self._broadcast({index: ("update", (current_time,)) for index in range(len(self.transports))})
+
+    def stats(self) -> List[Dict[str, int]]:
+        """
+        Obtém as contagens de cada shard.
+
+        Returns:
+            Lista de dicionários com "owned" e "ghosts", na ordem dos shards.
+        """
+        replies = self._broadcast({index: ("stats", ()) for index in range(len(self.transports))})
+        return [replies[index] for index in range(len(self.transports))]
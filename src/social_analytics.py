@@ -0,0 +1,354 @@
+"""
+Módulo que implementa as análises da rede social dos personagens.
+
+As análises são mantidas a partir do registro de alterações do
+RelationshipStore, portanto o custo de cada tick é proporcional ao número
+de relacionamentos alterados:
+
+- comunidades (componentes conexos, ignorando a direção) com union-find; a
+  remoção de um relacionamento apenas marca a estrutura para ser
+  reconstruída na próxima consulta;
+- grau e força (soma das confianças) de entrada e saída; o decaimento
+  global é absorvido por um fator de escala, sem percorrer os personagens;
+- PageRank ponderado pela confiança, recalculado aproximadamente a cada
+  `pagerank_interval` ticks a partir do resultado anterior.
+"""
+
+from typing import Dict, List, Optional, Set
+
+import numpy as np
+
+from src.relationships import RelationshipStore
+
+# Abaixo disso as forças são renormalizadas para não perder precisão
+_MIN_SCALE = 1e-6
+
+
+class SocialAnalytics:
+    """
+    Comunidades, centralidade e isolamento na rede de relacionamentos.
+
+    É o consumidor do registro de alterações do armazenamento: `update`
+    esvazia esse registro a cada chamada (ou recalcula tudo, se ele transbordou).
+    """
+
+    def __init__(self, store: RelationshipStore, pagerank_interval: int = 10,
+                 damping: float = 0.85, pagerank_iterations: int = 20,
+                 tolerance: float = 1e-6):
+        """
+        Inicializa as análises a partir dos relacionamentos existentes.
+
+        Args:
+            store: Armazenamento de relacionamentos.
+            pagerank_interval: Ticks entre dois recálculos do PageRank.
+            damping: Fator de amortecimento do PageRank.
+            pagerank_iterations: Número máximo de iterações por recálculo.
+            tolerance: Variação (norma L1) abaixo da qual as iterações param.
+        """
+        self.store = store
+        self.pagerank_interval = pagerank_interval
+        self.damping = damping
+        self.pagerank_iterations = pagerank_iterations
+        self.tolerance = tolerance
+        self._pagerank: Dict[str, float] = {}
+        self._last_pagerank: Optional[int] = None
+        self.changes_processed = 0
+        self.rebuilds = 0
+        self._parent: Dict[str, str] = {}
+        self._rebuild()
+
+    def _rebuild(self) -> None:
+        """
+        Recalcula graus, forças e comunidades a partir de todos os relacionamentos
+        (na criação, ou quando o registro de alterações do armazenamento transbordou).
+        """
+        characters = list(self._parent)
+        self.out_degree: Dict[str, int] = {}
+        self.in_degree: Dict[str, int] = {}
+        # Forças sem o fator de escala: força real = bruta * escala
+        self._out_strength: Dict[str, float] = {}
+        self._in_strength: Dict[str, float] = {}
+        self._scale = 1.0
+        self._parent = {}
+        self._size: Dict[str, int] = {}
+        self._components_dirty = False
+        for character_id in characters:
+            self.add_character(character_id)
+
+        self.store.drain_changes()
+        for source, target, trust in self.store.pairs():
+            self._apply_edge(source, target, 0.0, trust, added=True)
+
+    def add_character(self, character_id: str) -> None:
+        """
+        Registra um personagem (mesmo sem relacionamentos, para aparecer como isolado).
+
+        Args:
+            character_id: ID do personagem.
+        """
+        if character_id not in self._parent:
+            self._parent[character_id] = character_id
+            self._size[character_id] = 1
+            self.out_degree[character_id] = 0
+            self.in_degree[character_id] = 0
+            self._out_strength[character_id] = 0.0
+            self._in_strength[character_id] = 0.0
+
+    def _apply_edge(self, source: str, target: str, old_trust: float, new_trust: float,
+                    added: bool = False, removed: bool = False) -> None:
+        """
+        Aplica a alteração de um relacionamento aos graus, às forças e às comunidades.
+        """
+        self.add_character(source)
+        self.add_character(target)
+        delta = (new_trust - old_trust) / self._scale
+        self._out_strength[source] += delta
+        self._in_strength[target] += delta
+        if added:
+            self.out_degree[source] += 1
+            self.in_degree[target] += 1
+            if not self._components_dirty:
+                self._union(source, target)
+        elif removed:
+            self.out_degree[source] -= 1
+            self.in_degree[target] -= 1
+            # Union-find não desfaz uniões: reconstrói na próxima consulta
+            self._components_dirty = True
+
+    def update(self, current_time: Optional[int] = None) -> int:
+        """
+        Processa as alterações dos relacionamentos desde a última chamada e,
+        se for a hora, recalcula o PageRank.
+
+        Args:
+            current_time: Tempo atual da simulação.
+
+        Returns:
+            Número de alterações processadas.
+        """
+        if self.store.changes_overflowed:
+            # Alterações foram descartadas: o incremental não vale mais
+            self._rebuild()
+            self.rebuilds += 1
+            changes = []
+        else:
+            changes = self.store.drain_changes()
+        for event, source, target, old_trust, new_trust in changes:
+            if event == "decay":
+                self._scale *= new_trust
+                if self._scale < _MIN_SCALE:
+                    self._renormalize()
+            else:
+                self._apply_edge(source, target, old_trust, new_trust,
+                                 added=event == "added", removed=event == "removed")
+        self.changes_processed += len(changes)
+
+        if current_time is not None and (self._last_pagerank is None or
+                                         current_time - self._last_pagerank >= self.pagerank_interval):
+            self.compute_pagerank()
+            self._last_pagerank = current_time
+        return len(changes)
+
+    def _renormalize(self) -> None:
+        """
+        Incorpora o fator de escala às forças brutas.
+        """
+        scale = self._scale
+        for strengths in (self._out_strength, self._in_strength):
+            for character_id in strengths:
+                strengths[character_id] *= scale
+        self._scale = 1.0
+
+    def out_strength(self, character_id: str) -> float:
+        """
+        Obtém a soma das confianças de um personagem nos outros.
+
+        Args:
+            character_id: ID do personagem.
+
+        Returns:
+            A força de saída.
+        """
+        return self._out_strength.get(character_id, 0.0) * self._scale
+
+    def in_strength(self, character_id: str) -> float:
+        """
+        Obtém a soma das confianças dos outros em um personagem.
+
+        Args:
+            character_id: ID do personagem.
+
+        Returns:
+            A força de entrada.
+        """
+        return self._in_strength.get(character_id, 0.0) * self._scale
+
+    def degree(self, character_id: str) -> int:
+        """
+        Obtém o número de relacionamentos de um personagem (de entrada e de saída).
+
+        Args:
+            character_id: ID do personagem.
+
+        Returns:
+            O grau total.
+        """
+        return self.out_degree.get(character_id, 0) + self.in_degree.get(character_id, 0)
+
+    def most_central(self, k: int = 5, by: str = "in_strength") -> List[str]:
+        """
+        Obtém os personagens mais centrais.
+
+        Args:
+            k: Número de personagens.
+            by: "in_strength", "out_strength", "degree" ou "pagerank".
+
+        Returns:
+            Lista de IDs, do mais para o menos central.
+        """
+        measures = {"in_strength": self.in_strength, "out_strength": self.out_strength,
+                    "degree": self.degree, "pagerank": self.pagerank}
+        if by not in measures:
+            raise ValueError(f"Medida de centralidade inválida: {by}")
+        measure = measures[by]
+        return sorted(self._parent, key=lambda character_id: (-measure(character_id), character_id))[:k]
+
+    def isolated(self) -> List[str]:
+        """
+        Obtém os personagens registrados sem nenhum relacionamento.
+
+        Returns:
+            Lista de IDs.
+        """
+        return [character_id for character_id in self._parent if self.degree(character_id) == 0]
+
+    def _find(self, character_id: str) -> str:
+        """
+        Encontra o representante da comunidade, com compressão de caminho.
+        """
+        parent = self._parent
+        root = character_id
+        while parent[root] != root:
+            root = parent[root]
+        while parent[character_id] != root:
+            parent[character_id], character_id = root, parent[character_id]
+        return root
+
+    def _union(self, a: str, b: str) -> None:
+        """
+        Une as comunidades de dois personagens (união por tamanho).
+        """
+        root_a, root_b = self._find(a), self._find(b)
+        if root_a == root_b:
+            return
+        if self._size[root_a] < self._size[root_b]:
+            root_a, root_b = root_b, root_a
+        self._parent[root_b] = root_a
+        self._size[root_a] += self._size[root_b]
+
+    def _rebuild_components(self) -> None:
+        """
+        Reconstrói o union-find a partir dos relacionamentos atuais.
+        """
+        for character_id in self._parent:
+            self._parent[character_id] = character_id
+            self._size[character_id] = 1
+        self._components_dirty = False
+        for source, target, _ in self.store.pairs():
+            self._union(source, target)
+
+    def community_of(self, character_id: str) -> Optional[str]:
+        """
+        Obtém o representante da comunidade de um personagem.
+
+        Args:
+            character_id: ID do personagem.
+
+        Returns:
+            ID do representante, ou None se o personagem não for conhecido.
+        """
+        if character_id not in self._parent:
+            return None
+        if self._components_dirty:
+            self._rebuild_components()
+        return self._find(character_id)
+
+    def same_community(self, a: str, b: str) -> bool:
+        """
+        Verifica se dois personagens estão na mesma comunidade.
+
+        Args:
+            a: ID do primeiro personagem.
+            b: ID do segundo personagem.
+
+        Returns:
+            True se estiverem ligados por alguma cadeia de relacionamentos.
+        """
+        root = self.community_of(a)
+        return root is not None and root == self.community_of(b)
+
+    def communities(self, min_size: int = 1) -> List[Set[str]]:
+        """
+        Obtém as comunidades (componentes conexos).
+
+        Args:
+            min_size: Tamanho mínimo das comunidades devolvidas.
+
+        Returns:
+            Lista de conjuntos de IDs, da maior para a menor comunidade.
+        """
+        if self._components_dirty:
+            self._rebuild_components()
+        groups: Dict[str, Set[str]] = {}
+        for character_id in self._parent:
+            groups.setdefault(self._find(character_id), set()).add(character_id)
+        return sorted((group for group in groups.values() if len(group) >= min_size),
+                      key=len, reverse=True)
+
+    def compute_pagerank(self) -> Dict[str, float]:
+        """
+        Recalcula o PageRank ponderado pela confiança por iteração de potência,
+        partindo do resultado anterior.
+
+        Returns:
+            Dicionário ID do personagem -> PageRank.
+        """
+        characters, indptr, indices, weights = self.store.to_csr()
+        known = set(characters)
+        characters += sorted(character_id for character_id in self._parent if character_id not in known)
+        n = len(characters)
+        if n == 0:
+            self._pagerank = {}
+            return {}
+
+        sources = np.repeat(np.arange(len(indptr) - 1), np.diff(indptr))
+        out_weight = np.bincount(sources, weights=weights, minlength=n)
+        dangling = out_weight == 0
+        normalized = weights / np.where(out_weight == 0, 1.0, out_weight)[sources]
+
+        previous = self._pagerank
+        rank = np.array([previous.get(character_id, 1.0 / n) for character_id in characters])
+        rank /= rank.sum()
+        teleport = (1.0 - self.damping) / n
+        for _ in range(self.pagerank_iterations):
+            spread = np.bincount(indices, weights=rank[sources] * normalized, minlength=n)
+            updated = teleport + self.damping * (spread + rank[dangling].sum() / n)
+            change = np.abs(updated - rank).sum()
+            rank = updated
+            if change < self.tolerance:
+                break
+
+        self._pagerank = dict(zip(characters, rank.tolist()))
+        return dict(self._pagerank)
+
+    def pagerank(self, character_id: str) -> float:
+        """
+        Obtém o PageRank de um personagem calculado no último recálculo.
+
+        Args:
+            character_id: ID do personagem.
+
+        Returns:
+            O PageRank (0 se ainda não calculado).
+        """
+        return self._pagerank.get(character_id, 0.0)
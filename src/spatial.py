@@ -0,0 +1,184 @@
+"""
+Módulo que implementa a grade espacial uniforme do mundo.
+
+O espaço é dividido em células cúbicas de lado `cell_size`; cada célula
+guarda os IDs das entidades cujas posições caem nela. Uma consulta por raio
+visita apenas as células que intersectam a caixa envolvente da esfera, então
+o seu custo depende da densidade local, e não da população do mundo.
+"""
+
+from typing import Dict, List, Optional, Set, Tuple, Iterator, Mapping
+from math import floor
+
+Point = Tuple[float, float, float]
+CellKey = Tuple[int, int, int]
+
+
+def as_point(position: Mapping[str, float]) -> Point:
+    """
+    Converte uma posição em dicionário ({"x", "y", "z"}) em tupla.
+
+    Args:
+        position: Posição com as coordenadas (z é opcional).
+
+    Returns:
+        Tupla (x, y, z).
+    """
+    return (position["x"], position["y"], position.get("z", 0.0))
+
+
+class SpatialGrid:
+    """
+    Grade uniforme de hashing espacial: célula -> IDs das entidades.
+    """
+
+    def __init__(self, cell_size: float = 10.0):
+        """
+        Inicializa uma grade vazia.
+
+        Args:
+            cell_size: Lado das células (idealmente da ordem dos raios consultados).
+        """
+        if cell_size <= 0:
+            raise ValueError("O lado das células deve ser positivo.")
+        self.cell_size = cell_size
+        self._cells: Dict[CellKey, Set[str]] = {}
+        self._positions: Dict[str, Point] = {}
+        self._cell_of: Dict[str, CellKey] = {}
+        self.cells_visited = 0
+
+    def __len__(self) -> int:
+        return len(self._positions)
+
+    def __contains__(self, item_id: str) -> bool:
+        return item_id in self._positions
+
+    def cell_key(self, point: Point) -> CellKey:
+        """
+        Obtém a célula de um ponto.
+
+        Args:
+            point: Tupla (x, y, z).
+
+        Returns:
+            As coordenadas inteiras da célula.
+        """
+        size = self.cell_size
+        return (floor(point[0] / size), floor(point[1] / size), floor(point[2] / size))
+
+    def position(self, item_id: str) -> Optional[Point]:
+        """
+        Obtém a posição registrada de um item.
+
+        Args:
+            item_id: ID do item.
+
+        Returns:
+            Tupla (x, y, z), ou None se o item não estiver na grade.
+        """
+        return self._positions.get(item_id)
+
+    def insert(self, item_id: str, point: Point) -> None:
+        """
+        Insere (ou move) um item.
+
+        Args:
+            item_id: ID do item.
+            point: Posição do item.
+        """
+        self.move(item_id, point)
+
+    def move(self, item_id: str, point: Point) -> None:
+        """
+        Atualiza a posição de um item; só troca de célula se ela mudar.
+
+        Args:
+            item_id: ID do item.
+            point: Nova posição.
+        """
+        key = self.cell_key(point)
+        old_key = self._cell_of.get(item_id)
+        self._positions[item_id] = point
+        if key == old_key:
+            return
+        if old_key is not None:
+            self._discard(item_id, old_key)
+        self._cells.setdefault(key, set()).add(item_id)
+        self._cell_of[item_id] = key
+
+    def remove(self, item_id: str) -> None:
+        """
+        Retira um item da grade.
+
+        Args:
+            item_id: ID do item.
+        """
+        key = self._cell_of.pop(item_id, None)
+        if key is None:
+            return
+        del self._positions[item_id]
+        self._discard(item_id, key)
+
+    def _discard(self, item_id: str, key: CellKey) -> None:
+        cell = self._cells.get(key)
+        if cell is not None:
+            cell.discard(item_id)
+            if not cell:
+                del self._cells[key]
+
+    def items_in_cell(self, key: CellKey) -> Set[str]:
+        """
+        Obtém os itens de uma célula.
+
+        Args:
+            key: Coordenadas da célula.
+
+        Returns:
+            Conjunto de IDs (vazio se a célula não tiver itens).
+        """
+        return self._cells.get(key, set())
+
+    def _candidate_cells(self, center: Point, radius: float) -> Iterator[Set[str]]:
+        """
+        Percorre as células ocupadas que intersectam a caixa envolvente da esfera.
+        """
+        low = self.cell_key((center[0] - radius, center[1] - radius, center[2] - radius))
+        high = self.cell_key((center[0] + radius, center[1] + radius, center[2] + radius))
+        cells = self._cells
+        span = (high[0] - low[0] + 1) * (high[1] - low[1] + 1) * (high[2] - low[2] + 1)
+        if span > len(cells):
+            # Raio grande em relação à ocupação: percorre só as células ocupadas
+            for key, cell in cells.items():
+                if all(low[axis] <= key[axis] <= high[axis] for axis in range(3)):
+                    self.cells_visited += 1
+                    yield cell
+            return
+        for x in range(low[0], high[0] + 1):
+            for y in range(low[1], high[1] + 1):
+                for z in range(low[2], high[2] + 1):
+                    cell = cells.get((x, y, z))
+                    if cell:
+                        self.cells_visited += 1
+                        yield cell
+
+    def query_radius(self, center: Point, radius: float) -> List[str]:
+        """
+        Obtém os itens a no máximo `radius` de um ponto.
+
+        Args:
+            center: Centro da consulta.
+            radius: Raio da consulta.
+
+        Returns:
+            Lista de IDs.
+        """
+        cx, cy, cz = center
+        limit = radius * radius
+        positions = self._positions
+        found = []
+        for cell in self._candidate_cells(center, radius):
+            for item_id in cell:
+                x, y, z = positions[item_id]
+                if (x - cx) ** 2 + (y - cy) ** 2 + (z - cz) ** 2 <= limit:
+                    found.append(item_id)
+        return found
@@ -2,14 +2,86 @@
 Módulo que implementa o mundo da simulação.
 """
 
-from typing import Dict, List, Any, Optional, Set, Union
+from typing import Dict, List, Any, Optional, Set, Union, Iterator
+from collections.abc import Mapping
+from types import MappingProxyType
 import uuid
 
+from src.spatial import SpatialGrid, as_point
+
+
+def _distance(pos1: Dict[str, float], pos2: Dict[str, float]) -> float:
+    """
+    Calcula a distância entre dois pontos.
+
+    Args:
+        pos1: Primeira posição.
+        pos2: Segunda posição.
+
+    Returns:
+        A distância euclidiana.
+    """
+    return ((pos1["x"] - pos2["x"]) ** 2 +
+            (pos1["y"] - pos2["y"]) ** 2 +
+            (pos1["z"] - pos2["z"]) ** 2) ** 0.5
+
+
+class EntityView(Mapping):
+    """
+    Visão somente leitura de uma entidade, com as mesmas chaves de `to_dict()`.
+
+    Não copia nada: lê os atributos da entidade no momento do acesso (dicionários
+    aninhados, como posição e propriedades, são expostos como MappingProxyType).
+    Compara-se como igual ao dicionário equivalente; use `to_dict()` quando for
+    preciso um retrato independente (ex: serialização).
+    """
+
+    __slots__ = ("_entity",)
+
+    def __init__(self, entity: 'Entity'):
+        """
+        Inicializa a visão.
+
+        Args:
+            entity: Entidade observada.
+        """
+        self._entity = entity
+
+    def __getitem__(self, key: str) -> Any:
+        entity = self._entity
+        if key not in entity.VIEW_FIELDS:
+            raise KeyError(key)
+        value = getattr(entity, key)
+        return MappingProxyType(value) if isinstance(value, dict) else value
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._entity.VIEW_FIELDS)
+
+    def __len__(self) -> int:
+        return len(self._entity.VIEW_FIELDS)
+
+    def to_dict(self) -> Dict[str, Any]:
+        """
+        Serializa a entidade observada.
+
+        Returns:
+            Um dicionário representando a entidade.
+        """
+        return self._entity.to_dict()
+
+    def __repr__(self) -> str:
+        return f"EntityView({self._entity})"
+
 
 class Entity:
     """
     Classe base para todas as entidades no mundo.
     """
+
+    # Chaves de `to_dict()` expostas por EntityView
+    VIEW_FIELDS = ("id", "type", "name", "position", "properties")
+    # Mundo que contém a entidade (definido por WorldModule.add_entity)
+    _world: Optional['WorldModule'] = None
     
     def __init__(self, entity_id: Optional[str] = None, entity_type: str = "Entity", 
                  name: str = "", position: Optional[Dict[str, float]] = None,
@@ -29,6 +101,32 @@ class Entity:
         self.name = name
         self.position = position if position else {"x": 0.0, "y": 0.0, "z": 0.0}
         self.properties = properties if properties else {}
+        # Contador de versão, incrementado a cada mudança feita pelo mundo
+        self.version = 0
+        self._view: Optional[EntityView] = None
+
+    @property
+    def position(self) -> Dict[str, float]:
+        return self._position
+
+    @position.setter
+    def position(self, position: Dict[str, float]) -> None:
+        # Atribuições diretas mantêm a grade espacial do mundo em dia
+        # (alterações dentro do dicionário ainda exigem WorldModule.refresh_entity)
+        self._position = position
+        if self._world is not None:
+            self._world.refresh_entity(self.id)
+
+    def view(self) -> EntityView:
+        """
+        Obtém a visão somente leitura da entidade (criada uma única vez).
+
+        Returns:
+            A EntityView da entidade.
+        """
+        if self._view is None:
+            self._view = EntityView(self)
+        return self._view
         
     def to_dict(self) -> Dict[str, Any]:
         """
@@ -72,6 +170,8 @@ class Location(Entity):
     """
     Representa um local no mundo.
     """
+
+    VIEW_FIELDS = Entity.VIEW_FIELDS + ("area",)
     
     def __init__(self, entity_id: Optional[str] = None, name: str = "", 
                  position: Optional[Dict[str, float]] = None,
@@ -147,19 +247,115 @@ class Location(Entity):
         )
 
 
+def entity_from_dict(data: Dict[str, Any]) -> Entity:
+    """
+    Recria uma entidade (ou um local) a partir de `to_dict()`.
+
+    Args:
+        data: Dicionário contendo os dados da entidade.
+
+    Returns:
+        Uma instância de Location se o tipo for "Location", senão de Entity.
+    """
+    if data.get("type") == "Location":
+        return Location.from_dict(data)
+    return Entity.from_dict(data)
+
+
+class WorldEvent:
+    """
+    Evento ambiental localizado (ex: uma explosão, um grito, uma porta batendo).
+    """
+
+    def __init__(self, event_type: str, position: Dict[str, float], radius: float,
+                 data: Optional[Dict[str, Any]] = None, source: Optional[str] = None,
+                 event_id: Optional[str] = None):
+        """
+        Inicializa um evento.
+
+        Args:
+            event_type: Tipo do evento.
+            position: Posição do evento no mundo (dicionário com coordenadas).
+            radius: Raio de alcance do evento.
+            data: Dados adicionais do evento.
+            source: ID da entidade que causou o evento (não o recebe).
+            event_id: ID único do evento. Se não fornecido, um UUID será gerado.
+        """
+        self.id = event_id if event_id else str(uuid.uuid4())
+        self.type = event_type
+        self.position = position
+        self.radius = radius
+        self.data = data if data else {}
+        self.source = source
+        self.time: Optional[int] = None
+
+    def to_dict(self) -> Dict[str, Any]:
+        """
+        Converte o evento para um dicionário.
+
+        Returns:
+            Um dicionário representando o evento.
+        """
+        return {
+            "id": self.id,
+            "type": self.type,
+            "position": self.position,
+            "radius": self.radius,
+            "data": self.data,
+            "source": self.source,
+            "time": self.time
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> 'WorldEvent':
+        """
+        Cria um evento a partir de um dicionário.
+
+        Args:
+            data: Dicionário contendo os dados do evento.
+
+        Returns:
+            Uma instância de WorldEvent.
+        """
+        event = cls(data["type"], data["position"], data["radius"], data=data.get("data"),
+                    source=data.get("source"), event_id=data.get("id"))
+        event.time = data.get("time")
+        return event
+
+    def __str__(self) -> str:
+        return f"WorldEvent(id={self.id}, type={self.type})"
+
+
 class WorldModule:
     """
     Classe que implementa o módulo de mundo.
     Gerencia o estado do ambiente de simulação.
     """
     
-    def __init__(self):
+    def __init__(self, cell_size: float = 10.0):
         """
         Inicializa o módulo de mundo.
+
+        Args:
+            cell_size: Lado das células da grade espacial.
         """
         self.entities: Dict[str, Entity] = {}
         self.locations: Dict[str, Location] = {}
         self.current_time = 0
+        # Grade espacial com as posições das entidades (mantida por add/remove/move_entity)
+        self.grid = SpatialGrid(cell_size)
+        # Eventos emitidos aguardando a próxima atualização e caixas de entrada por agente
+        self.pending_events: List[WorldEvent] = []
+        self.inboxes: Dict[str, List[WorldEvent]] = {}
+        self.events_delivered = 0
+        # Eventos descartados sem terem sido lidos (ver deliver_events)
+        self.events_expired = 0
+        # Incrementado quando um local é adicionado, removido ou movido (invalida a navegação)
+        self.locations_version = 0
+        # Navegação entre locais (src.navigation.NavigationGraph), usada por "move" com "navigate"
+        self.navigation = None
+        # Movimento por velocidade (src.kinematics.KinematicsSystem), avançado em update
+        self.kinematics = None
         
     def add_entity(self, entity: Entity) -> None:
         """
@@ -169,10 +365,13 @@ class WorldModule:
             entity: Entidade a ser adicionada.
         """
         self.entities[entity.id] = entity
+        entity._world = self
+        self.grid.insert(entity.id, as_point(entity.position))
         
         # Se for um local, adiciona também à lista de locais
         if isinstance(entity, Location):
             self.locations[entity.id] = entity
+            self.locations_version += 1
             
     def remove_entity(self, entity_id: str) -> None:
         """
@@ -184,10 +383,17 @@ class WorldModule:
         if entity_id in self.entities:
             entity = self.entities[entity_id]
             del self.entities[entity_id]
+            if entity._world is self:
+                entity._world = None
+            self.grid.remove(entity_id)
+            self.inboxes.pop(entity_id, None)
+            if self.kinematics is not None:
+                self.kinematics.remove(entity_id)
             
             # Se for um local, remove também da lista de locais
             if isinstance(entity, Location) and entity_id in self.locations:
                 del self.locations[entity_id]
+                self.locations_version += 1
                 
     def get_entity(self, entity_id: str) -> Optional[Entity]:
         """
@@ -200,6 +406,74 @@ class WorldModule:
             A entidade correspondente ao ID, ou None se não existir.
         """
         return self.entities.get(entity_id)
+
+    def move_entity(self, entity_id: str, position: Dict[str, float]) -> bool:
+        """
+        Move uma entidade, mantendo a grade espacial atualizada.
+
+        Atribuir `entity.position` tem o mesmo efeito; só alterações dentro do
+        dicionário de posição precisam ser comunicadas com `refresh_entity`.
+
+        Args:
+            entity_id: ID da entidade.
+            position: Nova posição.
+
+        Returns:
+            True se a entidade existir, False caso contrário.
+        """
+        entity = self.entities.get(entity_id)
+        if entity is None:
+            return False
+        entity._position = position
+        entity.version += 1
+        self.grid.move(entity_id, as_point(position))
+        if entity_id in self.locations:
+            self.locations_version += 1
+        if self.kinematics is not None:
+            self.kinematics.place(entity_id, position)
+        return True
+
+    def touch_entity(self, entity_id: str) -> None:
+        """
+        Marca uma entidade como modificada (ex: depois de alterar as suas propriedades),
+        incrementando a sua versão.
+
+        Args:
+            entity_id: ID da entidade.
+        """
+        entity = self.entities.get(entity_id)
+        if entity is not None:
+            entity.version += 1
+
+    def refresh_entity(self, entity_id: str) -> None:
+        """
+        Sincroniza a grade espacial com a posição atual de uma entidade.
+
+        Args:
+            entity_id: ID da entidade.
+        """
+        entity = self.entities.get(entity_id)
+        if entity is not None:
+            entity.version += 1
+            self.grid.move(entity_id, as_point(entity.position))
+            if entity_id in self.locations:
+                self.locations_version += 1
+            if self.kinematics is not None:
+                self.kinematics.place(entity_id, entity.position)
+
+    def get_entities_in_radius(self, position: Dict[str, float], radius: float) -> List[Entity]:
+        """
+        Obtém as entidades a no máximo `radius` de uma posição (consulta na grade).
+
+        Args:
+            position: Centro da consulta.
+            radius: Raio da consulta.
+
+        Returns:
+            Lista de entidades.
+        """
+        entities = self.entities
+        return [entities[entity_id] for entity_id in self.grid.query_radius(as_point(position), radius)]
     
     def get_entities_at_location(self, location_id: str) -> List[Entity]:
         """
@@ -253,35 +527,28 @@ class WorldModule:
         if not agent:
             return {"error": "Agent not found"}
             
-        # Se não foi fornecida uma área, usa a posição do agente
-        if not area:
-            # Área padrão ao redor do agente
-            area = {
-                "center": agent.position,
-                "radius": 10.0
-            }
-            
-        # Calcula a distância entre dois pontos
-        def distance(pos1, pos2):
-            return ((pos1["x"] - pos2["x"]) ** 2 + 
-                    (pos1["y"] - pos2["y"]) ** 2 + 
-                    (pos1["z"] - pos2["z"]) ** 2) ** 0.5
+        # Se não foi fornecida uma área, usa a posição do agente (raio padrão 10)
+        if area:
+            center, radius = area["center"], area["radius"]
+        else:
+            center, radius = agent.position, 10.0
             
-        # Filtra as entidades que estão dentro da área de percepção
-        perceived_entities = []
-        for entity in self.entities.values():
-            if entity.id != agent_id:  # Não inclui o próprio agente
-                if distance(entity.position, area["center"]) <= area["radius"]:
-                    perceived_entities.append(entity.to_dict())
+        # Filtra as entidades que estão dentro da área de percepção (só as células próximas);
+        # o resultado traz visões somente leitura, sem copiar as entidades
+        entities = self.entities
+        perceived_entities = [entities[entity_id].view()
+                              for entity_id in self.grid.query_radius(as_point(center), radius)
+                              if entity_id != agent_id]  # Não inclui o próprio agente
                     
         # Obtém o local atual do agente
         current_location = self.get_location_of_entity(agent_id)
         
         return {
             "time": self.current_time,
-            "position": agent.position,
-            "location": current_location.to_dict() if current_location else None,
-            "entities": perceived_entities
+            "position": MappingProxyType(agent.position),
+            "location": current_location.view() if current_location else None,
+            "entities": perceived_entities,
+            "events": [event.to_dict() for event in self.consume_events(agent_id)]
         }
     
     def act(self, agent_id: str, action: Dict[str, Any]) -> Dict[str, Any]:
@@ -306,15 +573,38 @@ class WorldModule:
             new_position = action.get("position")
             if not new_position:
                 return {"success": False, "error": "No position specified"}
+
+            # Com "navigate", o destino precisa ser alcançável pelos locais
+            path = None
+            if action.get("navigate") and self.navigation is not None:
+                path = self.navigation.path(agent.position, new_position)
+                if path is None:
+                    return {"success": False, "error": "No route to position"}
+
+            # Com "speed", o agente caminha até o destino nas próximas atualizações
+            speed = action.get("speed")
+            if speed and self.kinematics is not None:
+                self.kinematics.follow(agent_id, path[1:] if path else [new_position], speed)
+                result = {
+                    "success": True,
+                    "destination": new_position,
+                    "location": self.get_location_of_entity(agent_id)
+                }
+                if path is not None:
+                    result["path"] = path
+                return result
                 
             # Atualiza a posição do agente
-            agent.position = new_position
+            self.move_entity(agent_id, new_position)
             
-            return {
+            result = {
                 "success": True,
                 "new_position": new_position,
                 "location": self.get_location_of_entity(agent_id)
             }
+            if path is not None:
+                result["path"] = path
+            return result
             
         elif action_type == "interact":
             # Ação de interação com outra entidade
@@ -327,11 +617,7 @@ class WorldModule:
                 return {"success": False, "error": "Target not found"}
                 
             # Verifica se o alvo está próximo o suficiente
-            distance = ((agent.position["x"] - target.position["x"]) ** 2 + 
-                        (agent.position["y"] - target.position["y"]) ** 2 + 
-                        (agent.position["z"] - target.position["z"]) ** 2) ** 0.5
-                
-            if distance > action.get("max_distance", 2.0):
+            if _distance(agent.position, target.position) > action.get("max_distance", 2.0):
                 return {"success": False, "error": "Target too far away"}
                 
             # Executa a interação (aqui seria implementada a lógica específica)
@@ -339,7 +625,7 @@ class WorldModule:
             
             return {
                 "success": True,
-                "target": target.to_dict(),
+                "target": target.view(),
                 "interaction": interaction
             }
             
@@ -353,10 +639,70 @@ class WorldModule:
         Args:
             current_time: Tempo atual da simulação.
         """
+        elapsed = current_time - self.current_time
         self.current_time = current_time
-        
-        # Aqui seriam implementadas atualizações específicas do mundo,
-        # como eventos ambientais, mudanças de estado, etc.
+        if self.kinematics is not None and elapsed > 0:
+            self.kinematics.step(elapsed)
+        self.deliver_events()
+
+    def emit_event(self, event: WorldEvent) -> WorldEvent:
+        """
+        Emite um evento ambiental; ele é entregue na próxima atualização do mundo.
+
+        Args:
+            event: Evento a ser emitido.
+
+        Returns:
+            O evento emitido.
+        """
+        self.pending_events.append(event)
+        return event
+
+    def deliver_events(self) -> int:
+        """
+        Entrega os eventos pendentes nas caixas de entrada das entidades ao alcance.
+
+        As entidades afetadas vêm de uma consulta por raio na grade, então o
+        custo depende de quantas estão perto do evento, e não da população.
+        Locais não recebem eventos.
+
+        Os eventos valem até a atualização seguinte: os que não foram lidos
+        por `perceive`/`consume_events` até lá são descartados (e contados em
+        `events_expired`), para que entidades que nunca percebem, como
+        objetos, não acumulem eventos sem limite.
+
+        Returns:
+            Número de entregas feitas.
+        """
+        events, self.pending_events = self.pending_events, []
+        entities = self.entities
+        inboxes = self.inboxes
+        if inboxes:
+            self.events_expired += sum(len(inbox) for inbox in inboxes.values())
+            inboxes.clear()
+        delivered = 0
+        for event in events:
+            event.time = self.current_time
+            for entity_id in self.grid.query_radius(as_point(event.position), event.radius):
+                if entity_id == event.source or isinstance(entities[entity_id], Location):
+                    continue
+                inboxes.setdefault(entity_id, []).append(event)
+                delivered += 1
+        self.events_delivered += delivered
+        return delivered
+
+    def consume_events(self, agent_id: str) -> List[WorldEvent]:
+        """
+        Retira os eventos da caixa de entrada de um agente (entregues na
+        última atualização do mundo).
+
+        Args:
+            agent_id: ID do agente.
+
+        Returns:
+            Lista de eventos, na ordem de entrega.
+        """
+        return self.inboxes.pop(agent_id, [])
         
     def to_dict(self) -> Dict[str, Any]:
         """
@@ -387,14 +733,7 @@ class WorldModule:
         
         # Adiciona as entidades
         for entity_data in data.get("entities", []):
-            entity_type = entity_data.get("type")
-            
-            if entity_type == "Location":
-                entity = Location.from_dict(entity_data)
-            else:
-                entity = Entity.from_dict(entity_data)
-                
-            world.add_entity(entity)
+            world.add_entity(entity_from_dict(entity_data))
             
         return world
 
@@ -0,0 +1,115 @@
+"""
+Testes para o motor de avaliação OCC.
+"""
+
+import sys
+import os
+import time
+
+# Adiciona o diretório pai ao path para importar os módulos
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import numpy as np
+
+from src.psyche import PsycheModule
+from src.archetypes import ArchetypeTemplate
+from src.population import PopulationRegistry
+from src.appraisal import AppraisalEngine, AppraisalEvent
+
+def make_agent(agent_id, values, needs):
+    """Cria uma psique com valores e necessidades."""
+    psyche = PsycheModule(agent_id, agent_id)
+    psyche.create_from_archetype({"values": values, "needs": needs})
+    return psyche
+
+def test_scores_and_emotions():
+    """Testa as três pontuações OCC e as emoções geradas."""
+    print("Testando avaliação OCC...")
+
+    registry = PopulationRegistry()
+    agents = {
+        "guard": make_agent("guard", {"Security": 0.9, "Benevolence": 0.2}, {"Safety": 0.2}),
+        "thief": make_agent("thief", {"Power": 0.8, "Security": 0.1}, {"Safety": 0.9}),
+    }
+    for agent_id, psyche in agents.items():
+        registry.add_agent(agent_id, psyche)
+    engine = AppraisalEngine(registry)
+
+    robbery = AppraisalEvent("robbery", value_effects={"Security": -0.5, "Power": 0.5},
+                             need_effects={"Safety": -0.4}, actor="thief",
+                             standards={"Security": -0.8, "Power": 0.6})
+    pairs = [(robbery, "guard"), (robbery, "thief"), (robbery, "stranger")]
+    scores = engine.score(pairs)
+    assert np.allclose(scores["desirability"], [0.9 * -0.5 + 0.8 * -0.4, 0.8 * 0.5 + 0.1 * -0.5 + 0.1 * -0.4, 0.0])
+    assert np.allclose(scores["praiseworthiness"], [0.9 * -0.8, 0.8 * 0.6 + 0.1 * -0.8, 0.0])
+
+    emitted = engine.appraise(pairs, current_time=3)
+    assert set(emitted) == {"guard", "thief"}
+    guard = {edge.emotion: edge for edge in emitted["guard"]}
+    thief = {edge.emotion: edge for edge in emitted["thief"]}
+    assert set(guard) == {"Distress", "Reproach"} and set(thief) == {"Joy", "Pride"}
+    assert abs(guard["Distress"].intensity - 0.77) < 1e-9
+    assert guard["Reproach"].target == "thief" and guard["Distress"].target == "robbery"
+    # As emoções ligam os valores e necessidades afetados da psique do agente
+    security = [v for v in agents["guard"].get_values() if v.value_name == "Security"][0]
+    assert security.id in guard["Distress"].nodes and len(guard["Distress"].nodes) == 2
+    assert agents["guard"].get_current_emotions()[0] is guard["Distress"]
+    assert guard["Distress"].timestamp == 3
+
+    # Objeto atraente e evento prospectivo
+    gold = AppraisalEvent("gold_rumor", value_effects={"Power": 0.9}, object_id="gold",
+                          appeal={"Power": 0.7}, prospective=True)
+    thief = {edge.emotion for edge in engine.broadcast(gold)["thief"]}
+    assert thief == {"Hope", "Love"}
+    assert engine.emitted == 6
+
+    # Avaliar de novo o mesmo evento reforça as emoções vivas em vez de duplicá-las
+    distress = guard["Distress"]
+    for tick in range(4, 8):
+        again = {edge.emotion: edge for edge in engine.appraise([(robbery, "guard")], current_time=tick)["guard"]}
+        assert again["Distress"] is distress
+    distresses = [edge for edge in agents["guard"].psyche.get_edges_by_type("Emotion") if edge.emotion == "Distress"]
+    assert distresses == [distress]
+    assert abs(distress.intensity - (1 - 0.23 ** 5)) < 1e-9 and distress.timestamp == 7
+    assert engine.emitted == 6 and engine.merges == 8
+
+    # Repetições dentro do mesmo lote também são combinadas
+    engine.appraise([(gold, "thief"), (gold, "thief")])
+    assert len(agents["thief"].psyche.get_edges_by_type("Emotion")) == 4
+
+    print("Teste de avaliação OCC concluído com sucesso!")
+
+def test_crowd_event():
+    """Testa uma explosão ouvida por uma multidão em uma única passada."""
+    print("Testando avaliação de multidão...")
+
+    template = ArchetypeTemplate("villager", {"values": {"Security": 0.7}, "needs": {"Safety": 0.6}})
+    registry = PopulationRegistry()
+    crowd = [template.instantiate(f"npc_{i}", "NPC") for i in range(2000)]
+    for psyche in crowd:
+        registry.add_agent(psyche.character_id, psyche)
+    engine = AppraisalEngine(registry)
+
+    explosion = AppraisalEvent("explosion", value_effects={"Security": -0.8},
+                               need_effects={"Safety": -0.5})
+    start = time.perf_counter()
+    scores = engine.score([(explosion, agent_id) for agent_id in registry.agent_ids])
+    elapsed = time.perf_counter() - start
+    assert np.allclose(scores["desirability"], 0.7 * -0.8 + 0.4 * -0.5)
+    emitted = engine.broadcast(explosion, current_time=1)
+    assert len(emitted) == 2000
+    assert all(edges[0].emotion == "Distress" for edges in emitted.values())
+    # O template compartilhado não é alterado: as emoções ficam na camada de cada agente
+    assert len(template.graph.get_edges_by_type("Emotion")) == 0
+    print(f"  Pontuação de 2000 pares em {elapsed * 1000:.1f} ms")
+
+    print("Teste de avaliação de multidão concluído com sucesso!")
+
+def run_tests():
+    """Executa todos os testes."""
+    test_scores_and_emotions()
+    test_crowd_event()
+    print("Todos os testes concluídos com sucesso!")
+
+if __name__ == "__main__":
+    run_tests()
@@ -0,0 +1,130 @@
+"""
+Testes para os templates de arquétipo e as psiques com cópia na escrita.
+"""
+
+import sys
+import os
+import tracemalloc
+
+# Adiciona o diretório pai ao path para importar os módulos
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.hypergraph import Node
+from src.psyche import PsycheModule
+from src.archetypes import ArchetypeTemplate, get_template
+from src.rewriting import RewriteEngine
+
+COMMONER = {
+    "personality": {"Openness": 0.4, "Conscientiousness": 0.6, "Extraversion": 0.5,
+                    "Agreeableness": 0.7, "Neuroticism": 0.4, "HonestyHumility": 0.6},
+    "values": {"Security": 0.8, "Tradition": 0.6, "Benevolence": 0.7, "Power": 0.2},
+    "needs": {"Safety": 0.6, "Belonging": 0.5, "Esteem": 0.4},
+    "habits": {"Diligence": 0.6, "Gossip": 0.3},
+    "beliefs": [{"content": "O trabalho honesto é recompensado", "confidence": 0.7},
+                {"content": "Estranhos são perigosos", "confidence": 0.5}]
+}
+
+def test_overlay_copy_on_write():
+    """Testa que as alterações ficam na camada do personagem."""
+    print("Testando cópia na escrita...")
+
+    template = ArchetypeTemplate("commoner", COMMONER)
+    alice = template.instantiate("alice", "Alice")
+    bob = template.instantiate("bob", "Bob")
+    assert len(alice.get_values()) == 4 and alice.psyche.local_size() == (0, 0)
+
+    security = [v for v in alice.get_values() if v.value_name == "Security"][0]
+    changed = alice.psyche.update_node(security.id, priority=0.1)
+    assert changed is not security and security.priority == 0.8
+    assert alice.psyche.get_node(security.id).priority == 0.1
+    assert bob.psyche.get_node(security.id).priority == 0.8
+    assert [v.value_name for v in alice.get_top_values(1)] == ["Benevolence"]
+    assert [v.value_name for v in bob.get_top_values(1)] == ["Security"]
+    assert len(alice.get_values()) == 4
+
+    # Remover um nó da base apenas o esconde na camada
+    power = [v for v in alice.get_values() if v.value_name == "Power"][0]
+    alice.psyche.remove_node(power.id)
+    assert power.id not in alice.psyche.nodes and power.id in bob.psyche.nodes
+    assert len(alice.psyche.nodes) == len(bob.psyche.nodes) - 1
+
+    # Elementos locais convivem com os da base nas consultas e na incidência
+    alice.psyche.add_node(Node("bob", "Character"))
+    memory = alice.add_memory(["bob", security.id], "Fear", 0.8, salience=0.9)
+    assert alice.psyche.get_edges_for_node(security.id) == [memory]
+    assert bob.psyche.get_edges_for_node(security.id) == []
+    assert alice.psyche.query_edges("Memory").involving_match("ValueNode(priority<0.5)").first() is memory
+    assert alice.psyche.query_nodes("Value").where("priority", ">=", 0.6).count() == 2
+
+    # O template é somente leitura
+    try:
+        template.graph.update_node(security.id, priority=0.0)
+        assert False, "O template deveria rejeitar alterações"
+    except RuntimeError:
+        pass
+    assert template.graph.get_node(security.id).priority == 0.8
+    try:
+        template.graph.add_node(Node("leak", "Value"))
+        assert False, "O template deveria rejeitar inserções"
+    except RuntimeError:
+        pass
+    assert "leak" not in template.graph.nodes and "leak" not in bob.psyche.nodes
+
+    # A versão achatada é um hiper-grafo independente
+    flat = alice.psyche.flatten()
+    assert flat.get_node(security.id).priority == 0.1 and power.id not in flat.nodes
+
+    print("Teste de cópia na escrita concluído com sucesso!")
+
+def test_overlay_rewriting():
+    """Testa o motor de reescrita sobre uma psique em camadas."""
+    print("Testando reescrita sobre psique em camadas...")
+
+    template = get_template("commoner_rules", COMMONER)
+    assert get_template("commoner_rules") is template
+    carol = template.instantiate("carol", "Carol")
+    dave = template.instantiate("dave", "Dave")
+    carol.add_rule([], "[ValueNode(valueName=Security, priority>0.5)]",
+                   "decrease_priority(ValueNode:Security, 0.3)", 0.9)
+    fired = RewriteEngine(carol.psyche).run_tick()
+    assert fired == 1
+    carol_security = [v for v in carol.get_values() if v.value_name == "Security"][0]
+    dave_security = [v for v in dave.get_values() if v.value_name == "Security"][0]
+    assert abs(carol_security.priority - 0.5) < 1e-9 and dave_security.priority == 0.8
+
+    print("Teste de reescrita sobre psique em camadas concluído com sucesso!")
+
+def test_crowd_memory():
+    """Compara a memória de uma multidão com e sem template."""
+    print("Testando memória de multidão...")
+
+    def measure(factory):
+        tracemalloc.start()
+        crowd = [factory(i) for i in range(300)]
+        size = tracemalloc.get_traced_memory()[0]
+        tracemalloc.stop()
+        return size, crowd
+
+    def full(i):
+        psyche = PsycheModule(f"npc_{i}", "NPC")
+        psyche.create_from_archetype(COMMONER)
+        return psyche
+
+    template = ArchetypeTemplate("crowd", COMMONER)
+    full_size, _ = measure(full)
+    overlay_size, crowd = measure(lambda i: template.instantiate(f"npc_{i}", "NPC"))
+    print(f"  por personagem: {full_size / 300:.0f} B completo, {overlay_size / 300:.0f} B em camadas")
+    assert overlay_size * 4 < full_size
+    assert len(crowd[0].get_beliefs()) == 2
+
+    print("Teste de memória de multidão concluído com sucesso!")
+
+def run_tests():
+    """Executa todos os testes."""
+    test_overlay_copy_on_write()
+    test_overlay_rewriting()
+    test_crowd_memory()
+    print("Todos os testes concluídos com sucesso!")
+
+if __name__ == "__main__":
+    run_tests()
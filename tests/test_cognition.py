@@ -0,0 +1,190 @@
+"""
+Testes para a seleção de ação com orçamento do Módulo de Cognição.
+"""
+
+import sys
+import os
+import time
+
+# Adiciona o diretório pai ao path para importar os módulos
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.modules.character_module import Character
+from src.modules.cognition_module import CognitionModule
+from src.modules.data_structures import Node, Hyperedge, Hypergraph
+from src.modules.decision_trace import DecisionTrace, DEBUG, INFO, WARNING
+from src.modules.simulation_core import SimulationCore
+from src.psyche import PsycheModule
+from src.rewriting import RewriteEngine
+
+def test_outcome_cache():
+    """Testa a escolha da melhor opção e o cache de resultados previstos."""
+    print("Testando cache de resultados previstos...")
+
+    calls = []
+    def model(state_key, option):
+        calls.append(option)
+        return {"rest": 0.2, "work": 0.7, "chat": 0.5}[option]
+
+    character = Character("c1")
+    character.p_npc.add_node(Node("h_chat", "Habit", action="chat", strength=0.3))
+    cognition = CognitionModule(character, candidate_actions=["rest", "work"], outcome_model=model)
+    assert cognition.expanded_human_act() == "work"
+    assert cognition.options == ["rest", "work", "chat"]
+    assert cognition.early_exit is None and cognition.skipped_steps == []
+
+    # O mesmo estado reaproveita as previsões; a emoção repetida é combinada na mesma aresta
+    cognition.expanded_human_act()
+    assert len(calls) == 3 and cognition.outcome_cache_hits == 3
+    emotions = [edge for edge in character.p_npc.hyperedges.values() if edge.type == "EmotionEdge"]
+    assert len(emotions) == 1 and len(cognition.emotions) == 1
+    assert abs(emotions[0].intensity - (1 - (1 - 0.63) * (1 - 0.7))) < 1e-9
+
+    # Limpar as hiper-arestas também limpa os índices (a próxima chamada observa de novo o evento)
+    character.p_npc.hyperedges.clear()
+    cognition.expanded_human_act()
+    assert len(character.p_npc.get_edges_by_type("EmotionEdge")) == 1
+
+    print("Teste de cache de resultados previstos concluído com sucesso!")
+
+def test_early_exits():
+    """Testa as saídas antecipadas por hábito forte e por regra."""
+    print("Testando saídas antecipadas...")
+
+    def model(state_key, option):
+        raise AssertionError("A deliberação deveria ter sido pulada")
+
+    character = Character("c2")
+    character.p_npc.add_node(Node("h_pray", "Habit", action="pray", strength=0.95))
+    # Só os nós do tipo Habit são consultados
+    character.p_npc.add_node(Node("g_steal", "Goal", action="steal", strength=1.0))
+    cognition = CognitionModule(character, candidate_actions=["work"], outcome_model=model)
+    assert cognition.expanded_human_act() == "pray"
+    assert cognition.early_exit == "habit"
+
+    psyche = PsycheModule("c3", "C3")
+    psyche.add_value("Security", 0.9)
+    psyche.add_rule([], "[ValueNode(valueName=Security, priority>0.5)]", "decrease_priority(ValueNode:Security, 0.1)")
+    engine = RewriteEngine(psyche.psyche)
+    rule_id = engine.matcher.active_rules()[0]
+    cognition = CognitionModule(Character("c3"), rewrite_engine=engine,
+                                reflex_rules={rule_id: "flee"}, outcome_model=model)
+    assert cognition.expanded_human_act() == "flee"
+    assert cognition.early_exit == "rule"
+
+    print("Teste de saídas antecipadas concluído com sucesso!")
+
+def test_budget():
+    """Testa o limite de tempo: devolve a melhor ação encontrada até o prazo."""
+    print("Testando orçamento de tempo...")
+
+    options = [f"option_{i}" for i in range(20)]
+    def slow_model(state_key, option):
+        time.sleep(0.01)
+        return options.index(option)
+
+    cognition = CognitionModule(Character("c4"), candidate_actions=options,
+                                outcome_model=slow_model, budget=0.035)
+    start = time.perf_counter()
+    action = cognition.expanded_human_act()
+    elapsed = time.perf_counter() - start
+    evaluated = len(cognition.predicted_outcomes)
+    assert 1 <= evaluated < len(options)
+    assert action == f"option_{evaluated - 1}"
+    assert cognition.skipped_steps == [7, 11, 12]
+    assert elapsed < 0.2
+
+    print("Teste de orçamento de tempo concluído com sucesso!")
+
+def test_decision_trace():
+    """Testa o rastro de decisões em buffer circular."""
+    print("Testando rastro de decisões...")
+
+    trace = DecisionTrace(capacity=8, level=DEBUG)
+    character = Character("c5", archetype="hero", trace=trace)
+    cognition = CognitionModule(character, candidate_actions=["work"])
+    assert cognition.trace is trace
+    cognition.expanded_human_act()
+    # O buffer guarda apenas as últimas entradas
+    assert len(trace) == 8 and trace.dropped > 0
+    decision = trace.latest_decision()
+    assert decision == []  # o início do ato já foi sobrescrito
+
+    trace = DecisionTrace(capacity=64, level=INFO)
+    cognition = CognitionModule(Character("c6"), candidate_actions=["work"], trace=trace)
+    cognition.expanded_human_act()
+    character_decision = trace.latest_decision()
+    assert [entry.step for entry in character_decision] == [0, 8]
+    assert character_decision[1].message == "Selected action: work"
+    assert trace.last(1)[0].level == INFO
+
+    # Desligado por agente: nada é armazenado
+    trace.enabled = False
+    cognition.character.p_npc.hyperedges.clear()
+    cognition.expanded_human_act()
+    assert len(trace) == 2
+
+    # Passos pulados por orçamento ficam como WARNING
+    trace.enabled = True
+    cognition.character.p_npc.hyperedges.clear()
+    cognition.expanded_human_act(budget=0.0)
+    warnings = trace.entries(min_level=WARNING)
+    assert [entry.step for entry in warnings] == [2, 3, 4, 5, 6, 7, 11, 12]
+
+    core = SimulationCore(trace=trace)
+    core.tick()
+    assert trace.tick == 1
+
+    print("Teste de rastro de decisões concluído com sucesso!")
+
+def test_adapter_mutations():
+    """Testa que as mutações pela API antiga mantêm os índices do grafo."""
+    print("Testando mutações pelo adaptador...")
+
+    graph = Hypergraph()
+    graph.add_node(Node("a", "Agent"))
+    graph.add_node(Node("b", "Agent"))
+    graph.add_hyperedge(Hyperedge("e1", "Emotion", ["a"], intensity=0.9))
+    graph.add_hyperedge(Hyperedge("e2", "Emotion", ["a", "b"], intensity=0.2))
+
+    # Escritas nas propriedades passam pelo grafo
+    edge = graph.get_hyperedge("e1")
+    edge.properties["intensity"] = 0.1
+    assert graph.edges_in_range("Emotion", "intensity", low=0.5) == []
+    graph.get_hyperedge("e2").properties.update(intensity=0.8)
+    assert [e.id for e in graph.edges_in_range("Emotion", "intensity", low=0.5)] == ["e2"]
+
+    # Remoções pelo mapeamento antigo atualizam a incidência
+    del graph.hyperedges["e2"]
+    assert [e.id for e in graph.get_edges_for_node("b")] == []
+    graph.hyperedges.clear()
+    assert len(graph.hyperedges) == 0 and graph.get_edges_for_node("a") == []
+    graph.hyperedges["e3"] = Hyperedge("e3", "Emotion", ["b"], intensity=0.7)
+    assert [e.id for e in graph.get_edges_for_node("b")] == ["e3"]
+
+    # Fora do grafo, a escrita só altera o elemento
+    edge.properties["intensity"] = 0.95
+    assert graph.edges_in_range("Emotion", "intensity", low=0.9) == []
+
+    # Nomes que escondem métodos são rejeitados
+    for build in (lambda: Node("c", "Agent", to_dict=1), lambda: edge.properties.__setitem__("properties", 1)):
+        try:
+            build()
+            assert False, "Deveria ter lançado KeyError"
+        except KeyError:
+            pass
+    assert graph.get_node("a").to_dict() == {"id": "a", "type": "Agent"}
+
+    print("Teste de mutações pelo adaptador concluído com sucesso!")
+
+def run_tests():
+    """Executa todos os testes."""
+    test_outcome_cache()
+    test_early_exits()
+    test_budget()
+    test_decision_trace()
+    test_adapter_mutations()
+    print("Todos os testes concluídos com sucesso!")
+
+if __name__ == "__main__":
+    run_tests()
@@ -0,0 +1,125 @@
+"""
+Testes para o índice de similaridade de memórias e crenças.
+"""
+
+import sys
+import os
+import random
+
+# Adiciona o diretório pai ao path para importar os módulos
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import numpy as np
+
+from src.psyche import PsycheModule
+from src.edges import MemoryEdge
+from src.archetypes import ArchetypeTemplate
+from src.embeddings import HashingEmbedder, IVFIndex, EmbeddingIndex, search_across
+
+WORDS = ("lobo floresta noite medo rio ponte traição amigo ouro rei festa chuva "
+         "fogo casa irmão mentira promessa espada cavalo mar tempestade vila").split()
+
+def random_texts(count, seed=0):
+    """Gera frases aleatórias com o vocabulário de teste."""
+    rng = random.Random(seed)
+    return [" ".join(rng.choice(WORDS) for _ in range(6)) for _ in range(count)]
+
+def test_hashing_embedder():
+    """Testa o embedding por truque do hashing."""
+    print("Testando embedding por hashing...")
+
+    embedder = HashingEmbedder(dim=64)
+    a = embedder("O lobo atacou na floresta")
+    assert a.shape == (64,) and abs(np.linalg.norm(a) - 1.0) < 1e-5
+    assert np.allclose(a, embedder("o LOBO atacou na floresta"))
+    assert float(a @ embedder("lobo na floresta")) > float(a @ embedder("festa do rei"))
+    assert not embedder("").any()
+    assert embedder.embed_many(["a", "b"]).shape == (2, 64)
+
+    print("Teste de embedding por hashing concluído com sucesso!")
+
+def test_ivf_recall():
+    """Compara o índice IVF com a busca exata."""
+    print("Testando revocação do índice IVF...")
+
+    embedder = HashingEmbedder(dim=128)
+    index = IVFIndex(128, n_probe=6, min_train_size=200)
+    for i, text in enumerate(random_texts(2000)):
+        index.add(f"m{i}", embedder(text))
+    assert index.is_trained
+
+    queries = embedder.embed_many(random_texts(50, seed=1))
+    hits = 0
+    for query, approximate in zip(queries, index.search_batch(queries, 10)):
+        exact = {item_id for item_id, _ in index.brute_force_search(query, 10)}
+        hits += len(exact & {item_id for item_id, _ in approximate})
+    assert hits / (50 * 10) >= 0.6
+
+    index.remove("m0")
+    assert "m0" not in index and len(index) == 1999
+    assert all(item_id != "m0" for item_id, _ in index.search(queries[0], 2000))
+
+    print("Teste de revocação do índice IVF concluído com sucesso!")
+
+def test_embedding_index():
+    """Testa o índice por psique mantido pelos ouvintes do grafo."""
+    print("Testando índice de similaridade da psique...")
+
+    psyche = PsycheModule("char_1", "Teste")
+    belief = psyche.add_belief("O mundo é perigoso à noite", 0.8)
+    index = EmbeddingIndex(psyche.psyche, dim=128)
+    assert belief.embedding is not None
+
+    psyche.psyche.add_edge(MemoryEdge("m1", [], "Fear", description="Um lobo me atacou na floresta"))
+    psyche.psyche.add_edge(MemoryEdge("m2", [], "Joy", description="A festa na casa do rei"))
+    best, score = index.similar("lobo na floresta escura", k=1)[0]
+    assert best.id == "m1" and score > 0
+
+    # Alterar a descrição recalcula o vetor
+    psyche.psyche.update_edge("m2", description="lobo floresta lobo floresta")
+    assert index.similar("lobo floresta", k=1)[0][0].id == "m2"
+
+    psyche.psyche.remove_edge("m1")
+    assert len(index) == 2
+
+    # O vetor é serializado com a memória
+    assert MemoryEdge.from_dict(psyche.psyche.get_edge("m2").to_dict()).embedding is not None
+
+    other = PsycheModule("char_2", "Outro")
+    other.add_belief("A festa do rei", 0.5)
+    results = search_across({"char_1": index, "char_2": EmbeddingIndex(other.psyche, dim=128)},
+                            ["festa do rei", "perigo à noite"], k=1)
+    assert results["char_2"][0][0][0].content == "A festa do rei"
+    assert results["char_1"][1][0][0] is belief
+
+    print("Teste de índice de similaridade da psique concluído com sucesso!")
+
+def test_embedding_overlay():
+    """Testa que indexar uma psique em camadas não altera o template."""
+    print("Testando índice sobre psique em camadas...")
+
+    template = ArchetypeTemplate("embedding_test", {"beliefs": [{"content": "Lobos vivem na floresta",
+                                                                 "confidence": 0.6}]})
+    shared = template.graph.get_nodes_by_type("Belief")[0]
+    psyche = template.instantiate("char_3", "Camada")
+    index = EmbeddingIndex(psyche.psyche, dim=128)
+    assert shared.embedding is None
+    assert psyche.psyche.get_node(shared.id).embedding is not None
+    assert index.similar("lobos na floresta", k=1)[0][0].id == shared.id
+
+    # No próprio template (congelado) o vetor fica apenas no índice
+    frozen_index = EmbeddingIndex(template.graph, dim=128)
+    assert len(frozen_index) == 1 and shared.embedding is None
+
+    print("Teste de índice sobre psique em camadas concluído com sucesso!")
+
+def run_tests():
+    """Executa todos os testes."""
+    test_hashing_embedder()
+    test_ivf_recall()
+    test_embedding_index()
+    test_embedding_overlay()
+    print("Todos os testes concluídos com sucesso!")
+
+if __name__ == "__main__":
+    run_tests()
@@ -0,0 +1,70 @@
+"""
+Testes para o acumulador de emoções.
+"""
+
+import sys
+import os
+
+# Adiciona o diretório pai ao path para importar os módulos
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.psyche import PsycheModule
+from src.emotions import EmotionAccumulator, combine_intensities
+
+def test_merge_on_insert():
+    """Testa a combinação de avaliações repetidas em uma única emoção."""
+    print("Testando combinação de emoções...")
+
+    psyche = PsycheModule("char1", "Char1")
+    friend = psyche.add_value("Friendship", 0.8)
+    accumulator = EmotionAccumulator(psyche.psyche)
+    first = accumulator.appraise("Joy", 0.5, target="bob", cause=friend.id, current_time=1)
+    assert first.type == "Emotion" and first.nodes == [friend.id]
+    for tick in range(2, 50):
+        edge = accumulator.appraise("Joy", 0.5, target="bob", cause=friend.id, current_time=tick)
+        assert edge is first
+    assert len(accumulator) == 1 and accumulator.merges == 48
+    assert combine_intensities(0.5, 0.5) == 0.75
+    assert abs(first.intensity - (1 - 0.5 ** 49)) < 1e-9
+    assert first.timestamp == 49
+
+    # Chaves diferentes geram emoções diferentes
+    accumulator.appraise("Joy", 0.4, target="carol", cause=friend.id)
+    accumulator.appraise("Anger", 0.4, target="bob", cause=friend.id)
+    assert len(accumulator) == 3
+    assert len(psyche.psyche.get_edges_by_type("Emotion")) == 3
+    assert accumulator.get("Anger", "bob", friend.id).intensity == 0.4
+    # O índice ordenado de intensidade acompanha as combinações
+    assert psyche.psyche.top_edges("Emotion", "intensity", 1) == [first]
+    assert psyche.get_current_emotions()[0] is first
+
+    print("Teste de combinação de emoções concluído com sucesso!")
+
+def test_decay_and_pruning():
+    """Testa o decaimento e a remoção das emoções fracas."""
+    print("Testando decaimento de emoções...")
+
+    psyche = PsycheModule("char2", "Char2")
+    accumulator = EmotionAccumulator(psyche.psyche, prune_below=0.05)
+    strong = accumulator.appraise("Fear", 0.9, cause=None, target="wolf", decay_rate=0.1)
+    accumulator.appraise("Joy", 0.1, target="sun", decay_rate=0.5)
+    assert accumulator.decay(2) == 1
+    assert len(accumulator) == 1 and accumulator.get("Joy", "sun") is None
+    assert abs(strong.intensity - 0.9 * 0.81) < 1e-9
+
+    # Remoções externas são acompanhadas; a próxima avaliação recria a emoção
+    psyche.psyche.remove_edge(strong.id)
+    assert len(accumulator) == 0
+    again = accumulator.appraise("Fear", 0.3, target="wolf")
+    assert again is not strong and again.intensity == 0.3
+
+    print("Teste de decaimento de emoções concluído com sucesso!")
+
+def run_tests():
+    """Executa todos os testes."""
+    test_merge_on_insert()
+    test_decay_and_pruning()
+    print("Todos os testes concluídos com sucesso!")
+
+if __name__ == "__main__":
+    run_tests()
@@ -31,6 +31,39 @@ class TestFase1And2(unittest.TestCase):
         self.assertEqual(hg.get_hyperedge("e1"), edge1)
         self.assertEqual(hg.get_hyperedge("e1").properties["emotionTag"], "Joy")
 
+    def test_adapter_shares_core_indexes(self):
+        from src.hypergraph import Hypergraph as CoreHypergraph
+        hg = Hypergraph()
+        self.assertIsInstance(hg, CoreHypergraph)
+        hg.add_node(Node("v1", "Value", valueName="Security", priority=0.9))
+        hg.add_node(Node("v2", "Value", valueName="Power", priority=0.3))
+        hg.add_hyperedge(Hyperedge("m1", "Memory", nodes=["v1", "v2"], salience=0.5))
+        with self.assertRaises(ValueError):
+            hg.add_node(Node("v1", "Value"))
+        with self.assertRaises(ValueError):
+            hg.add_hyperedge(Hyperedge("m1", "Memory", nodes=["v1"]))
+        with self.assertRaises(ValueError):
+            hg.add_hyperedge(Hyperedge("m2", "Memory", nodes=["missing"]))
+        with self.assertRaises(TypeError):
+            hg.add_node("v3")
+
+        # Properties are real attributes, visible to the core indexes and queries
+        node = hg.get_node("v2")
+        self.assertEqual(node.priority, 0.3)
+        hg.update_node("v2", priority=0.95)
+        self.assertEqual(node.properties["priority"], 0.95)
+        self.assertEqual([n.id for n in hg.top_nodes("Value", "priority", 1)], ["v2"])
+        self.assertEqual(hg.query_nodes("Value").where("priority", ">", 0.5).count(), 2)
+        self.assertEqual([e.id for e in hg.get_edges_for_node("v1")], ["m1"])
+        node.properties["mood"] = "calm"
+        self.assertEqual(node.mood, "calm")
+
+        # Shared serialization round-trips the adapter elements
+        restored = Hypergraph.from_dict(hg.to_dict())
+        self.assertEqual(restored.get_node("v1").properties["valueName"], "Security")
+        self.assertEqual(restored.get_hyperedge("m1").properties, {"salience": 0.5})
+        self.assertEqual(len(restored.hyperedges), 1)
+
     def test_simulation_core(self):
         sim_core = SimulationCore()
         self.assertIsInstance(sim_core, SimulationCore)
@@ -9,6 +9,8 @@ import os
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 from src.hypergraph import Node, Hyperedge, Hypergraph
+from src.nodes import ValueNode
+from src.edges import MemoryEdge
 
 def test_node():
     """Testa a criação e manipulação de nós."""
@@ -140,11 +142,69 @@ def test_hypergraph():
     
     print("Teste de Hypergraph concluído com sucesso!")
 
+def test_bulk_insert():
+    """Testa a inserção em lote a partir de colunas."""
+    print("Testando inserção em lote...")
+    
+    graph = Hypergraph(graph_id="g1", name="TestGraph")
+    
+    # Nós com tipo registrado recebem a subclasse correta
+    values = graph.add_nodes_bulk(
+        ["v1", "v2", "v3"],
+        "Value",
+        {"value_name": ["Security", "Benevolence", "Power"], "priority": [0.9, 0.8, 1.5]}
+    )
+    assert len(values) == 3
+    assert isinstance(graph.get_node("v2"), ValueNode)
+    assert graph.get_node("v2").value_name == "Benevolence"
+    assert graph.get_node("v3").priority == 1.0  # Valor é limitado pelo construtor
+    
+    # Coluna de tipos e tipos não registrados
+    graph.add_nodes_bulk(["c1", "c2"], ["Character", "Character"])
+    assert len(graph.get_nodes_by_type("Character")) == 2
+    assert len(graph.get_nodes_by_type("Value")) == 3
+    
+    # Hiper-arestas em lote
+    edges = graph.add_edges_bulk(
+        ["m1", "m2"],
+        [["c1", "v1"], ["c1", "c2"]],
+        "Memory",
+        {"emotion_tag": ["Fear", "Joy"], "salience": [0.9, 0.2]}
+    )
+    assert len(edges) == 2
+    assert isinstance(graph.get_edge("m1"), MemoryEdge)
+    assert graph.get_edge("m2").emotion_tag == "Joy"
+    assert len(graph.get_edges_by_type("Memory")) == 2
+    assert {edge.id for edge in graph.get_edges_for_node("c1")} == {"m1", "m2"}
+    
+    # Um nó inexistente invalida todo o lote
+    try:
+        graph.add_edges_bulk(["m3", "m4"], [["c1"], ["missing"]])
+        assert False, "Esperava ValueError"
+    except ValueError:
+        pass
+    assert graph.get_edge("m3") is None
+    
+    # Remoção mantém os índices consistentes
+    graph.remove_node("c2")
+    assert graph.get_edge("m2") is None
+    assert [edge.id for edge in graph.get_edges_for_node("c1")] == ["m1"]
+    assert len(graph.get_edges_by_type("Memory")) == 1
+    
+    # A serialização restaura as subclasses registradas
+    graph2 = Hypergraph.from_dict(graph.to_dict())
+    assert isinstance(graph2.get_node("v1"), ValueNode)
+    assert isinstance(graph2.get_edge("m1"), MemoryEdge)
+    assert [edge.id for edge in graph2.get_edges_for_node("v1")] == ["m1"]
+    
+    print("Teste de inserção em lote concluído com sucesso!")
+
 def run_tests():
     """Executa todos os testes."""
     test_node()
     test_hyperedge()
     test_hypergraph()
+    test_bulk_insert()
     print("Todos os testes concluídos com sucesso!")
 
 if __name__ == "__main__":
@@ -0,0 +1,114 @@
+"""
+Testes para os índices ordenados por atributo do hiper-grafo.
+"""
+
+import sys
+import os
+
+# Adiciona o diretório pai ao path para importar os módulos
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.hypergraph import Hypergraph
+from src.indexes import SortedAttributeIndex
+from src.psyche import PsycheModule
+
+def test_sorted_attribute_index():
+    """Testa o índice ordenado isoladamente."""
+    print("Testando índice ordenado...")
+
+    index = SortedAttributeIndex("priority")
+    index.add_many([("a", 0.2), ("b", 0.9), ("c", 0.5), ("d", "alta")])
+    assert len(index) == 3 and "d" not in index
+    assert list(index.range(0.2, 0.5)) == ["a", "c"]
+    assert list(index.range(0.2, 0.5, include_low=False)) == ["c"]
+    assert index.count_range(low=0.5) == 2
+    assert index.top_k(2) == ["b", "c"]
+    assert index.bottom_k(1) == ["a"]
+
+    index.add("a", 1.0)
+    index.remove("b")
+    assert index.top_k(5) == ["a", "c"]
+    assert index.get("a") == 1.0
+
+    print("Teste de índice ordenado concluído com sucesso!")
+
+def test_graph_range_queries():
+    """Testa a manutenção dos índices pelo hiper-grafo."""
+    print("Testando consultas por intervalo no hiper-grafo...")
+
+    graph = Hypergraph()
+    graph.add_nodes_bulk(["v1", "v2", "v3"], "Value",
+                         {"value_name": ["A", "B", "C"], "priority": [0.3, 0.9, 0.6]})
+    assert [n.id for n in graph.nodes_in_range("Value", "priority", low=0.5)] == ["v3", "v2"]
+    assert [n.id for n in graph.top_nodes("Value", "priority", 1)] == ["v2"]
+
+    # Alterações notificadas reindexam o elemento
+    graph.update_node("v1", priority=1.0)
+    assert [n.id for n in graph.top_nodes("Value", "priority", 1)] == ["v1"]
+
+    # Em lote, a reindexação acontece ao final
+    with graph.batch():
+        graph.update_node("v2", priority=0.0)
+        assert graph.get_range_index("node", "Value", "priority").get("v2") == 0.9
+    assert [n.id for n in graph.nodes_in_range("Value", "priority", high=0.5)] == ["v2"]
+
+    graph.remove_node("v1")
+    assert [n.id for n in graph.top_nodes("Value", "priority", 3)] == ["v3", "v2"]
+
+    # Atributos não declarados podem ser indexados sob demanda
+    graph.add_edges_bulk(["e1", "e2"], [["v2"], ["v3"]], "Emotion", {"decay_rate": [0.3, 0.05]})
+    assert [e.id for e in graph.edges_in_range("Emotion", "decay_rate", high=0.1)] == ["e2"]
+    graph.update_edge("e1", decay_rate=0.01)
+    assert [e.id for e in graph.edges_in_range("Emotion", "decay_rate", high=0.1)] == ["e1", "e2"]
+
+    # O planejador usa o índice quando ele é mais seletivo
+    query = graph.query_nodes("Value").where("priority", ">", 0.5)
+    assert query.explain().startswith("índice ordenado de priority")
+    assert [n.id for n in query] == ["v3"]
+
+    print("Teste de consultas por intervalo no hiper-grafo concluído com sucesso!")
+
+def test_psyche_top_k():
+    """Testa os acessos por limiar e top-k da psique."""
+    print("Testando acessos top-k da psique...")
+
+    psyche = PsycheModule("char_1", "Teste")
+    psyche.add_value("Security", 0.8)
+    psyche.add_value("Power", 0.2)
+    psyche.add_value("Benevolence", 0.9)
+    assert [v.value_name for v in psyche.get_top_values(2)] == ["Benevolence", "Security"]
+
+    psyche.add_memory([], "Fear", 0.9, salience=0.4)
+    strongest = psyche.add_memory([], "Joy", 0.3, salience=0.95)
+    assert psyche.get_top_memories(1) == [strongest]
+
+    weak = psyche.add_emotion([], "Anger", intensity=0.05)
+    strong = psyche.add_emotion([], "Joy", intensity=0.7)
+    assert psyche.get_current_emotions() == [strong]
+
+    # O decaimento em lote reindexa as intensidades
+    strong.timestamp = 0
+    psyche.update(100)
+    assert strong not in psyche.get_current_emotions()
+    assert weak.intensity <= 0.05
+
+    # Alterações diretas, sem notify_changed, também valem; a ordem é a de inserção
+    fresh = psyche.add_emotion([], "Fear", intensity=0.8)
+    fresh.timestamp = 100
+    fresh.update_intensity(200)
+    assert fresh not in psyche.get_current_emotions()
+    weak.intensity = 0.6
+    late = psyche.add_emotion([], "Hope", intensity=0.9)
+    assert psyche.get_current_emotions() == [weak, late]
+
+    print("Teste de acessos top-k da psique concluído com sucesso!")
+
+def run_tests():
+    """Executa todos os testes."""
+    test_sorted_attribute_index()
+    test_graph_range_queries()
+    test_psyche_top_k()
+    print("Todos os testes concluídos com sucesso!")
+
+if __name__ == "__main__":
+    run_tests()
@@ -0,0 +1,108 @@
+"""
+Testes para o gerenciamento de interesse.
+"""
+
+import sys
+import os
+
+# Adiciona o diretório pai ao path para importar os módulos
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.world import Entity, WorldModule
+from src.interest import InterestManager
+from src.modules.simulation_core import SimulationCore
+
+
+def _ids(entities):
+    return sorted(entity["id"] for entity in entities)
+
+
+def test_interest_diffs():
+    """Testa as entradas, saídas e mudanças entre ticks."""
+    print("Testando InterestManager...")
+
+    world = WorldModule()
+    world.add_entity(Entity(entity_id="alice", position={"x": 0.0, "y": 0.0, "z": 0.0}))
+    world.add_entity(Entity(entity_id="bob", position={"x": 3.0, "y": 0.0, "z": 0.0}))
+    world.add_entity(Entity(entity_id="tree", position={"x": 0.0, "y": 4.0, "z": 0.0}))
+    world.add_entity(Entity(entity_id="far", position={"x": 90.0, "y": 0.0, "z": 0.0}))
+
+    interest = InterestManager(world, default_radius=5.0)
+    interest.subscribe("alice")
+
+    # Primeiro diff: tudo o que é visível entra
+    diff = interest.diff("alice")
+    assert _ids(diff.entered) == ["bob", "tree"]
+    assert diff.left == [] and diff.changed == []
+    assert interest.visible("alice") == {"bob", "tree"}
+
+    # Nada mudou: diff vazio, nada é reportado
+    reported = interest.reported
+    assert interest.diff("alice").is_empty()
+    assert interest.reported == reported
+
+    # bob se move dentro do raio (muda), tree é alterada, far se aproxima (entra)
+    world.move_entity("bob", {"x": 2.0, "y": 0.0, "z": 0.0})
+    world.get_entity("tree").properties["fruit"] = "apple"
+    world.touch_entity("tree")
+    world.move_entity("far", {"x": 4.0, "y": 0.0, "z": 0.0})
+    diff = interest.diff("alice")
+    assert _ids(diff.entered) == ["far"]
+    assert _ids(diff.changed) == ["bob", "tree"]
+    assert diff.left == []
+
+    # bob sai do raio e tree é removida do mundo
+    world.move_entity("bob", {"x": 50.0, "y": 0.0, "z": 0.0})
+    world.remove_entity("tree")
+    diff = interest.diff("alice")
+    assert sorted(diff.left) == ["bob", "tree"]
+    assert diff.entered == [] and diff.changed == []
+
+    # O próprio agente se move: o conjunto visível acompanha
+    world.move_entity("alice", {"x": 50.0, "y": 1.0, "z": 0.0})
+    diff = interest.diff("alice")
+    assert _ids(diff.entered) == ["bob"]
+    assert diff.left == ["far"]
+
+    interest.unsubscribe("alice")
+    assert "alice" not in interest
+    try:
+        interest.diff("alice")
+        assert False, "Deveria exigir inscrição"
+    except KeyError:
+        pass
+
+    print("Teste de InterestManager concluído com sucesso!")
+
+
+def test_interest_as_system():
+    """Testa o gerenciador registrado como sistema da simulação."""
+    print("Testando InterestManager como sistema...")
+
+    world = WorldModule()
+    world.add_entity(Entity(entity_id="alice", position={"x": 0.0, "y": 0.0, "z": 0.0}))
+    world.add_entity(Entity(entity_id="bob", position={"x": 1.0, "y": 0.0, "z": 0.0}))
+    interest = InterestManager(world)
+    interest.subscribe("alice")
+    interest.subscribe("bob", radius=0.5)
+
+    core = SimulationCore()
+    core.register_system(interest)
+    core.tick()
+    assert _ids(interest.diffs["alice"].entered) == ["bob"]
+    assert interest.diffs["bob"].is_empty()
+    core.tick()
+    assert all(diff.is_empty() for diff in interest.diffs.values())
+
+    print("Teste de InterestManager como sistema concluído com sucesso!")
+
+
+def run_tests():
+    """Executa todos os testes."""
+    test_interest_diffs()
+    test_interest_as_system()
+    print("Todos os testes concluídos com sucesso!")
+
+
+if __name__ == "__main__":
+    run_tests()
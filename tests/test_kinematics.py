@@ -0,0 +1,136 @@
+"""
+Testes para o movimento por velocidade.
+"""
+
+import sys
+import os
+import math
+
+import numpy as np
+
+# Adiciona o diretório pai ao path para importar os módulos
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.world import Entity, Location, WorldModule
+from src.navigation import NavigationGraph
+from src.kinematics import KinematicsSystem
+
+
+def test_walk_and_arrive():
+    """Testa a caminhada até um alvo ao longo das atualizações do mundo."""
+    print("Testando KinematicsSystem...")
+
+    world = WorldModule()
+    world.add_entity(Entity(entity_id="alice", position={"x": 0.0, "y": 0.0, "z": 0.0}))
+    kinematics = KinematicsSystem(world, separation_radius=0.0)
+    assert world.kinematics is kinematics
+
+    result = world.act("alice", {"type": "move", "position": {"x": 10.0, "y": 0.0, "z": 0.0},
+                                 "speed": 4.0})
+    assert result["success"] and result["destination"]["x"] == 10.0
+    assert world.get_entity("alice").position["x"] == 0.0  # ainda não andou
+
+    world.update(1)
+    assert world.get_entity("alice").position["x"] == 4.0
+    assert kinematics.is_moving("alice")
+    world.update(2)
+    world.update(3)  # não passa do alvo
+    assert world.get_entity("alice").position == {"x": 10.0, "y": 0.0, "z": 0.0}
+    assert not kinematics.is_moving("alice")
+    assert np.all(kinematics.velocities == 0.0)
+
+    # A grade espacial acompanha o movimento
+    assert [e.id for e in world.get_entities_in_radius({"x": 10.0, "y": 0.0, "z": 0.0}, 0.5)] == ["alice"]
+
+    # Teletransporte durante a caminhada: segue a partir da nova posição
+    kinematics.walk_to("alice", {"x": 10.0, "y": 10.0, "z": 0.0}, 1.0)
+    world.move_entity("alice", {"x": 10.0, "y": 8.0, "z": 0.0})
+    world.update(4)
+    assert world.get_entity("alice").position["y"] == 9.0
+
+    world.remove_entity("alice")
+    assert "alice" not in kinematics and len(kinematics) == 0
+    world.update(5)
+
+    print("Teste de KinematicsSystem concluído com sucesso!")
+
+
+def test_follow_navigation_path():
+    """Testa a caminhada pelos pontos de passagem da navegação."""
+    print("Testando caminhada por rotas...")
+
+    world = WorldModule()
+    for room_id, x, y in (("hall", 0.0, 0.0), ("corridor", 10.0, 0.0), ("garden", 0.0, 10.0)):
+        world.add_entity(Location(entity_id=room_id, position={"x": x, "y": y, "z": 0.0}))
+    world.add_entity(Entity(entity_id="bob", position={"x": 0.0, "y": 10.0, "z": 0.0}))
+    world.navigation = NavigationGraph(world)
+    KinematicsSystem(world)
+
+    result = world.act("bob", {"type": "move", "position": {"x": 10.0, "y": 0.0, "z": 0.0},
+                               "speed": 2.5, "navigate": True})
+    assert [(p["x"], p["y"]) for p in result["path"]] == [(0.0, 10.0), (0.0, 5.0), (5.0, 0.0), (10.0, 0.0)]
+    tick = 0
+    visited = set()
+    while world.kinematics.is_moving("bob"):
+        tick += 1
+        world.update(tick)
+        location = world.get_location_of_entity("bob")
+        visited.add(location.id if location else None)
+        assert tick < 20
+    assert world.get_entity("bob").position == {"x": 10.0, "y": 0.0, "z": 0.0}
+    assert visited == {"garden", "hall", "corridor"}
+
+    print("Teste de caminhada por rotas concluído com sucesso!")
+
+
+def test_separation():
+    """Testa a repulsão entre vizinhos próximos (só via células vizinhas)."""
+    print("Testando separação entre vizinhos...")
+
+    world = WorldModule(cell_size=2.0)
+    kinematics = KinematicsSystem(world, separation_radius=1.0, separation_strength=1.0)
+    # Dois agentes lado a lado caminhando para cima, e um distante
+    world.add_entity(Entity(entity_id="a", position={"x": 0.0, "y": 0.0, "z": 0.0}))
+    world.add_entity(Entity(entity_id="b", position={"x": 0.4, "y": 0.0, "z": 0.0}))
+    world.add_entity(Entity(entity_id="far", position={"x": 50.0, "y": 0.0, "z": 0.0}))
+    for entity_id in ("a", "b", "far"):
+        position = world.get_entity(entity_id).position
+        kinematics.walk_to(entity_id, {"x": position["x"], "y": 10.0, "z": 0.0}, 1.0)
+
+    world.update(1)
+    a, b, far = (world.get_entity(entity_id).position for entity_id in ("a", "b", "far"))
+    assert a["x"] < 0.0 and b["x"] > 0.4  # afastaram-se
+    assert far["x"] == 50.0 and far["y"] == 1.0  # sem vizinhos, sem desvio
+    # Só os pares das células vizinhas são examinados: (a, b) e (b, a)
+    assert kinematics.pairs_checked == 2
+
+    # Multidão convergindo para um ponto: com separação, os vizinhos ficam mais afastados
+    spacing = {}
+    for radius in (0.0, 1.0):
+        world = WorldModule(cell_size=2.0)
+        kinematics = KinematicsSystem(world, separation_radius=radius)
+        for i in range(300):
+            angle = 2 * math.pi * i / 300
+            world.add_entity(Entity(entity_id=f"n{i}", position={"x": 20.0 * math.cos(angle),
+                                                                  "y": 20.0 * math.sin(angle), "z": 0.0}))
+            kinematics.walk_to(f"n{i}", {"x": 0.0, "y": 0.0, "z": 0.0}, 1.0)
+        for tick in range(1, 16):
+            world.update(tick)
+        positions = kinematics.positions[:, :2]
+        distances = np.linalg.norm(positions[:, None] - positions[None], axis=2) + np.eye(300) * 100
+        spacing[radius] = distances.min(axis=1).mean()
+    assert spacing[1.0] > spacing[0.0] * 1.5
+
+    print("Teste de separação entre vizinhos concluído com sucesso!")
+
+
+def run_tests():
+    """Executa todos os testes."""
+    test_walk_and_arrive()
+    test_follow_navigation_path()
+    test_separation()
+    print("Todos os testes concluídos com sucesso!")
+
+
+if __name__ == "__main__":
+    run_tests()
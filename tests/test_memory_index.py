@@ -0,0 +1,100 @@
+"""
+Testes para o índice associativo de memórias.
+"""
+
+import sys
+import os
+
+# Adiciona o diretório pai ao path para importar os módulos
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.hypergraph import Node
+from src.psyche import PsycheModule
+from src.memory_index import AssociativeMemoryIndex
+from src.world import WorldModule, Entity
+from src.modules.character_module import Character
+from src.modules.cognition_module import CognitionModule
+
+def build_psyche():
+    """Cria um personagem com memórias envolvendo outros personagens."""
+    psyche = PsycheModule("self", "Teste")
+    for node_id in ("char_x", "char_y", "char_z"):
+        psyche.psyche.add_node(Node(node_id, "Character"))
+    psyche.current_time = 0
+    psyche.add_memory(["char_x"], "Fear", 0.8, salience=0.9)
+    psyche.current_time = 90
+    psyche.add_memory(["char_x", "char_y"], "Joy", 0.5, salience=0.5)
+    psyche.add_memory(["char_z"], "Anger", 0.5, salience=1.0)
+    return psyche
+
+def test_retrieve():
+    """Testa a recuperação top-k pelos participantes e pela emoção."""
+    print("Testando recuperação associativa...")
+
+    psyche = build_psyche()
+    index = AssociativeMemoryIndex(psyche.psyche, recency_half_life=10,
+                                   salience_weight=0.3, recency_weight=0.7)
+    assert len(index) == 3
+
+    # A memória recente vence a antiga mais saliente quando a recência pesa
+    results = index.retrieve(["char_x"], k=2, current_time=100)
+    assert [m.emotion_tag for m, _ in results] == ["Joy", "Fear"]
+    # Sem tempo atual, apenas a saliência (e a relevância) contam
+    assert index.retrieve(["char_x"], k=1)[0][0].emotion_tag == "Fear"
+    # Memórias com mais estímulos em comum são mais relevantes
+    assert index.retrieve(["char_x", "char_y"], k=1)[0][0].emotion_tag == "Joy"
+    assert index.retrieve(emotion_tags=["Anger"])[0][0].nodes == ["char_z"]
+
+    # O custo depende apenas das listas percorridas
+    index.postings_scanned = 0
+    index.retrieve(["char_z"])
+    assert index.postings_scanned == 1
+
+    print("Teste de recuperação associativa concluído com sucesso!")
+
+def test_index_maintenance():
+    """Testa a manutenção do índice pelos ouvintes do grafo."""
+    print("Testando manutenção do índice associativo...")
+
+    psyche = build_psyche()
+    index = AssociativeMemoryIndex(psyche.psyche)
+    memory = psyche.add_memory(["char_y"], "Sadness", 0.4, salience=0.4)
+    assert memory.id in index.memories_involving("char_y")
+
+    psyche.psyche.update_edge(memory.id, nodes=["char_z"], emotion_tag="Fear")
+    assert memory.id not in index.memories_involving("char_y")
+    assert memory.id in index.memories_tagged("Fear")
+
+    psyche.psyche.remove_edge(memory.id)
+    assert memory.id not in index.memories_tagged("Fear")
+    index.detach()
+    psyche.add_memory(["char_y"], "Joy", 0.4, salience=0.4)
+    assert len(index) == 3
+
+    print("Teste de manutenção do índice associativo concluído com sucesso!")
+
+def test_cognition_retrieval():
+    """Testa o passo de recuperação de memórias da cognição."""
+    print("Testando recuperação de memórias na cognição...")
+
+    psyche = build_psyche()
+    world = WorldModule()
+    world.add_entity(Entity("self", "Character", "Self", {"x": 0, "y": 0, "z": 0}))
+    world.add_entity(Entity("char_z", "Character", "Z", {"x": 1, "y": 0, "z": 0}))
+    cognition = CognitionModule(Character("self"), world=world,
+                                memory_index=AssociativeMemoryIndex(psyche.psyche))
+    cognition.expanded_human_act()
+    assert cognition.perceived_ids == ["char_z"]
+    assert [m.emotion_tag for m in cognition.retrieved_memories] == ["Anger"]
+
+    print("Teste de recuperação de memórias na cognição concluído com sucesso!")
+
+def run_tests():
+    """Executa todos os testes."""
+    test_retrieve()
+    test_index_maintenance()
+    test_cognition_retrieval()
+    print("Todos os testes concluídos com sucesso!")
+
+if __name__ == "__main__":
+    run_tests()
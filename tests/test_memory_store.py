@@ -0,0 +1,133 @@
+"""
+Testes para a consolidação e o armazenamento em camadas das memórias.
+"""
+
+import sys
+import os
+import gc
+
+# Adiciona o diretório pai ao path para importar os módulos
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.psyche import PsycheModule
+from src.memory_store import ColdMemoryStore, MemoryConsolidator, estimate_memory_size
+
+def test_merge_duplicates():
+    """Testa a fusão de memórias quase idênticas."""
+    print("Testando fusão de memórias...")
+
+    psyche = PsycheModule("char_1", "Teste")
+    value = psyche.add_value("Security", 0.8)
+    consolidator = psyche.enable_memory_consolidation(merge_window=5)
+
+    for time in (0, 2, 4):
+        psyche.current_time = time
+        psyche.add_memory([value.id], "Fear", 0.3 + time / 10, salience=0.5)
+    psyche.current_time = 30
+    psyche.add_memory([value.id], "Fear", 0.2, salience=0.5)
+    psyche.add_memory([value.id], "Fear", 0.9, salience=0.9, is_cornerstone=True)
+
+    result = consolidator.consolidate(30)
+    assert result["merged"] == 2
+    memories = psyche.get_memories()
+    assert len(memories) == 3
+    summary = [m for m in memories if m.merged_count == 3][0]
+    assert abs(summary.salience - (1 - 0.5 ** 3)) < 1e-9
+    assert abs(summary.intensity - 0.7) < 1e-9 and summary.timestamp == 4
+    consolidator.cold_store.close()
+
+    print("Teste de fusão de memórias concluído com sucesso!")
+
+def test_tiered_storage():
+    """Testa a camada fria com orçamento de RAM e o retorno sob consulta."""
+    print("Testando armazenamento em camadas...")
+
+    psyche = PsycheModule("char_2", "Teste")
+    value = psyche.add_value("Security", 0.8)
+    for i in range(20):
+        psyche.current_time = i
+        psyche.add_memory([value.id], f"Tag{i}", 0.5, salience=i / 20,
+                          is_cornerstone=(i == 0))
+    size = estimate_memory_size(psyche.get_memories()[0])
+    consolidator = psyche.enable_memory_consolidation(ram_budget_bytes=size * 8, hot_window=5)
+
+    psyche.update(20)
+    hot = psyche.get_memories()
+    stats = consolidator.get_stats()
+    assert stats["cold_memories"] == 20 - len(hot) and stats["hot_bytes"] <= size * 8 + size
+    # A memória fundamental e as recentes continuam em RAM
+    hot_times = {m.timestamp for m in hot}
+    assert {0, 15, 16, 17, 18, 19} <= hot_times
+    # As menos salientes foram para a camada fria primeiro
+    assert min(hot_times - {0}) > max(set(range(20)) - hot_times)
+
+    # Consultar uma memória fria a traz de volta ao grafo
+    recalled = psyche.recall_memories(emotion_tag="Tag3")
+    assert len(recalled) == 1 and recalled[0].id in psyche.psyche.edges
+    assert recalled[0].nodes == [value.id]
+    assert consolidator.get_stats()["paged_in"] == 1
+    assert len(psyche.recall_memories(involving=[value.id])) == 20
+    consolidator.cold_store.close()
+
+    print("Teste de armazenamento em camadas concluído com sucesso!")
+
+def test_cold_store():
+    """Testa o banco da camada fria isoladamente."""
+    print("Testando camada fria...")
+
+    store = ColdMemoryStore()
+    psyche = PsycheModule("char_3", "Teste")
+    value = psyche.add_value("Power", 0.4)
+    memory = psyche.add_memory([value.id], "Joy", 0.6, salience=0.3)
+    assert store.put_many([memory]) == 1 and memory.id in store
+    assert store.query(involving=[value.id])[0]["emotion_tag"] == "Joy"
+    assert store.query(min_salience=0.5) == []
+    store.remove_many([memory.id])
+    assert len(store) == 0
+    path = store.path
+    store.close()
+    assert not os.path.exists(path)
+
+    print("Teste de camada fria concluído com sucesso!")
+
+def test_release_cold_store():
+    """Testa a liberação do arquivo e da conexão da camada fria."""
+    print("Testando liberação da camada fria...")
+
+    psyche = PsycheModule("char_4", "Teste")
+    path = psyche.enable_memory_consolidation().cold_store.path
+    assert os.path.exists(path)
+    # Reativar fecha o consolidador anterior; close desativa
+    second = psyche.enable_memory_consolidation().cold_store.path
+    assert not os.path.exists(path) and os.path.exists(second)
+    psyche.close()
+    assert psyche.memory_consolidator is None and not os.path.exists(second)
+    psyche.close()
+
+    # Camada fria fornecida pelo chamador continua aberta
+    shared = ColdMemoryStore()
+    with MemoryConsolidator(psyche, cold_store=shared):
+        pass
+    assert len(shared) == 0
+    shared.close()
+    shared.close()
+
+    # Sem close, o arquivo temporário é apagado quando a camada é coletada
+    store = ColdMemoryStore()
+    path = store.path
+    del store
+    gc.collect()
+    assert not os.path.exists(path)
+
+    print("Teste de liberação da camada fria concluído com sucesso!")
+
+def run_tests():
+    """Executa todos os testes."""
+    test_merge_duplicates()
+    test_tiered_storage()
+    test_cold_store()
+    test_release_cold_store()
+    print("Todos os testes concluídos com sucesso!")
+
+if __name__ == "__main__":
+    run_tests()
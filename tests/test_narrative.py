@@ -0,0 +1,112 @@
+"""
+Testes para o planejador HTN e o diretor narrativo.
+"""
+
+import sys
+import os
+
+# Adiciona o diretório pai ao path para importar os módulos
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.narrative import HTNDomain, HTNPlanner, Method, NarrativeDirector
+from src.modules.simulation_core import SimulationCore
+
+def make_domain():
+    """Cria a biblioteca do loop "Trabalhar na fazenda"."""
+    domain = HTNDomain()
+    domain.add_primitive("IrAoCampo", effects={"at_field": True})
+    domain.add_primitive("Colher", {"at_field": True, "season": "harvest"}, {"has_crops": True})
+    domain.add_primitive("Plantar", {"at_field": True}, {"planted": True})
+    domain.add_primitive("Vender", {"has_crops": True, "market_open": True}, {"has_crops": False})
+    domain.add_primitive("Descansar")
+    domain.add_compound("Trabalhar", [
+        Method("colheita", ["IrAoCampo", "Colher", "Vender"]),
+        Method("plantio", ["IrAoCampo", "Plantar"]),
+    ])
+    domain.add_compound("Dia", [
+        Method("trabalho", ["Trabalhar"], {"weather": "sunny"}),
+        Method("ferreiro", ["Descansar"], archetypes=["Smith"]),
+        Method("folga", ["Descansar"]),
+    ])
+    return domain
+
+def test_decomposition_and_cache():
+    """Testa a decomposição com retrocesso e a memorização por assinatura."""
+    print("Testando decomposição HTN...")
+
+    planner = HTNPlanner(make_domain())
+    state = {"weather": "sunny", "season": "harvest", "market_open": True}
+    plan, signature = planner.plan("Dia", state, "Farmer")
+    assert plan == ("IrAoCampo", "Colher", "Vender")
+    # "at_field" e "has_crops" são escritos por efeitos: não entram na assinatura
+    assert dict(signature) == {"weather": "sunny", "season": "harvest", "market_open": True}
+
+    # Retrocesso: o mercado fechado leva ao método de plantio
+    closed = dict(state, market_open=False)
+    assert planner.plan("Dia", closed, "Farmer")[0] == ("IrAoCampo", "Plantar")
+
+    # Fatos irrelevantes não impedem o reaproveitamento do plano
+    assert planner.misses == 2
+    plan_again, _ = planner.plan("Dia", dict(state, mood="grumpy"), "Farmer")
+    assert plan_again is plan and planner.hits == 1
+
+    # A chave inclui o arquétipo; a chuva torna a assinatura mais curta
+    assert planner.plan("Dia", {"weather": "rain"}, "Smith")[0] == ("Descansar",)
+    assert planner.plan("Dia", {"weather": "rain", "season": "x"}, "Smith")[0] == ("Descansar",)
+    assert planner.hits == 2
+
+    # Invalidação: descarta apenas as entradas com o valor antigo do fato
+    assert len(planner) == 3
+    assert planner.invalidate_fact("market_open", False) == 1
+    assert len(planner) == 2
+
+    print("Testes de decomposição HTN concluídos com sucesso!")
+
+def test_director_incremental_replanning():
+    """Testa o diretor com replanejamento incremental no núcleo da simulação."""
+    print("Testando diretor narrativo...")
+
+    core = SimulationCore()
+    director = NarrativeDirector(make_domain(), core)
+    director.world_facts.update({"weather": "sunny", "season": "harvest", "market_open": True})
+    for i in range(100):
+        director.assign(f"farmer_{i}", "Dia", "Farmer")
+    director.assign("hermit", "Dia", "Farmer", facts={"weather": "rain"})
+    assert director.planner.misses == 2 and director.planner.hits == 99
+    assert director.get_plan("farmer_7") == ("IrAoCampo", "Colher", "Vender")
+    assert director.get_plan("hermit") == ("Descansar",)
+
+    # Fato de que nenhum plano depende: ninguém é replanejado
+    director.set_world_fact("festival", True)
+    core.tick()
+    assert director.replans == 101
+
+    # O mercado fecha: só os fazendeiros dependem dele
+    director.set_world_fact("market_open", False)
+    core.tick()
+    assert director.replans == 201
+    assert director.get_plan("farmer_3") == ("IrAoCampo", "Plantar")
+    assert director.planner.misses == 3
+
+    # Execução do plano aplica os efeitos aos fatos do agente
+    assert director.next_task("farmer_3") == "IrAoCampo"
+    assert director.complete_task("farmer_3") == "Plantar"
+    assert director.complete_task("farmer_3") is None
+
+    # Fatos próprios afetam só o agente
+    director.set_agent_fact("farmer_5", "weather", "storm")
+    assert director.update(core.current_tick) == 1
+    assert director.get_plan("farmer_5") == ("Descansar",)
+    director.unassign("farmer_5")
+    assert director.get_plan("farmer_5") is None
+
+    print("Testes do diretor narrativo concluídos com sucesso!")
+
+def run_tests():
+    """Executa todos os testes."""
+    test_decomposition_and_cache()
+    test_director_incremental_replanning()
+    print("\nTodos os testes do módulo narrativo foram concluídos com sucesso!")
+
+if __name__ == "__main__":
+    run_tests()
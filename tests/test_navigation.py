@@ -0,0 +1,126 @@
+"""
+Testes para a navegação entre locais.
+"""
+
+import sys
+import os
+
+# Adiciona o diretório pai ao path para importar os módulos
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.world import Entity, Location, WorldModule
+from src.navigation import NavigationGraph
+
+
+def _room(room_id, x, y, width=10.0, height=10.0):
+    return Location(entity_id=room_id, name=room_id, position={"x": x, "y": y, "z": 0.0},
+                    area={"width": width, "height": height, "depth": 10.0})
+
+
+def _world():
+    """
+    Planta em U:  hall (0,0) - corridor (10,0) - kitchen (20,0)
+                  garden (0,10) fica acima do hall; cellar (50,0) é isolado.
+    """
+    world = WorldModule()
+    for room in (_room("hall", 0.0, 0.0), _room("corridor", 10.0, 0.0),
+                 _room("kitchen", 20.0, 0.0), _room("garden", 0.0, 10.0),
+                 _room("cellar", 50.0, 0.0)):
+        world.add_entity(room)
+    return world
+
+
+def test_routes():
+    """Testa adjacência, rotas e pontos de passagem."""
+    print("Testando NavigationGraph...")
+
+    world = _world()
+    navigation = NavigationGraph(world)
+    assert sorted(navigation.neighbors("hall")) == ["corridor", "garden"]
+    assert navigation.route("garden", "kitchen") == ["garden", "hall", "corridor", "kitchen"]
+    assert navigation.distance("hall", "kitchen") == 20.0
+    assert navigation.route("hall", "cellar") is None
+    assert navigation.distance("hall", "cellar") == float("inf")
+    assert navigation.route("hall", "hall") == ["hall"]
+
+    # Portais no centro da região de contato
+    path = navigation.path({"x": 1.0, "y": 1.0, "z": 0.0}, {"x": 21.0, "y": 0.0, "z": 0.0})
+    assert [(p["x"], p["y"]) for p in path] == [(1.0, 1.0), (5.0, 0.0), (15.0, 0.0), (21.0, 0.0)]
+    # Fora dos locais: linha reta
+    assert len(navigation.path({"x": 100.0, "y": 0.0, "z": 0.0}, {"x": 0.0, "y": 0.0, "z": 0.0})) == 2
+    assert navigation.path({"x": 0.0, "y": 0.0, "z": 0.0}, {"x": 50.0, "y": 0.0, "z": 0.0}) is None
+
+    print("Teste de NavigationGraph concluído com sucesso!")
+
+
+def test_cache_and_invalidation():
+    """Testa o cache de rotas, bloqueios e mudanças nos locais."""
+    print("Testando cache e invalidação de rotas...")
+
+    world = _world()
+    navigation = NavigationGraph(world)
+    navigation.route("garden", "kitchen")
+    navigation.route("garden", "kitchen")
+    assert navigation.cache_hits == 1 and navigation.cache_misses == 1
+    assert navigation.builds == 1
+
+    # Bloquear a passagem hall-corridor isola a cozinha do jardim
+    navigation.block("corridor", "hall")
+    assert navigation.route("garden", "kitchen") is None
+    navigation.unblock("hall", "corridor")
+    assert navigation.route("garden", "kitchen") is not None
+
+    # Um novo local liga o porão: o grafo é recalculado sozinho
+    builds = navigation.builds
+    world.add_entity(_room("tunnel", 37.5, 0.0, width=25.0))
+    assert navigation.route("kitchen", "cellar") == ["kitchen", "tunnel", "cellar"]
+    assert navigation.builds == builds + 1
+    world.remove_entity("tunnel")
+    assert navigation.route("kitchen", "cellar") is None
+
+    stats = navigation.stats()
+    assert stats["locations"] == 5 and stats["portals"] == 3
+
+    print("Teste de cache e invalidação de rotas concluído com sucesso!")
+
+
+def test_batched_paths_and_move():
+    """Testa consultas em lote e o movimento com navegação."""
+    print("Testando caminhos em lote...")
+
+    world = _world()
+    navigation = NavigationGraph(world)
+    world.navigation = navigation
+    for i in range(50):
+        world.add_entity(Entity(entity_id=f"npc{i}", position={"x": 0.5 * (i % 8), "y": 10.0, "z": 0.0}))
+
+    goal = {"x": 20.0, "y": 1.0, "z": 0.0}
+    paths = navigation.plan_paths([(f"npc{i}", goal) for i in range(50)] + [("ghost", goal)])
+    assert len(paths) == 50
+    assert all(len(path) == 5 and path[-1] == goal for path in paths.values())
+    # Um único par de locais (garden -> kitchen): uma rota calculada
+    assert navigation.cache_misses == 1
+
+    result = world.act("npc0", {"type": "move", "position": goal, "navigate": True})
+    assert result["success"] and len(result["path"]) == 5
+    assert result["location"].id == "kitchen"
+    result = world.act("npc1", {"type": "move", "position": {"x": 50.0, "y": 0.0, "z": 0.0},
+                                "navigate": True})
+    assert result == {"success": False, "error": "No route to position"}
+    assert world.get_entity("npc1").position["y"] == 10.0
+    # Sem "navigate", continua sendo teletransporte
+    assert "path" not in world.act("npc1", {"type": "move", "position": goal})
+
+    print("Teste de caminhos em lote concluído com sucesso!")
+
+
+def run_tests():
+    """Executa todos os testes."""
+    test_routes()
+    test_cache_and_invalidation()
+    test_batched_paths_and_move()
+    print("Todos os testes concluídos com sucesso!")
+
+
+if __name__ == "__main__":
+    run_tests()
@@ -0,0 +1,97 @@
+"""
+Testes para o registro de população.
+"""
+
+import sys
+import os
+
+# Adiciona o diretório pai ao path para importar os módulos
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import numpy as np
+
+from src.psyche import PsycheModule
+from src.archetypes import ArchetypeTemplate
+from src.population import PopulationRegistry
+
+def make_agent(agent_id, extraversion, belonging):
+    """Cria uma psique com um traço e uma necessidade."""
+    psyche = PsycheModule(agent_id, agent_id)
+    psyche.create_from_archetype({"personality": {"Extraversion": extraversion},
+                                  "needs": {"Belonging": belonging}})
+    return psyche
+
+def test_crowd_queries():
+    """Testa consultas vetorizadas sobre a multidão."""
+    print("Testando consultas de multidão...")
+
+    registry = PopulationRegistry(capacity=2)
+    agents = {"a": make_agent("a", 0.9, 0.2), "b": make_agent("b", 0.8, 0.9),
+              "c": make_agent("c", 0.3, 0.1)}
+    for agent_id, psyche in agents.items():
+        registry.add_agent(agent_id, psyche)
+    # Agente sem os atributos: NaN nunca satisfaz uma condição
+    registry.add_agent("d", PsycheModule("d", "d"))
+    assert len(registry) == 4
+
+    outgoing_lonely = [("Personality", "Extraversion", ">", 0.7), ("Need", "Belonging", "<", 0.5)]
+    assert registry.select(*outgoing_lonely) == ["a"]
+    assert registry.count(("Personality", "Extraversion", "!=", 0.3)) == 2
+    assert abs(registry.aggregate("Personality", "Extraversion") - 2.0 / 3) < 1e-9
+    assert registry.aggregate("Need", "Belonging", "max",
+                              [("Personality", "Extraversion", ">", 0.5)]) == 0.9
+    assert registry.aggregate("Value", "Power") is None
+    counts, edges = registry.histogram("Need", "Belonging", bins=2)
+    assert counts.tolist() == [2, 1] and edges.tolist() == [0.0, 0.5, 1.0]
+
+    # Mutações das psiques são espelhadas na matriz
+    need = agents["b"].get_needs()[0]
+    agents["b"].psyche.update_node(need.id, satisfaction=0.1)
+    assert registry.select(*outgoing_lonely) == ["a", "b"]
+    agents["c"].add_value("Power", 0.6)
+    assert registry.get("c", "Value", "Power") == 0.6
+    agents["a"].psyche.remove_node(agents["a"].get_needs()[0].id)
+    assert registry.get("a", "Need", "Belonging") is None
+
+    # Remover um agente move a última linha para o seu lugar
+    registry.remove_agent("a")
+    assert registry.agent_ids == ["d", "b", "c"]
+    assert registry.get("b", "Need", "Belonging") == 0.1
+    agents["a"].add_value("Power", 0.1)
+    assert np.isnan(registry.values("Value", "Power")[0])
+
+    # Desligar o registro o esvazia: nada fica com linhas que não acompanham mais as psiques
+    registry.detach()
+    assert len(registry) == 0 and "b" not in registry and registry.psyche("b") is None
+    registry.remove_agent("b")
+    agents["b"].add_value("Power", 0.9)
+    assert registry.count(("Value", "Power", ">", 0.0)) == 0
+    registry.add_agent("b", agents["b"])
+    assert registry.get("b", "Value", "Power") == 0.9
+
+    print("Teste de consultas de multidão concluído com sucesso!")
+
+def test_template_population():
+    """Testa o registro com psiques em camadas."""
+    print("Testando registro com templates...")
+
+    template = ArchetypeTemplate("population", {"personality": {"Extraversion": 0.5}})
+    registry = PopulationRegistry()
+    crowd = [template.instantiate(f"npc_{i}", "NPC") for i in range(50)]
+    for psyche in crowd:
+        registry.add_agent(psyche.character_id, psyche)
+    trait = crowd[7].get_personality_traits()[0]
+    crowd[7].psyche.update_node(trait.id, value=0.95)
+    assert registry.select(("Personality", "Extraversion", ">", 0.9)) == ["npc_7"]
+    assert registry.count(("Personality", "Extraversion", "==", 0.5)) == 49
+
+    print("Teste de registro com templates concluído com sucesso!")
+
+def run_tests():
+    """Executa todos os testes."""
+    test_crowd_queries()
+    test_template_population()
+    print("Todos os testes concluídos com sucesso!")
+
+if __name__ == "__main__":
+    run_tests()
@@ -0,0 +1,75 @@
+"""
+Testes para as consultas declarativas sobre o hiper-grafo.
+"""
+
+import sys
+import os
+
+# Adiciona o diretório pai ao path para importar os módulos
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.hypergraph import Hypergraph, Node
+from src.nodes import ValueNode
+from src.edges import MemoryEdge
+
+def build_graph():
+    """Cria um grafo com personagens, valores e memórias."""
+    graph = Hypergraph()
+    graph.add_nodes_bulk(["self", "char_x", "char_y"], "Character")
+    graph.add_nodes_bulk(["v_security", "v_power"], "Value",
+                         {"value_name": ["Security", "Power"], "priority": [0.9, 0.4]})
+    graph.add_edges_bulk(
+        ["m1", "m2", "m3", "m4"],
+        [["self", "char_x", "v_security"], ["self", "char_x", "v_power"],
+         ["self", "char_y", "v_security"], ["self", "char_x", "v_security"]],
+        "Memory",
+        {"emotion_tag": ["Fear", "Fear", "Fear", "Joy"], "salience": [0.9, 0.5, 0.7, 0.3]}
+    )
+    return graph
+
+def test_query_edges():
+    """Testa consultas de hiper-arestas com restrições combinadas."""
+    print("Testando consultas de hiper-arestas...")
+    
+    graph = build_graph()
+    query = (graph.query_edges("Memory")
+             .where("emotion_tag", "==", "Fear")
+             .involving("char_x")
+             .involving_match("ValueNode(priority>0.8)"))
+    assert [edge.id for edge in query] == ["m1"]
+    
+    # O planejador começa pela lista de incidência mais curta
+    assert "incidência de char_y" in graph.query_edges("Memory").involving("char_y").explain()
+    assert [e.id for e in graph.query_edges("Memory").involving("char_y")] == ["m3"]
+    
+    # Condições em texto e na notação das regras
+    assert graph.query_edges("Memory").where("salience>=0.7").count() == 2
+    assert {e.id for e in graph.query("MemoryEdge(type=Fear)")} == {"m1", "m2", "m3"}
+    
+    # Resultados são produzidos sob demanda
+    results = iter(graph.query_edges("Memory"))
+    assert next(results).type == "Memory"
+    assert graph.query_edges("Memory").limit(2).count() == 2
+    assert graph.query_edges("Emotion").first() is None
+    
+    print("Teste de consultas de hiper-arestas concluído com sucesso!")
+
+def test_query_nodes():
+    """Testa consultas de nós."""
+    print("Testando consultas de nós...")
+    
+    graph = build_graph()
+    assert [n.id for n in graph.query_nodes("Value").where("priority", ">", 0.8)] == ["v_security"]
+    assert {n.id for n in graph.query_nodes("Character").connected_to("char_y")} == {"self"}
+    assert graph.query_nodes().count() == 5
+    
+    print("Teste de consultas de nós concluído com sucesso!")
+
+def run_tests():
+    """Executa todos os testes."""
+    test_query_edges()
+    test_query_nodes()
+    print("Todos os testes concluídos com sucesso!")
+
+if __name__ == "__main__":
+    run_tests()
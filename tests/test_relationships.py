@@ -0,0 +1,108 @@
+"""
+Testes para o armazenamento de relacionamentos.
+"""
+
+import sys
+import os
+
+# Adiciona o diretório pai ao path para importar os módulos
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import numpy as np
+
+from src.relationships import RelationshipStore
+
+def test_pair_lookup():
+    """Testa a criação, a busca e a remoção de pares."""
+    print("Testando busca de pares...")
+
+    store = RelationshipStore(capacity=2)
+    store.add("alice", "bob", trust=0.6)
+    store.add("bob", "alice")
+    store.add("alice", "carol", trust=0.9, debt=1.5, stage="Bonding")
+    assert len(store) == 3
+    assert ("alice", "bob") in store and ("carol", "alice") not in store
+    assert store.get_trust("bob", "alice") == store.initial_trust
+    assert store.get_debt("alice", "carol") == 1.5
+    assert store.get_stage("alice", "carol") == "Bonding"
+    assert store.get("carol", "alice") is None
+    assert dict(store.neighbors("alice")) == {"bob": 0.6, "carol": 0.9}
+    assert dict(store.incoming("alice")) == {"bob": store.initial_trust}
+
+    try:
+        store.add("alice", "alice")
+        assert False, "Deveria rejeitar um relacionamento consigo mesmo"
+    except ValueError:
+        pass
+
+    # A linha removida é reaproveitada
+    store.remove("alice", "bob")
+    assert ("alice", "bob") not in store and len(store) == 2
+    assert dict(store.neighbors("alice")) == {"carol": 0.9}
+    row = store.add("dave", "erin")
+    assert row == 0 and store.get_trust("dave", "erin") == store.initial_trust
+    assert sorted(store.characters()) == ["alice", "bob", "carol", "dave", "erin"]
+
+    print("Testes de busca de pares concluídos com sucesso!")
+
+def test_exchange_and_stages():
+    """Testa as trocas sociais e os estágios de Knapp."""
+    print("Testando trocas sociais...")
+
+    store = RelationshipStore()
+    store.add("bob", "alice", trust=0.3)
+    value = store.record_exchange("alice", "bob", {"love": 2.0, "information": 1.0})
+    assert abs(value - 2.6) < 1e-9
+    relationship = store.get("bob", "alice")
+    assert abs(relationship["trust"] - 0.56) < 1e-9
+    assert abs(relationship["debt"] - 2.6) < 1e-9
+    assert relationship["stage"] == "Intensifying"
+
+    # Retribuir abate a dívida
+    store.record_exchange("bob", "alice", {"love": 1.0})
+    assert abs(store.get_debt("bob", "alice") - 1.6) < 1e-9
+
+    # Depois de um vínculo, uma queda de confiança leva ao afastamento
+    store.adjust("bob", "alice", trust_delta=0.4)
+    assert store.get_stage("bob", "alice") == "Bonding"
+    store.adjust("bob", "alice", trust_delta=-0.6)
+    assert store.get_stage("bob", "alice") == "Stagnating"
+
+    print("Testes de trocas sociais concluídos com sucesso!")
+
+def test_vectorized_decay():
+    """Testa o decaimento vetorizado e o registro de alterações."""
+    print("Testando decaimento vetorizado...")
+
+    store = RelationshipStore(trust_decay=0.1, debt_decay=0.5)
+    for i in range(100):
+        store.add(f"c{i}", f"c{(i + 1) % 100}", trust=0.5, debt=2.0)
+    store.remove("c0", "c1")
+    store.drain_changes()
+
+    store.update(2)
+    assert abs(store.get_trust("c5", "c6") - 0.5 * 0.81) < 1e-9
+    assert abs(store.get_debt("c5", "c6") - 0.5) < 1e-9
+    assert store.get("c0", "c1") is None
+    changes = store.drain_changes()
+    assert changes == [("decay", None, None, 0.81, 0.81)]
+    assert store.drain_changes() == []
+
+    # Exportação CSR com as confianças atuais
+    characters, indptr, indices, trust = store.to_csr()
+    assert len(characters) == 100 and indptr[-1] == 99 == len(indices)
+    assert np.allclose(trust, 0.5 * 0.81)
+    five = characters.index("c5")
+    assert characters[indices[indptr[five]]] == "c6"
+
+    print("Testes de decaimento vetorizado concluídos com sucesso!")
+
+def run_tests():
+    """Executa todos os testes."""
+    test_pair_lookup()
+    test_exchange_and_stages()
+    test_vectorized_decay()
+    print("\nTodos os testes do armazenamento de relacionamentos foram concluídos com sucesso!")
+
+if __name__ == "__main__":
+    run_tests()
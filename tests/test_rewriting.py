@@ -0,0 +1,144 @@
+"""
+Testes para o motor de reescrita do hiper-grafo.
+"""
+
+import sys
+import os
+
+# Adiciona o diretório pai ao path para importar os módulos
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.hypergraph import Hypergraph, Node
+from src.nodes import ValueNode
+from src.edges import MemoryEdge, RuleEdge
+from src.rewriting import ChangeSet, RewriteEngine, RewriteConflict
+
+def build_graph():
+    """Cria um grafo com dois valores e uma regra de traição."""
+    graph = Hypergraph()
+    graph.add_node(Node(node_id="self", node_type="Character"))
+    graph.add_node(ValueNode(node_id="v_benevolence", value_name="Benevolence", priority=0.9))
+    graph.add_node(ValueNode(node_id="v_security", value_name="Security", priority=0.5))
+    graph.add_edge(RuleEdge(
+        edge_id="r1",
+        trigger="[MemoryEdge(type=Betrayal), ValueNode(valueName=Benevolence, priority>0.8)]",
+        action="decrease_priority(ValueNode:Benevolence, 0.2); increase_priority(ValueNode:Security, 0.3)",
+        confidence=0.9
+    ))
+    return graph
+
+def test_rewrite_engine():
+    """Testa a aplicação em lote dos disparos de regras."""
+    print("Testando RewriteEngine...")
+    
+    graph = build_graph()
+    engine = RewriteEngine(graph)
+    
+    updates = []
+    graph.register_listener(lambda event, item: updates.append((event, item.id)))
+    
+    # Sem memória de traição, nada dispara
+    assert engine.run_tick() == 0
+    
+    graph.add_edge(MemoryEdge(edge_id="m1", nodes=["self"], emotion_tag="Betrayal"))
+    updates.clear()
+    assert engine.run_tick() == 1
+    assert abs(graph.get_node("v_benevolence").priority - 0.7) < 1e-9
+    assert abs(graph.get_node("v_security").priority - 0.8) < 1e-9
+    
+    # Cada elemento alterado é notificado uma única vez
+    assert sorted(updates) == [("node_updated", "v_benevolence"), ("node_updated", "v_security")]
+    
+    # A regra deixou de estar satisfeita (prioridade <= 0.8) e não dispara de novo
+    assert engine.run_tick() == 0
+    
+    stats = engine.get_stats()
+    assert stats["firings"] == 1
+    assert engine.firings_per_second() > 0
+    
+    print("Teste de RewriteEngine concluído com sucesso!")
+
+def test_changeset_rollback():
+    """Testa que um conflito desfaz todo o lote."""
+    print("Testando rollback de ChangeSet...")
+    
+    graph = build_graph()
+    
+    # Atribuições divergentes são detectadas ao registrar
+    changeset = ChangeSet()
+    changeset.set_attribute("node", "v_security", "priority", 0.1)
+    try:
+        changeset.set_attribute("node", "v_security", "priority", 0.2)
+        assert False, "Esperava RewriteConflict"
+    except RewriteConflict:
+        pass
+    
+    # Um alvo inexistente desfaz as edições já aplicadas
+    changeset = ChangeSet()
+    changeset.add_node(Node(node_id="new", node_type="Event"))
+    changeset.add_delta("node", "v_benevolence", "priority", -0.5)
+    changeset.add_delta("node", "missing", "priority", 0.1)
+    try:
+        changeset.apply(graph)
+        assert False, "Esperava RewriteConflict"
+    except RewriteConflict:
+        pass
+    assert graph.get_node("new") is None
+    assert graph.get_node("v_benevolence").priority == 0.9
+    
+    # O motor descarta o disparo conflitante (vence a ordem da agenda) e aplica o resto
+    graph.add_edge(RuleEdge(edge_id="r2", trigger="[ValueNode(valueName=Security)]",
+                            action="set_priority(ValueNode:Security, 0.1)"))
+    graph.add_edge(RuleEdge(edge_id="r3", trigger="[ValueNode(valueName=Security)]",
+                            action="set_priority(ValueNode:Security, 0.2)"))
+    graph.add_edge(RuleEdge(edge_id="r4", trigger="[ValueNode(valueName=Security)]",
+                            action="increase_priority(ValueNode:Benevolence, 0.05)"))
+    engine = RewriteEngine(graph)
+    assert engine.run_tick() == 2
+    assert engine.rolled_back_batches == 0
+    assert list(engine.conflicted_rules) == ["r3"]
+    assert graph.get_node("v_security").priority == 0.1
+    assert abs(graph.get_node("v_benevolence").priority - 0.95) < 1e-9
+    
+    # O disparo descartado não volta para a agenda
+    assert engine.run_tick() == 0
+    
+    # Uma falha na aplicação desfaz o lote e reaplica as regras uma a uma
+    graph.add_edge(RuleEdge(edge_id="r5", trigger="[ValueNode(valueName=Benevolence)]",
+                            action="increase_value_name(ValueNode:Security, 0.1)"))
+    graph.add_edge(RuleEdge(edge_id="r6", trigger="[ValueNode(valueName=Benevolence)]",
+                            action="decrease_priority(ValueNode:Benevolence, 0.5)"))
+    assert engine.run_tick() == 1
+    assert engine.rolled_back_batches == 1
+    assert "r5" in engine.conflicted_rules
+    assert abs(graph.get_node("v_benevolence").priority - 0.45) < 1e-9
+    assert graph.get_node("v_security").value_name == "Security"
+    
+    print("Teste de rollback de ChangeSet concluído com sucesso!")
+
+def test_invalid_action_skipped():
+    """Testa que uma regra com ação malformada não derruba o lote."""
+    print("Testando regra com ação malformada...")
+    
+    graph = build_graph()
+    graph.add_edge(RuleEdge(edge_id="r_bad", trigger="[ValueNode(valueName=Security)]",
+                            action="frobnicate(ValueNode:Security, 0.1)"))
+    graph.add_edge(RuleEdge(edge_id="r_good", trigger="[ValueNode(valueName=Security)]",
+                            action="set_priority(ValueNode:Security, 0.2)"))
+    engine = RewriteEngine(graph)
+    assert engine.run_tick() == 1
+    assert graph.get_node("v_security").priority == 0.2
+    assert list(engine.invalid_rules) == ["r_bad"]
+    assert engine.rolled_back_batches == 0
+    
+    print("Teste de regra com ação malformada concluído com sucesso!")
+
+def run_tests():
+    """Executa todos os testes."""
+    test_rewrite_engine()
+    test_changeset_rollback()
+    test_invalid_action_skipped()
+    print("Todos os testes concluídos com sucesso!")
+
+if __name__ == "__main__":
+    run_tests()
@@ -0,0 +1,116 @@
+"""
+Testes para a compilação e o casamento incremental de gatilhos de regras.
+"""
+
+import sys
+import os
+
+# Adiciona o diretório pai ao path para importar os módulos
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.hypergraph import Hypergraph, Node
+from src.nodes import ValueNode
+from src.edges import MemoryEdge, RuleEdge
+from src.rules import parse_trigger, RuleMatcher, RuleSyntaxError
+
+TRIGGER = "[MemoryEdge(type=Betrayal), ValueNode(valueName=Benevolence, priority>0.8)]"
+
+def test_parse_trigger():
+    """Testa a compilação de gatilhos em padrões."""
+    print("Testando parse_trigger...")
+    
+    trigger = parse_trigger(TRIGGER)
+    assert len(trigger.patterns) == 2
+    
+    memory, value = trigger.patterns
+    assert memory.kind == "edge"
+    assert memory.element_type == "Memory"
+    assert memory.conditions[0].attribute == "emotion_tag"
+    assert memory.conditions[0].value == "Betrayal"
+    
+    assert value.kind == "node"
+    assert value.element_type == "Value"
+    assert [c.attribute for c in value.conditions] == ["value_name", "priority"]
+    assert value.conditions[1].operator == ">"
+    assert value.conditions[1].value == 0.8
+    
+    # Os padrões avaliam elementos reais
+    assert value.matches(ValueNode(value_name="Benevolence", priority=0.9))
+    assert not value.matches(ValueNode(value_name="Benevolence", priority=0.5))
+    assert memory.matches(MemoryEdge(emotion_tag="Betrayal"))
+    
+    # Gatilhos iguais são compilados uma única vez
+    assert parse_trigger(TRIGGER) is trigger
+    assert parse_trigger("").patterns == ()
+    
+    try:
+        parse_trigger("[Banana(x=1)]")
+        assert False, "Esperava RuleSyntaxError"
+    except RuleSyntaxError:
+        pass
+    
+    print("Teste de parse_trigger concluído com sucesso!")
+
+def test_rule_matcher():
+    """Testa o casamento incremental de regras sobre o grafo."""
+    print("Testando RuleMatcher...")
+    
+    graph = Hypergraph()
+    graph.add_node(Node(node_id="self", node_type="Character"))
+    graph.add_node(ValueNode(node_id="v1", value_name="Benevolence", priority=0.9))
+    graph.add_edge(RuleEdge(edge_id="r1", trigger=TRIGGER,
+                            action="decrease_priority(ValueNode:Benevolence, 0.2)"))
+    
+    matcher = RuleMatcher(graph)
+    assert "r1" in matcher.triggers
+    assert not matcher.is_active("r1")
+    
+    # Uma memória de traição completa o gatilho
+    graph.add_edge(MemoryEdge(edge_id="m1", nodes=["self"], emotion_tag="Betrayal"))
+    assert matcher.is_active("r1")
+    assert matcher.get_matches("r1") == [{"m1"}, {"v1"}]
+    assert matcher.pop_activations() == ["r1"]
+    assert matcher.pop_activations() == []
+    
+    # Elementos de tipos não referenciados não provocam reavaliação
+    checks = matcher.pattern_checks
+    graph.add_node(Node(node_id="x", node_type="Character"))
+    assert matcher.pattern_checks == checks
+    
+    # Alterar o atributo desativa a regra
+    graph.update_node("v1", priority=0.5)
+    assert not matcher.is_active("r1")
+    graph.update_node("v1", priority=0.95)
+    assert matcher.pop_activations() == ["r1"]
+    
+    # Remover a memória também desativa
+    graph.remove_edge("m1")
+    assert not matcher.is_active("r1")
+    
+    # Regras adicionadas depois são acompanhadas automaticamente
+    graph.add_edge(RuleEdge(edge_id="r2", trigger="[ValueNode(priority>=0.9)]"))
+    assert matcher.is_active("r2")
+    graph.remove_edge("r2")
+    assert "r2" not in matcher.triggers
+    
+    # Um gatilho malformado não interrompe a inserção no grafo
+    graph.add_edge(RuleEdge(edge_id="r3", trigger="[ValueNode(priority>>0.9"))
+    assert graph.get_edge("r3") is not None
+    assert "r3" not in matcher.triggers and "r3" in matcher.invalid_rules
+    graph.update_edge("r3", trigger="[ValueNode(priority>=0.9)]")
+    assert matcher.is_active("r3") and "r3" not in matcher.invalid_rules
+    graph.update_edge("r3", trigger="???")
+    assert "r3" not in matcher.triggers and "r3" in matcher.invalid_rules
+    graph.remove_edge("r3")
+    assert matcher.invalid_rules == {}
+    
+    print("Teste de RuleMatcher concluído com sucesso!")
+
+def run_tests():
+    """Executa todos os testes."""
+    test_parse_trigger()
+    test_rule_matcher()
+    print("Todos os testes concluídos com sucesso!")
+
+if __name__ == "__main__":
+    run_tests()
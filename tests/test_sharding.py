@@ -0,0 +1,212 @@
+"""
+Testes para o mundo particionado em shards.
+"""
+
+import sys
+import os
+import random
+
+# Adiciona o diretório pai ao path para importar os módulos
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.world import Entity, Location, WorldModule, WorldEvent
+from src.sharding import StripPartition, ShardedWorld, Shard
+from src.interest import InterestManager
+
+
+def _ids(perception):
+    return sorted(entity["id"] for entity in perception["entities"])
+
+
+def test_partition():
+    """Testa a divisão em faixas e o halo."""
+    print("Testando StripPartition...")
+
+    partition = StripPartition(0.0, 100.0, 4, halo=5.0)
+    assert partition.shard_of({"x": 0.0}) == 0
+    assert partition.shard_of({"x": 24.9}) == 0
+    assert partition.shard_of({"x": 25.0}) == 1
+    assert partition.shard_of({"x": -10.0}) == 0
+    assert partition.shard_of({"x": 500.0}) == 3
+    assert partition.shards_near({"x": 12.0}) == {0}
+    assert partition.shards_near({"x": 23.0}) == {0, 1}
+    assert partition.shards_near({"x": 52.0}) == {1, 2}
+    assert partition.shards_within({"x": 70.0}, 30.0) == {1, 2, 3}
+
+    try:
+        StripPartition(0.0, 100.0, 0)
+        assert False, "Deveria rejeitar zero shards"
+    except ValueError:
+        pass
+
+    print("Teste de StripPartition concluído com sucesso!")
+
+
+def test_ghosts_and_handoff():
+    """Testa a percepção perto da fronteira e o repasse de um movimento."""
+    print("Testando fantasmas e handoff...")
+
+    partition = StripPartition(0.0, 100.0, 2, halo=10.0)
+    with ShardedWorld(partition) as world:
+        world.add_entity(Location(entity_id="plaza", position={"x": 55.0, "y": 0.0, "z": 0.0}))
+        world.add_entity(Entity(entity_id="alice", position={"x": 47.0, "y": 0.0, "z": 0.0}))
+        world.add_entity(Entity(entity_id="bob", position={"x": 53.0, "y": 0.0, "z": 0.0}))
+        world.add_entity(Entity(entity_id="carol", position={"x": 10.0, "y": 0.0, "z": 0.0}))
+        assert world.owner_of("alice") == 0 and world.owner_of("bob") == 1
+
+        # alice vê bob (fantasma no shard 0) através da fronteira
+        assert _ids(world.perceive("alice")) == ["bob", "plaza"]
+        assert world.stats() == [{"owned": 2, "ghosts": 2}, {"owned": 2, "ghosts": 1}]
+
+        # Interagir com um fantasma funciona no shard dono do agente
+        result = world.act("alice", {"type": "interact", "target": "bob", "max_distance": 7.0})
+        assert result["success"] and result["target"]["id"] == "bob"
+
+        # Movimento que cruza a fronteira: handoff para o shard 1
+        result = world.act("alice", {"type": "move", "position": {"x": 56.0, "y": 0.0, "z": 0.0}})
+        assert result["success"]
+        assert result["location"]["id"] == "plaza"
+        assert world.owner_of("alice") == 1
+        assert world.handoffs == 1
+        assert _ids(world.perceive("alice")) == ["bob", "plaza"]
+
+        # Longe da fronteira: o fantasma no shard 0 é retirado
+        world.act("alice", {"type": "move", "position": {"x": 90.0, "y": 0.0, "z": 0.0}})
+        assert world.stats()[0]["ghosts"] == 2  # bob e plaza
+        world.act("carol", {"type": "move", "position": {"x": 45.0, "y": 0.0, "z": 0.0}})
+        assert "alice" not in _ids(world.perceive("carol"))
+
+        world.remove_entity("bob")
+        assert world.stats() == [{"owned": 1, "ghosts": 1}, {"owned": 2, "ghosts": 1}]
+        assert world.perceive("bob") == {"error": "Agent not found"}
+        world.update(3)
+        assert world.perceive("carol")["time"] == 3
+
+    print("Teste de fantasmas e handoff concluído com sucesso!")
+
+
+def _scenario(world, rng, agents, ticks):
+    """Executa passos com movimentos aleatórios e devolve as percepções."""
+    history = []
+    for _ in range(ticks):
+        actions = []
+        for agent_id in agents:
+            position = {"x": rng.uniform(0.0, 100.0), "y": rng.uniform(0.0, 20.0), "z": 0.0}
+            actions.append((agent_id, {"type": "move", "position": position}))
+        if isinstance(world, ShardedWorld):
+            perceptions = world.step(actions, agents)["perceptions"]
+        else:
+            for agent_id, action in actions:
+                world.act(agent_id, action)
+            perceptions = {agent_id: world.perceive(agent_id) for agent_id in agents}
+        history.append({agent_id: _ids(perception) for agent_id, perception in perceptions.items()})
+    return history
+
+
+def test_matches_single_world():
+    """Testa que os shards percebem o mesmo que um único mundo."""
+    print("Testando equivalência com um único mundo...")
+
+    agents = [f"a{i}" for i in range(40)]
+    expected = None
+    for transport, shard_count in (("local", 1), ("local", 3), ("process", 3)):
+        rng = random.Random(7)
+        entities = [Entity(entity_id=agent_id,
+                           position={"x": rng.uniform(0.0, 100.0), "y": rng.uniform(0.0, 20.0), "z": 0.0})
+                    for agent_id in agents]
+        if expected is None:
+            single = WorldModule()
+            for entity in entities:
+                single.add_entity(entity)
+            expected = _scenario(single, random.Random(11), agents, 5)
+            rng = random.Random(7)
+            entities = [Entity(entity_id=agent_id,
+                               position={"x": rng.uniform(0.0, 100.0), "y": rng.uniform(0.0, 20.0), "z": 0.0})
+                        for agent_id in agents]
+        # Halo igual ao raio de percepção padrão
+        partition = StripPartition(0.0, 100.0, shard_count, halo=10.0)
+        with ShardedWorld(partition, transport=transport) as world:
+            world.add_entities(entities)
+            assert _scenario(world, random.Random(11), agents, 5) == expected
+            assert sum(stats["owned"] for stats in world.stats()) == len(agents)
+
+    print("Teste de equivalência com um único mundo concluído com sucesso!")
+
+
+def test_shard_errors():
+    """Testa comandos inválidos e erros vindos de processos."""
+    print("Testando erros dos shards...")
+
+    shard = Shard(0, StripPartition(0.0, 10.0, 1))
+    try:
+        shard.handle("explode", ())
+        assert False, "Deveria rejeitar comandos desconhecidos"
+    except ValueError:
+        pass
+
+    with ShardedWorld(StripPartition(0.0, 10.0, 1), transport="process") as world:
+        world.transports[0].send("apply", [("bogus",)])
+        try:
+            world.transports[0].receive()
+            assert False, "Deveria propagar o erro do processo"
+        except RuntimeError as error:
+            assert "bogus" in str(error)
+
+    print("Teste de erros dos shards concluído com sucesso!")
+
+
+def test_events_and_versions_across_border():
+    """Testa eventos que cruzam a fronteira e a versão dos fantasmas."""
+    print("Testando eventos e versões entre shards...")
+
+    partition = StripPartition(0.0, 100.0, 2, halo=10.0)
+    with ShardedWorld(partition) as world:
+        world.add_entity(Entity(entity_id="alice", position={"x": 47.0, "y": 0.0, "z": 0.0}))
+        world.add_entity(Entity(entity_id="bob", position={"x": 53.0, "y": 0.0, "z": 0.0}))
+        world.add_entity(Entity(entity_id="carol", position={"x": 10.0, "y": 0.0, "z": 0.0}))
+        shards = [transport.shard for transport in world.transports]
+
+        # Um grito no shard 0 chega a bob, do shard 1, uma única vez
+        world.emit_event(WorldEvent("shout", {"x": 48.0, "y": 0.0, "z": 0.0}, 6.0, source="alice"))
+        world.update(1)
+        assert [event["type"] for event in world.perceive("bob")["events"]] == ["shout"]
+        assert world.perceive("alice")["events"] == [] and world.perceive("carol")["events"] == []
+        assert not shards[0].world.inboxes and not shards[1].world.inboxes
+
+        # Eventos longe da fronteira ficam só no shard que o raio alcança
+        world.emit_event(WorldEvent("bell", {"x": 10.0, "y": 0.0, "z": 0.0}, 3.0))
+        assert shards[1].world.pending_events == []
+        world.update(2)
+        assert [event["type"] for event in world.perceive("carol")["events"]] == ["bell"]
+
+        # O fantasma leva a versão do dono, então o diff de interesse vê as mudanças
+        interest = InterestManager(shards[0].world)
+        interest.subscribe("alice")
+        assert [view["id"] for view in interest.diff("alice").entered] == ["bob"]
+        world.act("bob", {"type": "move", "position": {"x": 54.0, "y": 0.0, "z": 0.0}})
+        assert shards[0].world.get_entity("bob").version == shards[1].world.get_entity("bob").version > 0
+        assert [view["id"] for view in interest.diff("alice").changed] == ["bob"]
+
+        # Um agente que cruza a fronteira leva os eventos ainda não lidos
+        world.emit_event(WorldEvent("bell", {"x": 40.0, "y": 0.0, "z": 0.0}, 10.0, event_id="bell_3"))
+        world.update(3)
+        world.act("alice", {"type": "move", "position": {"x": 56.0, "y": 0.0, "z": 0.0}})
+        assert shards[1].owns("alice") and "alice" not in shards[0].world.inboxes
+        events = world.perceive("alice")["events"]
+        assert [(event["id"], event["time"]) for event in events] == [("bell_3", 3)]
+
+    print("Teste de eventos e versões entre shards concluído com sucesso!")
+
+
+def run_tests():
+    """Executa todos os testes."""
+    test_partition()
+    test_ghosts_and_handoff()
+    test_matches_single_world()
+    test_shard_errors()
+    test_events_and_versions_across_border()
+    print("Todos os testes concluídos com sucesso!")
+
+
+if __name__ == "__main__":
+    run_tests()
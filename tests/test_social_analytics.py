@@ -0,0 +1,140 @@
+"""
+Testes para as análises da rede social.
+"""
+
+import sys
+import os
+
+# Adiciona o diretório pai ao path para importar os módulos
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.relationships import RelationshipStore
+from src.social_analytics import SocialAnalytics
+
+def test_communities_and_isolation():
+    """Testa as comunidades incrementais e os personagens isolados."""
+    print("Testando comunidades...")
+
+    store = RelationshipStore()
+    store.add("a", "b")
+    store.add("b", "c")
+    store.add("x", "y")
+    analytics = SocialAnalytics(store)
+    analytics.add_character("hermit")
+    assert analytics.same_community("a", "c")
+    assert not analytics.same_community("a", "x")
+    assert analytics.isolated() == ["hermit"]
+
+    # Novas ligações unem comunidades
+    store.add("c", "x")
+    assert analytics.update() == 1
+    assert analytics.same_community("a", "y")
+    assert [len(group) for group in analytics.communities()] == [5, 1]
+
+    # A remoção de uma ponte reconstrói as comunidades na próxima consulta
+    store.remove("c", "x")
+    store.add("hermit", "a")
+    analytics.update()
+    assert not analytics.same_community("a", "y")
+    assert analytics.same_community("hermit", "c")
+    assert analytics.communities(min_size=2) == [{"a", "b", "c", "hermit"}, {"x", "y"}]
+    assert analytics.isolated() == []
+
+    print("Testes de comunidades concluídos com sucesso!")
+
+def test_incremental_strength():
+    """Testa o grau e a força incrementais sob decaimento."""
+    print("Testando força incremental...")
+
+    store = RelationshipStore(trust_decay=0.5)
+    store.add("a", "hub", trust=0.8)
+    store.add("b", "hub", trust=0.4)
+    store.add("hub", "a", trust=0.2)
+    analytics = SocialAnalytics(store)
+    assert analytics.in_degree["hub"] == 2 and analytics.degree("hub") == 3
+    assert abs(analytics.in_strength("hub") - 1.2) < 1e-9
+
+    store.adjust("b", "hub", trust_delta=0.2)
+    store.update(1)
+    assert analytics.update() == 2
+    assert abs(analytics.in_strength("hub") - 0.7) < 1e-9
+    assert abs(analytics.out_strength("hub") - 0.1) < 1e-9
+
+    # Decaimento prolongado força a renormalização sem perder a consistência
+    for tick in range(2, 30):
+        store.update(tick)
+        analytics.update()
+    expected = sum(trust for _, trust in store.incoming("hub"))
+    assert abs(analytics.in_strength("hub") - expected) < 1e-12
+    assert analytics.most_central(1) == ["hub"]
+
+    print("Testes de força incremental concluídos com sucesso!")
+
+def test_pagerank():
+    """Testa o PageRank periódico."""
+    print("Testando PageRank...")
+
+    store = RelationshipStore()
+    for follower in ("a", "b", "c", "d"):
+        store.add(follower, "leader", trust=0.9)
+    store.add("leader", "a", trust=0.5)
+    analytics = SocialAnalytics(store, pagerank_interval=5)
+    analytics.add_character("loner")
+    analytics.update(current_time=0)
+    ranks = {character_id: analytics.pagerank(character_id)
+             for character_id in ("leader", "a", "b", "loner")}
+    total = sum(analytics.pagerank(character_id) for character_id in ("a", "b", "c", "d", "leader", "loner"))
+    assert abs(total - 1.0) < 1e-6
+    assert ranks["leader"] > ranks["a"] > ranks["b"]
+    assert analytics.most_central(1, by="pagerank") == ["leader"]
+
+    # Só recalcula depois do intervalo
+    store.add("leader", "b", trust=0.5)
+    analytics.update(current_time=3)
+    assert analytics.pagerank("b") == ranks["b"]
+    analytics.update(current_time=5)
+    assert analytics.pagerank("b") > ranks["b"]
+
+    print("Testes de PageRank concluídos com sucesso!")
+
+def test_change_log_overflow():
+    """Testa o limite do registro de alterações e o recálculo completo."""
+    print("Testando limite do registro de alterações...")
+
+    # Sem consumidor, o registro não cresce sem limite
+    store = RelationshipStore(max_changes=5)
+    store.add("a", "b")
+    for tick in range(1, 100):
+        store.update(tick)
+    assert store.changes_overflowed and store.drain_changes() == []
+    assert not store.changes_overflowed
+
+    # Com transbordamento, as análises são recalculadas a partir dos relacionamentos
+    analytics = SocialAnalytics(store)
+    analytics.add_character("hermit")
+    for i in range(10):
+        store.add(f"c{i}", "a", trust=0.5)
+    store.remove("a", "b")
+    assert analytics.update() == 0 and analytics.rebuilds == 1
+    assert analytics.degree("a") == 10
+    assert abs(analytics.in_strength("a") - 5.0) < 1e-9
+    assert analytics.same_community("c0", "c9") and not analytics.same_community("a", "b")
+    assert sorted(analytics.isolated()) == ["b", "hermit"]
+
+    # Depois do recálculo, volta ao modo incremental
+    store.add("hermit", "a", trust=0.5)
+    assert analytics.update() == 1 and analytics.rebuilds == 1
+    assert analytics.degree("a") == 11
+
+    print("Testes de limite do registro de alterações concluídos com sucesso!")
+
+def run_tests():
+    """Executa todos os testes."""
+    test_communities_and_isolation()
+    test_incremental_strength()
+    test_pagerank()
+    test_change_log_overflow()
+    print("\nTodos os testes das análises sociais foram concluídos com sucesso!")
+
+if __name__ == "__main__":
+    run_tests()
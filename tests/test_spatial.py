@@ -0,0 +1,158 @@
+"""
+Testes para a grade espacial e a difusão de eventos do mundo.
+"""
+
+import sys
+import os
+
+# Adiciona o diretório pai ao path para importar os módulos
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.spatial import SpatialGrid
+from src.world import Entity, Location, WorldModule, WorldEvent
+
+
+def test_spatial_grid():
+    """Testa inserção, movimento, remoção e consulta por raio."""
+    print("Testando SpatialGrid...")
+
+    grid = SpatialGrid(cell_size=5.0)
+    grid.insert("a", (0.0, 0.0, 0.0))
+    grid.insert("b", (3.0, 4.0, 0.0))
+    grid.insert("c", (50.0, 0.0, 0.0))
+    assert len(grid) == 3
+    assert sorted(grid.query_radius((0.0, 0.0, 0.0), 5.0)) == ["a", "b"]
+    assert grid.query_radius((0.0, 0.0, 0.0), 4.9) == ["a"]
+
+    # Mover dentro da mesma célula não troca de célula; mover para longe troca
+    grid.move("b", (4.0, 4.0, 0.0))
+    assert "b" in grid.items_in_cell((0, 0, 0))
+    grid.move("b", (49.0, 0.0, 0.0))
+    assert sorted(grid.query_radius((50.0, 0.0, 0.0), 2.0)) == ["b", "c"]
+    assert "b" not in grid.items_in_cell((0, 0, 0))
+
+    grid.remove("c")
+    assert "c" not in grid
+    assert grid.query_radius((50.0, 0.0, 0.0), 2.0) == ["b"]
+
+    # Coordenadas negativas e raio maior que a ocupação
+    grid.insert("d", (-7.0, -2.0, 0.0))
+    assert sorted(grid.query_radius((0.0, 0.0, 0.0), 1000.0)) == ["a", "b", "d"]
+
+    print("Teste de SpatialGrid concluído com sucesso!")
+
+
+def test_world_event_delivery():
+    """Testa a entrega de eventos apenas às entidades ao alcance."""
+    print("Testando entrega de eventos do mundo...")
+
+    world = WorldModule(cell_size=10.0)
+    world.add_entity(Location(entity_id="square", name="Square",
+                              position={"x": 0.0, "y": 0.0, "z": 0.0}))
+    world.add_entity(Entity(entity_id="alice", position={"x": 1.0, "y": 0.0, "z": 0.0}))
+    world.add_entity(Entity(entity_id="bob", position={"x": 4.0, "y": 3.0, "z": 0.0}))
+    world.add_entity(Entity(entity_id="carol", position={"x": 80.0, "y": 0.0, "z": 0.0}))
+
+    world.emit_event(WorldEvent("explosion", {"x": 0.0, "y": 0.0, "z": 0.0}, 6.0,
+                                data={"loudness": 0.9}, source="alice", event_id="boom"))
+    # Eventos só são entregues na atualização do mundo
+    assert world.perceive("bob")["events"] == []
+
+    world.update(5)
+    assert world.events_delivered == 1  # só bob: alice é a fonte, square é um local, carol está longe
+    assert "carol" not in world.inboxes and "square" not in world.inboxes
+
+    perception = world.perceive("bob")
+    assert [event["id"] for event in perception["events"]] == ["boom"]
+    assert perception["events"][0]["time"] == 5
+    assert perception["events"][0]["data"]["loudness"] == 0.9
+    # A percepção consome a caixa de entrada
+    assert world.perceive("bob")["events"] == []
+
+    # A grade acompanha os movimentos feitos por act
+    world.act("carol", {"type": "move", "position": {"x": 2.0, "y": 0.0, "z": 0.0}})
+    world.emit_event(WorldEvent("shout", {"x": 0.0, "y": 0.0, "z": 0.0}, 3.0))
+    world.update(6)
+    assert [event["type"] for event in world.perceive("carol")["events"]] == ["shout"]
+    assert "carol" in [entity["id"] for entity in world.perceive("alice")["entities"]]
+
+    # Entidades removidas saem da grade e perdem a caixa de entrada
+    world.emit_event(WorldEvent("shout", {"x": 0.0, "y": 0.0, "z": 0.0}, 3.0))
+    world.update(7)
+    world.remove_entity("carol")
+    assert "carol" not in world.inboxes
+    assert world.get_entities_in_radius({"x": 2.0, "y": 0.0, "z": 0.0}, 0.5) == []
+
+    # Eventos não lidos expiram na atualização seguinte: quem nunca percebe não acumula
+    for i in range(20):
+        world.add_entity(Entity(entity_id=f"item_{i}", entity_type="Item",
+                                position={"x": float(i % 5), "y": float(i // 5), "z": 0.0}))
+    for tick in range(8, 58):
+        world.emit_event(WorldEvent("shout", {"x": 0.0, "y": 0.0, "z": 0.0}, 10.0))
+        world.update(tick)
+    assert max(len(inbox) for inbox in world.inboxes.values()) == 1
+    assert world.events_expired > 0
+    assert [event["type"] for event in world.perceive("bob")["events"]] == ["shout"]
+
+    print("Teste de entrega de eventos do mundo concluído com sucesso!")
+
+
+def test_delivery_scales_with_affected_agents():
+    """Testa que a entrega só visita as células próximas ao evento."""
+    print("Testando custo da entrega de eventos...")
+
+    world = WorldModule(cell_size=10.0)
+    for i in range(2000):
+        world.add_entity(Entity(entity_id=f"agent_{i}",
+                                position={"x": float((i % 50) * 20), "y": float((i // 50) * 20), "z": 0.0}))
+    world.emit_event(WorldEvent("bell", {"x": 0.0, "y": 0.0, "z": 0.0}, 25.0))
+    world.grid.cells_visited = 0
+    world.update(1)
+    assert world.events_delivered == 3  # (0,0), (20,0) e (0,20); (20,20) está a 28.3
+    assert world.grid.cells_visited <= 9
+
+    print("Teste de custo da entrega de eventos concluído com sucesso!")
+
+
+def test_direct_position_assignment():
+    """Testa que atribuir entity.position mantém a grade e a percepção em dia."""
+    print("Testando atribuição direta de posição...")
+
+    world = WorldModule(cell_size=10.0)
+    alice = Entity(entity_id="alice", position={"x": 0.0, "y": 0.0, "z": 0.0})
+    bob = Entity(entity_id="bob", position={"x": 100.0, "y": 0.0, "z": 0.0})
+    world.add_entity(alice)
+    world.add_entity(bob)
+    assert world.perceive("alice")["entities"] == []
+
+    version = bob.version
+    bob.position = {"x": 2.0, "y": 0.0, "z": 0.0}
+    assert bob.version > version
+    assert [entity.id for entity in world.get_entities_in_radius({"x": 2.0, "y": 0.0, "z": 0.0}, 0.5)] == ["bob"]
+    assert [entity["id"] for entity in world.perceive("alice")["entities"]] == ["bob"]
+    assert world.get_entities_in_radius({"x": 100.0, "y": 0.0, "z": 0.0}, 0.5) == []
+
+    # Alterações dentro do dicionário precisam de refresh_entity
+    bob.position["x"] = 50.0
+    world.refresh_entity("bob")
+    assert world.perceive("alice")["entities"] == []
+
+    # Fora do mundo, a atribuição não toca a grade
+    world.remove_entity("bob")
+    bob.position = {"x": 1.0, "y": 0.0, "z": 0.0}
+    assert world.perceive("alice")["entities"] == []
+
+    print("Teste de atribuição direta de posição concluído com sucesso!")
+
+
+def run_tests():
+    """Executa todos os testes."""
+    test_spatial_grid()
+    test_world_event_delivery()
+    test_delivery_scales_with_affected_agents()
+    test_direct_position_assignment()
+    print("Todos os testes concluídos com sucesso!")
+
+
+if __name__ == "__main__":
+    run_tests()
@@ -203,11 +203,50 @@ def test_world_module():
     
     print("Teste de WorldModule concluído com sucesso!")
 
+def test_entity_view():
+    """Testa as visões somente leitura devolvidas por perceive e act."""
+    print("Testando EntityView...")
+
+    world = WorldModule()
+    room = Location(entity_id="room", name="Room", position={"x": 0.0, "y": 0.0, "z": 0.0})
+    alice = Entity(entity_id="alice", name="Alice", position={"x": 1.0, "y": 0.0, "z": 0.0})
+    cup = Entity(entity_id="cup", name="Cup", position={"x": 2.0, "y": 0.0, "z": 0.0},
+                 properties={"full": True})
+    for entity in (room, alice, cup):
+        world.add_entity(entity)
+
+    perception = world.perceive("alice")
+    views = {view["id"]: view for view in perception["entities"]}
+    # Mesmas chaves e valores que to_dict(), sem cópias
+    assert views["cup"] == cup.to_dict()
+    assert dict(views["room"]) == room.to_dict()
+    assert perception["location"] == room.to_dict()
+    assert views["cup"] is cup.view()
+    assert perception["position"] == alice.position
+
+    # Somente leitura, mas reflete o estado atual da entidade
+    try:
+        views["cup"]["properties"]["full"] = False
+        assert False, "A visão deveria ser somente leitura"
+    except TypeError:
+        pass
+    cup.properties["full"] = False
+    assert views["cup"]["properties"]["full"] == False
+    assert views["cup"].to_dict() == cup.to_dict()
+    assert "area" in views["room"] and "area" not in views["cup"]
+
+    result = world.act("alice", {"type": "interact", "target": "cup"})
+    assert result["success"] == True
+    assert result["target"] == cup.to_dict()
+
+    print("Teste de EntityView concluído com sucesso!")
+
 def run_tests():
     """Executa todos os testes."""
     test_entity()
     test_location()
     test_world_module()
+    test_entity_view()
     print("Todos os testes concluídos com sucesso!")
 
 if __name__ == "__main__":